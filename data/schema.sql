@@ -1,37 +1,297 @@
+CREATE TABLE schema_version (
+  version INTEGER PRIMARY KEY,
+  name TEXT NOT NULL,
+  applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  backfilled_at TEXT
+);
+
 CREATE TABLE Authors (
-  id INTEGER PRIMARY KEY,
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
   name TEXT NOT NULL,
-birth_year INTEGER,
-nationality TEXT
+  birth_year INTEGER,
+  nationality TEXT
 );
-CREATE TABLE Books (
-  id INTEGER PRIMARY KEY,
-  title TEXT NOT NULL,
-  isbn TEXT UNIQUE NOT NULL,
-  year INTEGER,
-  genre TEXT,
-  copies INTEGER DEFAULT 1,
-  author_id INTEGER,
-  FOREIGN KEY(author_id) REFERENCES Authors(id)
 
+CREATE TABLE Books (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      title TEXT NOT NULL,
+      isbn TEXT UNIQUE NOT NULL,
+      year INTEGER,
+      genre TEXT,
+      copies INTEGER DEFAULT 1,
+      author_id INTEGER, on_loan INTEGER NOT NULL DEFAULT 0, available_copies INTEGER
+  GENERATED ALWAYS AS (COALESCE(copies, 0) - on_loan) VIRTUAL, decade INTEGER GENERATED ALWAYS AS (year - year % 10) VIRTUAL,
+      FOREIGN KEY(author_id) REFERENCES Authors(id)
 );
+
 CREATE TABLE Members (
-  id INTEGER PRIMARY KEY,
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
   name TEXT NOT NULL,
-  email TEXT UNIQUE,
+  email TEXT UNIQUE NOT NULL,
   phone TEXT,
-  membership_date TEXT,
-  status TEXT
+  membership_date TEXT DEFAULT CURRENT_DATE,
+  status TEXT DEFAULT 'active'
 );
+
 CREATE TABLE Loans (
-  id INTEGER PRIMARY KEY,
-  book_id INTEGER,
-  member_id INTEGER,
-loan_date TEXT,
-due_date TEXT,
-return_date TEXT,
-status TEXT,
-FOREIGN KEY(book_id) REFERENCES Books(id),
-FOREIGN KEY(member_id) REFERENCES Members(id)
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  book_id INTEGER NOT NULL,
+  member_id INTEGER NOT NULL,
+  loan_date TEXT DEFAULT CURRENT_DATE,
+  due_date TEXT NOT NULL,
+  return_date TEXT,
+  status TEXT DEFAULT 'borrowed', renewals INTEGER NOT NULL DEFAULT 0,
+  FOREIGN KEY(book_id) REFERENCES Books(id),
+  FOREIGN KEY(member_id) REFERENCES Members(id)
 );
 
+CREATE VIRTUAL TABLE BookSearch USING fts5(
+  title, genre, isbn, author_name,
+  tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE VIRTUAL TABLE AuthorSearch USING fts5(
+  name,
+  tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TABLE job_state (
+  name TEXT PRIMARY KEY,
+  watermark TEXT,
+  last_run_at TEXT,
+  last_scanned INTEGER NOT NULL DEFAULT 0,
+  last_updated INTEGER NOT NULL DEFAULT 0,
+  last_duration REAL,
+  total_runs INTEGER NOT NULL DEFAULT 0,
+  total_updated INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE change_versions (
+  table_name TEXT PRIMARY KEY,
+  version INTEGER NOT NULL DEFAULT 0,
+  changed_at REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE library_stats (
+  name TEXT PRIMARY KEY,
+  value INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE stats_seed (
+  name TEXT PRIMARY KEY,
+  watermark INTEGER NOT NULL,
+  seeded_to INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE book_facets (
+  genre TEXT NOT NULL,
+  decade INTEGER NOT NULL,
+  nationality TEXT NOT NULL,
+  books INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (genre, decade, nationality)
+) WITHOUT ROWID;
+
+CREATE TABLE row_changes (
+  seq INTEGER PRIMARY KEY AUTOINCREMENT,
+  table_name TEXT NOT NULL,
+  row_id INTEGER NOT NULL
+);
+
+CREATE INDEX idx_books_title_id ON Books(title, id);
+
+CREATE INDEX idx_authors_name_id ON Authors(name, id);
+
+CREATE INDEX idx_members_name_id ON Members(name, id);
+
+CREATE INDEX idx_books_author_id ON Books(author_id);
+
+CREATE INDEX idx_loans_book_id ON Loans(book_id);
+
+CREATE INDEX idx_loans_member_id ON Loans(member_id);
+
+CREATE INDEX idx_loans_status_due_date ON Loans(status, due_date);
+
+CREATE INDEX idx_loans_status_id ON Loans(status, id);
+
+CREATE INDEX idx_members_name_nocase ON Members(name COLLATE NOCASE, id);
+
+CREATE INDEX idx_books_genre_title_id ON Books(genre, title, id);
+
+CREATE INDEX idx_books_decade_title_id ON Books(decade, title, id);
+
+CREATE INDEX idx_authors_nationality_id ON Authors(nationality, id);
+
+CREATE TRIGGER books_search_insert AFTER INSERT ON Books
+  BEGIN
+      INSERT INTO BookSearch (rowid, title, genre, isbn, author_name)
+      VALUES (NEW.id, NEW.title, NEW.genre, NEW.isbn,
+              (SELECT name FROM Authors WHERE id = NEW.author_id));
+END;
+
+CREATE TRIGGER books_search_update
+  AFTER UPDATE OF title, genre, isbn, author_id ON Books
+  BEGIN
+      DELETE FROM BookSearch WHERE rowid = OLD.id;
+      INSERT INTO BookSearch (rowid, title, genre, isbn, author_name)
+      VALUES (NEW.id, NEW.title, NEW.genre, NEW.isbn,
+              (SELECT name FROM Authors WHERE id = NEW.author_id));
+END;
+
+CREATE TRIGGER books_search_delete AFTER DELETE ON Books
+  BEGIN
+      DELETE FROM BookSearch WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER authors_search_insert AFTER INSERT ON Authors
+  BEGIN
+      INSERT INTO AuthorSearch (rowid, name) VALUES (NEW.id, NEW.name);
+END;
+
+CREATE TRIGGER authors_search_update AFTER UPDATE OF name ON Authors
+  BEGIN
+      UPDATE AuthorSearch SET name = NEW.name WHERE rowid = NEW.id;
+      UPDATE BookSearch SET author_name = NEW.name
+      WHERE rowid IN (SELECT id FROM Books WHERE author_id = NEW.id);
+END;
+
+CREATE TRIGGER authors_search_delete AFTER DELETE ON Authors
+  BEGIN
+      DELETE FROM AuthorSearch WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER books_copies_check
+  BEFORE UPDATE OF copies ON Books
+  WHEN COALESCE(NEW.copies, 0) < OLD.on_loan
+  BEGIN
+      SELECT RAISE(ABORT, 'copies cannot be fewer than the copies on loan');
+END;
+
+CREATE TRIGGER stats_members_insert AFTER INSERT ON Members
+  BEGIN
+      UPDATE library_stats SET value = value + 1 WHERE name = 'rows:Members';
+END;
+
+CREATE TRIGGER stats_members_delete AFTER DELETE ON Members
+  BEGIN
+      UPDATE library_stats SET value = value - 1 WHERE name = 'rows:Members';
+END;
+
+CREATE TRIGGER stats_loans_insert AFTER INSERT ON Loans
+  BEGIN
+      UPDATE library_stats SET value = value + 1 WHERE name = 'rows:Loans';
+END;
+
+CREATE TRIGGER stats_loans_delete AFTER DELETE ON Loans
+  BEGIN
+      UPDATE library_stats SET value = value - 1 WHERE name = 'rows:Loans';
+END;
+
+CREATE TRIGGER stats_books_insert AFTER INSERT ON Books
+  BEGIN
+      UPDATE library_stats SET value = value + 1 WHERE name = 'rows:Books';
+      UPDATE library_stats SET value = value + COALESCE(NEW.copies, 0) WHERE name = 'copies:Books';
+      INSERT INTO library_stats (name, value) VALUES ('genre:' || COALESCE(NEW.genre, ''), 1) ON CONFLICT(name) DO UPDATE SET value = value + 1;
+END;
+
+CREATE TRIGGER stats_books_delete AFTER DELETE ON Books
+  BEGIN
+      UPDATE library_stats SET value = value - 1 WHERE name = 'rows:Books';
+      UPDATE library_stats SET value = value - COALESCE(OLD.copies, 0) WHERE name = 'copies:Books';
+      UPDATE library_stats SET value = value - 1 WHERE name = 'genre:' || COALESCE(OLD.genre, '');
+END;
+
+CREATE TRIGGER stats_books_copies_update AFTER UPDATE OF copies ON Books
+  WHEN OLD.copies IS NOT NEW.copies
+  BEGIN
+      UPDATE library_stats SET value = value + COALESCE(NEW.copies, 0) - COALESCE(OLD.copies, 0) WHERE name = 'copies:Books';
+END;
+
+CREATE TRIGGER stats_books_genre_update AFTER UPDATE OF genre ON Books
+  WHEN OLD.genre IS NOT NEW.genre
+  BEGIN
+      UPDATE library_stats SET value = value - 1 WHERE name = 'genre:' || COALESCE(OLD.genre, '');
+      INSERT INTO library_stats (name, value) VALUES ('genre:' || COALESCE(NEW.genre, ''), 1) ON CONFLICT(name) DO UPDATE SET value = value + 1;
+END;
+
+CREATE TRIGGER stats_authors_insert AFTER INSERT ON Authors
+  BEGIN
+      UPDATE library_stats SET value = value + 1 WHERE name = 'rows:Authors';
+      INSERT INTO library_stats (name, value) VALUES ('nationality:' || COALESCE(NEW.nationality, ''), 1) ON CONFLICT(name) DO UPDATE SET value = value + 1;
+END;
+
+CREATE TRIGGER stats_authors_delete AFTER DELETE ON Authors
+  BEGIN
+      UPDATE library_stats SET value = value - 1 WHERE name = 'rows:Authors';
+      UPDATE library_stats SET value = value - 1 WHERE name = 'nationality:' || COALESCE(OLD.nationality, '');
+END;
+
+CREATE TRIGGER stats_authors_nationality_update AFTER UPDATE OF nationality ON Authors
+  WHEN OLD.nationality IS NOT NEW.nationality
+  BEGIN
+      UPDATE library_stats SET value = value - 1 WHERE name = 'nationality:' || COALESCE(OLD.nationality, '');
+      INSERT INTO library_stats (name, value) VALUES ('nationality:' || COALESCE(NEW.nationality, ''), 1) ON CONFLICT(name) DO UPDATE SET value = value + 1;
+END;
+
+CREATE TRIGGER facets_books_insert AFTER INSERT ON Books
+  BEGIN
+      INSERT INTO book_facets (genre, decade, nationality, books) VALUES (COALESCE(NEW.genre, ''), COALESCE(NEW.decade, ''), COALESCE((SELECT nationality FROM Authors WHERE id = NEW.author_id), ''), 1) ON CONFLICT(genre, decade, nationality) DO UPDATE SET books = books + 1;
+END;
+
+CREATE TRIGGER facets_books_delete AFTER DELETE ON Books
+  BEGIN
+      UPDATE book_facets SET books = books - 1 WHERE genre = COALESCE(OLD.genre, '') AND decade = COALESCE(OLD.decade, '') AND nationality = COALESCE((SELECT nationality FROM Authors WHERE id = OLD.author_id), '');
+END;
+
+CREATE TRIGGER facets_books_update AFTER UPDATE OF genre, year, author_id ON Books
+  WHEN OLD.genre IS NOT NEW.genre OR OLD.year IS NOT NEW.year OR OLD.author_id IS NOT NEW.author_id
+  BEGIN
+      UPDATE book_facets SET books = books - 1 WHERE genre = COALESCE(OLD.genre, '') AND decade = COALESCE(OLD.decade, '') AND nationality = COALESCE((SELECT nationality FROM Authors WHERE id = OLD.author_id), '');
+      INSERT INTO book_facets (genre, decade, nationality, books) VALUES (COALESCE(NEW.genre, ''), COALESCE(NEW.decade, ''), COALESCE((SELECT nationality FROM Authors WHERE id = NEW.author_id), ''), 1) ON CONFLICT(genre, decade, nationality) DO UPDATE SET books = books + 1;
+END;
+
+CREATE TRIGGER facets_authors_nationality_update AFTER UPDATE OF nationality ON Authors
+  WHEN OLD.nationality IS NOT NEW.nationality
+  BEGIN
+      UPDATE book_facets
+      SET books = books - (
+          SELECT COUNT(*) FROM Books b
+          WHERE b.author_id = OLD.id
+            AND COALESCE(b.genre, '') = book_facets.genre
+            AND COALESCE(b.decade, '') = book_facets.decade
+      )
+      WHERE nationality = COALESCE(OLD.nationality, '')
+        AND (genre, decade) IN (
+            SELECT COALESCE(genre, ''), COALESCE(decade, '') FROM Books WHERE author_id = OLD.id
+        );
+      INSERT INTO book_facets (genre, decade, nationality, books)
+      SELECT COALESCE(genre, ''), COALESCE(decade, ''), COALESCE(NEW.nationality, ''), COUNT(*)
+      FROM Books WHERE author_id = NEW.id
+      GROUP BY 1, 2
+      ON CONFLICT(genre, decade, nationality) DO UPDATE SET books = books + excluded.books;
+END;
+
+CREATE TRIGGER row_changes_books_update AFTER UPDATE ON Books
+  BEGIN
+      INSERT INTO row_changes (table_name, row_id) VALUES ('Books', OLD.id);
+END;
+
+CREATE TRIGGER row_changes_books_delete AFTER DELETE ON Books
+  BEGIN
+      INSERT INTO row_changes (table_name, row_id) VALUES ('Books', OLD.id);
+END;
+
+CREATE TRIGGER row_changes_authors_update AFTER UPDATE ON Authors
+  BEGIN
+      INSERT INTO row_changes (table_name, row_id) VALUES ('Authors', OLD.id);
+END;
+
+CREATE TRIGGER row_changes_authors_delete AFTER DELETE ON Authors
+  BEGIN
+      INSERT INTO row_changes (table_name, row_id) VALUES ('Authors', OLD.id);
+END;
+
+CREATE TRIGGER row_changes_trim AFTER INSERT ON row_changes
+  WHEN NEW.seq % 1000 = 0
+  BEGIN
+      DELETE FROM row_changes WHERE seq <= NEW.seq - 10000;
+END;
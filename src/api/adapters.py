@@ -1,17 +1,30 @@
 """
 API Adapters for Library Management System
-Wraps BookManager and AuthorManager to provide JSON-friendly responses
+Wraps the book, author, loan and member repositories for the API routes;
+records are returned as they come from SQLite and serialized by the app's
+JSON provider (api/json_provider.py)
 """
 
-import io
-import sys
-import contextlib
-from book_manager import BookManager
-from author_manager import AuthorManager
+import sqlite3
+from book_repository import BookRepository, COPIES_ON_LOAN_ERROR
+from author_repository import AuthorRepository
+from loan_repository import LoanRepository, CirculationError, DEFAULT_LOAN_DAYS, RENEWAL_DAYS
+from member_repository import MemberRepository
+from overdue_scanner import OverdueScanner
+from search_index import DEFAULT_SEARCH_LIMIT
+from change_versions import sync_record_cache
+
+
+def _batch_results(results):
+    """Move the written records of batch results to their 'data' key"""
+    for result in results:
+        if 'row' in result:
+            result['data'] = result.pop('row')
+    return results
 
 
 class BookAPIAdapter:
-    """Adapter to convert BookManager console output to JSON-friendly data"""
+    """Adapter serving book records to the API routes"""
 
     def __init__(self, database):
         """
@@ -20,66 +33,49 @@ class BookAPIAdapter:
         Args:
             database (Database): Database instance
         """
-        self.manager = BookManager(database)
+        self.repository = BookRepository(database)
         self.db = database
 
-    @contextlib.contextmanager
-    def _suppress_output(self):
-        """Context manager to suppress print statements"""
-        old_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-        try:
-            yield
-        finally:
-            sys.stdout = old_stdout
+    def get_all(self):
+        """
+        Get all books as records
+
+        Returns:
+            list: List of Book records
+        """
+        return self.repository.get_all_books()
 
-    def _row_to_dict(self, row):
+    def list_page(self, limit, after=None, filters=None):
         """
-        Convert book row tuple to dictionary
+        Get one page of books in (title, id) order
 
         Args:
-            row: Database row tuple
+            limit (int): Page size
+            after (tuple, optional): (title, id) cursor from the previous page
+            filters (dict, optional): genre, decade and/or nationality to match
 
         Returns:
-            dict: Book data as dictionary, or None if row is None
+            tuple: (list of Book records, (title, id) of the last book,
+                    or None when there are no further pages)
         """
-        if not row:
-            return None
-
-        # From JOIN query: id, title, isbn, year, genre, copies, author_id, author_name
-        if len(row) >= 8:
-            return {
-                'id': row[0],
-                'title': row[1],
-                'isbn': row[2],
-                'year': row[3],
-                'genre': row[4],
-                'copies': row[5],
-                'author_id': row[6],
-                'author_name': row[7]
-            }
-        else:
-            # Fallback for basic book data
-            return {
-                'id': row[0],
-                'title': row[1],
-                'isbn': row[2],
-                'year': row[3] if len(row) > 3 else None,
-                'genre': row[4] if len(row) > 4 else None,
-                'copies': row[5] if len(row) > 5 else 1,
-                'author_id': row[6] if len(row) > 6 else None
-            }
+        # Fetch one extra row to learn whether another page follows
+        rows = self.repository.list_books(limit + 1, after, filters)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_after = (rows[-1].title, rows[-1].id) if has_more else None
+        return rows, next_after
 
-    def get_all(self):
+    def iter_batches(self, batch_size=1000):
         """
-        Get all books as list of dictionaries
+        Iterate over all books in id order, one batch at a time
 
-        Returns:
-            list: List of book dictionaries
+        Args:
+            batch_size (int, optional): Rows per batch
+
+        Yields:
+            list: Up to batch_size Book records
         """
-        with self._suppress_output():
-            rows = self.manager.view_all_books()
-        return [self._row_to_dict(row) for row in rows]
+        yield from self.repository.iter_book_batches(batch_size)
 
     def get_by_id(self, book_id):
         """
@@ -89,11 +85,9 @@ class BookAPIAdapter:
             book_id (int): Book ID
 
         Returns:
-            dict: Book data or None if not found
+            Book: Book record or None if not found
         """
-        with self._suppress_output():
-            row = self.manager.get_book_by_id(book_id)
-        return self._row_to_dict(row)
+        return self.repository.get_book_by_id(book_id)
 
     def create(self, title, isbn, year=None, genre=None, copies=1, author_id=None):
         """
@@ -108,14 +102,13 @@ class BookAPIAdapter:
             author_id (int, optional): Author ID
 
         Returns:
-            dict: Created book data or None if failed
+            Book: Created book record or None if failed
         """
-        with self._suppress_output():
-            book_id = self.manager.add_book(title, isbn, year, genre, copies, author_id)
-
-        if book_id:
-            return self.get_by_id(book_id)
-        return None
+        try:
+            book_id = self.repository.add_book(title, isbn, year, genre, copies, author_id)
+        except sqlite3.Error:
+            return None
+        return self.get_by_id(book_id)
 
     def update(self, book_id, title=None, isbn=None, year=None, genre=None, copies=None, author_id=None):
         """
@@ -131,10 +124,19 @@ class BookAPIAdapter:
             author_id (int, optional): New author ID
 
         Returns:
-            dict: Updated book data or None if failed
+            Book: Updated book record or None if failed
+
+        Raises:
+            CirculationError: If copies would drop below the copies on loan
         """
-        with self._suppress_output():
-            success = self.manager.update_book(book_id, title, isbn, year, genre, copies, author_id)
+        try:
+            success = self.repository.update_book(book_id, title, isbn, year, genre, copies, author_id)
+        except sqlite3.IntegrityError as e:
+            if COPIES_ON_LOAN_ERROR in str(e):
+                raise CirculationError(f"Book {book_id} has more copies on loan than the new copies count")
+            return None
+        except sqlite3.Error:
+            return None
 
         if success:
             return self.get_by_id(book_id)
@@ -150,22 +152,64 @@ class BookAPIAdapter:
         Returns:
             bool: True if successful, False otherwise
         """
-        with self._suppress_output():
-            return self.manager.delete_book(book_id)
+        try:
+            return self.repository.delete_book(book_id)
+        except sqlite3.Error:
+            return False
+
+    def create_many(self, items, atomic=True):
+        """
+        Create many books in one transaction
+
+        Args:
+            items (list): Book objects as accepted by create()
+            atomic (bool, optional): All or nothing (default) or partial success
+
+        Returns:
+            tuple: (results, committed); created results carry the book in 'data'
+        """
+        results, committed = self.repository.add_books(items, atomic)
+        return _batch_results(results), committed
+
+    def update_many(self, items, atomic=True):
+        """
+        Update many books in one transaction
+
+        Args:
+            items (list): Objects with the book id plus the fields to change
+            atomic (bool, optional): All or nothing (default) or partial success
+
+        Returns:
+            tuple: (results, committed); updated results carry the book in 'data'
+        """
+        results, committed = self.repository.update_books(items, atomic)
+        return _batch_results(results), committed
+
+    def delete_many(self, items, atomic=True):
+        """
+        Delete many books in one transaction
 
-    def search(self, search_term):
+        Args:
+            items (list): Book ids, or objects with an id
+            atomic (bool, optional): All or nothing (default) or partial success
+
+        Returns:
+            tuple: (results, committed)
+        """
+        return self.repository.delete_books(items, atomic)
+
+    def search(self, search_term, limit=DEFAULT_SEARCH_LIMIT):
         """
         Search books
 
         Args:
             search_term (str): Search query
+            limit (int, optional): Maximum number of results
 
         Returns:
-            list: List of matching book dictionaries
+            list: List of matching Book records, best match first
         """
-        with self._suppress_output():
-            rows = self.manager.search_book(search_term)
-        return [self._row_to_dict(row) for row in rows]
+        return self.repository.search_books(search_term, limit)
 
     def get_count(self):
         """
@@ -174,12 +218,42 @@ class BookAPIAdapter:
         Returns:
             int: Number of books
         """
-        with self._suppress_output():
-            return self.manager.get_book_count()
+        return self.repository.get_book_count()
+
+    def get_facets(self, filters=None):
+        """
+        Get book counts per genre, decade and author nationality
+
+        Args:
+            filters (dict, optional): genre, decade and/or nationality to match
+
+        Returns:
+            dict: {'total': matching books, 'facets': {facet: [{'value', 'count'}]}};
+                  books without a value are listed under a None value
+        """
+        total, counts = self.repository.get_facets(filters)
+        return {
+            'total': total,
+            'facets': {
+                facet: [{'value': value if value != '' else None, 'count': count} for value, count in values]
+                for facet, values in counts.items()
+            },
+        }
+
+    def get_version(self):
+        """
+        Get the change version of the books table (for ETags), first dropping
+        cached rows that other processes changed
+
+        Returns:
+            tuple: (version, changed_at epoch seconds)
+        """
+        sync_record_cache(self.db)
+        return self.repository.get_change_version()
 
 
 class AuthorAPIAdapter:
-    """Adapter to convert AuthorManager console output to JSON-friendly data"""
+    """Adapter serving author records to the API routes"""
 
     def __init__(self, database):
         """
@@ -188,50 +262,48 @@ class AuthorAPIAdapter:
         Args:
             database (Database): Database instance
         """
-        self.manager = AuthorManager(database)
+        self.repository = AuthorRepository(database)
         self.db = database
 
-    @contextlib.contextmanager
-    def _suppress_output(self):
-        """Context manager to suppress print statements"""
-        old_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-        try:
-            yield
-        finally:
-            sys.stdout = old_stdout
+    def get_all(self):
+        """
+        Get all authors as records
 
-    def _row_to_dict(self, row):
+        Returns:
+            list: List of Author records
         """
-        Convert author row tuple to dictionary
+        return self.repository.get_all_authors()
+
+    def list_page(self, limit, after=None):
+        """
+        Get one page of authors in (name, id) order
 
         Args:
-            row: Database row tuple
+            limit (int): Page size
+            after (tuple, optional): (name, id) cursor from the previous page
 
         Returns:
-            dict: Author data as dictionary, or None if row is None
+            tuple: (list of Author records, (name, id) of the last author,
+                    or None when there are no further pages)
         """
-        if not row:
-            return None
-
-        # Author row: id, name, birth_year, nationality
-        return {
-            'id': row[0],
-            'name': row[1],
-            'birth_year': row[2] if len(row) > 2 else None,
-            'nationality': row[3] if len(row) > 3 else None
-        }
+        # Fetch one extra row to learn whether another page follows
+        rows = self.repository.list_authors(limit + 1, after)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_after = (rows[-1].name, rows[-1].id) if has_more else None
+        return rows, next_after
 
-    def get_all(self):
+    def iter_batches(self, batch_size=1000):
         """
-        Get all authors as list of dictionaries
+        Iterate over all authors in id order, one batch at a time
 
-        Returns:
-            list: List of author dictionaries
+        Args:
+            batch_size (int, optional): Rows per batch
+
+        Yields:
+            list: Up to batch_size Author records
         """
-        with self._suppress_output():
-            rows = self.manager.view_all_authors()
-        return [self._row_to_dict(row) for row in rows]
+        yield from self.repository.iter_author_batches(batch_size)
 
     def get_by_id(self, author_id):
         """
@@ -241,11 +313,9 @@ class AuthorAPIAdapter:
             author_id (int): Author ID
 
         Returns:
-            dict: Author data or None if not found
+            Author: Author record or None if not found
         """
-        with self._suppress_output():
-            row = self.manager.get_author_by_id(author_id)
-        return self._row_to_dict(row)
+        return self.repository.get_author_by_id(author_id)
 
     def create(self, name, birth_year=None, nationality=None):
         """
@@ -257,14 +327,13 @@ class AuthorAPIAdapter:
             nationality (str, optional): Nationality
 
         Returns:
-            dict: Created author data or None if failed
+            Author: Created author record or None if failed
         """
-        with self._suppress_output():
-            author_id = self.manager.add_author(name, birth_year, nationality)
-
-        if author_id:
-            return self.get_by_id(author_id)
-        return None
+        try:
+            author_id = self.repository.add_author(name, birth_year, nationality)
+        except sqlite3.Error:
+            return None
+        return self.get_by_id(author_id)
 
     def update(self, author_id, name=None, birth_year=None, nationality=None):
         """
@@ -277,10 +346,12 @@ class AuthorAPIAdapter:
             nationality (str, optional): New nationality
 
         Returns:
-            dict: Updated author data or None if failed
+            Author: Updated author record or None if failed
         """
-        with self._suppress_output():
-            success = self.manager.update_author(author_id, name, birth_year, nationality)
+        try:
+            success = self.repository.update_author(author_id, name, birth_year, nationality)
+        except sqlite3.Error:
+            return None
 
         if success:
             return self.get_by_id(author_id)
@@ -296,22 +367,64 @@ class AuthorAPIAdapter:
         Returns:
             bool: True if successful, False otherwise
         """
-        with self._suppress_output():
-            return self.manager.delete_author(author_id)
+        try:
+            return self.repository.delete_author(author_id)
+        except sqlite3.Error:
+            return False
+
+    def create_many(self, items, atomic=True):
+        """
+        Create many authors in one transaction
+
+        Args:
+            items (list): Author objects as accepted by create()
+            atomic (bool, optional): All or nothing (default) or partial success
+
+        Returns:
+            tuple: (results, committed); created results carry the author in 'data'
+        """
+        results, committed = self.repository.add_authors(items, atomic)
+        return _batch_results(results), committed
 
-    def search(self, search_term):
+    def update_many(self, items, atomic=True):
+        """
+        Update many authors in one transaction
+
+        Args:
+            items (list): Objects with the author id plus the fields to change
+            atomic (bool, optional): All or nothing (default) or partial success
+
+        Returns:
+            tuple: (results, committed); updated results carry the author in 'data'
+        """
+        results, committed = self.repository.update_authors(items, atomic)
+        return _batch_results(results), committed
+
+    def delete_many(self, items, atomic=True):
+        """
+        Delete many authors in one transaction
+
+        Args:
+            items (list): Author ids, or objects with an id
+            atomic (bool, optional): All or nothing (default) or partial success
+
+        Returns:
+            tuple: (results, committed)
+        """
+        return self.repository.delete_authors(items, atomic)
+
+    def search(self, search_term, limit=DEFAULT_SEARCH_LIMIT):
         """
         Search authors
 
         Args:
             search_term (str): Search query
+            limit (int, optional): Maximum number of results
 
         Returns:
-            list: List of matching author dictionaries
+            list: List of matching Author records, best match first
         """
-        with self._suppress_output():
-            rows = self.manager.search_author(search_term)
-        return [self._row_to_dict(row) for row in rows]
+        return self.repository.search_authors(search_term, limit)
 
     def get_count(self):
         """
@@ -320,5 +433,293 @@ class AuthorAPIAdapter:
         Returns:
             int: Number of authors
         """
-        with self._suppress_output():
-            return self.manager.get_author_count()
+        return self.repository.get_author_count()
+
+    def get_version(self):
+        """
+        Get the change version of the authors table (for ETags), first dropping
+        cached rows that other processes changed
+
+        Returns:
+            tuple: (version, changed_at epoch seconds)
+        """
+        sync_record_cache(self.db)
+        return self.repository.get_change_version()
+
+
+class LoanAPIAdapter:
+    """
+    Adapter serving loan records to the API routes
+
+    Circulation methods let CirculationError/NotFoundError propagate so the
+    routes can report why a checkout, return or renewal was refused.
+    """
+
+    def __init__(self, database):
+        """
+        Initialize LoanAPIAdapter with database connection
+
+        Args:
+            database (Database): Database instance
+        """
+        self.repository = LoanRepository(database)
+        self.db = database
+
+    def list_page(self, limit, after=None, member_id=None, book_id=None, status=None):
+        """
+        Get one page of loans, newest first
+
+        Args:
+            limit (int): Page size
+            after (tuple, optional): (id,) cursor from the previous page
+            member_id (int, optional): Only loans of this member
+            book_id (int, optional): Only loans of this book
+            status (str, optional): Only loans with this status
+
+        Returns:
+            tuple: (list of Loan records, (id,) of the last loan, or None
+                    when there are no further pages)
+        """
+        # Fetch one extra row to learn whether another page follows
+        rows = self.repository.list_loans(limit + 1, after[0] if after else None,
+                                          member_id, book_id, status)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_after = (rows[-1].id,) if has_more else None
+        return rows, next_after
+
+    def iter_batches(self, batch_size=1000):
+        """
+        Iterate over all loans in id order, one batch at a time
+
+        Args:
+            batch_size (int, optional): Rows per batch
+
+        Yields:
+            list: Up to batch_size Loan records
+        """
+        yield from self.repository.iter_loan_batches(batch_size)
+
+    def get_by_id(self, loan_id):
+        """
+        Get single loan by ID
+
+        Args:
+            loan_id (int): Loan ID
+
+        Returns:
+            Loan: Loan record or None if not found
+        """
+        return self.repository.get_loan_by_id(loan_id)
+
+    def checkout(self, book_id, member_id, loan_days=DEFAULT_LOAN_DAYS):
+        """
+        Check a book out to a member
+
+        Args:
+            book_id (int): Book ID
+            member_id (int): Member ID
+            loan_days (int, optional): Days until the loan is due
+
+        Returns:
+            Loan: Created loan record
+        """
+        loan_id = self.repository.checkout(book_id, member_id, loan_days)
+        return self.get_by_id(loan_id)
+
+    def return_loan(self, loan_id):
+        """
+        Return a loan
+
+        Args:
+            loan_id (int): Loan ID
+
+        Returns:
+            Loan: Updated loan record
+        """
+        self.repository.return_loan(loan_id)
+        return self.get_by_id(loan_id)
+
+    def renew(self, loan_id, days=RENEWAL_DAYS):
+        """
+        Renew a loan
+
+        Args:
+            loan_id (int): Loan ID
+            days (int, optional): Days to extend by
+
+        Returns:
+            Loan: Updated loan record
+        """
+        self.repository.renew(loan_id, days)
+        return self.get_by_id(loan_id)
+
+    def get_count(self, status=None):
+        """
+        Get loan count
+
+        Args:
+            status (str, optional): Only count loans with this status
+
+        Returns:
+            int: Number of loans
+        """
+        return self.repository.get_loan_count(status)
+
+    def get_overdue_scan_state(self):
+        """
+        Get the overdue scanner's watermark and last-run metrics
+
+        Returns:
+            dict: Scanner state or None if it has never run
+        """
+        return OverdueScanner(self.db).get_state()
+
+    def run_overdue_scan(self, as_of=None, full=False):
+        """
+        Mark loans past their due date as overdue now
+
+        Args:
+            as_of (str, optional): Cut-off date (YYYY-MM-DD, default: today)
+            full (bool, optional): Ignore the watermark and scan every borrowed loan
+
+        Returns:
+            dict: Run statistics
+        """
+        return OverdueScanner(self.db).run(as_of, full)
+
+
+class MemberAPIAdapter:
+    """Adapter serving member records to the API routes"""
+
+    def __init__(self, database):
+        """
+        Initialize MemberAPIAdapter with database connection
+
+        Args:
+            database (Database): Database instance
+        """
+        self.repository = MemberRepository(database)
+        self.db = database
+
+    def list_page(self, limit, after=None):
+        """
+        Get one page of members in (name, id) order
+
+        Args:
+            limit (int): Page size
+            after (tuple, optional): (name, id) cursor from the previous page
+
+        Returns:
+            tuple: (list of Member records, (name, id) of the last member,
+                    or None when there are no further pages)
+        """
+        # Fetch one extra row to learn whether another page follows
+        rows = self.repository.list_members(limit + 1, after)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_after = (rows[-1].name, rows[-1].id) if has_more else None
+        return rows, next_after
+
+    def get_by_id(self, member_id):
+        """
+        Get single member by ID
+
+        Args:
+            member_id (int): Member ID
+
+        Returns:
+            Member: Member record or None if not found
+        """
+        return self.repository.get_member_by_id(member_id)
+
+    def get_by_email(self, email):
+        """
+        Get single member by email address (case-insensitive)
+
+        Args:
+            email (str): Email address
+
+        Returns:
+            Member: Member record or None if not found
+        """
+        return self.repository.get_member_by_email(email)
+
+    def create(self, name, email, phone=None, status='active'):
+        """
+        Create new member
+
+        Args:
+            name (str): Member name
+            email (str): Email address (unique)
+            phone (str, optional): Phone number
+            status (str, optional): Membership status
+
+        Returns:
+            Member: Created member record or None if failed
+        """
+        try:
+            member_id = self.repository.add_member(name, email, phone, status)
+        except sqlite3.Error:
+            return None
+        return self.get_by_id(member_id)
+
+    def update(self, member_id, name=None, email=None, phone=None, status=None):
+        """
+        Update member
+
+        Args:
+            member_id (int): Member ID
+            name (str, optional): New name
+            email (str, optional): New email address
+            phone (str, optional): New phone number
+            status (str, optional): New membership status
+
+        Returns:
+            Member: Updated member record or None if failed
+        """
+        try:
+            success = self.repository.update_member(member_id, name, email, phone, status)
+        except sqlite3.Error:
+            return None
+
+        if success:
+            return self.get_by_id(member_id)
+        return None
+
+    def delete(self, member_id):
+        """
+        Delete member
+
+        Args:
+            member_id (int): Member ID
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            return self.repository.delete_member(member_id)
+        except sqlite3.Error:
+            return False
+
+    def search(self, prefix, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Search members by name or email prefix
+
+        Args:
+            prefix (str): Start of a name or email address
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: List of matching Member records ordered by name
+        """
+        return self.repository.search_members(prefix, limit)
+
+    def get_count(self):
+        """
+        Get total member count
+
+        Returns:
+            int: Number of members
+        """
+        return self.repository.get_member_count()
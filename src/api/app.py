@@ -5,20 +5,44 @@ Main entry point for the web API
 
 import sys
 import os
+import time
+import sqlite3
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from flask import Flask, send_from_directory, jsonify
+from flask import Flask, send_from_directory, jsonify, request, Response
 from flask_cors import CORS
 from database import Database
-from api.adapters import BookAPIAdapter, AuthorAPIAdapter
+from migrations import Migrator
+from record_cache import DEFAULT_RECORD_CACHE_SIZE, DEFAULT_RECORD_CACHE_TTL
+from query_stats import DEFAULT_SLOW_QUERY_MS, LATENCY_BUCKETS_MS
+from library_stats import (get_row_counts, get_counter, get_group_counts, StatsReconciler,
+                           BackgroundStatsReconciler)
+from api.metrics import (RequestMetrics, MetricsWriter, CONTENT_TYPE, write_pool_metrics,
+                         write_cache_metrics, write_fragment_metrics, write_query_metrics,
+                         write_row_counts)
+from overdue_scanner import BackgroundOverdueScanner
+from api.json_provider import FastJSONProvider, DEFAULT_FRAGMENT_CACHE_SIZE
+from api.adapters import BookAPIAdapter, AuthorAPIAdapter, LoanAPIAdapter, MemberAPIAdapter
 from api.routes.books import books_bp, init_book_routes
 from api.routes.authors import authors_bp, init_author_routes
+from api.routes.loans import loans_bp, init_loan_routes
+from api.routes.members import members_bp, init_member_routes
+from api.routes.export import export_bp, init_export_routes
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='../static', static_url_path='/static')
 
+# Adapters return records (records.py); responses are encoded with orjson when
+# installed (LIBRARY_JSON_BACKEND=json forces the standard library) and
+# unchanged records reuse their cached JSON (LIBRARY_JSON_CACHE_SIZE=0 disables)
+app.json = FastJSONProvider(
+    app,
+    backend=os.environ.get('LIBRARY_JSON_BACKEND'),
+    cache_size=int(os.environ.get('LIBRARY_JSON_CACHE_SIZE', DEFAULT_FRAGMENT_CACHE_SIZE)),
+)
+
 # Enable CORS for API endpoints
 CORS(app, resources={
     r"/api/*": {
@@ -28,15 +52,33 @@ CORS(app, resources={
     }
 })
 
+# Per-route request counters and latency histograms for /metrics
+request_metrics = RequestMetrics()
+request_metrics.install(app)
+
 # Flask application context for database
 from flask import g
+from werkzeug.local import LocalProxy
+
+# Shared database: owns the connection pool that requests check out from and
+# the book/author record cache (LIBRARY_CACHE_SIZE=0 disables it).
+# LIBRARY_DB_PROFILE selects the PRAGMA profile (see database.PRAGMA_PROFILES).
+# Statement timings are on unless LIBRARY_QUERY_STATS=0; statements over
+# LIBRARY_SLOW_QUERY_MS go to the slow-query log (and LIBRARY_SLOW_QUERY_LOG)
+database = Database(
+    db_path=os.environ.get('LIBRARY_DB_PATH', '../data/library.db'),
+    pool_size=int(os.environ.get('LIBRARY_DB_POOL_SIZE', 8)),
+    cache_size=int(os.environ.get('LIBRARY_CACHE_SIZE', DEFAULT_RECORD_CACHE_SIZE)),
+    cache_ttl=float(os.environ.get('LIBRARY_CACHE_TTL', DEFAULT_RECORD_CACHE_TTL)),
+    instrument=os.environ.get('LIBRARY_QUERY_STATS', '1') != '0',
+    slow_query_ms=float(os.environ.get('LIBRARY_SLOW_QUERY_MS', DEFAULT_SLOW_QUERY_MS)),
+    slow_query_log=os.environ.get('LIBRARY_SLOW_QUERY_LOG'),
+)
 
 def get_database():
-    """Get database instance for current request"""
+    """Get a pooled database connection for the current request"""
     if 'db' not in g:
-        g.db = Database()
-        if not g.db.connect():
-            raise Exception("Failed to connect to database")
+        g.db = database.lease()
     return g.db
 
 def get_book_adapter():
@@ -51,21 +93,83 @@ def get_author_adapter():
         g.author_adapter = AuthorAPIAdapter(get_database())
     return g.author_adapter
 
-# Initialize adapters (create globals for routes to use)
+def get_loan_adapter():
+    """Get loan adapter for current request"""
+    if 'loan_adapter' not in g:
+        g.loan_adapter = LoanAPIAdapter(get_database())
+    return g.loan_adapter
+
+def get_member_adapter():
+    """Get member adapter for current request"""
+    if 'member_adapter' not in g:
+        g.member_adapter = MemberAPIAdapter(get_database())
+    return g.member_adapter
+
+# Background threads, when started (see start_background_tasks)
+overdue_scanner = None
+stats_reconciler = None
+
+
+def start_background_tasks():
+    """
+    Start the optional in-process overdue scanner and counter reconciliation
+
+    Both act on the whole database, so they must run in one process only: the
+    pre-fork launcher (LIBRARY_BACKGROUND_TASKS=manual) calls this in its
+    first worker instead of at import
+    """
+    global overdue_scanner, stats_reconciler
+
+    # Run overdue_scanner.py from cron instead when several servers share the database
+    overdue_scan_interval = float(os.environ.get('LIBRARY_OVERDUE_SCAN_INTERVAL', 0))
+    if overdue_scan_interval > 0:
+        overdue_scanner = BackgroundOverdueScanner(database, overdue_scan_interval)
+        overdue_scanner.start()
+
+    # python library_stats.py reconcile from cron does the same
+    stats_reconcile_interval = float(os.environ.get('LIBRARY_STATS_RECONCILE_INTERVAL', 0))
+    if stats_reconcile_interval > 0:
+        stats_reconciler = BackgroundStatsReconciler(database, stats_reconcile_interval)
+        stats_reconciler.start()
+
+
+# Initialize routes (adapters resolve to the current request's connection).
+# LIBRARY_IMPORT_ONLY=1 only loads the code: no connection, no migration and
+# no background task (used by the pre-fork launcher to check a reload)
 try:
-    # Create initial instances just for initialization
-    temp_db = Database()
-    temp_db.connect()
-    book_adapter = BookAPIAdapter(temp_db)
-    author_adapter = AuthorAPIAdapter(temp_db)
+    if os.environ.get('LIBRARY_IMPORT_ONLY') != '1':
+        if not database.connect():
+            raise Exception("Failed to connect to database")
+
+        # Only check the schema version; migrate when this is a new or older database
+        migrator = Migrator(database)
+        if not migrator.is_current():
+            print(f"Database schema at version {migrator.current_version()}, "
+                  f"upgrading to {migrator.latest_version()}")
+            if not migrator.migrate():
+                raise Exception("Failed to migrate database")
+
+        if os.environ.get('LIBRARY_BACKGROUND_TASKS') != 'manual':
+            start_background_tasks()
+
+    book_adapter = LocalProxy(get_book_adapter)
+    author_adapter = LocalProxy(get_author_adapter)
+    loan_adapter = LocalProxy(get_loan_adapter)
+    member_adapter = LocalProxy(get_member_adapter)
 
     # Initialize routes with adapters
     init_book_routes(book_adapter)
     init_author_routes(author_adapter)
+    init_loan_routes(loan_adapter)
+    init_member_routes(member_adapter)
+    init_export_routes(database)
 
     # Register blueprints
     app.register_blueprint(books_bp)
     app.register_blueprint(authors_bp)
+    app.register_blueprint(loans_bp)
+    app.register_blueprint(members_bp)
+    app.register_blueprint(export_bp)
 
 except Exception as e:
     print(f"Error initializing application: {e}")
@@ -77,42 +181,189 @@ except Exception as e:
 def debug():
     """Debug endpoint to check adapter functionality"""
     try:
-        import os
-        import sqlite3
+        # Inspect a pooled connection, not the shared import-time one
+        with database.lease() as db:
+            conn = db.get_connection()
+            db_conn_str = str(conn)
+            pragma_settings = database.get_pragma_settings(conn)
 
-        # Get database connection info
-        db_conn_str = str(database.conn)
+            # Maintained row counts (no table scans)
+            row_counts = get_row_counts(conn)
 
-        # Try direct SQL query
-        cursor = database.get_cursor()
-        cursor.execute("SELECT COUNT(*) FROM Books")
-        direct_book_count = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM Authors")
-        direct_author_count = cursor.fetchone()[0]
+        pool_stats = database.get_pool().stats()
+        cache_stats = database.get_record_cache().stats()
 
         # Get database file path
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        resolved_db_path = os.path.join(current_dir, '..', '..', 'data', 'library.db')
-        resolved_db_path = os.path.abspath(resolved_db_path)
+        resolved_db_path = database.get_db_path()
 
-        # Test through adapter
-        books = book_adapter.get_all()
-        authors = author_adapter.get_all()
+        # Test through adapter: one row each instead of the whole catalogue
+        books, _ = book_adapter.list_page(1)
+        authors, _ = author_adapter.list_page(1)
 
         return jsonify({
             'db_connection': db_conn_str,
-            'sql_book_count': direct_book_count,
-            'sql_author_count': direct_author_count,
-            'adapter_books_count': len(books),
-            'adapter_authors_count': len(authors),
+            'pool': pool_stats,
+            'record_cache': cache_stats,
+            'pragmas': pragma_settings,
+            'row_counts': row_counts,
             'expected_db_path': resolved_db_path,
             'db_exists': os.path.exists(resolved_db_path),
-            'sample_book': books[0] if books else None
+            'sample_book': books[0] if books else None,
+            'sample_author': authors[0] if authors else None
         })
     except Exception as e:
         import traceback
         return jsonify({'error': str(e), 'traceback': traceback.format_exc()})
 
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get hit/miss/eviction counters of the book and author record cache"""
+    stats = database.get_record_cache().stats()
+    return jsonify({
+        'success': True,
+        'data': stats,
+        'message': f"Record cache: {stats['size']} of {stats['max_size']} entries"
+    }), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text-format metrics; cheap enough to scrape every few seconds"""
+    writer = MetricsWriter()
+    request_metrics.write(writer)
+    write_pool_metrics(writer, database.get_pool().stats())
+    write_cache_metrics(writer, database.get_record_cache().stats())
+    write_fragment_metrics(writer, app.json.fragments.stats())
+    query_stats = database.get_query_stats()
+    if query_stats is not None:
+        write_query_metrics(writer, query_stats, LATENCY_BUCKETS_MS)
+    with database.get_pool().connection() as conn:
+        write_row_counts(writer, get_row_counts(conn))
+    return Response(writer.render(), mimetype=None, content_type=CONTENT_TYPE)
+
+
+@app.route('/api/stats', methods=['GET'])
+def get_library_stats():
+    """Catalogue totals from the trigger-maintained counters (constant time)"""
+    with database.lease() as db:
+        conn = db.get_connection()
+        row_counts = get_row_counts(conn)
+        data = {
+            'books': row_counts.get('Books'),
+            'copies': get_counter(conn, 'copies:Books'),
+            'authors': row_counts.get('Authors'),
+            'members': row_counts.get('Members'),
+            'loans': row_counts.get('Loans'),
+            'genres': get_group_counts(conn, 'genre'),
+            'nationalities': get_group_counts(conn, 'nationality'),
+            'last_reconciled': StatsReconciler(db).get_state(),
+        }
+    return jsonify({
+        'success': True,
+        'data': data,
+        'message': f"{data['books']} books ({data['copies']} copies) by {data['authors']} authors"
+    }), 200
+
+
+def check_health():
+    """
+    Check that this process can serve requests: lease a pooled connection
+    and run a query on it
+
+    Returns:
+        dict: healthy flag, pid, pre-fork worker number (None outside the
+              launcher), query time, pool usage and the error if any
+    """
+    health = {
+        'healthy': True,
+        'pid': os.getpid(),
+        'worker': os.environ.get('LIBRARY_WORKER_ID'),
+        'query_ms': None,
+        'error': None,
+    }
+    start = time.perf_counter()
+    try:
+        with database.lease() as db:
+            db.get_connection().execute("SELECT 1").fetchone()
+        health['query_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    except sqlite3.Error as e:
+        health['healthy'] = False
+        health['error'] = str(e)
+    health['pool'] = database.get_pool().stats()
+    return health
+
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Health of the process answering (one pre-fork worker); 503 when it cannot query"""
+    health = check_health()
+    if not health['healthy']:
+        return jsonify({
+            'success': False,
+            'error': f"Database unavailable: {health['error']}",
+            'code': 503,
+            'data': health
+        }), 503
+    return jsonify({
+        'success': True,
+        'data': health,
+        'message': f"Process {health['pid']} healthy"
+    }), 200
+
+
+# Sort keys accepted by /api/query-stats
+QUERY_STATS_SORTS = ('total_ms', 'mean_ms', 'max_ms', 'count', 'rows', 'errors')
+
+
+@app.route('/api/query-stats', methods=['GET'])
+def get_query_stats():
+    """Get the heaviest SQL statements and the slow-query log (?limit=&sort=total_ms)"""
+    stats = database.get_query_stats()
+    if stats is None:
+        return jsonify({
+            'success': False,
+            'error': 'Query statistics are disabled (LIBRARY_QUERY_STATS=0)',
+            'code': 404
+        }), 404
+
+    sort = request.args.get('sort', 'total_ms')
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        limit = None
+    if sort not in QUERY_STATS_SORTS or limit is None or limit < 1:
+        return jsonify({
+            'success': False,
+            'error': f"limit must be a positive integer and sort one of: {', '.join(QUERY_STATS_SORTS)}",
+            'code': 400
+        }), 400
+
+    totals = stats.totals()
+    return jsonify({
+        'success': True,
+        'data': {
+            'totals': totals,
+            'slow_query_ms': stats.slow_query_ms,
+            'queries': stats.snapshot(limit, sort),
+            'slow_queries': stats.slow_queries(),
+        },
+        'message': f"{totals['statements']} statements in {totals['fingerprints']} distinct queries"
+    }), 200
+
+
+@app.route('/api/query-stats', methods=['DELETE'])
+def reset_query_stats():
+    """Reset the statement statistics and the slow-query log"""
+    stats = database.get_query_stats()
+    if stats is not None:
+        stats.reset()
+    return jsonify({
+        'success': True,
+        'data': None,
+        'message': 'Query statistics reset'
+    }), 200
+
+
 # Root route - serve index.html
 @app.route('/')
 def index():
@@ -143,11 +394,15 @@ def internal_error(error):
 
 @app.teardown_appcontext
 def cleanup_database(exception=None):
-    """Clean up database connection on app teardown"""
+    """Return the request's pooled connection on app teardown"""
+    g.pop('book_adapter', None)
+    g.pop('author_adapter', None)
+    g.pop('loan_adapter', None)
+    g.pop('member_adapter', None)
     db = g.pop('db', None)
     if db is not None:
         try:
-            db.close()
+            db.close(failed=exception is not None)
         except:
             pass
 
@@ -0,0 +1,324 @@
+"""
+ASGI server mode for Library Management API
+Serves the Flask application from an event loop, so an idle keep-alive
+client costs a socket instead of a blocked thread
+
+Requests run the same Flask views as the threaded server, so every endpoint
+keeps its contract, on two bounded thread pools:
+- GET/HEAD requests under /api/books and /api/authors go to reader threads.
+  Each reader owns one read-only connection for its whole life.
+- Every other request goes to the worker pool and leases a connection from
+  the Database pool as usual.
+Requests beyond LIBRARY_ASGI_MAX_PENDING in flight get a 503 instead of
+queueing without bound.
+
+Usage (uvicorn is optional and not in requirements.txt):
+    pip install uvicorn
+    uvicorn api.asgi:app --app-dir src --port 5001
+    python src/api/asgi.py --port 5001
+
+Settings: LIBRARY_ASGI_READERS (reader threads, default 4),
+LIBRARY_ASGI_WORKERS (worker threads, default 4) and
+LIBRARY_ASGI_MAX_PENDING (default 1000), plus the LIBRARY_* settings of app.py.
+"""
+
+import io
+import os
+import sys
+import json
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import g
+from api.app import app as flask_app, database
+from api.adapters import BookAPIAdapter, AuthorAPIAdapter
+
+DEFAULT_READERS = 4
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 1000
+
+# Requests served by the reader threads
+READ_METHODS = ('GET', 'HEAD')
+READ_PREFIXES = ('/api/books', '/api/authors')
+
+# Body bytes collected on the pool thread before the response starts; larger
+# (streamed) bodies are forwarded chunk by chunk
+BUFFERED_BODY_BYTES = 64 * 1024
+
+
+def build_environ(scope, body):
+    """
+    Build the WSGI environ of an ASGI HTTP request
+
+    Args:
+        scope (dict): ASGI connection scope
+        body (bytes): Request body
+
+    Returns:
+        dict: WSGI environ
+    """
+    server = scope.get('server') or ('localhost', None)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        # WSGI carries paths as latin-1 strings of the UTF-8 bytes
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else 'HTTP_' + name
+        value = raw_value.decode('latin-1')
+        # Repeated headers are folded into one comma-separated value
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    # The body has been read in full, so its length is known even when the
+    # client sent it chunked
+    environ['CONTENT_LENGTH'] = str(len(body))
+    environ.pop('HTTP_TRANSFER_ENCODING', None)
+    return environ
+
+
+class LibraryASGI:
+    """
+    ASGI application running a WSGI (Flask) app on bounded thread pools
+
+    The event loop only moves bytes; each request's view runs on a pool
+    thread, so the number of threads and connections stays fixed however
+    many clients are connected.
+    """
+
+    def __init__(self, wsgi_app, database, readers=DEFAULT_READERS, workers=DEFAULT_WORKERS,
+                 max_pending=DEFAULT_MAX_PENDING):
+        """
+        Initialize LibraryASGI
+
+        Args:
+            wsgi_app (flask.Flask): Application to serve
+            database (Database): Database the reader connections are opened on
+            readers (int, optional): Reader threads (one connection each)
+            workers (int, optional): Threads for every other request
+            max_pending (int, optional): Requests in flight before answering 503
+        """
+        self.wsgi_app = wsgi_app
+        self.database = database
+        self.readers = readers
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._local = threading.local()
+        self._reader_dbs = []
+        self._lock = threading.Lock()
+        self._reader_pool = None
+        self._worker_pool = None
+        wsgi_app.before_request(self._use_reader_adapters)
+
+    def start(self):
+        """Create the thread pools (reader connections open with their threads)"""
+        with self._lock:
+            if self._reader_pool is None:
+                self._reader_pool = ThreadPoolExecutor(self.readers, thread_name_prefix='library-reader',
+                                                       initializer=self._open_reader)
+                self._worker_pool = ThreadPoolExecutor(self.workers, thread_name_prefix='library-worker')
+
+    def stop(self):
+        """Wait for running requests, then close the reader connections"""
+        with self._lock:
+            pools = (self._reader_pool, self._worker_pool)
+            self._reader_pool = self._worker_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        with self._lock:
+            for db in self._reader_dbs:
+                db.close()
+            self._reader_dbs = []
+
+    def _open_reader(self):
+        """Reader thread initializer: open its dedicated connection and adapters"""
+        db = self.database.open_dedicated(read_only=True)
+        with self._lock:
+            self._reader_dbs.append(db)
+        self._local.adapters = {
+            'book_adapter': BookAPIAdapter(db),
+            'author_adapter': AuthorAPIAdapter(db),
+        }
+
+    def _use_reader_adapters(self):
+        """before_request hook: on a reader thread, serve from its own connection"""
+        adapters = getattr(self._local, 'adapters', None)
+        if adapters is not None:
+            for name, adapter in adapters.items():
+                setattr(g, name, adapter)
+
+    def _start_response(self, environ):
+        """
+        Run the WSGI app and collect the start of its body (on a pool thread)
+
+        Returns:
+            tuple: (status, headers, buffered chunks, body iterator or None
+                    when the body is complete)
+        """
+        started = {}
+        chunks = []
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = headers
+            # PEP 3333 write() callable; Flask never calls it
+            return chunks.append
+
+        result = self.wsgi_app(environ, start_response)
+        iterator = iter(result)
+        size = 0
+        for chunk in iterator:
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= BUFFERED_BODY_BYTES:
+                return started['status'], started['headers'], chunks, (result, iterator)
+        if hasattr(result, 'close'):
+            result.close()
+        return started['status'], started['headers'], chunks, None
+
+    @staticmethod
+    def _next_chunk(iterator):
+        return next(iterator, None)
+
+    @staticmethod
+    def _close(result):
+        if hasattr(result, 'close'):
+            result.close()
+
+    async def __call__(self, scope, receive, send):
+        """ASGI entry point"""
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        if self.pending >= self.max_pending:
+            await self._send_json(send, 503, {
+                'success': False,
+                'error': 'Server busy, try again shortly',
+                'code': 503
+            }, [(b'retry-after', b'1')])
+            return
+
+        self.pending += 1
+        try:
+            body = await self._read_body(receive)
+            if body is None:
+                return
+            self.start()
+            reads = scope['method'] in READ_METHODS and scope['path'].startswith(READ_PREFIXES)
+            pool = self._reader_pool if reads else self._worker_pool
+            loop = asyncio.get_running_loop()
+
+            status, headers, chunks, streaming = await loop.run_in_executor(
+                pool, self._start_response, build_environ(scope, body))
+            await send({
+                'type': 'http.response.start',
+                'status': status,
+                'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                            for name, value in headers],
+            })
+            if streaming is None:
+                await send({'type': 'http.response.body', 'body': b''.join(chunks)})
+                return
+
+            result, iterator = streaming
+            try:
+                await send({'type': 'http.response.body', 'body': b''.join(chunks), 'more_body': True})
+                while True:
+                    chunk = await loop.run_in_executor(pool, self._next_chunk, iterator)
+                    if chunk is None:
+                        break
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                await send({'type': 'http.response.body', 'body': b''})
+            finally:
+                await loop.run_in_executor(pool, self._close, result)
+        finally:
+            self.pending -= 1
+
+    @staticmethod
+    async def _read_body(receive):
+        """Read the whole request body; None if the client went away"""
+        parts = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            parts.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                return b''.join(parts)
+
+    @staticmethod
+    async def _send_json(send, status, payload, headers=()):
+        body = json.dumps(payload).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'),
+                        (b'content-length', str(len(body)).encode('ascii')), *headers],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _lifespan(self, receive, send):
+        """Open the pools on startup and drain them on shutdown"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await asyncio.get_running_loop().run_in_executor(None, self.stop)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+app = LibraryASGI(
+    flask_app, database,
+    readers=int(os.environ.get('LIBRARY_ASGI_READERS', DEFAULT_READERS)),
+    workers=int(os.environ.get('LIBRARY_ASGI_WORKERS', DEFAULT_WORKERS)),
+    max_pending=int(os.environ.get('LIBRARY_ASGI_MAX_PENDING', DEFAULT_MAX_PENDING)),
+)
+
+
+def main(argv=None):
+    """Serve the ASGI app with uvicorn"""
+    parser = argparse.ArgumentParser(description="Run the Library Management API on an ASGI server")
+    parser.add_argument('--host', default='0.0.0.0', help="Interface to bind (default: 0.0.0.0)")
+    parser.add_argument('--port', type=int, default=5001, help="Port (default: 5001)")
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("✗ uvicorn is not installed: pip install uvicorn "
+              "(or serve api.asgi:app with any ASGI server)")
+        return 1
+
+    uvicorn.run(app, host=args.host, port=args.port, lifespan='on')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
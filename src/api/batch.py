@@ -0,0 +1,85 @@
+"""
+Batch request helpers for Library Management API
+Parses batch bodies and builds the per-item responses of the /batch endpoints
+"""
+
+from flask import jsonify
+from batch_writes import MAX_BATCH_SIZE
+
+BATCH_MODES = ('atomic', 'partial')
+
+
+def parse_batch_body(request):
+    """
+    Read the items and mode of a batch request
+
+    The body is either a JSON array of items or {"items": [...], "mode": ...};
+    the mode may also be given as ?mode=. Atomic is the default.
+
+    Args:
+        request (flask.Request): Current request
+
+    Returns:
+        tuple: (items, atomic)
+
+    Raises:
+        ValueError: If the body or mode is invalid
+    """
+    data = request.get_json(silent=True)
+    mode = request.args.get('mode')
+    if isinstance(data, dict):
+        mode = data.get('mode', mode)
+        data = data.get('items')
+    if not isinstance(data, list):
+        raise ValueError('Body must be a JSON array of items or {"items": [...]}')
+    if not data:
+        raise ValueError('No items given')
+    if len(data) > MAX_BATCH_SIZE:
+        raise ValueError(f'At most {MAX_BATCH_SIZE} items per batch')
+
+    mode = mode or 'atomic'
+    if mode not in BATCH_MODES:
+        raise ValueError(f'mode must be one of: {", ".join(BATCH_MODES)}')
+    return data, mode == 'atomic'
+
+
+def batch_response(results, committed, atomic, noun, verb, success_code=200):
+    """
+    Build the JSON response of a batch write
+
+    Atomic batches answer success_code when everything was applied and 400
+    with the failing items otherwise (409 when an item was refused as a
+    conflict, e.g. copies still on loan); partial batches always answer 200
+    with per-item statuses.
+
+    Args:
+        results (list): Per-item results from the adapter
+        committed (bool): Whether the transaction committed
+        atomic (bool): Whether the batch ran in atomic mode
+        noun (str): Plural noun for messages, e.g. 'books'
+        verb (str): Past tense for messages, e.g. 'created'
+        success_code (int, optional): Status of a fully applied atomic batch
+
+    Returns:
+        tuple: (response, status code)
+    """
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+
+    if atomic and not committed:
+        code = 409 if 'conflict' in counts else 400
+        return jsonify({
+            'success': False,
+            'error': f'Batch rejected, no {noun} {verb}',
+            'results': results,
+            'code': code
+        }), code
+
+    applied = counts.get(verb, 0)
+    return jsonify({
+        'success': True,
+        'data': results,
+        'counts': counts,
+        'message': f'{applied} of {len(results)} {noun} {verb}'
+    }), success_code if atomic else 200
@@ -0,0 +1,89 @@
+"""
+Conditional GET helpers for Library Management API
+Answers If-None-Match / If-Modified-Since with 304 from a table's change version
+"""
+
+import time
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from flask import request, make_response
+
+
+def make_etag(version, changed_at, full_path):
+    """
+    Build a strong ETag for one response variant
+
+    Args:
+        version (int): Change version of the table behind the response
+        changed_at (float): Epoch seconds of that version (tells apart equal
+            version numbers of a database restored from a backup)
+        full_path (str): Request path with query string; every page, search
+            term and limit is a separate variant
+
+    Returns:
+        str: ETag value (without quotes)
+    """
+    raw = f"{version}:{changed_at!r}:{full_path}".encode('utf-8')
+    return hashlib.blake2b(raw, digest_size=12).hexdigest()
+
+
+def _last_modified(changed_at):
+    """
+    HTTP date for Last-Modified, or None while the change is under a second old
+
+    Last-Modified has one-second resolution. Until the second of the last
+    change is over, another write in the same second would keep the same
+    date, so only the ETag is sent.
+    """
+    if time.time() - changed_at < 1.0:
+        return None
+    return datetime.fromtimestamp(int(changed_at), timezone.utc)
+
+
+def conditional(get_version):
+    """
+    Decorate a GET view with ETag/Last-Modified headers and 304 responses
+
+    The version is read before the view runs, so a write racing with the
+    view can only make the ETag older than the body (the next request gets a
+    full response), never newer. A 304 skips the view entirely.
+
+    Args:
+        get_version (callable): Returns (version, changed_at) of the table the
+            view reads, or None to disable conditional handling
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            current = get_version()
+            if current is None:
+                return view(*args, **kwargs)
+
+            version, changed_at = current
+            etag = make_etag(version, changed_at, request.full_path)
+            last_modified = _last_modified(changed_at)
+
+            # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            elif last_modified is not None and request.if_modified_since is not None:
+                not_modified = last_modified <= request.if_modified_since
+            else:
+                not_modified = False
+
+            if not_modified:
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            # Let browsers keep the body but revalidate before every reuse
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,338 @@
+"""
+JSON provider for Library Management API
+Serializes responses with orjson when it is installed (pip install orjson)
+and with the standard library otherwise, and serializes the record types of
+records.py without building dicts first
+
+Records are encoded once while they are unchanged: their JSON bytes are kept
+in a bounded fragment cache keyed by (record type, id) together with the
+values they were encoded from. A record whose values still match reuses the
+cached bytes; a changed row no longer matches and is encoded again, so
+writes never need to invalidate anything.
+
+LIBRARY_JSON_BACKEND picks the encoder ('orjson' or 'json'; default: orjson
+when installed) and LIBRARY_JSON_CACHE_SIZE the number of cached records (0
+disables the cache). Output differs between the backends only in how
+non-ASCII text is written: the standard library escapes it (\\u00e9) like
+Flask's default provider, orjson writes UTF-8.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from flask.json.provider import DefaultJSONProvider
+from records import Record
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Records kept by the fragment cache (LIBRARY_JSON_CACHE_SIZE overrides it in the API)
+DEFAULT_FRAGMENT_CACHE_SIZE = 10000
+
+
+def json_default(value):
+    """
+    json `default` hook: records become objects, anything else is handled
+    as by Flask's default provider (dates, UUIDs, dataclasses...)
+
+    Args:
+        value: Object the json module cannot serialize itself
+
+    Returns:
+        A JSON-serializable replacement
+    """
+    if isinstance(value, Record):
+        return value.to_dict()
+    return DefaultJSONProvider.default(value)
+
+
+class StdlibEncoder:
+    """Compact JSON encoding with the json module"""
+
+    name = 'json'
+
+    def __init__(self):
+        # Same output as Flask's default provider in compact mode (non-ASCII
+        # text escaped); records and exports keep their column order
+        self._sorted = json.JSONEncoder(sort_keys=True, separators=(',', ':'),
+                                        default=json_default).encode
+        self._plain = json.JSONEncoder(separators=(',', ':'), default=json_default).encode
+
+    def encode_sorted(self, value):
+        """
+        Encode a response payload with sorted keys
+
+        Args:
+            value: JSON-serializable value (records included)
+
+        Returns:
+            bytes: Compact JSON
+        """
+        return self._sorted(value).encode('utf-8')
+
+    def encode_items(self, records):
+        """
+        Encode records as the comma-separated items of a JSON array, keys in
+        column order
+
+        Args:
+            records (list): Records to encode
+
+        Returns:
+            bytes: Items without the enclosing brackets
+        """
+        return ','.join(self._plain(record) for record in records).encode('utf-8')
+
+    def encode_lines(self, records):
+        """
+        Encode records as NDJSON lines, keys in column order
+
+        Args:
+            records (list): Records to encode
+
+        Returns:
+            bytes: One JSON object per line
+        """
+        return ''.join(self._plain(record) + '\n' for record in records).encode('utf-8')
+
+
+class OrjsonEncoder(StdlibEncoder):
+    """Compact JSON encoding with orjson, falling back to the json module for
+    values orjson rejects (e.g. integers beyond 64 bits)"""
+
+    name = 'orjson'
+
+    # Datetimes go through json_default, so they are written as Flask writes them
+    OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def encode_sorted(self, value):
+        try:
+            return orjson.dumps(value, default=json_default, option=self.OPTIONS | orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:
+            return super().encode_sorted(value)
+
+    def encode_items(self, records):
+        try:
+            return orjson.dumps(records, default=json_default, option=self.OPTIONS)[1:-1]
+        except orjson.JSONEncodeError:
+            return super().encode_items(records)
+
+    def encode_lines(self, records):
+        try:
+            option = self.OPTIONS | orjson.OPT_APPEND_NEWLINE
+            return b''.join([orjson.dumps(record, default=json_default, option=option) for record in records])
+        except orjson.JSONEncodeError:
+            return super().encode_lines(records)
+
+
+ENCODERS = {
+    'json': StdlibEncoder,
+    'orjson': OrjsonEncoder,
+}
+
+
+def get_encoder(name=None):
+    """
+    Create the encoder for a backend name
+
+    Args:
+        name (str, optional): 'orjson' or 'json'; defaults to orjson when it
+            is installed
+
+    Returns:
+        StdlibEncoder: Encoder instance
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    name = name or ('orjson' if orjson is not None else 'json')
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown JSON backend '{name}' (choose from: {', '.join(sorted(ENCODERS))})")
+    if name == 'orjson' and orjson is None:
+        raise ValueError("JSON backend 'orjson' is not installed (pip install orjson)")
+    return ENCODERS[name]()
+
+
+class FragmentCache:
+    """
+    JSON bytes of records, keyed by (record type, id)
+
+    Each entry keeps the values it was encoded from and is only reused while
+    the record still has them. The least recently used entries are evicted
+    first. Records are encoded outside the lock.
+    """
+
+    def __init__(self, encode, max_size=DEFAULT_FRAGMENT_CACHE_SIZE):
+        """
+        Initialize FragmentCache
+
+        Args:
+            encode (callable): Encodes one record to bytes
+            max_size (int, optional): Maximum number of cached records (0 disables)
+        """
+        self.encode = encode
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, record):
+        """
+        Return the JSON bytes of a record, encoding it on a miss
+
+        Args:
+            record (Record): Record to serialize
+
+        Returns:
+            bytes: Encoded record
+        """
+        key = (type(record), record.id)
+        values = record.astuple()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == values:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        fragment = self.encode(record)
+        if self.max_size > 0:
+            with self._lock:
+                self._entries[key] = (values, fragment)
+                self._entries.move_to_end(key)
+                if len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return fragment
+
+    def encode_list(self, records):
+        """
+        Encode a list of records as a JSON array
+
+        Lists longer than the cache are encoded in one call instead, since
+        their entries would evict each other before being reused.
+
+        Args:
+            records (list): Records (other items are encoded uncached)
+
+        Returns:
+            bytes: JSON array
+        """
+        if len(records) > self.max_size:
+            return self.encode(records)
+        return b'[' + b','.join([self.get(record) if isinstance(record, Record) else self.encode(record)
+                                 for record in records]) + b']'
+
+    def clear(self):
+        """Drop every cached fragment"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Snapshot of the cache counters
+
+        Returns:
+            dict: size, max_size, hits, misses, hit_ratio and evictions
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+            }
+
+
+def response_payload(args, kwargs):
+    """
+    The value jsonify() serializes for its arguments
+
+    Args:
+        args (tuple): Positional arguments: none, one value, or several (a list)
+        kwargs (dict): Keyword arguments (an object); not combined with args
+
+    Returns:
+        The payload (None when there are no arguments)
+
+    Raises:
+        TypeError: If both args and kwargs are given
+    """
+    if args and kwargs:
+        raise TypeError("app.json.response() takes either args or kwargs, not both")
+    if len(args) == 1:
+        return args[0]
+    return args or kwargs or None
+
+
+class RecordJSONProvider(DefaultJSONProvider):
+    """Flask's default JSON provider, plus records"""
+
+    default = staticmethod(json_default)
+
+
+class FastJSONProvider(RecordJSONProvider):
+    """
+    JSON provider writing compact responses with the selected encoder
+
+    jsonify() payloads are encoded straight to bytes; records at the top of
+    the payload or of its values (e.g. 'data' of a list or detail response)
+    come from the fragment cache, the rest is encoded in one call per value.
+    Keys are sorted, as by Flask's default provider. With app.debug (and
+    `compact` unset) responses are pretty-printed by the default provider.
+    """
+
+    def __init__(self, app, backend=None, cache_size=DEFAULT_FRAGMENT_CACHE_SIZE):
+        """
+        Initialize FastJSONProvider
+
+        Args:
+            app (flask.Flask): Application
+            backend (str, optional): Encoder name (see get_encoder)
+            cache_size (int, optional): Records kept by the fragment cache
+        """
+        super().__init__(app)
+        self.encoder = get_encoder(backend)
+        self.fragments = FragmentCache(self.encoder.encode_sorted, cache_size)
+
+    def encode(self, obj):
+        """
+        Encode a response payload
+
+        Args:
+            obj: JSON-serializable value (records included)
+
+        Returns:
+            bytes: Compact JSON with sorted keys
+        """
+        if isinstance(obj, dict) and all(type(key) is str for key in obj):
+            encode_sorted = self.encoder.encode_sorted
+            return b'{' + b','.join([encode_sorted(key) + b':' + self._encode_value(obj[key])
+                                     for key in sorted(obj)]) + b'}'
+        return self._encode_value(obj)
+
+    def _encode_value(self, value):
+        if isinstance(value, Record):
+            return self.fragments.get(value)
+        if isinstance(value, (list, tuple)) and value and isinstance(value[0], Record):
+            return self.fragments.encode_list(value)
+        return self.encoder.encode_sorted(value)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.encode(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(self.encode(response_payload(args, kwargs)) + b'\n',
+                                        mimetype=self.mimetype)
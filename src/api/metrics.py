@@ -0,0 +1,248 @@
+"""
+Metrics for Library Management API
+Per-route request counters and latency histograms, rendered together with
+pool, cache, query and row-count gauges in the Prometheus text format
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from flask import g, request
+
+# Upper bounds (seconds) of the request latency histogram buckets
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Content type of the text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    """Escape a label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    """Render {name="value",...} (empty string for no labels)"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _number(value):
+    """Render a sample value"""
+    if value is None:
+        return 'NaN'
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+class MetricsWriter:
+    """Collects metric families and renders them as exposition text"""
+
+    def __init__(self):
+        """Initialize MetricsWriter"""
+        self.lines = []
+
+    def family(self, name, kind, help_text, samples):
+        """
+        Add one metric family
+
+        Args:
+            name (str): Metric name
+            kind (str): counter, gauge or histogram
+            help_text (str): HELP line
+            samples (iterable): (suffix, labels dict, value) tuples; suffix is
+                appended to the name ('' , '_bucket', '_sum', '_count')
+        """
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            self.lines.append(f"{name}{suffix}{_labels(**labels)} {_number(value)}")
+
+    def histogram(self, name, help_text, series, bounds):
+        """
+        Add a histogram family
+
+        Args:
+            name (str): Metric name
+            help_text (str): HELP line
+            series (iterable): (labels dict, cumulative bucket counts, sum, count);
+                the counts have one entry per bound plus +Inf
+            bounds (tuple): Bucket upper bounds
+        """
+        samples = []
+        for labels, cumulative, total, count in series:
+            for bound, value in zip(bounds, cumulative):
+                samples.append(('_bucket', dict(labels, le=repr(float(bound))), value))
+            samples.append(('_bucket', dict(labels, le='+Inf'), cumulative[-1]))
+            samples.append(('_sum', labels, float(total)))
+            samples.append(('_count', labels, count))
+        self.family(name, 'histogram', help_text, samples)
+
+    def render(self):
+        """Return the collected families as exposition text"""
+        return '\n'.join(self.lines) + '\n'
+
+
+class RequestMetrics:
+    """
+    Thread-safe request counters and latency histograms
+
+    Requests are labelled with the matched URL rule (e.g.
+    /api/books/<int:book_id>) rather than the raw path, so the number of
+    series stays bounded whatever clients request.
+    """
+
+    def __init__(self):
+        """Initialize RequestMetrics"""
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._latency = {}
+        self.in_flight = 0
+        self.started_at = time.time()
+
+    def install(self, app):
+        """
+        Time every request of a Flask app
+
+        Args:
+            app (flask.Flask): Application to instrument
+        """
+        app.before_request(self._before)
+        app.after_request(self._after)
+        app.teardown_request(self._teardown)
+
+    def _before(self):
+        g.metrics_started = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+
+    def _after(self, response):
+        started = g.get('metrics_started')
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            self.observe(request.method, route, response.status_code, time.perf_counter() - started)
+        return response
+
+    def _teardown(self, exception=None):
+        if g.pop('metrics_started', None) is not None:
+            with self._lock:
+                self.in_flight -= 1
+
+    def observe(self, method, route, status, seconds):
+        """
+        Record one finished request
+
+        Args:
+            method (str): HTTP method
+            route (str): URL rule
+            status (int): Response status code
+            seconds (float): Time from before_request to after_request
+        """
+        bucket = bisect_left(REQUEST_BUCKETS, seconds)
+        with self._lock:
+            key = (method, route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            series = self._latency.get((method, route))
+            if series is None:
+                series = self._latency[(method, route)] = [[0] * (len(REQUEST_BUCKETS) + 1), 0.0, 0]
+            series[0][bucket] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def write(self, writer):
+        """
+        Add the request families to a MetricsWriter
+
+        Args:
+            writer (MetricsWriter): Output
+        """
+        with self._lock:
+            requests = sorted(self._requests.items())
+            latency = sorted((key, (list(value[0]), value[1], value[2])) for key, value in self._latency.items())
+            in_flight = self.in_flight
+
+        writer.family('library_http_requests_total', 'counter', 'Finished HTTP requests',
+                      [('', {'method': method, 'route': route, 'status': status}, count)
+                       for (method, route, status), count in requests])
+        series = []
+        for (method, route), (buckets, total, count) in latency:
+            cumulative, running = [], 0
+            for value in buckets:
+                running += value
+                cumulative.append(running)
+            series.append(({'method': method, 'route': route}, cumulative, total, count))
+        writer.histogram('library_http_request_duration_seconds', 'Request handling time', series, REQUEST_BUCKETS)
+        writer.family('library_http_requests_in_flight', 'gauge', 'Requests being handled',
+                      [('', {}, in_flight)])
+        writer.family('library_uptime_seconds', 'gauge', 'Seconds since the API started',
+                      [('', {}, round(time.time() - self.started_at, 3))])
+
+
+def write_pool_metrics(writer, pool_stats):
+    """Add connection pool gauges and counters from ConnectionPool.stats()"""
+    writer.family('library_db_pool_connections', 'gauge', 'Pooled connections by state', [
+        ('', {'state': 'in_use'}, pool_stats['in_use']),
+        ('', {'state': 'idle'}, pool_stats['idle']),
+    ])
+    writer.family('library_db_pool_max_connections', 'gauge', 'Pool size limit',
+                  [('', {}, pool_stats['max_size'])])
+    writer.family('library_db_pool_checkouts_total', 'counter', 'Connections checked out',
+                  [('', {}, pool_stats['checkouts'])])
+    writer.family('library_db_pool_waits_total', 'counter', 'Checkouts that had to wait',
+                  [('', {}, pool_stats['waits'])])
+    writer.family('library_db_pool_timeouts_total', 'counter', 'Checkouts that timed out',
+                  [('', {}, pool_stats['timeouts'])])
+    writer.family('library_db_pool_wait_seconds_total', 'counter', 'Time spent waiting for a connection',
+                  [('', {}, float(pool_stats['total_wait_seconds']))])
+
+
+def write_cache_metrics(writer, cache_stats):
+    """Add record cache gauges and counters from RecordCache.stats()"""
+    writer.family('library_record_cache_entries', 'gauge', 'Cached book and author rows',
+                  [('', {}, cache_stats['size'])])
+    writer.family('library_record_cache_max_entries', 'gauge', 'Record cache size limit',
+                  [('', {}, cache_stats['max_size'])])
+    for name in ('hits', 'misses', 'evictions', 'expirations', 'invalidations'):
+        writer.family(f'library_record_cache_{name}_total', 'counter', f'Record cache {name}',
+                      [('', {}, cache_stats[name])])
+    writer.family('library_record_cache_hit_ratio', 'gauge', 'Hits per lookup since start',
+                  [('', {}, cache_stats['hit_ratio'])])
+
+
+def write_fragment_metrics(writer, fragment_stats):
+    """Add JSON fragment cache gauges and counters from FragmentCache.stats()"""
+    writer.family('library_json_fragment_cache_entries', 'gauge', 'Records with cached JSON',
+                  [('', {}, fragment_stats['size'])])
+    writer.family('library_json_fragment_cache_max_entries', 'gauge', 'JSON fragment cache size limit',
+                  [('', {}, fragment_stats['max_size'])])
+    for name in ('hits', 'misses', 'evictions'):
+        writer.family(f'library_json_fragment_cache_{name}_total', 'counter', f'JSON fragment cache {name}',
+                      [('', {}, fragment_stats[name])])
+
+
+def write_query_metrics(writer, query_stats, bounds_ms):
+    """Add per-fingerprint statement counters and an overall statement histogram"""
+    histograms = query_stats.histograms()
+    writer.family('library_db_statements_total', 'counter', 'SQL statements by query fingerprint',
+                  [('', {'fingerprint': key}, count) for key, count, _, _ in histograms])
+    writer.family('library_db_statement_seconds_total', 'counter', 'SQL time by query fingerprint',
+                  [('', {'fingerprint': key}, total_ms / 1000) for key, _, total_ms, _ in histograms])
+
+    combined = [0] * (len(bounds_ms) + 1)
+    for _, _, _, cumulative in histograms:
+        for index, value in enumerate(cumulative):
+            combined[index] += value
+    total = sum(total_ms for _, _, total_ms, _ in histograms) / 1000
+    writer.histogram('library_db_statement_duration_seconds', 'SQL statement time', [
+        ({}, combined, total, combined[-1]),
+    ], tuple(bound / 1000 for bound in bounds_ms))
+    writer.family('library_db_slow_statements_total', 'counter', 'Statements over the slow-query threshold',
+                  [('', {}, query_stats.totals()['slow'])])
+
+
+def write_row_counts(writer, row_counts):
+    """Add table row-count gauges"""
+    writer.family('library_rows', 'gauge', 'Rows per table (trigger-maintained)',
+                  [('', {'table': table}, count) for table, count in sorted(row_counts.items())])
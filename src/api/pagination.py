@@ -0,0 +1,75 @@
+"""
+Keyset pagination helpers for Library Management API
+Encodes and decodes the opaque cursors used by the list endpoints
+"""
+
+import base64
+import json
+
+# Default and maximum page sizes for list endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(sort_key):
+    """
+    Encode a sort key such as (title, id) as an opaque URL-safe cursor
+
+    Args:
+        sort_key (tuple): Sort column values of the last row on a page
+
+    Returns:
+        str: Cursor token
+    """
+    raw = json.dumps(list(sort_key), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, key_length=2):
+    """
+    Decode a cursor produced by encode_cursor()
+
+    Args:
+        token (str): Cursor token
+        key_length (int, optional): Number of values in the endpoint's sort key
+
+    Returns:
+        tuple: Sort key ending with the row id, e.g. (title, id) or (id,)
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        sort_key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+    if (not isinstance(sort_key, list) or len(sort_key) != key_length
+            or not isinstance(sort_key[-1], int)):
+        raise ValueError('Invalid cursor')
+    return tuple(sort_key)
+
+
+def parse_page_args(args, key_length=2):
+    """
+    Read "limit" and "after" from request arguments
+
+    Args:
+        args: Request query arguments (werkzeug MultiDict)
+        key_length (int, optional): Number of values in the endpoint's sort key
+
+    Returns:
+        tuple: (limit, after) where after is a decoded sort key or None
+
+    Raises:
+        ValueError: If limit is not an integer or the cursor is invalid
+    """
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError('Query parameter "limit" must be an integer')
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    after = args.get('after')
+    return limit, decode_cursor(after, key_length) if after else None
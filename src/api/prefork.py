@@ -0,0 +1,463 @@
+"""
+Pre-fork launcher for Library Management API
+Runs several worker processes over api.app:app on one listening socket, so
+request parsing and JSON serialization use every core of the server
+
+The master process imports the app once (schema check and migrations),
+reads the hot pages once through a read-only connection so they are in the
+OS page cache, then forks the workers. Workers share the imported code
+copy-on-write and open their own SQLite connections after fork
+(Database.after_fork); each serves requests on a bounded thread pool. The
+optional overdue scanner and counter reconciliation run in worker 1 only.
+
+Signals to the master:
+- HUP: graceful reload. The new code is imported in a subprocess (without
+  opening the database: LIBRARY_IMPORT_ONLY=1), then the master re-executes
+  itself on the same socket, starts new workers and retires the old ones
+  once the new ones are healthy. No connection is refused meanwhile, and the
+  master keeps its pid.
+- TERM/INT: graceful stop. Workers finish the requests in progress.
+
+Per-worker health: every worker runs check_health() every few seconds and
+reports to the master over a pipe; a worker that is unhealthy or silent for
+--timeout seconds is killed and replaced. GET /healthz shows the health of
+the worker that answers it.
+
+Each worker has its own record cache. Triggers log every changed book and
+author row in the shared database's row_changes table, and each worker
+drops those rows from its cache before answering a conditional GET, so a row
+changed through one worker is reloaded by the others on their next lookup.
+
+Usage:
+    python src/api/prefork.py --workers 8 --port 5001
+    kill -HUP <master pid>
+
+Settings: LIBRARY_PREFORK_WORKERS (default: CPU count),
+LIBRARY_PREFORK_THREADS (threads per worker, default 8) and
+LIBRARY_PREFORK_TIMEOUT (default 30), plus the LIBRARY_* settings of app.py.
+"""
+
+import os
+import gc
+import sys
+import time
+import select
+import signal
+import socket
+import argparse
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# The background tasks run in the first worker, not in every process
+os.environ['LIBRARY_BACKGROUND_TASKS'] = 'manual'
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+from api.app import app as flask_app, database, check_health, start_background_tasks
+from api.adapters import BookAPIAdapter, AuthorAPIAdapter
+from library_stats import get_row_counts
+
+DEFAULT_THREADS = 8
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_GRACEFUL_TIMEOUT = 30.0
+
+# Seconds between a worker's health checks
+HEARTBEAT_INTERVAL = 2.0
+
+# Rows of each listing read by the warm-up
+WARM_PAGE_SIZE = 100
+
+# Set by the master before re-executing itself on HUP
+LISTEN_FD_ENV = 'LIBRARY_PREFORK_FD'
+RETIRING_ENV = 'LIBRARY_PREFORK_RETIRING'
+
+
+def warm_up(database):
+    """
+    Read the hot pages once, in the master, so every worker finds them in
+    the OS page cache
+
+    Args:
+        database (Database): Database to read
+
+    Returns:
+        float: Seconds taken
+    """
+    start = time.perf_counter()
+    db = database.open_dedicated(read_only=True)
+    try:
+        books = BookAPIAdapter(db)
+        books.list_page(WARM_PAGE_SIZE)
+        books.get_facets()
+        AuthorAPIAdapter(db).list_page(WARM_PAGE_SIZE)
+        get_row_counts(db.get_connection())
+    finally:
+        db.close()
+    return time.perf_counter() - start
+
+
+class WorkerRequestHandler(WSGIRequestHandler):
+    """One request per connection, so an idle keep-alive client never holds a
+    worker thread (keep-alive belongs to the proxy in front)"""
+    protocol_version = 'HTTP/1.0'
+
+
+class WorkerServer(BaseWSGIServer):
+    """WSGI server of one worker: accepts on the shared socket and handles
+    each request on a fixed-size thread pool"""
+
+    multithread = True
+
+    def __init__(self, host, port, app, threads, fd):
+        """
+        Initialize WorkerServer
+
+        Args:
+            host (str): Interface the socket is bound to
+            port (int): Port the socket is bound to
+            app (flask.Flask): Application to serve
+            threads (int): Request threads
+            fd (int): Listening socket inherited from the master
+        """
+        super().__init__(host, port, app, handler=WorkerRequestHandler, fd=fd)
+        # Every worker polls the same socket; the losers of an accept race
+        # must not block in accept()
+        self.socket.setblocking(False)
+        self.pool = ThreadPoolExecutor(threads, thread_name_prefix='library-request')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def run_worker(index, sock, args, heartbeat_fd, master_pid):
+    """
+    Body of a forked worker process; never returns
+
+    Args:
+        index (int): Worker number (1-based, kept across restarts)
+        sock (socket.socket): Listening socket
+        args (argparse.Namespace): Launcher options
+        heartbeat_fd (int): Pipe to the master for health reports
+        master_pid (int): Pid of the master
+    """
+    status = 0
+    try:
+        os.environ['LIBRARY_WORKER_ID'] = str(index)
+        # The master coordinates Ctrl-C and reloads
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+        server = WorkerServer(args.host, args.port, flask_app, args.threads, sock.fileno())
+        stopping = threading.Event()
+
+        def stop(*_):
+            if not stopping.is_set():
+                stopping.set()
+                # shutdown() waits for serve_forever, which runs in this thread
+                threading.Thread(target=server.shutdown, daemon=True).start()
+
+        def heartbeat():
+            while not stopping.wait(HEARTBEAT_INTERVAL):
+                if os.getppid() != master_pid:
+                    print(f"✗ Worker {index}: master is gone, stopping", flush=True)
+                    stop()
+                    return
+                if check_health()['healthy']:
+                    try:
+                        os.write(heartbeat_fd, b'.')
+                    except OSError:
+                        # The master re-executed itself (reload); it stops us
+                        pass
+
+        signal.signal(signal.SIGTERM, stop)
+        if index == 1:
+            start_background_tasks()
+        if check_health()['healthy']:
+            os.write(heartbeat_fd, b'.')
+        threading.Thread(target=heartbeat, name='library-heartbeat', daemon=True).start()
+
+        server.serve_forever(poll_interval=0.5)
+        # Finish the requests already accepted
+        server.pool.shutdown(wait=True)
+        database.close()
+    except BaseException as e:
+        print(f"✗ Worker {index} failed: {e}", flush=True)
+        status = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # Skip the interpreter teardown: it would finalize objects inherited
+        # from the master, including its SQLite connections
+        os._exit(status)
+
+
+class Worker:
+    """Master-side record of one worker process"""
+
+    def __init__(self, index, pid, heartbeat_fd):
+        self.index = index
+        self.pid = pid
+        self.heartbeat_fd = heartbeat_fd
+        self.started = time.monotonic()
+        self.last_seen = None
+
+
+class PreforkServer:
+    """
+    Master process: keeps `workers` worker processes running, replaces dead
+    or unhealthy ones, and handles reload and stop signals
+    """
+
+    def __init__(self, sock, args, retiring=()):
+        """
+        Initialize PreforkServer
+
+        Args:
+            sock (socket.socket): Bound, listening socket shared by the workers
+            args (argparse.Namespace): Launcher options
+            retiring (iterable, optional): Pids of the previous generation's
+                workers, stopped once the new ones are healthy (after a reload)
+        """
+        self.sock = sock
+        self.args = args
+        self.workers = {}
+        self.retiring = {pid: None for pid in retiring}
+        self._signal = None
+
+    def run(self):
+        """
+        Serve until TERM/INT; re-execute the master on HUP
+
+        Returns:
+            int: Exit status
+        """
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(signum, self._on_signal)
+
+        for index in range(1, self.args.workers + 1):
+            self.spawn(index)
+
+        while True:
+            self.read_heartbeats(1.0)
+            self.reap()
+            if self._signal == signal.SIGHUP:
+                self._signal = None
+                self.reload()
+            elif self._signal is not None:
+                self.stop()
+                return 0
+            self.check_workers()
+
+    def _on_signal(self, signum, frame):
+        self._signal = signum
+
+    def spawn(self, index):
+        """Fork worker number `index`"""
+        read_fd, write_fd = os.pipe()
+        master_pid = os.getpid()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            for worker in self.workers.values():
+                os.close(worker.heartbeat_fd)
+            run_worker(index, self.sock, self.args, write_fd, master_pid)
+        os.close(write_fd)
+        os.set_blocking(read_fd, False)
+        self.workers[pid] = Worker(index, pid, read_fd)
+        print(f"✓ Worker {index} started (pid {pid})", flush=True)
+
+    def read_heartbeats(self, timeout):
+        """Wait up to `timeout` seconds for health reports"""
+        fds = {worker.heartbeat_fd: worker for worker in self.workers.values()}
+        try:
+            ready, _, _ = select.select(list(fds), [], [], timeout)
+        except InterruptedError:
+            return
+        now = time.monotonic()
+        for fd in ready:
+            try:
+                if os.read(fd, 4096):
+                    fds[fd].last_seen = now
+            except BlockingIOError:
+                pass
+
+    def reap(self):
+        """Collect exited workers and replace them unless stopping"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid in self.retiring:
+                del self.retiring[pid]
+                continue
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            os.close(worker.heartbeat_fd)
+            if self._signal in (signal.SIGTERM, signal.SIGINT):
+                continue
+            print(f"✗ Worker {worker.index} (pid {pid}) exited with status "
+                  f"{os.waitstatus_to_exitcode(status)}, restarting", flush=True)
+            if time.monotonic() - worker.started < 1.0:
+                # Don't spin on a worker that fails while starting
+                time.sleep(1.0)
+            self.spawn(worker.index)
+
+    def check_workers(self):
+        """Kill workers that stopped reporting health; retire the previous
+        generation once every current worker is healthy"""
+        now = time.monotonic()
+        for worker in list(self.workers.values()):
+            silent = now - (worker.last_seen or worker.started)
+            if silent > self.args.timeout:
+                print(f"✗ Worker {worker.index} (pid {worker.pid}) unhealthy for "
+                      f"{silent:.0f}s, killing it", flush=True)
+                self._kill(worker.pid, signal.SIGKILL)
+                worker.last_seen = now
+
+        if self.retiring and all(worker.last_seen for worker in self.workers.values()):
+            started = [pid for pid, deadline in self.retiring.items() if deadline is None]
+            for pid in started:
+                self._kill(pid, signal.SIGTERM)
+                self.retiring[pid] = now + self.args.graceful_timeout
+            if started:
+                print(f"✓ New workers healthy, stopping {len(started)} previous workers", flush=True)
+            for pid, deadline in self.retiring.items():
+                if now > deadline:
+                    self._kill(pid, signal.SIGKILL)
+
+    def reload(self):
+        """Re-execute the master with the current code, keeping the socket
+        and the running workers until the new ones are healthy"""
+        check = subprocess.run([sys.executable, os.path.abspath(__file__), '--check'],
+                               env={**os.environ, 'LIBRARY_IMPORT_ONLY': '1'},
+                               capture_output=True, text=True)
+        if check.returncode != 0:
+            print(f"✗ Reload aborted, the new code does not start:\n{check.stdout}{check.stderr}",
+                  flush=True)
+            return
+        print("✓ Reloading", flush=True)
+        os.environ[LISTEN_FD_ENV] = str(self.sock.fileno())
+        os.environ[RETIRING_ENV] = ','.join(str(pid) for pid in [*self.workers, *self.retiring])
+        self.sock.set_inheritable(True)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(sys.executable, [sys.executable, os.path.abspath(__file__), *sys.argv[1:]])
+
+    def stop(self):
+        """Stop every worker gracefully, killing those still busy after
+        graceful_timeout seconds"""
+        print("Stopping workers...", flush=True)
+        pids = [*self.workers, *self.retiring]
+        for pid in pids:
+            self._kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.args.graceful_timeout
+        while pids and time.monotonic() < deadline:
+            pids = [pid for pid in pids if not self._reaped(pid)]
+            time.sleep(0.1)
+        for pid in pids:
+            self._kill(pid, signal.SIGKILL)
+            self._reaped(pid, block=True)
+        self.sock.close()
+        database.close()
+        print("✓ All workers stopped", flush=True)
+
+    @staticmethod
+    def _reaped(pid, block=False):
+        try:
+            return os.waitpid(pid, 0 if block else os.WNOHANG)[0] == pid
+        except ChildProcessError:
+            return True
+
+    @staticmethod
+    def _kill(pid, signum):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+def open_listener(host, port):
+    """
+    Return the listening socket: the one handed over by a reloading master,
+    or a newly bound one
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind
+
+    Returns:
+        socket.socket: Listening socket
+    """
+    fd = os.environ.pop(LISTEN_FD_ENV, None)
+    if fd is not None:
+        sock = socket.socket(fileno=int(fd))
+        sock.set_inheritable(False)
+        return sock
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(socket.SOMAXCONN)
+    return sock
+
+
+def main(argv=None):
+    """Run the pre-fork master"""
+    parser = argparse.ArgumentParser(description="Run the Library Management API on pre-forked workers")
+    parser.add_argument('--host', default='0.0.0.0', help="Interface to bind (default: 0.0.0.0)")
+    parser.add_argument('--port', type=int, default=5001, help="Port (default: 5001)")
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('LIBRARY_PREFORK_WORKERS', os.cpu_count() or 1)),
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument('--threads', type=int,
+                        default=int(os.environ.get('LIBRARY_PREFORK_THREADS', DEFAULT_THREADS)),
+                        help=f"Request threads per worker (default: {DEFAULT_THREADS})")
+    parser.add_argument('--timeout', type=float,
+                        default=float(os.environ.get('LIBRARY_PREFORK_TIMEOUT', DEFAULT_TIMEOUT)),
+                        help=f"Seconds without a health report before a worker is replaced "
+                             f"(default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument('--graceful-timeout', type=float, default=DEFAULT_GRACEFUL_TIMEOUT,
+                        help=f"Seconds stopping workers get to finish their requests "
+                             f"(default: {DEFAULT_GRACEFUL_TIMEOUT:g})")
+    parser.add_argument('--check', action='store_true',
+                        help="Only check that the app imports, without opening the "
+                             "database (used by reload)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return 0
+
+    try:
+        sock = open_listener(args.host, args.port)
+    except OSError as e:
+        print(f"✗ Cannot listen on {args.host}:{args.port}: {e.strerror}")
+        return 1
+    retiring = [int(pid) for pid in os.environ.pop(RETIRING_ENV, '').split(',') if pid]
+
+    print(f"✓ Warm-up read in {warm_up(database) * 1000:.0f}ms")
+    # Keep the garbage collector from touching (and so copying) the objects
+    # the workers share with the master
+    gc.freeze()
+
+    print(f"✓ Master {os.getpid()} serving http://{args.host}:{args.port} "
+          f"with {args.workers} workers x {args.threads} threads", flush=True)
+    return PreforkServer(sock, args, retiring).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,10 @@ Provides REST endpoints for author operations
 """
 
 from flask import Blueprint, request, jsonify
+from search_index import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from api.pagination import parse_page_args, encode_cursor
+from api.conditional import conditional
+from api.batch import parse_batch_body, batch_response
 
 authors_bp = Blueprint('authors', __name__)
 
@@ -17,33 +21,31 @@ def init_author_routes(adapter):
     author_adapter = adapter
 
 
+def _authors_version():
+    """Change version of the authors table, read before a GET view runs"""
+    return author_adapter.get_version()
+
+
 @authors_bp.route('/api/authors', methods=['GET'])
+@conditional(_authors_version)
 def get_authors():
-    """Get all authors"""
+    """Get one page of authors ordered by name (?limit=&after=<next_cursor>)"""
     try:
-        # Create fresh cursor for this request
-        conn = author_adapter.db.conn
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, name, birth_year, nationality
-            FROM Authors
-            ORDER BY name
-        """)
-        rows = cursor.fetchall()
-        cursor.close()
-
-        authors = []
-        for row in rows:
-            authors.append({
-                'id': row[0],
-                'name': row[1],
-                'birth_year': row[2],
-                'nationality': row[3]
-            })
+        try:
+            limit, after = parse_page_args(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'code': 400
+            }), 400
+
+        authors, next_after = author_adapter.list_page(limit, after)
 
         return jsonify({
             'success': True,
             'data': authors,
+            'next_cursor': encode_cursor(next_after) if next_after else None,
             'message': f'Retrieved {len(authors)} authors'
         }), 200
     except Exception as e:
@@ -57,6 +59,7 @@ def get_authors():
 
 
 @authors_bp.route('/api/authors/<int:author_id>', methods=['GET'])
+@conditional(_authors_version)
 def get_author(author_id):
     """Get author by ID"""
     try:
@@ -202,9 +205,50 @@ def delete_author(author_id):
         }), 500
 
 
+def _run_author_batch(write, verb, success_code=200):
+    """Parse a batch body, apply it with write(items, atomic) and build the response"""
+    try:
+        try:
+            items, atomic = parse_batch_body(request)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'code': 400
+            }), 400
+
+        results, committed = write(items, atomic)
+        return batch_response(results, committed, atomic, 'authors', verb, success_code)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'code': 500
+        }), 500
+
+
+@authors_bp.route('/api/authors/batch', methods=['POST'])
+def create_authors_batch():
+    """Create many authors in one transaction (?mode=atomic|partial)"""
+    return _run_author_batch(author_adapter.create_many, 'created', 201)
+
+
+@authors_bp.route('/api/authors/batch', methods=['PUT'])
+def update_authors_batch():
+    """Update many authors by id in one transaction (?mode=atomic|partial)"""
+    return _run_author_batch(author_adapter.update_many, 'updated')
+
+
+@authors_bp.route('/api/authors/batch', methods=['DELETE'])
+def delete_authors_batch():
+    """Delete many authors by id in one transaction (?mode=atomic|partial)"""
+    return _run_author_batch(author_adapter.delete_many, 'deleted')
+
+
 @authors_bp.route('/api/authors/search', methods=['GET'])
+@conditional(_authors_version)
 def search_authors():
-    """Search authors by query parameter"""
+    """Search authors by query parameter (optional "limit", ranked best first)"""
     try:
         query = request.args.get('q', '')
 
@@ -215,7 +259,17 @@ def search_authors():
                 'code': 400
             }), 400
 
-        authors = author_adapter.search(query)
+        try:
+            limit = int(request.args.get('limit', DEFAULT_SEARCH_LIMIT))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'Query parameter "limit" must be an integer',
+                'code': 400
+            }), 400
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+        authors = author_adapter.search(query, limit)
 
         return jsonify({
             'success': True,
@@ -232,6 +286,7 @@ def search_authors():
 
 
 @authors_bp.route('/api/authors/count', methods=['GET'])
+@conditional(_authors_version)
 def get_authors_count():
     """Get total author count"""
     try:
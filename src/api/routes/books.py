@@ -4,6 +4,11 @@ Provides REST endpoints for book operations
 """
 
 from flask import Blueprint, request, jsonify
+from search_index import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from loan_repository import CirculationError
+from api.pagination import parse_page_args, encode_cursor
+from api.conditional import conditional
+from api.batch import parse_batch_body, batch_response
 
 books_bp = Blueprint('books', __name__)
 
@@ -17,38 +22,54 @@ def init_book_routes(adapter):
     book_adapter = adapter
 
 
+def _books_version():
+    """Change version of the books table, read before a GET view runs"""
+    return book_adapter.get_version()
+
+
+def parse_facet_filters(args):
+    """
+    Read the genre, decade and nationality filters from request arguments
+
+    Args:
+        args: Request query arguments (werkzeug MultiDict)
+
+    Returns:
+        dict: Filters that were given (empty values are ignored)
+
+    Raises:
+        ValueError: If decade is not a multiple of 10
+    """
+    filters = {facet: args.get(facet) for facet in ('genre', 'nationality') if args.get(facet)}
+    decade = args.get('decade')
+    if decade:
+        if not decade.lstrip('-').isdigit() or int(decade) % 10:
+            raise ValueError('Query parameter "decade" must be a year ending in 0, e.g. 1990')
+        filters['decade'] = int(decade)
+    return filters
+
+
 @books_bp.route('/api/books', methods=['GET'])
+@conditional(_books_version)
 def get_books():
-    """Get all books"""
+    """Get one page of books ordered by title (?limit=&after=<next_cursor>&genre=&decade=&nationality=)"""
     try:
-        # Create fresh cursor for this request
-        conn = book_adapter.db.conn
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT b.id, b.title, b.isbn, b.year, b.genre, b.copies, b.author_id, a.name AS author_name
-            FROM Books b
-            LEFT JOIN Authors a ON b.author_id = a.id
-            ORDER BY b.title
-        """)
-        rows = cursor.fetchall()
-        cursor.close()
-
-        books = []
-        for row in rows:
-            books.append({
-                'id': row[0],
-                'title': row[1],
-                'isbn': row[2],
-                'year': row[3],
-                'genre': row[4],
-                'copies': row[5],
-                'author_id': row[6],
-                'author_name': row[7]
-            })
+        try:
+            limit, after = parse_page_args(request.args)
+            filters = parse_facet_filters(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'code': 400
+            }), 400
+
+        books, next_after = book_adapter.list_page(limit, after, filters)
 
         return jsonify({
             'success': True,
             'data': books,
+            'next_cursor': encode_cursor(next_after) if next_after else None,
             'message': f'Retrieved {len(books)} books'
         }), 200
     except Exception as e:
@@ -62,6 +83,7 @@ def get_books():
 
 
 @books_bp.route('/api/books/<int:book_id>', methods=['GET'])
+@conditional(_books_version)
 def get_book(book_id):
     """Get book by ID"""
     try:
@@ -169,7 +191,14 @@ def update_book(book_id):
             update_fields['author_id'] = data['author_id'] if data['author_id'] != '' else None
 
         # Update book
-        book = book_adapter.update(book_id, **update_fields)
+        try:
+            book = book_adapter.update(book_id, **update_fields)
+        except CirculationError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'code': 409
+            }), 409
 
         if book:
             return jsonify({
@@ -218,9 +247,50 @@ def delete_book(book_id):
         }), 500
 
 
+def _run_book_batch(write, verb, success_code=200):
+    """Parse a batch body, apply it with write(items, atomic) and build the response"""
+    try:
+        try:
+            items, atomic = parse_batch_body(request)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'code': 400
+            }), 400
+
+        results, committed = write(items, atomic)
+        return batch_response(results, committed, atomic, 'books', verb, success_code)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'code': 500
+        }), 500
+
+
+@books_bp.route('/api/books/batch', methods=['POST'])
+def create_books_batch():
+    """Create many books in one transaction (?mode=atomic|partial)"""
+    return _run_book_batch(book_adapter.create_many, 'created', 201)
+
+
+@books_bp.route('/api/books/batch', methods=['PUT'])
+def update_books_batch():
+    """Update many books by id in one transaction (?mode=atomic|partial)"""
+    return _run_book_batch(book_adapter.update_many, 'updated')
+
+
+@books_bp.route('/api/books/batch', methods=['DELETE'])
+def delete_books_batch():
+    """Delete many books by id in one transaction (?mode=atomic|partial)"""
+    return _run_book_batch(book_adapter.delete_many, 'deleted')
+
+
 @books_bp.route('/api/books/search', methods=['GET'])
+@conditional(_books_version)
 def search_books():
-    """Search books by query parameter"""
+    """Search books by query parameter (optional "limit", ranked best first)"""
     try:
         query = request.args.get('q', '')
 
@@ -231,7 +301,17 @@ def search_books():
                 'code': 400
             }), 400
 
-        books = book_adapter.search(query)
+        try:
+            limit = int(request.args.get('limit', DEFAULT_SEARCH_LIMIT))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'Query parameter "limit" must be an integer',
+                'code': 400
+            }), 400
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+        books = book_adapter.search(query, limit)
 
         return jsonify({
             'success': True,
@@ -247,7 +327,36 @@ def search_books():
         }), 500
 
 
+@books_bp.route('/api/books/facets', methods=['GET'])
+@conditional(_books_version)
+def get_book_facets():
+    """Get book counts per genre, decade and author nationality (?genre=&decade=&nationality=)"""
+    try:
+        try:
+            filters = parse_facet_filters(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'code': 400
+            }), 400
+
+        facets = book_adapter.get_facets(filters)
+        return jsonify({
+            'success': True,
+            'data': dict(facets, filters=filters),
+            'message': f"{facets['total']} books match"
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'code': 500
+        }), 500
+
+
 @books_bp.route('/api/books/count', methods=['GET'])
+@conditional(_books_version)
 def get_books_count():
     """Get total book count"""
     try:
@@ -0,0 +1,105 @@
+"""
+Export routes for Library Management API
+Streams whole tables as NDJSON or JSON in constant memory
+"""
+
+import zlib
+from flask import Blueprint, Response, request, jsonify, current_app
+from api.json_provider import get_encoder
+from api.adapters import BookAPIAdapter, AuthorAPIAdapter, LoanAPIAdapter
+
+export_bp = Blueprint('export', __name__)
+
+# Global database instance (will be set by app.py)
+export_database = None
+
+# Rows fetched from SQLite (and encoded) per streamed chunk
+EXPORT_BATCH_SIZE = 1000
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+def init_export_routes(database):
+    """Initialize export routes with the shared Database (exports open their own connection)"""
+    global export_database
+    export_database = database
+
+
+EXPORTS = {
+    'books': lambda db, size: BookAPIAdapter(db).iter_batches(size),
+    'authors': lambda db, size: AuthorAPIAdapter(db).iter_batches(size),
+    'loans': lambda db, size: LoanAPIAdapter(db).iter_batches(size),
+}
+
+
+def _encode_chunks(batches, fmt, encoder):
+    """Encode record batches as NDJSON lines or as one streamed JSON array"""
+    if fmt == 'ndjson':
+        for batch in batches:
+            yield encoder.encode_lines(batch)
+        return
+
+    first = True
+    yield b'['
+    for batch in batches:
+        if batch:
+            chunk = encoder.encode_items(batch)
+            yield chunk if first else b',' + chunk
+            first = False
+    yield b']'
+
+
+def _gzip_chunks(chunks):
+    """Compress a stream of byte chunks as a single gzip member"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@export_bp.route('/api/export/<string:table>', methods=['GET'])
+def export_table(table):
+    """Stream every row of books, authors or loans (?format=ndjson|json&gzip=1)"""
+    fmt = request.args.get('format', 'ndjson')
+    use_gzip = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+
+    if table not in EXPORTS:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown export "{table}" (choose from: {", ".join(EXPORTS)})',
+            'code': 404
+        }), 404
+    if fmt not in FORMATS:
+        return jsonify({
+            'success': False,
+            'error': 'Query parameter "format" must be "ndjson" or "json"',
+            'code': 400
+        }), 400
+
+    # The app's encoder (orjson when installed); exports bypass the fragment
+    # cache, whose entries a full table would only evict
+    encoder = getattr(current_app.json, 'encoder', None) or get_encoder('json')
+
+    def generate():
+        # The stream outlives the request context and lasts as long as the
+        # client takes to read it, so it reads through its own read-only
+        # connection rather than keeping one of the pool's from requests.
+        # Closed when the last chunk is sent or the client goes away.
+        db = export_database.open_dedicated(read_only=True)
+        try:
+            chunks = _encode_chunks(EXPORTS[table](db, EXPORT_BATCH_SIZE), fmt, encoder)
+            if use_gzip:
+                chunks = _gzip_chunks(chunks)
+            yield from chunks
+        finally:
+            db.close()
+
+    headers = {'Content-Disposition': f'attachment; filename="{table}.{fmt}"'}
+    if use_gzip:
+        headers['Content-Encoding'] = 'gzip'
+    return Response(generate(), mimetype=FORMATS[fmt], headers=headers)
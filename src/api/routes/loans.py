@@ -0,0 +1,228 @@
+"""
+Loan routes for Library Management API
+Provides REST endpoints for checkout, return and renewal of books
+"""
+
+from flask import Blueprint, request, jsonify
+from loan_repository import CirculationError, NotFoundError, LOAN_STATUSES, DEFAULT_LOAN_DAYS, RENEWAL_DAYS
+from api.pagination import parse_page_args, encode_cursor
+
+loans_bp = Blueprint('loans', __name__)
+
+# Global adapter instance (will be set by app.py)
+loan_adapter = None
+
+
+def init_loan_routes(adapter):
+    """Initialize loan routes with adapter instance"""
+    global loan_adapter
+    loan_adapter = adapter
+
+
+def _error(message, code):
+    """Build an error response"""
+    return jsonify({
+        'success': False,
+        'error': message,
+        'code': code
+    }), code
+
+
+def _int_value(source, name, default=None):
+    """
+    Read an optional integer from query arguments or a JSON body
+
+    Raises:
+        ValueError: If the value is present but not an integer
+    """
+    value = source.get(name, default)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'"{name}" must be an integer')
+
+
+def _circulation_error(e):
+    """Map a refused checkout/return/renewal to 404 or 409"""
+    return _error(str(e), 404 if isinstance(e, NotFoundError) else 409)
+
+
+@loans_bp.route('/api/loans', methods=['GET'])
+def get_loans():
+    """Get one page of loans, newest first (?member_id=&book_id=&status=&limit=&after=)"""
+    try:
+        try:
+            limit, after = parse_page_args(request.args, key_length=1)
+            member_id = _int_value(request.args, 'member_id')
+            book_id = _int_value(request.args, 'book_id')
+        except ValueError as e:
+            return _error(str(e), 400)
+
+        status = request.args.get('status') or None
+        if status is not None and status not in LOAN_STATUSES:
+            return _error(f'"status" must be one of: {", ".join(LOAN_STATUSES)}', 400)
+
+        loans, next_after = loan_adapter.list_page(limit, after, member_id, book_id, status)
+
+        return jsonify({
+            'success': True,
+            'data': loans,
+            'next_cursor': encode_cursor(next_after) if next_after else None,
+            'message': f'Retrieved {len(loans)} loans'
+        }), 200
+
+    except Exception as e:
+        return _error(str(e), 500)
+
+
+@loans_bp.route('/api/loans/<int:loan_id>', methods=['GET'])
+def get_loan(loan_id):
+    """Get loan by ID"""
+    try:
+        loan = loan_adapter.get_by_id(loan_id)
+        if loan:
+            return jsonify({
+                'success': True,
+                'data': loan,
+                'message': 'Loan retrieved successfully'
+            }), 200
+        return _error(f'Loan with ID {loan_id} not found', 404)
+
+    except Exception as e:
+        return _error(str(e), 500)
+
+
+@loans_bp.route('/api/loans', methods=['POST'])
+def checkout_book():
+    """Check a book out to a member ({"book_id", "member_id", "loan_days"?})"""
+    try:
+        data = request.get_json(silent=True) or {}
+
+        try:
+            book_id = _int_value(data, 'book_id')
+            member_id = _int_value(data, 'member_id')
+            loan_days = _int_value(data, 'loan_days', DEFAULT_LOAN_DAYS)
+        except ValueError as e:
+            return _error(str(e), 400)
+
+        if book_id is None or member_id is None:
+            return _error('book_id and member_id are required', 400)
+        if loan_days < 1:
+            return _error('"loan_days" must be at least 1', 400)
+
+        try:
+            loan = loan_adapter.checkout(book_id, member_id, loan_days)
+        except CirculationError as e:
+            return _circulation_error(e)
+
+        return jsonify({
+            'success': True,
+            'data': loan,
+            'message': 'Book checked out successfully'
+        }), 201
+
+    except Exception as e:
+        return _error(str(e), 500)
+
+
+@loans_bp.route('/api/loans/<int:loan_id>/return', methods=['POST'])
+def return_book(loan_id):
+    """Return a borrowed book"""
+    try:
+        try:
+            loan = loan_adapter.return_loan(loan_id)
+        except CirculationError as e:
+            return _circulation_error(e)
+
+        return jsonify({
+            'success': True,
+            'data': loan,
+            'message': f'Loan {loan_id} returned successfully'
+        }), 200
+
+    except Exception as e:
+        return _error(str(e), 500)
+
+
+@loans_bp.route('/api/loans/<int:loan_id>/renew', methods=['POST'])
+def renew_loan(loan_id):
+    """Extend a loan's due date ({"days"?})"""
+    try:
+        data = request.get_json(silent=True) or {}
+
+        try:
+            days = _int_value(data, 'days', RENEWAL_DAYS)
+        except ValueError as e:
+            return _error(str(e), 400)
+        if days < 1:
+            return _error('"days" must be at least 1', 400)
+
+        try:
+            loan = loan_adapter.renew(loan_id, days)
+        except CirculationError as e:
+            return _circulation_error(e)
+
+        return jsonify({
+            'success': True,
+            'data': loan,
+            'message': f'Loan {loan_id} renewed until {loan.due_date}'
+        }), 200
+
+    except Exception as e:
+        return _error(str(e), 500)
+
+
+@loans_bp.route('/api/loans/count', methods=['GET'])
+def get_loans_count():
+    """Get loan count (optional "status")"""
+    try:
+        status = request.args.get('status') or None
+        if status is not None and status not in LOAN_STATUSES:
+            return _error(f'"status" must be one of: {", ".join(LOAN_STATUSES)}', 400)
+
+        count = loan_adapter.get_count(status)
+
+        return jsonify({
+            'success': True,
+            'data': {'count': count},
+            'message': f'Total loans: {count}'
+        }), 200
+
+    except Exception as e:
+        return _error(str(e), 500)
+
+
+@loans_bp.route('/api/loans/overdue-scan', methods=['GET'])
+def get_overdue_scan():
+    """Get the overdue scanner's watermark and last-run metrics"""
+    try:
+        state = loan_adapter.get_overdue_scan_state()
+
+        return jsonify({
+            'success': True,
+            'data': state,
+            'message': 'Overdue scanner has not run yet' if state is None
+                       else f'Last overdue scan: {state["last_run_at"]}'
+        }), 200
+
+    except Exception as e:
+        return _error(str(e), 500)
+
+
+@loans_bp.route('/api/loans/overdue-scan', methods=['POST'])
+def run_overdue_scan():
+    """Run the overdue scanner now (optional "full": true to ignore the watermark)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        stats = loan_adapter.run_overdue_scan(full=bool(data.get('full')))
+
+        return jsonify({
+            'success': True,
+            'data': stats,
+            'message': f'{stats["updated"]} loans marked overdue ({stats["scanned"]} scanned)'
+        }), 200
+
+    except Exception as e:
+        return _error(str(e), 500)
@@ -0,0 +1,279 @@
+"""
+Member routes for Library Management API
+Provides REST endpoints for member operations
+"""
+
+from flask import Blueprint, request, jsonify
+from search_index import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from api.pagination import parse_page_args, encode_cursor
+
+members_bp = Blueprint('members', __name__)
+
+# Global adapter instance (will be set by app.py)
+member_adapter = None
+
+
+def init_member_routes(adapter):
+    """Initialize member routes with adapter instance"""
+    global member_adapter
+    member_adapter = adapter
+
+
+@members_bp.route('/api/members', methods=['GET'])
+def get_members():
+    """Get one page of members ordered by name (?limit=&after=<next_cursor>)"""
+    try:
+        try:
+            limit, after = parse_page_args(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'code': 400
+            }), 400
+
+        members, next_after = member_adapter.list_page(limit, after)
+
+        return jsonify({
+            'success': True,
+            'data': members,
+            'next_cursor': encode_cursor(next_after) if next_after else None,
+            'message': f'Retrieved {len(members)} members'
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'code': 500
+        }), 500
+
+
+@members_bp.route('/api/members/<int:member_id>', methods=['GET'])
+def get_member(member_id):
+    """Get member by ID"""
+    try:
+        member = member_adapter.get_by_id(member_id)
+        if member:
+            return jsonify({
+                'success': True,
+                'data': member,
+                'message': 'Member retrieved successfully'
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'error': f'Member with ID {member_id} not found',
+                'code': 404
+            }), 404
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'code': 500
+        }), 500
+
+
+@members_bp.route('/api/members/by-email', methods=['GET'])
+def get_member_by_email():
+    """Get member by email address (?email=, case-insensitive)"""
+    try:
+        email = request.args.get('email', '')
+
+        if not email:
+            return jsonify({
+                'success': False,
+                'error': 'Query parameter "email" is required',
+                'code': 400
+            }), 400
+
+        member = member_adapter.get_by_email(email)
+        if member:
+            return jsonify({
+                'success': True,
+                'data': member,
+                'message': 'Member retrieved successfully'
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'error': f'Member with email {email} not found',
+                'code': 404
+            }), 404
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'code': 500
+        }), 500
+
+
+@members_bp.route('/api/members', methods=['POST'])
+def create_member():
+    """Create new member"""
+    try:
+        data = request.get_json()
+
+        # Validate required fields
+        if not data or not data.get('name') or not data.get('email'):
+            return jsonify({
+                'success': False,
+                'error': 'Name and email are required',
+                'code': 400
+            }), 400
+
+        # Extract fields
+        name = data.get('name')
+        email = data.get('email')
+        phone = data.get('phone') or None
+        status = data.get('status') or 'active'
+
+        # Create member
+        member = member_adapter.create(name, email, phone, status)
+
+        if member:
+            return jsonify({
+                'success': True,
+                'data': member,
+                'message': 'Member created successfully'
+            }), 201
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to create member (email may already be registered)',
+                'code': 400
+            }), 400
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'code': 500
+        }), 500
+
+
+@members_bp.route('/api/members/<int:member_id>', methods=['PUT'])
+def update_member(member_id):
+    """Update member"""
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'No data provided',
+                'code': 400
+            }), 400
+
+        # Extract fields (only include if present)
+        update_fields = {}
+        for field in ('name', 'email', 'phone', 'status'):
+            if data.get(field):
+                update_fields[field] = data[field]
+
+        # Update member
+        member = member_adapter.update(member_id, **update_fields)
+
+        if member:
+            return jsonify({
+                'success': True,
+                'data': member,
+                'message': 'Member updated successfully'
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to update member (member may not exist or email is taken)',
+                'code': 400
+            }), 400
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'code': 500
+        }), 500
+
+
+@members_bp.route('/api/members/<int:member_id>', methods=['DELETE'])
+def delete_member(member_id):
+    """Delete member"""
+    try:
+        success = member_adapter.delete(member_id)
+
+        if success:
+            return jsonify({
+                'success': True,
+                'message': f'Member {member_id} deleted successfully'
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to delete member (may not exist or has linked loans)',
+                'code': 400
+            }), 400
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'code': 500
+        }), 500
+
+
+@members_bp.route('/api/members/search', methods=['GET'])
+def search_members():
+    """Search members by name or email prefix (optional "limit", ordered by name)"""
+    try:
+        query = request.args.get('q', '')
+
+        if not query:
+            return jsonify({
+                'success': False,
+                'error': 'Search query parameter "q" is required',
+                'code': 400
+            }), 400
+
+        try:
+            limit = int(request.args.get('limit', DEFAULT_SEARCH_LIMIT))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'Query parameter "limit" must be an integer',
+                'code': 400
+            }), 400
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+        members = member_adapter.search(query, limit)
+
+        return jsonify({
+            'success': True,
+            'data': members,
+            'message': f'Found {len(members)} members matching "{query}"'
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'code': 500
+        }), 500
+
+
+@members_bp.route('/api/members/count', methods=['GET'])
+def get_members_count():
+    """Get total member count"""
+    try:
+        count = member_adapter.get_count()
+
+        return jsonify({
+            'success': True,
+            'data': {'count': count},
+            'message': f'Total members: {count}'
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'code': 500
+        }), 500
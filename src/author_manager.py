@@ -1,10 +1,12 @@
 """
 Author Manager module for Library Management System
-Handles CRUD operations for authors
+Handles CRUD operations for authors with console output
 """
 
 import sqlite3
 from database import Database
+from author_repository import AuthorRepository
+from search_index import DEFAULT_SEARCH_LIMIT
 
 
 class AuthorManager:
@@ -20,6 +22,22 @@ class AuthorManager:
         self.db = database
         self.conn = database.get_connection()
         self.cursor = database.get_cursor()
+        self.repository = AuthorRepository(database)
+
+    def _print_authors_table(self, authors):
+        """Print author records as a formatted table"""
+        print("=" * 90)
+        print(f"{'ID':<6} {'Name':<30} {'Birth Year':<12} {'Nationality':<30}")
+        print("=" * 90)
+
+        for author in authors:
+            author_id, name, birth_year, nationality = author
+            birth_year_str = str(birth_year) if birth_year else "N/A"
+            nationality_str = nationality if nationality else "N/A"
+
+            print(f"{author_id:<6} {name:<30} {birth_year_str:<12} {nationality_str:<30}")
+
+        print("=" * 90)
 
     def add_author(self, name, birth_year=None, nationality=None):
         """
@@ -34,16 +52,7 @@ class AuthorManager:
             int: ID of the newly created author, or None if failed
         """
         try:
-            # SQL INSERT statement with parameters to prevent SQL injection
-            query = """
-                INSERT INTO Authors (name, birth_year, nationality)
-                VALUES (?, ?, ?)
-            """
-
-            self.cursor.execute(query, (name, birth_year, nationality))
-            self.conn.commit()
-
-            author_id = self.cursor.lastrowid
+            author_id = self.repository.add_author(name, birth_year, nationality)
             print(f"✓ Author added successfully! (ID: {author_id})")
             print(f"  Name: {name}")
             if birth_year:
@@ -60,36 +69,54 @@ class AuthorManager:
             print(f"✗ Error adding author: {e}")
             return None
 
+    def bulk_add_authors(self, records, batch_size=1000):
+        """
+        Insert many authors in batched transactions and print a summary
+
+        Names already in the database are not added again (see
+        AuthorRepository.bulk_add_authors).
+
+        Args:
+            records (iterable): Dicts with name and optional birth_year, nationality
+            batch_size (int, optional): Rows per transaction (default: 1000)
+
+        Returns:
+            dict: Report with inserted and existing counts, IDs by name and errors
+        """
+        report = self.repository.bulk_add_authors(records, batch_size)
+        print(f"✓ Bulk import finished: {report['inserted']} authors added, "
+              f"{report['existing']} already present, {len(report['errors'])} errors")
+        return report
+
+    def get_author_id_map(self):
+        """
+        Map every author name to its ID (lowest ID wins for duplicate names)
+
+        Returns:
+            dict: Author name -> author ID
+        """
+        try:
+            return self.repository.get_author_id_map()
+        except sqlite3.Error as e:
+            print(f"✗ Error retrieving authors: {e}")
+            return {}
+
     def view_all_authors(self):
         """
         Display all authors in a formatted table
 
         Returns:
-            list: List of author tuples, or empty list if none found
+            list: List of author records, or empty list if none found
         """
         try:
-            query = "SELECT id, name, birth_year, nationality FROM Authors ORDER BY name"
-            self.cursor.execute(query)
-            authors = self.cursor.fetchall()
+            authors = self.repository.get_all_authors()
 
             if not authors:
                 print("\n📚 No authors found in the database.")
                 return []
 
-            # Print formatted table header
-            print("\n" + "=" * 90)
-            print(f"{'ID':<6} {'Name':<30} {'Birth Year':<12} {'Nationality':<30}")
-            print("=" * 90)
-
-            # Print each author row
-            for author in authors:
-                author_id, name, birth_year, nationality = author
-                birth_year_str = str(birth_year) if birth_year else "N/A"
-                nationality_str = nationality if nationality else "N/A"
-
-                print(f"{author_id:<6} {name:<30} {birth_year_str:<12} {nationality_str:<30}")
-
-            print("=" * 90)
+            print()
+            self._print_authors_table(authors)
             print(f"Total authors: {len(authors)}\n")
 
             return authors
@@ -98,29 +125,74 @@ class AuthorManager:
             print(f"✗ Error retrieving authors: {e}")
             return []
 
-    def search_author(self, search_term):
+    def view_authors_page(self, limit=20, after=None):
         """
-        Search for authors by name using pattern matching
+        Display one page of authors ordered by (name, id)
+
+        Args:
+            limit (int, optional): Authors per page
+            after (tuple, optional): (name, id) of the last author on the
+                previous page; None starts from the beginning
+
+        Returns:
+            tuple: (list of author records, (name, id) to pass as `after` for
+                   the next page, or None on the last page)
+        """
+        try:
+            authors = self.repository.list_authors(limit + 1, after)
+        except sqlite3.Error as e:
+            print(f"✗ Error retrieving authors: {e}")
+            return [], None
+
+        next_after = (authors[limit - 1][1], authors[limit - 1][0]) if len(authors) > limit else None
+        authors = authors[:limit]
+        if not authors:
+            print("\n📚 No authors found.")
+            return [], None
+
+        print()
+        self._print_authors_table(authors)
+        return authors, next_after
+
+    def list_authors(self, limit=100, after=None):
+        """
+        Fetch one page of authors ordered by (name, id) using keyset pagination
+
+        Args:
+            limit (int, optional): Maximum number of authors to return
+            after (tuple, optional): (name, id) of the last author on the
+                previous page; None starts from the beginning
+
+        Returns:
+            list: Author records (id, name, birth_year, nationality)
+        """
+        return self.repository.list_authors(limit, after)
+
+    def iter_author_batches(self, batch_size=1000):
+        """
+        Iterate over every author in id order without loading the whole table
+
+        Args:
+            batch_size (int, optional): Rows fetched from SQLite per batch
+
+        Yields:
+            list: Up to batch_size author records
+        """
+        return self.repository.iter_author_batches(batch_size)
+
+    def search_author(self, search_term, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Search for authors by name
 
         Args:
             search_term (str): Name or partial name to search for
+            limit (int, optional): Maximum number of results (default: 50)
 
         Returns:
-            list: List of matching author tuples
+            list: List of matching author records, best match first
         """
         try:
-            # Using LIKE operator for pattern matching (case-insensitive)
-            query = """
-                SELECT id, name, birth_year, nationality
-                FROM Authors
-                WHERE name LIKE ?
-                ORDER BY name
-            """
-
-            # Add wildcards for partial matching
-            search_pattern = f"%{search_term}%"
-            self.cursor.execute(query, (search_pattern,))
-            authors = self.cursor.fetchall()
+            authors = self.repository.search_authors(search_term, limit)
 
             if not authors:
                 print(f"\n📚 No authors found matching '{search_term}'")
@@ -128,18 +200,7 @@ class AuthorManager:
 
             # Print formatted results
             print(f"\n🔍 Search results for '{search_term}':")
-            print("=" * 90)
-            print(f"{'ID':<6} {'Name':<30} {'Birth Year':<12} {'Nationality':<30}")
-            print("=" * 90)
-
-            for author in authors:
-                author_id, name, birth_year, nationality = author
-                birth_year_str = str(birth_year) if birth_year else "N/A"
-                nationality_str = nationality if nationality else "N/A"
-
-                print(f"{author_id:<6} {name:<30} {birth_year_str:<12} {nationality_str:<30}")
-
-            print("=" * 90)
+            self._print_authors_table(authors)
             print(f"Found {len(authors)} author(s)\n")
 
             return authors
@@ -156,17 +217,10 @@ class AuthorManager:
             author_id (int): The ID of the author to retrieve
 
         Returns:
-            tuple: Author data (id, name, birth_year, nationality) or None if not found
+            Author: Author record or None if not found
         """
         try:
-            query = """
-                SELECT id, name, birth_year, nationality
-                FROM Authors
-                WHERE id = ?
-            """
-
-            self.cursor.execute(query, (author_id,))
-            author = self.cursor.fetchone()
+            author = self.repository.get_author_by_id(author_id)
 
             if not author:
                 print(f"\n✗ No author found with ID: {author_id}")
@@ -205,30 +259,10 @@ class AuthorManager:
             if not self.get_author_by_id(author_id):
                 return False
 
-            # Build dynamic UPDATE query based on provided fields
-            updates = []
-            params = []
-
-            if name is not None:
-                updates.append("name = ?")
-                params.append(name)
-            if birth_year is not None:
-                updates.append("birth_year = ?")
-                params.append(birth_year)
-            if nationality is not None:
-                updates.append("nationality = ?")
-                params.append(nationality)
-
-            if not updates:
+            if not self.repository.update_author(author_id, name, birth_year, nationality):
                 print("✗ No fields to update")
                 return False
 
-            query = f"UPDATE Authors SET {', '.join(updates)} WHERE id = ?"
-            params.append(author_id)
-
-            self.cursor.execute(query, params)
-            self.conn.commit()
-
             print(f"✓ Author {author_id} updated successfully!")
             return True
 
@@ -251,9 +285,7 @@ class AuthorManager:
             if not self.get_author_by_id(author_id):
                 return False
 
-            query = "DELETE FROM Authors WHERE id = ?"
-            self.cursor.execute(query, (author_id,))
-            self.conn.commit()
+            self.repository.delete_author(author_id)
 
             print(f"✓ Author {author_id} deleted successfully!")
             return True
@@ -273,10 +305,7 @@ class AuthorManager:
             int: Number of authors in the database
         """
         try:
-            query = "SELECT COUNT(*) FROM Authors"
-            self.cursor.execute(query)
-            count = self.cursor.fetchone()[0]
-            return count
+            return self.repository.get_author_count()
         except sqlite3.Error as e:
             print(f"✗ Error counting authors: {e}")
             return 0
@@ -0,0 +1,475 @@
+"""
+Author Repository module for Library Management System
+Silent data-access layer for authors: runs SQL and returns rows, never prints
+"""
+
+import sqlite3
+from search_index import SearchIndex, DEFAULT_SEARCH_LIMIT
+from change_versions import bump_version, get_version
+from library_stats import deferred_counters, get_row_count, get_group_counts
+from records import Author
+from batch_writes import (BatchItemError, prepare_items, check_fields, item_id,
+                          run_batch, fetch_rows_by_ids)
+
+
+# Column list shared by every query that returns full author rows:
+# (id, name, birth_year, nationality)
+AUTHOR_SELECT = "SELECT id, name, birth_year, nationality FROM Authors"
+
+# Writable author columns and the ones that must hold integers
+AUTHOR_FIELDS = ('name', 'birth_year', 'nationality')
+AUTHOR_INTEGER_FIELDS = {'birth_year'}
+
+
+def _author_insert_params(item):
+    """Validate a batch create item and return its INSERT parameters"""
+    values = check_fields(item, AUTHOR_FIELDS, AUTHOR_INTEGER_FIELDS)
+    if not values['name']:
+        raise BatchItemError("Name is required")
+    return tuple(values[field] for field in AUTHOR_FIELDS)
+
+
+def _author_update_params(item):
+    """Validate a batch update item and return (author_id, {column: value})"""
+    author_id = item_id(item, 'Author')
+    values = check_fields(item, AUTHOR_FIELDS, AUTHOR_INTEGER_FIELDS)
+    updates = {column: value for column, value in values.items() if value is not None}
+    if not updates:
+        raise BatchItemError("No fields to update")
+    return author_id, updates
+
+
+class AuthorRepository:
+    """
+    Data access for authors
+
+    Every method uses its own cursor, returns records (records.py) or plain values and lets
+    sqlite3 errors propagate to the caller. Console output lives in
+    AuthorManager; the API adapters call this class directly.
+    """
+
+    def __init__(self, database):
+        """
+        Initialize AuthorRepository with database connection
+
+        Args:
+            database (Database): Database instance
+        """
+        self.db = database
+        self.conn = database.get_connection()
+        self.cache = database.get_record_cache()
+        self.search_index = SearchIndex(database)
+
+    def _fetchall(self, query, params=(), row_factory=None):
+        """Run a query on a fresh cursor and return all rows (built by row_factory if given)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = row_factory
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _fetchone(self, query, params=(), row_factory=None):
+        """Run a query on a fresh cursor and return the first row (built by row_factory if given)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = row_factory
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    def _write(self, query, params=(), tables=('Authors',)):
+        """Run a write statement, bump the tables' versions, commit and return rowcount/lastrowid"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, params)
+            rowcount, lastrowid = cursor.rowcount, cursor.lastrowid
+            if rowcount > 0:
+                bump_version(cursor, *tables)
+            self.conn.commit()
+            return rowcount, lastrowid
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def get_change_version(self):
+        """
+        Read the Authors change version
+
+        Returns:
+            tuple: (version, changed_at epoch seconds)
+        """
+        return get_version(self.conn, 'Authors')
+
+    def get_all_authors(self):
+        """
+        Fetch every author ordered by name
+
+        Returns:
+            list: Author records
+        """
+        return self._fetchall(AUTHOR_SELECT + " ORDER BY name", row_factory=Author.from_row)
+
+    def list_authors(self, limit=100, after=None):
+        """
+        Fetch one page of authors ordered by (name, id) using keyset pagination
+
+        Args:
+            limit (int, optional): Maximum number of authors to return
+            after (tuple, optional): (name, id) of the last author on the
+                previous page; None starts from the beginning
+
+        Returns:
+            list: Author records
+        """
+        if after is None:
+            return self._fetchall(AUTHOR_SELECT + " ORDER BY name, id LIMIT ?", (limit,),
+                                  row_factory=Author.from_row)
+        return self._fetchall(
+            AUTHOR_SELECT + " WHERE (name, id) > (?, ?) ORDER BY name, id LIMIT ?",
+            (after[0], after[1], limit),
+            row_factory=Author.from_row,
+        )
+
+    def iter_author_batches(self, batch_size=1000):
+        """
+        Iterate over every author in id order without loading the whole table
+
+        Args:
+            batch_size (int, optional): Rows fetched from SQLite per batch
+
+        Yields:
+            list: Up to batch_size author records
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = Author.from_row
+        try:
+            cursor.execute(AUTHOR_SELECT + " ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+    def search_authors(self, search_term, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Search authors by name
+
+        Uses the full-text index (ranked, prefix matching) when available and
+        falls back to LIKE pattern matching otherwise.
+
+        Args:
+            search_term (str): Name or partial name to search for
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: Matching author records, best match first
+        """
+        if self.search_index.is_available():
+            return self.search_index.search_authors(search_term, limit)
+
+        return self._fetchall(
+            AUTHOR_SELECT + " WHERE name LIKE ? ORDER BY name LIMIT ?",
+            (f"%{search_term}%", limit),
+            row_factory=Author.from_row,
+        )
+
+    def get_author_by_id(self, author_id):
+        """
+        Fetch a single author
+
+        Args:
+            author_id (int): The ID of the author
+
+        Returns:
+            Author: Author record or None if not found
+        """
+        return self.cache.get_or_load(
+            ('author', author_id),
+            lambda: self._fetchone(AUTHOR_SELECT + " WHERE id = ?", (author_id,), row_factory=Author.from_row),
+        )
+
+    def add_author(self, name, birth_year=None, nationality=None):
+        """
+        Insert an author
+
+        Args:
+            name (str): Author's full name
+            birth_year (int, optional): Year of birth
+            nationality (str, optional): Author's nationality
+
+        Returns:
+            int: ID of the new author
+        """
+        _, author_id = self._write("""
+            INSERT INTO Authors (name, birth_year, nationality)
+            VALUES (?, ?, ?)
+        """, (name, birth_year, nationality))
+        return author_id
+
+    def update_author(self, author_id, name=None, birth_year=None, nationality=None):
+        """
+        Update the given (non-None) fields of an author
+
+        Args:
+            author_id (int): ID of the author to update
+            name, birth_year, nationality (optional): New values
+
+        Returns:
+            bool: True if an author was updated, False if it doesn't exist or
+                  no fields were given
+        """
+        fields = {'name': name, 'birth_year': birth_year, 'nationality': nationality}
+        updates = {column: value for column, value in fields.items() if value is not None}
+        if not updates:
+            return False
+
+        query = f"UPDATE Authors SET {', '.join(f'{column} = ?' for column in updates)} WHERE id = ?"
+        # Book rows show the author's name and the book facets and filters
+        # use the nationality, so changing either changes book responses too
+        tables = ('Authors', 'Books') if {'name', 'nationality'} & set(updates) else ('Authors',)
+        rowcount, _ = self._write(query, [*updates.values(), author_id], tables)
+        self.cache.invalidate(('author', author_id))
+        if 'name' in updates:
+            # Cached book rows carry the author's name
+            self.cache.invalidate_where('book', lambda row: row.author_id == author_id)
+        return rowcount > 0
+
+    def delete_author(self, author_id):
+        """
+        Delete an author
+
+        Args:
+            author_id (int): ID of the author to delete
+
+        Returns:
+            bool: True if an author was deleted, False if it doesn't exist
+
+        Raises:
+            sqlite3.IntegrityError: If books reference the author
+        """
+        rowcount, _ = self._write("DELETE FROM Authors WHERE id = ?", (author_id,))
+        self.cache.invalidate(('author', author_id))
+        return rowcount > 0
+
+    def add_authors(self, items, atomic=True):
+        """
+        Insert many authors in one transaction
+
+        Args:
+            items (list): Dicts with name and optional birth_year, nationality
+            atomic (bool, optional): Insert all or nothing (default), or insert
+                the valid items and report the rest
+
+        Returns:
+            tuple: (results, committed); each result is {'index', 'status',
+                   'id'} plus 'row' (the author record) for created authors or
+                   'error' for rejected items
+        """
+        def insert(cursor, params):
+            cursor.execute("""
+                INSERT INTO Authors (name, birth_year, nationality)
+                VALUES (?, ?, ?)
+                RETURNING id
+            """, params)
+            return 'created', cursor.fetchone()[0]
+
+        prepared = prepare_items(items, _author_insert_params)
+        results, committed = run_batch(self.conn, prepared, insert, atomic, ('Authors',))
+        return self._attach_rows(results), committed
+
+    def update_authors(self, items, atomic=True):
+        """
+        Update many authors in one transaction
+
+        Args:
+            items (list): Dicts with the author id plus the fields to change
+            atomic (bool, optional): Update all or nothing (default), or update
+                the valid items and report the rest
+
+        Returns:
+            tuple: (results, committed) as for add_authors, with 'updated' rows
+        """
+        def update(cursor, value):
+            author_id, updates = value
+            cursor.execute(
+                f"UPDATE Authors SET {', '.join(f'{column} = ?' for column in updates)} WHERE id = ?",
+                [*updates.values(), author_id],
+            )
+            if cursor.rowcount == 0:
+                raise BatchItemError(f"Author {author_id} not found", 'not_found')
+            return 'updated', author_id
+
+        prepared = prepare_items(items, _author_update_params)
+        valid = [value for value in prepared if not isinstance(value, BatchItemError)]
+        renamed = {author_id for author_id, updates in valid if 'name' in updates}
+        # Book rows show the author's name and the book facets use the
+        # nationality, so those changes bump the Books version too
+        touches_books = renamed or any('nationality' in updates for _, updates in valid)
+        tables = ('Authors', 'Books') if touches_books else ('Authors',)
+        results, committed = run_batch(self.conn, prepared, update, atomic, tables)
+        if committed:
+            self.cache.invalidate(*(('author', result['id']) for result in results if result['id']))
+            if renamed:
+                self.cache.invalidate_where('book', lambda row: row.author_id in renamed)
+        return self._attach_rows(results), committed
+
+    def delete_authors(self, items, atomic=True):
+        """
+        Delete many authors in one transaction
+
+        Args:
+            items (list): Author ids, or dicts with an id
+            atomic (bool, optional): Delete all or nothing (default), or delete
+                what can be deleted and report the rest (authors with books
+                can't be deleted)
+
+        Returns:
+            tuple: (results, committed) as for add_authors, with 'deleted' items
+        """
+        def delete(cursor, author_id):
+            cursor.execute("DELETE FROM Authors WHERE id = ?", (author_id,))
+            if cursor.rowcount == 0:
+                raise BatchItemError(f"Author {author_id} not found", 'not_found')
+            return 'deleted', author_id
+
+        prepared = prepare_items(items, lambda item: item_id(item, 'Author'))
+        results, committed = run_batch(self.conn, prepared, delete, atomic, ('Authors',))
+        if committed:
+            self.cache.invalidate(*(('author', result['id']) for result in results if result['id']))
+        return results, committed
+
+    def _attach_rows(self, results):
+        """Add the written author rows to batch results with one IN (...) query per chunk"""
+        ids = [result['id'] for result in results if result['status'] in ('created', 'updated')]
+        rows = fetch_rows_by_ids(self.conn, AUTHOR_SELECT, 'id', ids, Author.from_row)
+        for result in results:
+            if result['id'] in rows:
+                result['row'] = rows[result['id']]
+        return results
+
+    def get_author_count(self):
+        """
+        Count all authors (trigger-maintained counter, no table scan)
+
+        Returns:
+            int: Number of authors
+        """
+        return get_row_count(self.conn, 'Authors')
+
+    def get_nationality_counts(self):
+        """
+        Count authors per nationality (trigger-maintained counters)
+
+        Returns:
+            dict: Nationality -> number of authors; authors without one under ''
+        """
+        return get_group_counts(self.conn, 'nationality')
+
+    def get_author_id_map(self):
+        """
+        Map every author name to its ID (lowest ID wins for duplicate names)
+
+        Returns:
+            dict: Author name -> author ID
+        """
+        return dict(self._fetchall("SELECT name, MIN(id) FROM Authors GROUP BY name"))
+
+    def bulk_add_authors(self, records, batch_size=1000):
+        """
+        Insert many authors in batched transactions, skipping names already present
+
+        Authors are matched by name: a name already in the database, or
+        earlier in the records, is not inserted again, so re-running an
+        import adds nothing. Rows without a name or with a non-integer
+        birth_year are reported and skipped.
+
+        Args:
+            records (iterable): Dicts with name and optional birth_year, nationality
+            batch_size (int, optional): Rows per transaction (default: 1000)
+
+        Returns:
+            dict: {'inserted': int, 'existing': int, 'ids': {name: author ID}
+                  for every name imported or found, 'errors': [...]} where
+                  each error is {'row': n, 'name': ..., 'error': ...}
+        """
+        report = {'inserted': 0, 'existing': 0, 'ids': {}, 'errors': []}
+        batch = []
+
+        for row_number, record in enumerate(records, start=1):
+            name = record.get('name')
+            if not name:
+                report['errors'].append({'row': row_number, 'name': name, 'error': 'Name is required'})
+                continue
+            try:
+                values = check_fields(record, AUTHOR_FIELDS, AUTHOR_INTEGER_FIELDS)
+            except BatchItemError as e:
+                report['errors'].append({'row': row_number, 'name': name, 'error': str(e)})
+                continue
+            batch.append((row_number, (name, values['birth_year'], values['nationality'])))
+            if len(batch) >= batch_size:
+                self._insert_author_batch(batch, report)
+                batch = []
+
+        if batch:
+            self._insert_author_batch(batch, report)
+
+        return report
+
+    def _find_author_ids(self, cursor, names):
+        """Map the given names to their lowest author ID (names not found are left out)"""
+        names = list(names)
+        ids = {}
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            cursor.execute(f"SELECT name, MIN(id) FROM Authors WHERE name IN ({', '.join('?' * len(chunk))}) "
+                           f"GROUP BY name", chunk)
+            ids.update(cursor.fetchall())
+        return ids
+
+    def _insert_author_batch(self, batch, report):
+        """
+        Insert the new names of one batch of (row_number, params) pairs in a single transaction
+
+        Args:
+            batch (list): (row_number, (name, birth_year, nationality))
+            report (dict): Report updated in place
+        """
+        query = """
+            INSERT INTO Authors (name, birth_year, nationality)
+            VALUES (?, ?, ?)
+        """
+        cursor = self.conn.cursor()
+        try:
+            # Check names under the write lock, so a concurrent import can't
+            # add one between the check and the insert
+            cursor.execute("BEGIN IMMEDIATE")
+            names = {params[0] for _, params in batch}
+            existing = self._find_author_ids(cursor, names)
+            new_rows = {}
+            for _, params in batch:
+                if params[0] not in existing:
+                    new_rows.setdefault(params[0], params)
+
+            if new_rows:
+                with self.search_index.deferred_author_indexing(), deferred_counters(self.conn, 'Authors'):
+                    cursor.executemany(query, list(new_rows.values()))
+                bump_version(cursor, 'Authors')
+                existing.update(self._find_author_ids(cursor, new_rows))
+            self.conn.commit()
+
+            report['inserted'] += len(new_rows)
+            report['existing'] += len(batch) - len(new_rows)
+            report['ids'].update(existing)
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            for row_number, params in batch:
+                report['errors'].append({'row': row_number, 'name': params[0], 'error': str(e)})
+        finally:
+            cursor.close()
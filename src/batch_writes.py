@@ -0,0 +1,202 @@
+"""
+Batch writes for Library Management System
+Applies many creates, updates or deletes in one transaction, either all or
+nothing (atomic) or item by item with per-item results (partial)
+"""
+
+import sqlite3
+from change_versions import bump_version
+
+# Most items accepted by one batch call
+MAX_BATCH_SIZE = 5000
+
+# Ids per "WHERE id IN (...)" lookup when reading back written rows
+ID_CHUNK_SIZE = 500
+
+
+class BatchItemError(Exception):
+    """Raised for one batch item that is invalid or can't be applied"""
+
+    def __init__(self, message, status='error'):
+        """
+        Initialize BatchItemError
+
+        Args:
+            message (str): Why the item was rejected
+            status (str, optional): Result status, 'error', 'not_found' or
+                'conflict' (the item breaks a circulation rule)
+        """
+        super().__init__(message)
+        self.status = status
+
+
+def prepare_items(items, prepare):
+    """
+    Validate every item up front
+
+    Args:
+        items (list): Raw items from the caller
+        prepare (callable): Turns one item into the value run_batch applies;
+            raises BatchItemError for an invalid item
+
+    Returns:
+        list: Prepared values, with a BatchItemError in place of each invalid item
+    """
+    prepared = []
+    for item in items:
+        try:
+            prepared.append(prepare(item))
+        except BatchItemError as e:
+            prepared.append(e)
+    return prepared
+
+
+def check_fields(item, fields, integer_fields):
+    """
+    Pick the known fields out of a batch item
+
+    Args:
+        item (dict): Item from the request
+        fields (tuple): Field names to read
+        integer_fields (set): Fields that must be integers when present
+
+    Returns:
+        dict: field -> value, with empty strings turned into None and digit
+              strings of integer fields turned into ints
+
+    Raises:
+        BatchItemError: If the item isn't an object or a field has the wrong type
+    """
+    if not isinstance(item, dict):
+        raise BatchItemError("Item must be an object")
+    values = {}
+    for field in fields:
+        value = item.get(field)
+        if value == '':
+            value = None
+        if field in integer_fields and value is not None:
+            if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+                value = int(value)
+            elif isinstance(value, bool) or not isinstance(value, int):
+                raise BatchItemError(f'"{field}" must be an integer')
+        values[field] = value
+    return values
+
+
+def item_id(item, noun):
+    """
+    Read the integer id of an update or delete item
+
+    Args:
+        item: {'id': n, ...} object or a bare integer id
+        noun (str): 'Book' or 'Author', for the error message
+
+    Returns:
+        int: The id
+
+    Raises:
+        BatchItemError: If there is no integer id
+    """
+    row_id = item.get('id') if isinstance(item, dict) else item
+    if isinstance(row_id, bool) or not isinstance(row_id, int):
+        raise BatchItemError(f"{noun} id must be an integer")
+    return row_id
+
+
+def run_batch(conn, prepared, apply_item, atomic=True, tables=()):
+    """
+    Apply prepared items in one BEGIN IMMEDIATE transaction
+
+    In atomic mode nothing is written unless every item succeeds: an invalid
+    item stops the batch before the transaction starts, and a failing
+    statement rolls the whole transaction back. In partial mode each item
+    runs under its own savepoint, so a failure only undoes that item.
+
+    Args:
+        conn (sqlite3.Connection): Connection to write on
+        prepared (list): Per item, the validated value passed to apply_item,
+            or the BatchItemError raised while validating it
+        apply_item (callable): apply_item(cursor, value) -> (status, row_id);
+            raises BatchItemError or sqlite3.IntegrityError to reject the item
+        atomic (bool, optional): All-or-nothing (default) or partial success
+        tables (tuple, optional): Tables whose change version is bumped when
+            anything was written
+
+    Returns:
+        tuple: (results, committed) where results holds one dict per item:
+               {'index', 'status', 'id'} plus 'error' for rejected items
+    """
+    results = []
+    if atomic:
+        results = [{'index': index, 'status': value.status, 'id': None, 'error': str(value)}
+                   for index, value in enumerate(prepared) if isinstance(value, BatchItemError)]
+        if results:
+            return results, False
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        written = 0
+
+        for index, value in enumerate(prepared):
+            if isinstance(value, BatchItemError):
+                results.append({'index': index, 'status': value.status, 'id': None, 'error': str(value)})
+                continue
+
+            if not atomic:
+                cursor.execute("SAVEPOINT batch_item")
+            try:
+                status, row_id = apply_item(cursor, value)
+            except (BatchItemError, sqlite3.IntegrityError) as e:
+                error = {'index': index, 'status': getattr(e, 'status', 'error'), 'id': None, 'error': str(e)}
+                if atomic:
+                    conn.rollback()
+                    return [error], False
+                cursor.execute("ROLLBACK TO batch_item")
+                cursor.execute("RELEASE batch_item")
+                results.append(error)
+                continue
+
+            if not atomic:
+                cursor.execute("RELEASE batch_item")
+            results.append({'index': index, 'status': status, 'id': row_id})
+            written += 1
+
+        if written:
+            bump_version(cursor, *tables)
+        conn.commit()
+        return results, True
+
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def fetch_rows_by_ids(conn, select, id_column, ids, row_factory=None):
+    """
+    Read rows back in a few "WHERE id IN (...)" queries
+
+    Args:
+        conn (sqlite3.Connection): Connection to read from
+        select (str): SELECT ... FROM ... without a WHERE clause
+        id_column (str): Qualified id column, e.g. 'b.id'
+        ids (list): Row ids
+        row_factory (callable, optional): sqlite3 row factory for the rows
+
+    Returns:
+        dict: id -> row
+    """
+    rows = {}
+    cursor = conn.cursor()
+    cursor.row_factory = row_factory
+    try:
+        for start in range(0, len(ids), ID_CHUNK_SIZE):
+            chunk = ids[start:start + ID_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f"{select} WHERE {id_column} IN ({placeholders})", chunk)
+            rows.update((row[0], row) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+    return rows
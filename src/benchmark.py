@@ -0,0 +1,717 @@
+"""
+Benchmark harness for Library Management System
+Generates synthetic catalogues, times the book/author managers and the JSON
+providers and load-tests the /api routes in-process, writing the results as JSON
+
+Usage:
+    python benchmark.py generate --books 100000 --db /tmp/bench-100k.db
+    python benchmark.py run --sizes 10000 100000 1000000 --output results.json
+    python benchmark.py compare baseline.json results.json --threshold 0.2
+    python benchmark.py json --db /tmp/bench-100k.db --rows 100000
+
+run builds (or reuses) one catalogue per size under --data-dir and measures
+each size in a fresh interpreter, so the API module, pool and record cache
+start cold for every size. Catalogues are generated from a fixed seed: the
+same size always yields the same rows, so results from different releases
+are comparable. compare exits with status 1 when an operation got slower
+than the threshold allows. json times only the serialization of one large
+list response, per JSON provider.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Format version of the results file; bump when its layout changes
+RESULTS_FORMAT = 1
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+DEFAULT_CONCURRENCY = [1, 4, 16]
+DEFAULT_SEED = 20240601
+
+# Each microbenchmark stops after this many operations or seconds, whichever
+# comes first (a single full listing of a 1M catalogue can take seconds)
+DEFAULT_MAX_OPS = 500
+DEFAULT_MAX_SECONDS = 2.0
+
+# Seconds each API concurrency level runs for
+DEFAULT_LOAD_DURATION = 5.0
+
+# Books per synthetic author
+BOOKS_PER_AUTHOR = 10
+
+# Books in the JSON serialization benchmark's payload
+DEFAULT_JSON_ROWS = 100000
+
+# ISBN prefix of the books added by the add_book benchmark (removed afterwards)
+BENCH_ISBN_PREFIX = 'BENCH-'
+
+WORDS = [
+    'shadow', 'river', 'garden', 'winter', 'empire', 'silent', 'golden', 'night',
+    'stone', 'ocean', 'forest', 'city', 'fire', 'glass', 'iron', 'summer', 'storm',
+    'house', 'secret', 'mountain', 'island', 'crown', 'letters', 'journey', 'memory',
+    'harbor', 'desert', 'light', 'broken', 'wild', 'lost', 'last', 'northern', 'red',
+    'music', 'paper', 'machine', 'kingdom', 'voyage', 'orchard', 'lantern', 'thunder',
+]
+GENRES = [
+    'Fiction', 'Mystery', 'Romance', 'Fantasy', 'Science Fiction', 'History',
+    'Biography', 'Poetry', 'Horror', 'Thriller', 'Travel', 'Essay',
+]
+FIRST_NAMES = [
+    'Ada', 'Bruno', 'Clara', 'Dmitri', 'Elena', 'Farid', 'Grace', 'Hiro', 'Ines',
+    'Jonas', 'Kemi', 'Liam', 'Mara', 'Nils', 'Olga', 'Pablo', 'Quinn', 'Rosa',
+]
+LAST_NAMES = [
+    'Abbott', 'Brandt', 'Costa', 'Dubois', 'Eriksen', 'Fischer', 'Garcia', 'Haas',
+    'Ivanova', 'Jensen', 'Kowalski', 'Lindqvist', 'Moreau', 'Novak', 'Okafor',
+]
+NATIONALITIES = ['British', 'American', 'French', 'German', 'Japanese', 'Nigerian', 'Brazilian']
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Send stdout to /dev/null (managers and Database print as they work)"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+# ---------------------------------------------------------------------------
+# Synthetic catalogue
+# ---------------------------------------------------------------------------
+
+def synthetic_authors(count, seed=DEFAULT_SEED):
+    """
+    Yield deterministic author records
+
+    Args:
+        count (int): Number of authors
+        seed (int, optional): Random seed
+
+    Yields:
+        dict: name, birth_year, nationality
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+            'birth_year': rng.randint(1750, 2000),
+            'nationality': rng.choice(NATIONALITIES),
+        }
+
+
+def synthetic_books(count, author_count, seed=DEFAULT_SEED):
+    """
+    Yield deterministic book records
+
+    Args:
+        count (int): Number of books
+        author_count (int): Authors to spread the books over (ids 1..author_count)
+        seed (int, optional): Random seed
+
+    Yields:
+        dict: title, isbn, year, genre, copies, author_id
+    """
+    rng = random.Random(seed + 1)
+    for i in range(count):
+        words = rng.sample(WORDS, rng.randint(2, 4))
+        yield {
+            'title': ' '.join(words).title(),
+            'isbn': f"978{i:010d}",
+            'year': rng.randint(1800, 2024),
+            'genre': rng.choice(GENRES),
+            'copies': rng.randint(1, 5),
+            'author_id': rng.randint(1, author_count),
+        }
+
+
+def generate_catalogue(db_path, books, seed=DEFAULT_SEED, batch_size=5000):
+    """
+    Create a new database at db_path filled with a synthetic catalogue
+
+    Args:
+        db_path (str): Path of the database file (must not exist yet)
+        books (int): Number of books (one author per BOOKS_PER_AUTHOR books)
+        seed (int, optional): Random seed
+        batch_size (int, optional): Rows per insert transaction
+
+    Returns:
+        dict: authors, books and seconds taken
+    """
+    from database import Database
+    from author_repository import AuthorRepository
+    from book_repository import BookRepository
+
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists")
+
+    start = time.perf_counter()
+    author_count = max(1, books // BOOKS_PER_AUTHOR)
+    db = Database(os.path.abspath(db_path))
+    with _quiet():
+        if not db.connect() or not db.create_tables():
+            raise RuntimeError(f"Could not create {db_path}")
+    try:
+        authors = AuthorRepository(db).bulk_add_authors(synthetic_authors(author_count, seed), batch_size)
+        report = BookRepository(db).bulk_add_books(synthetic_books(books, author_count, seed), batch_size)
+        db.get_connection().execute("ANALYZE")
+    finally:
+        db.conn.close()
+    return {'authors': authors['inserted'], 'books': report['inserted'],
+            'seconds': round(time.perf_counter() - start, 3)}
+
+
+def catalogue_path(data_dir, books, seed=DEFAULT_SEED):
+    """Path of the cached catalogue for one size and seed"""
+    return os.path.join(data_dir, f"library-{books}-{seed}.db")
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+
+def summarize(latencies, seconds):
+    """
+    Summarize per-operation latencies
+
+    Args:
+        latencies (list): Latencies in seconds
+        seconds (float): Wall-clock time the operations took
+
+    Returns:
+        dict: ops, seconds, ops_per_sec and mean/p50/p95/p99/max in milliseconds
+    """
+    if not latencies:
+        return {'ops': 0, 'seconds': round(seconds, 4)}
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return {
+        'ops': len(ordered),
+        'seconds': round(seconds, 4),
+        'ops_per_sec': round(len(ordered) / seconds, 1) if seconds else None,
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 4),
+        'p50_ms': round(percentile(0.50), 4),
+        'p95_ms': round(percentile(0.95), 4),
+        'p99_ms': round(percentile(0.99), 4),
+        'max_ms': round(ordered[-1] * 1000, 4),
+    }
+
+
+def time_operation(operation, max_ops=DEFAULT_MAX_OPS, max_seconds=DEFAULT_MAX_SECONDS):
+    """
+    Call operation(i) repeatedly and time every call
+
+    Args:
+        operation (callable): Called with the operation number
+        max_ops (int, optional): Stop after this many calls
+        max_seconds (float, optional): Stop once this much time has passed
+            (at least one call is always made)
+
+    Returns:
+        dict: Summary from summarize()
+    """
+    latencies = []
+    start = time.perf_counter()
+    deadline = start + max_seconds
+    for i in range(max_ops):
+        began = time.perf_counter()
+        operation(i)
+        finished = time.perf_counter()
+        latencies.append(finished - began)
+        if finished >= deadline:
+            break
+    return summarize(latencies, time.perf_counter() - start)
+
+
+# ---------------------------------------------------------------------------
+# Manager microbenchmarks
+# ---------------------------------------------------------------------------
+
+def run_manager_benchmarks(db, max_ops=DEFAULT_MAX_OPS, max_seconds=DEFAULT_MAX_SECONDS, seed=DEFAULT_SEED):
+    """
+    Time the book and author manager methods against a catalogue
+
+    Managers print their results; stdout goes to /dev/null while they run,
+    so the timings include formatting the output but not a terminal.
+    Books and authors added by the add_* benchmarks are deleted afterwards.
+
+    Args:
+        db (Database): Connected database holding a generated catalogue
+        max_ops (int, optional): Operations per benchmark
+        max_seconds (float, optional): Time budget per benchmark
+        seed (int, optional): Random seed for ids and search terms
+
+    Returns:
+        dict: Benchmark name -> summary
+    """
+    from author_manager import AuthorManager
+    from book_manager import BookManager
+
+    books = BookManager(db)
+    authors = AuthorManager(db)
+    book_count = books.repository.get_book_count()
+    author_count = authors.repository.get_author_count()
+    rng = random.Random(seed + 2)
+    run_tag = f"{BENCH_ISBN_PREFIX}{int(time.time())}-"
+
+    benchmarks = [
+        ('book.get_book_by_id', lambda i: books.get_book_by_id(rng.randint(1, book_count))),
+        ('book.search_book', lambda i: books.search_book(rng.choice(WORDS))),
+        ('book.view_all_books', lambda i: books.view_all_books()),
+        ('book.add_book', lambda i: books.add_book(f"Benchmark Book {i}", f"{run_tag}{i}",
+                                                   2000, 'Fiction', 1, rng.randint(1, author_count))),
+        ('author.get_author_by_id', lambda i: authors.get_author_by_id(rng.randint(1, author_count))),
+        ('author.search_author', lambda i: authors.search_author(rng.choice(LAST_NAMES))),
+        ('author.view_all_authors', lambda i: authors.view_all_authors()),
+        ('author.add_author', lambda i: authors.add_author(f"{run_tag}Author {i}", 1950, 'British')),
+    ]
+
+    results = {}
+    try:
+        for name, operation in benchmarks:
+            with _quiet():
+                results[name] = time_operation(operation, max_ops, max_seconds)
+            print(f"  {name:<26} {_describe(results[name])}")
+    finally:
+        conn = db.get_connection()
+        conn.execute("DELETE FROM Books WHERE isbn LIKE ?", (f"{run_tag}%",))
+        conn.execute("DELETE FROM Authors WHERE name LIKE ?", (f"{run_tag}%",))
+        conn.commit()
+    return results
+
+
+# ---------------------------------------------------------------------------
+# JSON serialization
+# ---------------------------------------------------------------------------
+
+def run_json_benchmarks(db, rows=DEFAULT_JSON_ROWS, max_ops=DEFAULT_MAX_OPS, max_seconds=DEFAULT_MAX_SECONDS):
+    """
+    Time serializing one large list response with each JSON provider
+
+    The payload is a jsonify()-style {success, data, message} response holding
+    up to `rows` book records. json_flask is the provider the API used before
+    api/json_provider.py's fast path (Flask's default provider, plus records);
+    json_stdlib and json_orjson are the fast path with the fragment cache
+    disabled, and json_orjson_cached is orjson with every record already in
+    the cache (the same rows served again, unchanged).
+
+    Args:
+        db (Database): Connected database holding a generated catalogue
+        rows (int, optional): Books in the payload
+        max_ops (int, optional): Operations per benchmark
+        max_seconds (float, optional): Time budget per benchmark
+
+    Returns:
+        dict: Benchmark name -> summary (plus 'rows' and 'bytes')
+    """
+    from flask import Flask
+    from book_repository import BookRepository
+    from api.json_provider import FastJSONProvider, RecordJSONProvider, orjson
+
+    books = []
+    for batch in BookRepository(db).iter_book_batches():
+        books.extend(batch[:rows - len(books)])
+        if len(books) >= rows:
+            break
+    payload = {'success': True, 'data': books, 'message': f"Found {len(books)} books"}
+
+    app = Flask(__name__)
+    providers = {
+        'json_flask': RecordJSONProvider(app),
+        'json_stdlib': FastJSONProvider(app, backend='json', cache_size=0),
+    }
+    if orjson is not None:
+        providers['json_orjson'] = FastJSONProvider(app, backend='orjson', cache_size=0)
+        providers['json_orjson_cached'] = FastJSONProvider(app, backend='orjson', cache_size=len(books))
+        providers['json_orjson_cached'].response(payload)
+
+    results = {'rows': len(books)}
+    for name, provider in providers.items():
+        results['bytes'] = len(provider.response(payload).get_data())
+        results[name] = time_operation(lambda i: provider.response(payload).get_data(), max_ops, max_seconds)
+        print(f"  {name:<26} {_describe(results[name])}")
+    return results
+
+
+# ---------------------------------------------------------------------------
+# API load test
+# ---------------------------------------------------------------------------
+
+def api_request_mix(book_count, author_count):
+    """
+    Weighted request mix for the load test
+
+    Args:
+        book_count (int): Books in the catalogue
+        author_count (int): Authors in the catalogue
+
+    Returns:
+        list: (weight, name, method, path factory, json body factory or None)
+    """
+    return [
+        (30, 'GET /api/books/<id>', 'GET', lambda rng: f"/api/books/{rng.randint(1, book_count)}", None),
+        (20, 'GET /api/books/search', 'GET', lambda rng: f"/api/books/search?q={rng.choice(WORDS)}", None),
+        (15, 'GET /api/books', 'GET', lambda rng: "/api/books?limit=50", None),
+        (10, 'GET /api/authors/<id>', 'GET', lambda rng: f"/api/authors/{rng.randint(1, author_count)}", None),
+        (10, 'GET /api/authors/search', 'GET',
+         lambda rng: f"/api/authors/search?q={rng.choice(LAST_NAMES)}", None),
+        (5, 'GET /api/books/count', 'GET', lambda rng: "/api/books/count", None),
+        (5, 'GET /api/authors', 'GET', lambda rng: "/api/authors?limit=50", None),
+        (5, 'POST /api/books', 'POST', lambda rng: "/api/books",
+         lambda rng: {'title': 'Load Test Book', 'isbn': f"{BENCH_ISBN_PREFIX}{rng.getrandbits(64):x}",
+                      'year': 2001, 'author_id': rng.randint(1, author_count)}),
+    ]
+
+
+def run_load_test(app, mix, concurrency, duration=DEFAULT_LOAD_DURATION, seed=DEFAULT_SEED):
+    """
+    Drive the Flask app with concurrent test clients for a fixed duration
+
+    Every worker thread has its own test client and issues requests from the
+    weighted mix back to back. The requests run in this process, so the
+    numbers cover routing, adapters, the pool and SQLite but no HTTP server
+    or network.
+
+    Args:
+        app (flask.Flask): Application under test
+        mix (list): Request mix from api_request_mix()
+        concurrency (int): Number of worker threads
+        duration (float, optional): Seconds to run
+        seed (int, optional): Random seed
+
+    Returns:
+        dict: requests, errors, seconds, requests_per_sec, overall latency
+              summary and one summary per request name
+    """
+    weights = [entry[0] for entry in mix]
+    latencies = {entry[1]: [] for entry in mix}
+    errors = {}
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(concurrency + 1)
+    stop_at = [0.0]
+
+    def worker(number):
+        rng = random.Random(seed + 100 + number)
+        client = app.test_client()
+        local = {name: [] for name in latencies}
+        local_errors = {}
+        start_barrier.wait()
+        while time.perf_counter() < stop_at[0]:
+            _, name, method, path, body = rng.choices(mix, weights)[0]
+            kwargs = {'json': body(rng)} if body else {}
+            began = time.perf_counter()
+            response = client.open(path(rng), method=method, **kwargs)
+            local[name].append(time.perf_counter() - began)
+            if response.status_code >= 500:
+                local_errors[name] = local_errors.get(name, 0) + 1
+            response.close()
+        with lock:
+            for name, values in local.items():
+                latencies[name].extend(values)
+            for name, count in local_errors.items():
+                errors[name] = errors.get(name, 0) + count
+
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    with _quiet():
+        stop_at[0] = time.perf_counter() + duration
+        start_barrier.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - began
+
+    everything = [value for values in latencies.values() for value in values]
+    overall = summarize(everything, seconds)
+    return {
+        'concurrency': concurrency,
+        'requests': overall['ops'],
+        'errors': sum(errors.values()),
+        'seconds': round(seconds, 3),
+        'requests_per_sec': overall.get('ops_per_sec'),
+        'latency': overall,
+        'routes': {name: summarize(values, seconds) for name, values in latencies.items() if values},
+        'route_errors': errors,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Runs
+# ---------------------------------------------------------------------------
+
+def measure(db_path, concurrency=DEFAULT_CONCURRENCY, max_ops=DEFAULT_MAX_OPS,
+            max_seconds=DEFAULT_MAX_SECONDS, duration=DEFAULT_LOAD_DURATION, seed=DEFAULT_SEED):
+    """
+    Run the manager, JSON serialization and API load benchmarks against one catalogue
+
+    Imports the API with LIBRARY_DB_PATH pointing at db_path, so call this
+    once per process.
+
+    Args:
+        db_path (str): Catalogue database
+        concurrency (list, optional): Worker counts for the load test
+        max_ops (int, optional): Operations per manager benchmark
+        max_seconds (float, optional): Time budget per manager benchmark
+        duration (float, optional): Seconds per load-test level
+        seed (int, optional): Random seed
+
+    Returns:
+        dict: books, authors, managers, json and api results
+    """
+    from database import Database
+
+    db_path = os.path.abspath(db_path)
+    db = Database(db_path)
+    if not db.connect():
+        raise RuntimeError(f"Could not open {db_path}")
+    try:
+        book_count = db.get_connection().execute("SELECT COUNT(*) FROM Books").fetchone()[0]
+        author_count = db.get_connection().execute("SELECT COUNT(*) FROM Authors").fetchone()[0]
+        print(f"Catalogue: {book_count} books, {author_count} authors")
+        print("Manager benchmarks:")
+        managers = run_manager_benchmarks(db, max_ops, max_seconds, seed)
+        print("JSON serialization:")
+        serialization = run_json_benchmarks(db, DEFAULT_JSON_ROWS, max_ops, max_seconds)
+    finally:
+        db.close()
+
+    os.environ['LIBRARY_DB_PATH'] = db_path
+    from api.app import app, database
+
+    print("API load test:")
+    mix = api_request_mix(book_count, author_count)
+    api = []
+    try:
+        for workers in concurrency:
+            result = run_load_test(app, mix, workers, duration, seed)
+            api.append(result)
+            print(f"  concurrency {workers:<3} {result['requests_per_sec']} req/s, "
+                  f"p50 {result['latency']['p50_ms']} ms, p99 {result['latency']['p99_ms']} ms, "
+                  f"{result['errors']} errors")
+    finally:
+        conn = database.get_connection()
+        conn.execute("DELETE FROM Books WHERE isbn LIKE ?", (f"{BENCH_ISBN_PREFIX}%",))
+        conn.commit()
+
+    return {'books': book_count, 'authors': author_count, 'managers': managers,
+            'json': serialization, 'api': api}
+
+
+def environment_info():
+    """Python, SQLite, platform and git commit of this run"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'commit': commit,
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+
+def run_suite(sizes, data_dir, output, concurrency=DEFAULT_CONCURRENCY, max_ops=DEFAULT_MAX_OPS,
+              max_seconds=DEFAULT_MAX_SECONDS, duration=DEFAULT_LOAD_DURATION, seed=DEFAULT_SEED):
+    """
+    Benchmark every catalogue size and write the combined results
+
+    Args:
+        sizes (list): Book counts
+        data_dir (str): Directory holding the generated catalogues
+        output (str): Results JSON path
+        concurrency, max_ops, max_seconds, duration, seed: See measure()
+
+    Returns:
+        dict: Combined results (also written to output)
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    results = {'format': RESULTS_FORMAT, 'environment': environment_info(),
+               'settings': {'concurrency': concurrency, 'max_ops': max_ops, 'max_seconds': max_seconds,
+                            'load_duration': duration, 'seed': seed},
+               'sizes': {}}
+
+    for books in sizes:
+        path = catalogue_path(data_dir, books, seed)
+        print(f"\n=== {books} books ===")
+        if not os.path.exists(path):
+            print(f"Generating {path} ...")
+            print(f"  {generate_catalogue(path, books, seed)}")
+
+        # Measure in a fresh interpreter: the API module binds its database at import
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as handle:
+            size_output = handle.name
+        try:
+            command = [sys.executable, os.path.abspath(__file__), 'measure', '--db', path,
+                       '--output', size_output, '--max-ops', str(max_ops),
+                       '--max-seconds', str(max_seconds), '--duration', str(duration),
+                       '--seed', str(seed), '--concurrency', *map(str, concurrency)]
+            subprocess.run(command, check=True)
+            with open(size_output) as f:
+                results['sizes'][str(books)] = json.load(f)
+        finally:
+            os.unlink(size_output)
+
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Comparing runs
+# ---------------------------------------------------------------------------
+
+def _describe(summary):
+    """One-line description of a summary"""
+    if not summary.get('ops'):
+        return "no operations"
+    return (f"{summary['ops']:>5} ops  {summary['ops_per_sec']:>10} ops/s  "
+            f"p50 {summary['p50_ms']} ms  p99 {summary['p99_ms']} ms")
+
+
+def flatten_results(results):
+    """
+    Flatten a results file into {"<size> <benchmark>": p50_ms}
+
+    Args:
+        results (dict): Results written by run_suite()
+
+    Returns:
+        dict: Benchmark key -> median latency in milliseconds
+    """
+    flat = {}
+    for size, data in results.get('sizes', {}).items():
+        for name, summary in data.get('managers', {}).items():
+            if summary.get('ops'):
+                flat[f"{size} {name}"] = summary['p50_ms']
+        for name, summary in data.get('json', {}).items():
+            if isinstance(summary, dict) and summary.get('ops'):
+                flat[f"{size} {name}"] = summary['p50_ms']
+        for level in data.get('api', []):
+            for name, summary in level['routes'].items():
+                flat[f"{size} c{level['concurrency']} {name}"] = summary['p50_ms']
+    return flat
+
+
+def compare_results(baseline, current, threshold=0.2, min_delta_ms=0.05):
+    """
+    Compare median latencies of two runs
+
+    Args:
+        baseline (dict): Earlier results
+        current (dict): Newer results
+        threshold (float, optional): Relative slowdown counted as a regression
+        min_delta_ms (float, optional): Ignore slowdowns smaller than this
+            (sub-50µs operations are dominated by noise)
+
+    Returns:
+        list: (key, baseline_ms, current_ms, ratio, regressed) for every
+              benchmark present in both runs
+    """
+    old = flatten_results(baseline)
+    new = flatten_results(current)
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key] / old[key] if old[key] else float('inf')
+        regressed = ratio > 1 + threshold and new[key] - old[key] > min_delta_ms
+        rows.append((key, old[key], new[key], ratio, regressed))
+    return rows
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the managers and the API")
+    parser.add_argument('command', choices=['generate', 'run', 'measure', 'compare', 'json'])
+    parser.add_argument('files', nargs='*', help="compare: baseline and current results")
+    parser.add_argument('--db', help="generate/measure/json: database path")
+    parser.add_argument('--books', type=int, default=10000, help="generate: number of books")
+    parser.add_argument('--rows', type=int, default=DEFAULT_JSON_ROWS,
+                        help="json: books in the serialized response (default: 100k)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="run: catalogue sizes (default: 10k 100k 1M)")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'library-bench'),
+                        help="run: where generated catalogues are kept and reused")
+    parser.add_argument('--output', default='benchmark-results.json', help="run/measure: results file")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=DEFAULT_CONCURRENCY,
+                        help="Load-test worker counts (default: 1 4 16)")
+    parser.add_argument('--duration', type=float, default=DEFAULT_LOAD_DURATION,
+                        help="Seconds per load-test level")
+    parser.add_argument('--max-ops', type=int, default=DEFAULT_MAX_OPS,
+                        help="Operations per manager benchmark")
+    parser.add_argument('--max-seconds', type=float, default=DEFAULT_MAX_SECONDS,
+                        help="Time budget per manager benchmark")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Random seed")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="compare: relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        if not args.db:
+            parser.error("generate needs --db")
+        print(generate_catalogue(args.db, args.books, args.seed))
+        return 0
+
+    if args.command == 'measure':
+        if not args.db:
+            parser.error("measure needs --db")
+        result = measure(args.db, args.concurrency, args.max_ops, args.max_seconds, args.duration, args.seed)
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        return 0
+
+    if args.command == 'json':
+        if not args.db:
+            parser.error("json needs --db")
+        from database import Database
+        db = Database(os.path.abspath(args.db))
+        with _quiet():
+            if not db.connect():
+                raise RuntimeError(f"Could not open {args.db}")
+        try:
+            run_json_benchmarks(db, args.rows, args.max_ops, args.max_seconds)
+        finally:
+            db.close()
+        return 0
+
+    if args.command == 'run':
+        run_suite(args.sizes, args.data_dir, args.output, args.concurrency, args.max_ops,
+                  args.max_seconds, args.duration, args.seed)
+        return 0
+
+    if len(args.files) != 2:
+        parser.error("compare needs two results files")
+    with open(args.files[0]) as f:
+        baseline = json.load(f)
+    with open(args.files[1]) as f:
+        current = json.load(f)
+    rows = compare_results(baseline, current, args.threshold)
+    regressions = 0
+    for key, old, new, ratio, regressed in rows:
+        marker = '✗' if regressed else ' '
+        print(f"{marker} {key:<50} {old:>10.4f} ms -> {new:>10.4f} ms  ({ratio:.2f}x)")
+        regressions += regressed
+    print(f"\n{len(rows)} benchmarks compared, {regressions} regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Book facets for Library Management System
+Book counts per (genre, decade, author nationality) kept by triggers in the
+book_facets table, so facet sidebars are a GROUP BY over a few thousand
+aggregate rows instead of the whole catalogue
+
+Books without a genre, year or author nationality are counted under ''.
+Every insert, delete and facet change on Books moves one count; changing an
+author's nationality moves the counts of that author's books. Bulk loads
+swap the per-row insert trigger for one set-based upsert (deferred_facets),
+like the search index and the library_stats counters.
+"""
+
+import contextlib
+
+# Facets in the order of the book_facets key
+FACETS = ('genre', 'decade', 'nationality')
+
+# (genre, decade, nationality, books) of the whole catalogue
+FACET_ROWS = """
+    SELECT COALESCE(b.genre, ''), COALESCE(b.decade, ''), COALESCE(a.nationality, ''), COUNT(*)
+    FROM Books b
+    LEFT JOIN Authors a ON a.id = b.author_id
+    GROUP BY 1, 2, 3
+"""
+
+# The same for books with id > ? (rows added by a bulk load)
+NEW_FACET_ROWS = FACET_ROWS.replace("GROUP BY", "WHERE b.id > ?\n    GROUP BY")
+
+
+# Per-row insert trigger as migration 10 created it (see migrations.py);
+# bulk loads swap it for one grouped upsert and recreate it
+FACET_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS facets_books_insert AFTER INSERT ON Books
+    BEGIN
+        INSERT INTO book_facets (genre, decade, nationality, books) VALUES (COALESCE(NEW.genre, ''), COALESCE(NEW.decade, ''), COALESCE((SELECT nationality FROM Authors WHERE id = NEW.author_id), ''), 1) ON CONFLICT(genre, decade, nationality) DO UPDATE SET books = books + 1;
+    END
+"""
+
+
+def _where(filters, exclude=None):
+    """WHERE clause and parameters over book_facets for the given filters"""
+    clauses, params = [], []
+    for facet in FACETS:
+        value = filters.get(facet)
+        if value is not None and facet != exclude:
+            clauses.append(f"{facet} = ?")
+            params.append(value)
+    return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+
+def count_books(conn, filters=None):
+    """
+    Count the books matching facet filters from the aggregates
+
+    Args:
+        conn (sqlite3.Connection): Connection to read from
+        filters (dict, optional): Values for any of FACETS
+
+    Returns:
+        int: Number of matching books
+    """
+    where, params = _where(filters or {})
+    return conn.execute(f"SELECT COALESCE(SUM(books), 0) FROM book_facets{where}", params).fetchone()[0]
+
+
+def get_facet_counts(conn, filters=None):
+    """
+    Book counts per value of every facet
+
+    Each facet is counted with the filters on the other facets applied, so a
+    sidebar shows how many books each alternative value would give.
+
+    Args:
+        conn (sqlite3.Connection): Connection to read from
+        filters (dict, optional): Values for any of FACETS
+
+    Returns:
+        dict: Facet -> list of (value, count) with the largest counts first;
+            books without a value are counted under ''
+    """
+    filters = filters or {}
+    counts = {}
+    for facet in FACETS:
+        where, params = _where(filters, exclude=facet)
+        counts[facet] = conn.execute(f"""
+            SELECT {facet}, SUM(books) FROM book_facets{where}
+            GROUP BY {facet} HAVING SUM(books) > 0
+            ORDER BY 2 DESC, 1
+        """, params).fetchall()
+    return counts
+
+
+@contextlib.contextmanager
+def deferred_facets(conn):
+    """
+    Count books inserted inside the block with one grouped upsert instead of
+    the per-row trigger
+
+    Must be used inside an explicit transaction: the trigger is dropped and
+    recreated within it, so a rollback restores it untouched. Books are
+    counted by id, so the block may only insert books (no deletes).
+
+    Args:
+        conn (sqlite3.Connection): Connection with the open transaction
+    """
+    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM Books").fetchone()[0]
+    conn.execute("DROP TRIGGER IF EXISTS facets_books_insert")
+    yield
+    conn.execute("INSERT INTO book_facets (genre, decade, nationality, books) " + NEW_FACET_ROWS + """
+        ON CONFLICT(genre, decade, nationality) DO UPDATE SET books = books + excluded.books
+    """, (last_id,))
+    conn.execute(FACET_INSERT_TRIGGER)
+
+
+def find_facet_drift(conn):
+    """
+    Compare book_facets with a GROUP BY over the catalogue
+
+    Call inside a transaction so both are read from the same snapshot.
+
+    Args:
+        conn (sqlite3.Connection): Connection to read from
+
+    Returns:
+        tuple: (number of facet rows checked, list of {'name', 'stored',
+            'actual'} for rows that disagree, named 'book_facets:genre|decade|nationality')
+    """
+    stored = {row[:3]: row[3] for row in conn.execute("SELECT genre, decade, nationality, books FROM book_facets")}
+    actual = {row[:3]: row[3] for row in conn.execute(FACET_ROWS)}
+    drift = []
+    for key in sorted(set(stored) | set(actual), key=repr):
+        # Combinations whose books are all gone keep a zero row
+        if stored.get(key, 0) != actual.get(key, 0):
+            drift.append({'name': 'book_facets:' + '|'.join(str(value) for value in key),
+                          'stored': stored.get(key), 'actual': actual.get(key, 0)})
+    return len(actual), drift
+
+
+def rebuild_facets(conn):
+    """
+    Recount book_facets from the catalogue (caller holds the write transaction)
+
+    Args:
+        conn (sqlite3.Connection): Connection with the open transaction
+    """
+    conn.execute("DELETE FROM book_facets")
+    conn.execute("INSERT INTO book_facets (genre, decade, nationality, books) " + FACET_ROWS)
@@ -1,10 +1,12 @@
 """
 Book Manager module for Library Management System
-Handles CRUD operations for books
+Handles CRUD operations for books with console output
 """
 
 import sqlite3
 from database import Database
+from book_repository import BookRepository
+from search_index import DEFAULT_SEARCH_LIMIT
 
 
 class BookManager:
@@ -20,6 +22,28 @@ class BookManager:
         self.db = database
         self.conn = database.get_connection()
         self.cursor = database.get_cursor()
+        self.repository = BookRepository(database)
+
+    def _print_books_table(self, books):
+        """Print book records as a formatted table"""
+        print("=" * 117)
+        print(f"{'ID':<5} {'Title':<30} {'Author':<25} {'ISBN':<15} {'Year':<6} {'Genre':<15} {'Copies':<7} {'Avail':<6}")
+        print("=" * 117)
+
+        for book in books:
+            book_id, title, isbn, year, genre, copies, author_id, author_name, available = book
+            year_str = str(year) if year else "N/A"
+            genre_str = genre if genre else "N/A"
+            author_str = author_name if author_name else "N/A"
+
+            # Truncate long titles and author names to fit columns
+            title_display = title[:28] + ".." if len(title) > 30 else title
+            author_display = author_str[:23] + ".." if len(author_str) > 25 else author_str
+
+            available_str = str(available) if available is not None else "N/A"
+            print(f"{book_id:<5} {title_display:<30} {author_display:<25} {isbn:<15} {year_str:<6} {genre_str:<15} {copies:<7} {available_str:<6}")
+
+        print("=" * 117)
 
     def add_book(self, title, isbn, year=None, genre=None, copies=1, author_id=None):
         """
@@ -37,16 +61,7 @@ class BookManager:
             int: ID of the newly created book, or None if failed
         """
         try:
-            # SQL INSERT statement with parameters to prevent SQL injection
-            query = """
-                INSERT INTO Books (title, isbn, year, genre, copies, author_id)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
-
-            self.cursor.execute(query, (title, isbn, year, genre, copies, author_id))
-            self.conn.commit()
-
-            book_id = self.cursor.lastrowid
+            book_id = self.repository.add_book(title, isbn, year, genre, copies, author_id)
             print(f"✓ Book added successfully! (ID: {book_id})")
             print(f"  Title: {title}")
             print(f"  ISBN: {isbn}")
@@ -70,78 +85,123 @@ class BookManager:
             print(f"✗ Error adding book: {e}")
             return None
 
+    def bulk_add_books(self, records, batch_size=1000, author_ids=None):
+        """
+        Insert many books in batched transactions and print a summary
+
+        See BookRepository.bulk_add_books for the record format.
+
+        Args:
+            records (iterable): Book dicts
+            batch_size (int, optional): Rows per transaction (default: 1000)
+            author_ids (dict, optional): Author name -> ID map
+
+        Returns:
+            dict: Report with inserted count, conflicts and errors
+        """
+        report = self.repository.bulk_add_books(records, batch_size, author_ids)
+        print(f"✓ Bulk import finished: {report['inserted']} books added, "
+              f"{len(report['conflicts'])} ISBN conflicts, {len(report['errors'])} errors")
+        return report
+
     def view_all_books(self):
         """
         Display all books in a formatted table with author names
 
         Returns:
-            list: List of book tuples, or empty list if none found
+            list: List of book records, or empty list if none found
         """
         try:
-            query = """
-                SELECT b.id, b.title, b.isbn, b.year, b.genre, b.copies, b.author_id, a.name AS author_name
-                FROM Books b
-                LEFT JOIN Authors a ON b.author_id = a.id
-                ORDER BY b.title
-            """
-            self.cursor.execute(query)
-            books = self.cursor.fetchall()
+            books = self.repository.get_all_books()
 
             if not books:
                 print("\n📚 No books found in the database.")
                 return []
 
-            # Print formatted table header
-            print("\n" + "=" * 110)
-            print(f"{'ID':<5} {'Title':<30} {'Author':<25} {'ISBN':<15} {'Year':<6} {'Genre':<15} {'Copies':<7}")
-            print("=" * 110)
+            print()
+            self._print_books_table(books)
+            print(f"Total books: {len(books)}\n")
 
-            # Print each book row
-            for book in books:
-                book_id, title, isbn, year, genre, copies, author_id, author_name = book
-                year_str = str(year) if year else "N/A"
-                genre_str = genre if genre else "N/A"
-                author_str = author_name if author_name else "N/A"
+            return books
 
-                # Truncate long titles and author names to fit columns
-                title_display = title[:28] + ".." if len(title) > 30 else title
-                author_display = author_str[:23] + ".." if len(author_str) > 25 else author_str
+        except sqlite3.Error as e:
+            print(f"✗ Error retrieving books: {e}")
+            return []
 
-                print(f"{book_id:<5} {title_display:<30} {author_display:<25} {isbn:<15} {year_str:<6} {genre_str:<15} {copies:<7}")
+    def view_books_page(self, limit=20, after=None, filters=None):
+        """
+        Display one page of books ordered by (title, id)
 
-            print("=" * 110)
-            print(f"Total books: {len(books)}\n")
+        Only the page is fetched (plus one row to learn whether another page
+        follows), so the first page of a large catalogue shows up at once.
 
-            return books
+        Args:
+            limit (int, optional): Books per page
+            after (tuple, optional): (title, id) of the last book on the
+                previous page; None starts from the beginning
+            filters (dict, optional): genre, decade and/or nationality to match
 
+        Returns:
+            tuple: (list of book records, (title, id) to pass as `after` for the
+                   next page, or None on the last page)
+        """
+        try:
+            books = self.repository.list_books(limit + 1, after, filters)
         except sqlite3.Error as e:
             print(f"✗ Error retrieving books: {e}")
-            return []
+            return [], None
+
+        next_after = (books[limit - 1][1], books[limit - 1][0]) if len(books) > limit else None
+        books = books[:limit]
+        if not books:
+            print("\n📚 No books found.")
+            return [], None
+
+        print()
+        self._print_books_table(books)
+        return books, next_after
+
+    def list_books(self, limit=100, after=None, filters=None):
+        """
+        Fetch one page of books ordered by (title, id) using keyset pagination
+
+        Args:
+            limit (int, optional): Maximum number of books to return
+            after (tuple, optional): (title, id) of the last book on the
+                previous page; None starts from the beginning
+            filters (dict, optional): genre, decade and/or nationality to match
+
+        Returns:
+            list: Book records (id, title, isbn, year, genre, copies, author_id, author_name,
+                  available_copies)
+        """
+        return self.repository.list_books(limit, after, filters)
+
+    def iter_book_batches(self, batch_size=1000):
+        """
+        Iterate over every book in id order without loading the whole table
 
-    def search_book(self, search_term):
+        Args:
+            batch_size (int, optional): Rows fetched from SQLite per batch
+
+        Yields:
+            list: Up to batch_size book records
+        """
+        return self.repository.iter_book_batches(batch_size)
+
+    def search_book(self, search_term, limit=DEFAULT_SEARCH_LIMIT):
         """
         Search for books by title, ISBN, genre, or author name
 
         Args:
             search_term (str): Term to search for
+            limit (int, optional): Maximum number of results (default: 50)
 
         Returns:
-            list: List of matching book tuples
+            list: List of matching book records, best match first
         """
         try:
-            # Using LIKE operator for pattern matching across multiple fields
-            query = """
-                SELECT b.id, b.title, b.isbn, b.year, b.genre, b.copies, b.author_id, a.name AS author_name
-                FROM Books b
-                LEFT JOIN Authors a ON b.author_id = a.id
-                WHERE b.title LIKE ? OR b.isbn LIKE ? OR b.genre LIKE ? OR a.name LIKE ?
-                ORDER BY b.title
-            """
-
-            # Add wildcards for partial matching
-            search_pattern = f"%{search_term}%"
-            self.cursor.execute(query, (search_pattern, search_pattern, search_pattern, search_pattern))
-            books = self.cursor.fetchall()
+            books = self.repository.search_books(search_term, limit)
 
             if not books:
                 print(f"\n📚 No books found matching '{search_term}'")
@@ -149,23 +209,7 @@ class BookManager:
 
             # Print formatted results
             print(f"\n🔍 Search results for '{search_term}':")
-            print("=" * 110)
-            print(f"{'ID':<5} {'Title':<30} {'Author':<25} {'ISBN':<15} {'Year':<6} {'Genre':<15} {'Copies':<7}")
-            print("=" * 110)
-
-            for book in books:
-                book_id, title, isbn, year, genre, copies, author_id, author_name = book
-                year_str = str(year) if year else "N/A"
-                genre_str = genre if genre else "N/A"
-                author_str = author_name if author_name else "N/A"
-
-                # Truncate long titles and author names to fit columns
-                title_display = title[:28] + ".." if len(title) > 30 else title
-                author_display = author_str[:23] + ".." if len(author_str) > 25 else author_str
-
-                print(f"{book_id:<5} {title_display:<30} {author_display:<25} {isbn:<15} {year_str:<6} {genre_str:<15} {copies:<7}")
-
-            print("=" * 110)
+            self._print_books_table(books)
             print(f"Found {len(books)} book(s)\n")
 
             return books
@@ -182,25 +226,17 @@ class BookManager:
             book_id (int): The ID of the book to retrieve
 
         Returns:
-            tuple: Book data or None if not found
+            Book: Book record or None if not found
         """
         try:
-            query = """
-                SELECT b.id, b.title, b.isbn, b.year, b.genre, b.copies, b.author_id, a.name AS author_name
-                FROM Books b
-                LEFT JOIN Authors a ON b.author_id = a.id
-                WHERE b.id = ?
-            """
-
-            self.cursor.execute(query, (book_id,))
-            book = self.cursor.fetchone()
+            book = self.repository.get_book_by_id(book_id)
 
             if not book:
                 print(f"\n✗ No book found with ID: {book_id}")
                 return None
 
             # Display book details
-            book_id, title, isbn, year, genre, copies, author_id, author_name = book
+            book_id, title, isbn, year, genre, copies, author_id, author_name, available = book
             print(f"\n📖 Book Details (ID: {book_id})")
             print("=" * 50)
             print(f"Title:      {title}")
@@ -208,6 +244,7 @@ class BookManager:
             print(f"Year:       {year if year else 'N/A'}")
             print(f"Genre:      {genre if genre else 'N/A'}")
             print(f"Copies:     {copies}")
+            print(f"Available:  {available if available is not None else 'N/A'}")
             if author_name:
                 print(f"Author:     {author_name} (ID: {author_id})")
             else:
@@ -241,39 +278,10 @@ class BookManager:
             if not self.get_book_by_id(book_id):
                 return False
 
-            # Build dynamic UPDATE query based on provided fields
-            updates = []
-            params = []
-
-            if title is not None:
-                updates.append("title = ?")
-                params.append(title)
-            if isbn is not None:
-                updates.append("isbn = ?")
-                params.append(isbn)
-            if year is not None:
-                updates.append("year = ?")
-                params.append(year)
-            if genre is not None:
-                updates.append("genre = ?")
-                params.append(genre)
-            if copies is not None:
-                updates.append("copies = ?")
-                params.append(copies)
-            if author_id is not None:
-                updates.append("author_id = ?")
-                params.append(author_id)
-
-            if not updates:
+            if not self.repository.update_book(book_id, title, isbn, year, genre, copies, author_id):
                 print("✗ No fields to update")
                 return False
 
-            query = f"UPDATE Books SET {', '.join(updates)} WHERE id = ?"
-            params.append(book_id)
-
-            self.cursor.execute(query, params)
-            self.conn.commit()
-
             print(f"✓ Book {book_id} updated successfully!")
             return True
 
@@ -302,9 +310,7 @@ class BookManager:
             if not self.get_book_by_id(book_id):
                 return False
 
-            query = "DELETE FROM Books WHERE id = ?"
-            self.cursor.execute(query, (book_id,))
-            self.conn.commit()
+            self.repository.delete_book(book_id)
 
             print(f"✓ Book {book_id} deleted successfully!")
             return True
@@ -316,22 +322,38 @@ class BookManager:
             print(f"✗ Error deleting book: {e}")
             return False
 
-    def get_book_count(self):
+    def get_book_count(self, filters=None):
         """
         Get the total number of books
 
+        Args:
+            filters (dict, optional): Only count books matching these genre,
+                decade and/or nationality values
+
         Returns:
             int: Number of books in the database
         """
         try:
-            query = "SELECT COUNT(*) FROM Books"
-            self.cursor.execute(query)
-            count = self.cursor.fetchone()[0]
-            return count
+            return self.repository.get_book_count(filters)
         except sqlite3.Error as e:
             print(f"✗ Error counting books: {e}")
             return 0
 
+    def rebuild_search_index(self):
+        """
+        Repopulate the book and author search index from the catalog
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            self.repository.search_index.rebuild()
+            print("✓ Search index rebuilt")
+            return True
+        except sqlite3.Error as e:
+            print(f"✗ Error rebuilding search index: {e}")
+            return False
+
 
 # Test the BookManager class
 if __name__ == "__main__":
@@ -0,0 +1,612 @@
+"""
+Book Repository module for Library Management System
+Silent data-access layer for books: runs SQL and returns rows, never prints
+"""
+
+import sqlite3
+from search_index import SearchIndex, DEFAULT_SEARCH_LIMIT
+from change_versions import bump_version, get_version
+from library_stats import deferred_counters, get_row_count, get_counter, get_group_counts
+from book_facets import count_books, get_facet_counts, deferred_facets
+from records import Book
+from batch_writes import (BatchItemError, prepare_items, check_fields, item_id,
+                          run_batch, fetch_rows_by_ids)
+
+
+# Column list shared by every query that returns full book rows:
+# (id, title, isbn, year, genre, copies, author_id, author_name, available_copies)
+BOOK_SELECT = """
+    SELECT b.id, b.title, b.isbn, b.year, b.genre, b.copies, b.author_id, a.name AS author_name,
+           b.available_copies
+    FROM Books b
+    LEFT JOIN Authors a ON b.author_id = a.id
+"""
+
+# Writable book columns and the ones that must hold integers
+BOOK_FIELDS = ('title', 'isbn', 'year', 'genre', 'copies', 'author_id')
+BOOK_INTEGER_FIELDS = {'year', 'copies', 'author_id'}
+
+# Error raised by the books_copies_check trigger (migration 4) when an update
+# would leave fewer copies than are out on loan
+COPIES_ON_LOAN_ERROR = 'copies cannot be fewer than the copies on loan'
+
+
+def _check_book_fields(item):
+    """Validate the book columns of an item and return {column: value}"""
+    values = check_fields(item, BOOK_FIELDS, BOOK_INTEGER_FIELDS)
+    if values['copies'] is not None and values['copies'] < 0:
+        raise BatchItemError("Copies cannot be negative")
+    return values
+
+
+def _book_insert_params(item):
+    """Validate a batch create item and return its INSERT parameters"""
+    values = _check_book_fields(item)
+    if not values['title'] or not values['isbn']:
+        raise BatchItemError("Title and ISBN are required")
+    if values['copies'] is None:
+        values['copies'] = 1
+    return tuple(values[field] for field in BOOK_FIELDS)
+
+
+def _book_update_params(item):
+    """Validate a batch update item and return (book_id, {column: value})"""
+    book_id = item_id(item, 'Book')
+    values = _check_book_fields(item)
+    updates = {column: value for column, value in values.items() if value is not None}
+    if not updates:
+        raise BatchItemError("No fields to update")
+    return book_id, updates
+
+
+class BookRepository:
+    """
+    Data access for books
+
+    Every method uses its own cursor, returns records (records.py) or plain values and lets
+    sqlite3 errors propagate to the caller. Console output lives in
+    BookManager; the API adapters call this class directly.
+    """
+
+    def __init__(self, database):
+        """
+        Initialize BookRepository with database connection
+
+        Args:
+            database (Database): Database instance
+        """
+        self.db = database
+        self.conn = database.get_connection()
+        self.search_index = SearchIndex(database)
+        self.cache = database.get_record_cache()
+
+    def _fetchall(self, query, params=(), row_factory=None):
+        """Run a query on a fresh cursor and return all rows (built by row_factory if given)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = row_factory
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _fetchone(self, query, params=(), row_factory=None):
+        """Run a query on a fresh cursor and return the first row (built by row_factory if given)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = row_factory
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    def _write(self, query, params=()):
+        """Run a write statement, bump the Books version, commit and return rowcount/lastrowid"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, params)
+            rowcount, lastrowid = cursor.rowcount, cursor.lastrowid
+            if rowcount > 0:
+                bump_version(cursor, 'Books')
+            self.conn.commit()
+            return rowcount, lastrowid
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def get_change_version(self):
+        """
+        Read the version of book responses: the Books change version (bumped
+        by every book and author name/nationality write) combined with the
+        Loans one (bumped by checkouts and returns, which move available_copies)
+
+        Returns:
+            tuple: (version, changed_at epoch seconds)
+        """
+        return get_version(self.conn, 'Books', 'Loans')
+
+    def get_all_books(self):
+        """
+        Fetch every book ordered by title
+
+        Returns:
+            list: Book records
+        """
+        return self._fetchall(BOOK_SELECT + " ORDER BY b.title", row_factory=Book.from_row)
+
+    def list_books(self, limit=100, after=None, filters=None):
+        """
+        Fetch one page of books ordered by (title, id) using keyset pagination
+
+        Genre and decade filters walk idx_books_genre_title_id or
+        idx_books_decade_title_id in page order. See _nationality_clause for
+        how the nationality filter is served.
+
+        Args:
+            limit (int, optional): Maximum number of books to return
+            after (tuple, optional): (title, id) of the last book on the
+                previous page; None starts from the beginning
+            filters (dict, optional): Values for any of book_facets.FACETS
+                (genre, decade, nationality)
+
+        Returns:
+            list: Book records
+        """
+        filters = {facet: value for facet, value in (filters or {}).items() if value is not None}
+        clauses, params = [], []
+        for facet in ('genre', 'decade'):
+            if facet in filters:
+                clauses.append(f"b.{facet} = ?")
+                params.append(filters[facet])
+        if 'nationality' in filters:
+            clauses.append(self._nationality_clause(filters, limit))
+            params.append(filters['nationality'])
+        if after is not None:
+            clauses.append("(b.title, b.id) > (?, ?)")
+            params.extend(after)
+
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return self._fetchall(BOOK_SELECT + where + " ORDER BY b.title, b.id LIMIT ?", (*params, limit),
+                              row_factory=Book.from_row)
+
+    def _nationality_clause(self, filters, limit):
+        """
+        Pick how to apply a nationality filter, using the facet counts
+
+        Nationality lives on Authors, so no Books index holds it in page
+        order. There are two ways to serve the filter. One fetches the
+        nationality's books through idx_books_author_id and sorts them, at a
+        cost of about `by_nationality` rows. The other walks the title (or
+        genre/decade) index and skips books by other authors, at a cost of
+        about limit * walked / matching rows. Pick the cheaper one; the unary
+        + keeps SQLite off idx_books_author_id.
+
+        Args:
+            filters (dict): Active filters, including 'nationality'
+            limit (int): Page size
+
+        Returns:
+            str: WHERE clause with one parameter (the nationality)
+        """
+        matching = count_books(self.conn, filters)
+        walked = count_books(self.conn, {facet: value for facet, value in filters.items()
+                                         if facet != 'nationality'})
+        by_nationality = count_books(self.conn, {'nationality': filters['nationality']})
+        column = "b.author_id" if by_nationality * max(matching, 1) <= limit * walked else "+b.author_id"
+        return f"{column} IN (SELECT id FROM Authors WHERE nationality = ?)"
+
+    def iter_book_batches(self, batch_size=1000):
+        """
+        Iterate over every book in id order without loading the whole table
+
+        Args:
+            batch_size (int, optional): Rows fetched from SQLite per batch
+
+        Yields:
+            list: Up to batch_size book records
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = Book.from_row
+        try:
+            cursor.execute(BOOK_SELECT + " ORDER BY b.id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+    def search_books(self, search_term, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Search books by title, ISBN, genre or author name
+
+        Uses the full-text index (ranked, prefix matching) when available and
+        falls back to LIKE pattern matching otherwise.
+
+        Args:
+            search_term (str): Term to search for
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: Matching book records, best match first
+        """
+        if self.search_index.is_available():
+            return self.search_index.search_books(search_term, limit)
+
+        search_pattern = f"%{search_term}%"
+        return self._fetchall(
+            BOOK_SELECT + """
+            WHERE b.title LIKE ? OR b.isbn LIKE ? OR b.genre LIKE ? OR a.name LIKE ?
+            ORDER BY b.title
+            LIMIT ?
+            """,
+            (search_pattern, search_pattern, search_pattern, search_pattern, limit),
+            row_factory=Book.from_row,
+        )
+
+    def get_book_by_id(self, book_id):
+        """
+        Fetch a single book, from the record cache when it is there
+
+        Args:
+            book_id (int): The ID of the book
+
+        Returns:
+            Book: Book record or None if not found
+        """
+        return self.cache.get_or_load(
+            ('book', book_id),
+            lambda: self._fetchone(BOOK_SELECT + " WHERE b.id = ?", (book_id,), row_factory=Book.from_row),
+        )
+
+    def add_book(self, title, isbn, year=None, genre=None, copies=1, author_id=None):
+        """
+        Insert a book
+
+        Args:
+            title (str): Book title
+            isbn (str): ISBN (unique identifier)
+            year (int, optional): Publication year
+            genre (str, optional): Book genre
+            copies (int, optional): Number of copies (default: 1)
+            author_id (int, optional): ID of the author
+
+        Returns:
+            int: ID of the new book
+
+        Raises:
+            sqlite3.IntegrityError: On a duplicate ISBN or unknown author
+        """
+        _, book_id = self._write("""
+            INSERT INTO Books (title, isbn, year, genre, copies, author_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (title, isbn, year, genre, copies, author_id))
+        return book_id
+
+    def update_book(self, book_id, title=None, isbn=None, year=None, genre=None, copies=None, author_id=None):
+        """
+        Update the given (non-None) fields of a book
+
+        Args:
+            book_id (int): ID of the book to update
+            title, isbn, year, genre, copies, author_id (optional): New values
+
+        Returns:
+            bool: True if a book was updated, False if it doesn't exist or no
+                  fields were given
+
+        Raises:
+            sqlite3.IntegrityError: On a duplicate ISBN or unknown author
+        """
+        fields = {'title': title, 'isbn': isbn, 'year': year, 'genre': genre,
+                  'copies': copies, 'author_id': author_id}
+        updates = {column: value for column, value in fields.items() if value is not None}
+        if not updates:
+            return False
+
+        query = f"UPDATE Books SET {', '.join(f'{column} = ?' for column in updates)} WHERE id = ?"
+        rowcount, _ = self._write(query, [*updates.values(), book_id])
+        self.cache.invalidate(('book', book_id))
+        return rowcount > 0
+
+    def delete_book(self, book_id):
+        """
+        Delete a book
+
+        Args:
+            book_id (int): ID of the book to delete
+
+        Returns:
+            bool: True if a book was deleted, False if it doesn't exist
+
+        Raises:
+            sqlite3.IntegrityError: If loans reference the book
+        """
+        rowcount, _ = self._write("DELETE FROM Books WHERE id = ?", (book_id,))
+        self.cache.invalidate(('book', book_id))
+        return rowcount > 0
+
+    def add_books(self, items, atomic=True):
+        """
+        Insert many books in one transaction
+
+        Args:
+            items (list): Dicts with title, isbn and optional year, genre,
+                copies, author_id
+            atomic (bool, optional): Insert all or nothing (default), or insert
+                the valid items and report the rest
+
+        Returns:
+            tuple: (results, committed); each result is {'index', 'status',
+                   'id'} plus 'row' (the book record) for created books or
+                   'error' for rejected items
+        """
+        def insert(cursor, params):
+            cursor.execute("""
+                INSERT INTO Books (title, isbn, year, genre, copies, author_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+                RETURNING id
+            """, params)
+            return 'created', cursor.fetchone()[0]
+
+        prepared = prepare_items(items, _book_insert_params)
+        results, committed = run_batch(self.conn, prepared, insert, atomic, ('Books',))
+        return self._attach_rows(results), committed
+
+    def update_books(self, items, atomic=True):
+        """
+        Update many books in one transaction
+
+        Args:
+            items (list): Dicts with the book id plus the fields to change
+            atomic (bool, optional): Update all or nothing (default), or update
+                the valid items and report the rest
+
+        Returns:
+            tuple: (results, committed) as for add_books, with 'updated' rows;
+                   an item lowering copies below the copies on loan gets
+                   status 'conflict'
+        """
+        def update(cursor, value):
+            book_id, updates = value
+            try:
+                cursor.execute(
+                    f"UPDATE Books SET {', '.join(f'{column} = ?' for column in updates)} WHERE id = ?",
+                    [*updates.values(), book_id],
+                )
+            except sqlite3.IntegrityError as e:
+                if COPIES_ON_LOAN_ERROR in str(e):
+                    raise BatchItemError(f"Book {book_id} has more copies on loan than the new copies count",
+                                         'conflict')
+                raise
+            if cursor.rowcount == 0:
+                raise BatchItemError(f"Book {book_id} not found", 'not_found')
+            return 'updated', book_id
+
+        prepared = prepare_items(items, _book_update_params)
+        results, committed = run_batch(self.conn, prepared, update, atomic, ('Books',))
+        if committed:
+            self.cache.invalidate(*(('book', result['id']) for result in results if result['id']))
+        return self._attach_rows(results), committed
+
+    def delete_books(self, items, atomic=True):
+        """
+        Delete many books in one transaction
+
+        Args:
+            items (list): Book ids, or dicts with an id
+            atomic (bool, optional): Delete all or nothing (default), or delete
+                what can be deleted and report the rest
+
+        Returns:
+            tuple: (results, committed) as for add_books, with 'deleted' items
+        """
+        def delete(cursor, book_id):
+            cursor.execute("DELETE FROM Books WHERE id = ?", (book_id,))
+            if cursor.rowcount == 0:
+                raise BatchItemError(f"Book {book_id} not found", 'not_found')
+            return 'deleted', book_id
+
+        prepared = prepare_items(items, lambda item: item_id(item, 'Book'))
+        results, committed = run_batch(self.conn, prepared, delete, atomic, ('Books',))
+        if committed:
+            self.cache.invalidate(*(('book', result['id']) for result in results if result['id']))
+        return results, committed
+
+    def _attach_rows(self, results):
+        """Add the written book rows to batch results with one IN (...) query per chunk"""
+        ids = [result['id'] for result in results if result['status'] in ('created', 'updated')]
+        rows = fetch_rows_by_ids(self.conn, BOOK_SELECT, 'b.id', ids, Book.from_row)
+        for result in results:
+            if result['id'] in rows:
+                result['row'] = rows[result['id']]
+        return results
+
+    def get_book_count(self, filters=None):
+        """
+        Count all books (trigger-maintained counter, no table scan)
+
+        Args:
+            filters (dict, optional): Only count books matching these facet
+                values (genre, decade, nationality), from book_facets
+
+        Returns:
+            int: Number of books
+        """
+        if filters:
+            return count_books(self.conn, filters)
+        return get_row_count(self.conn, 'Books')
+
+    def get_copy_count(self):
+        """
+        Count all copies of all books (trigger-maintained counter)
+
+        Returns:
+            int: Sum of the copies column
+        """
+        return get_counter(self.conn, 'copies:Books')
+
+    def get_facets(self, filters=None):
+        """
+        Count matching books and the books per genre, decade and author
+        nationality, from the book_facets aggregate (no catalogue scan)
+
+        Args:
+            filters (dict, optional): Values for any of book_facets.FACETS
+
+        Returns:
+            tuple: (number of books matching every filter, dict facet -> list of
+                (value, count); each facet is counted under the other filters)
+        """
+        return count_books(self.conn, filters), get_facet_counts(self.conn, filters)
+
+    def get_genre_counts(self):
+        """
+        Count books per genre (trigger-maintained counters)
+
+        Returns:
+            dict: Genre -> number of books; books without a genre under ''
+        """
+        return get_group_counts(self.conn, 'genre')
+
+    def bulk_add_books(self, records, batch_size=1000, author_ids=None):
+        """
+        Insert many books using executemany in batched transactions
+
+        Rows whose ISBN already exists (in the database or earlier in the
+        input), that lack a title/ISBN or that have a non-integer year,
+        copies or author_id (or negative copies) are reported and skipped;
+        the rest of their batch is still inserted.
+
+        Args:
+            records (iterable): Dicts with title, isbn and optional year, genre,
+                copies and author_id or author (author name)
+            batch_size (int, optional): Rows per transaction (default: 1000)
+            author_ids (dict, optional): Author name -> ID map used to resolve
+                the "author" field
+
+        Returns:
+            dict: {'inserted': int, 'conflicts': [...], 'errors': [...]} where
+                  each problem is {'row': n, 'isbn': ..., 'error': ...}
+        """
+        report = {'inserted': 0, 'conflicts': [], 'errors': []}
+        author_ids = author_ids or {}
+        seen_isbns = set()
+        batch = []
+
+        for row_number, record in enumerate(records, start=1):
+            title = record.get('title')
+            isbn = record.get('isbn')
+            if not title or not isbn:
+                report['errors'].append({'row': row_number, 'isbn': isbn,
+                                         'error': 'Title and ISBN are required'})
+                continue
+            if isbn in seen_isbns:
+                report['conflicts'].append({'row': row_number, 'isbn': isbn,
+                                            'error': 'Duplicate ISBN in input'})
+                continue
+            seen_isbns.add(isbn)
+
+            try:
+                values = _check_book_fields(record)
+            except BatchItemError as e:
+                report['errors'].append({'row': row_number, 'isbn': isbn, 'error': str(e)})
+                continue
+
+            author_id = values['author_id']
+            author_name = record.get('author')
+            if author_id is None and author_name:
+                author_id = author_ids.get(author_name)
+                if author_id is None:
+                    report['errors'].append({'row': row_number, 'isbn': isbn,
+                                             'error': f"Unknown author '{author_name}'"})
+                    continue
+
+            copies = values['copies']
+            batch.append((row_number, (title, isbn, values['year'], values['genre'],
+                                       1 if copies is None else copies, author_id)))
+            if len(batch) >= batch_size:
+                self._insert_book_batch(batch, report)
+                batch = []
+
+        if batch:
+            self._insert_book_batch(batch, report)
+
+        return report
+
+    def _insert_book_batch(self, batch, report):
+        """
+        Insert one batch of (row_number, params) pairs in a single transaction
+
+        Args:
+            batch (list): (row_number, (title, isbn, year, genre, copies, author_id))
+            report (dict): Report updated in place
+        """
+        query = """
+            INSERT INTO Books (title, isbn, year, genre, copies, author_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """
+        cursor = self.conn.cursor()
+        rows = batch
+        problems = {'conflicts': [], 'errors': []}
+        inserted = 0
+        try:
+            # Drop rows whose ISBN is already in the database
+            existing = set()
+            isbns = [params[1] for _, params in batch]
+            for start in range(0, len(isbns), 500):
+                chunk = isbns[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(f"SELECT isbn FROM Books WHERE isbn IN ({placeholders})", chunk)
+                existing.update(row[0] for row in cursor.fetchall())
+
+            rows = []
+            for row_number, params in batch:
+                if params[1] in existing:
+                    report['conflicts'].append({'row': row_number, 'isbn': params[1],
+                                                'error': 'ISBN already exists'})
+                else:
+                    rows.append((row_number, params))
+
+            cursor.execute("BEGIN IMMEDIATE")
+            with (self.search_index.deferred_book_indexing(), deferred_counters(self.conn, 'Books'),
+                  deferred_facets(self.conn)):
+                cursor.execute("SAVEPOINT bulk_batch")
+                try:
+                    cursor.executemany(query, [params for _, params in rows])
+                    cursor.execute("RELEASE bulk_batch")
+                    inserted = len(rows)
+                except sqlite3.IntegrityError:
+                    # Something slipped past the pre-check (e.g. a bad author_id);
+                    # retry row by row so only the offending rows are rejected
+                    cursor.execute("ROLLBACK TO bulk_batch")
+                    cursor.execute("RELEASE bulk_batch")
+
+                    for row_number, params in rows:
+                        cursor.execute("SAVEPOINT bulk_row")
+                        try:
+                            cursor.execute(query, params)
+                            cursor.execute("RELEASE bulk_row")
+                            inserted += 1
+                        except sqlite3.IntegrityError as e:
+                            cursor.execute("ROLLBACK TO bulk_row")
+                            cursor.execute("RELEASE bulk_row")
+                            problem = 'conflicts' if 'isbn' in str(e).lower() else 'errors'
+                            problems[problem].append({'row': row_number, 'isbn': params[1], 'error': str(e)})
+            if inserted:
+                bump_version(cursor, 'Books')
+            self.conn.commit()
+
+            report['inserted'] += inserted
+            report['conflicts'].extend(problems['conflicts'])
+            report['errors'].extend(problems['errors'])
+
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            for row_number, params in rows:
+                report['errors'].append({'row': row_number, 'isbn': params[1], 'error': str(e)})
+        finally:
+            cursor.close()
@@ -0,0 +1,105 @@
+"""
+Change versions for Library Management System
+Per-table version counters bumped inside every repository write transaction
+
+The API derives ETags and Last-Modified headers from them, so a client
+polling an unchanged collection costs one primary-key lookup instead of the
+collection query. Writes that bypass the repositories (raw SQL, the sqlite3
+shell) don't bump the version; clients may then see stale data until the
+next tracked write.
+
+Record caches follow the row_changes feed instead (sync_record_cache): it is
+filled by triggers, so every changed book or author row is dropped from
+every process's cache, whoever wrote it, without a version check per hit.
+"""
+
+# SQL expression for the current time as Unix epoch seconds (with fractions)
+EPOCH_NOW = "((julianday('now') - 2440587.5) * 86400.0)"
+
+BUMP_VERSION = f"""
+    UPDATE change_versions
+    SET version = version + 1, changed_at = {EPOCH_NOW}
+    WHERE table_name = ?
+"""
+
+
+def bump_version(cursor, *tables):
+    """
+    Record that tables changed, inside the caller's open transaction
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor of the writing connection (its
+            rowcount/lastrowid are overwritten)
+        *tables (str): Table names, e.g. 'Books'
+    """
+    for table in tables:
+        cursor.execute(BUMP_VERSION, (table,))
+
+
+def get_version(conn, *tables):
+    """
+    Read the combined change version of one or more tables
+
+    Args:
+        conn (sqlite3.Connection): Connection to read from
+        *tables (str): Table names, e.g. 'Books', 'Loans'
+
+    Returns:
+        tuple: (sum of the versions, latest changed_at epoch seconds) or None
+            if none of the tables is tracked
+    """
+    if len(tables) == 1:
+        return conn.execute(
+            "SELECT version, changed_at FROM change_versions WHERE table_name = ?", tables
+        ).fetchone()
+    row = conn.execute(
+        f"SELECT SUM(version), MAX(changed_at) FROM change_versions "
+        f"WHERE table_name IN ({', '.join('?' * len(tables))})", tables
+    ).fetchone()
+    return row if row[0] is not None else None
+
+
+def sync_record_cache(database):
+    """
+    Drop the cached rows that changed since the last sync, from any process
+
+    Reads the row_changes entries past the cache's change_seq: a changed
+    book drops ('book', id); a changed author drops ('author', id) and the
+    cached books showing that author. The first sync, or one that finds the
+    entries it needed already trimmed, clears the whole cache.
+
+    Call before answering from the cache under a freshly read version (the
+    API does this ahead of every conditional GET); cache hits themselves run
+    no SQL.
+
+    Args:
+        database (Database): Database whose connection and record cache to use
+    """
+    cache = database.get_record_cache()
+    if cache.max_size <= 0:
+        return
+    conn = database.get_connection()
+    since = cache.change_seq
+    if since is None:
+        # Position first: a row changed after this read is picked up next time
+        last = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM row_changes").fetchone()[0]
+        cache.clear()
+        cache.change_seq = last
+        return
+
+    rows = conn.execute(
+        "SELECT seq, table_name, row_id FROM row_changes WHERE seq > ? ORDER BY seq", (since,)
+    ).fetchall()
+    if not rows:
+        return
+    if rows[0][0] != since + 1:
+        # Trimmed past this cache's position: the changed rows are unknown
+        cache.clear()
+    else:
+        books = {row_id for _, table, row_id in rows if table == 'Books'}
+        authors = {row_id for _, table, row_id in rows if table == 'Authors'}
+        cache.invalidate(*(('book', book_id) for book_id in books),
+                         *(('author', author_id) for author_id in authors))
+        if authors:
+            cache.invalidate_where('book', lambda row: row.author_id in authors)
+    cache.change_seq = max(cache.change_seq, rows[-1][0])
@@ -5,21 +5,489 @@ Handles SQLite database connection and table creation
 
 import sqlite3
 import os
+import time
+import weakref
+import threading
+import contextlib
+from collections import deque
+from migrations import Migrator
+from record_cache import RecordCache, DEFAULT_RECORD_CACHE_SIZE, DEFAULT_RECORD_CACHE_TTL
+from query_stats import QueryStats, InstrumentedConnection, DEFAULT_SLOW_QUERY_MS
+
+
+# PRAGMA settings applied to every new connection, selectable per deployment.
+# Negative cache_size values are in KiB; busy_timeout is in milliseconds.
+PRAGMA_PROFILES = {
+    # WAL with relaxed syncing: readers never block on writers
+    'balanced': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16384,
+        'mmap_size': 134217728,
+        'temp_store': 'MEMORY',
+    },
+    # Large page cache and memory map for catalogue browsing/search traffic
+    'read_heavy': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,
+        'mmap_size': 1073741824,
+        'temp_store': 'MEMORY',
+    },
+    # WAL, but fsync on every commit so no committed loan is ever lost
+    'durable': {
+        'busy_timeout': 10000,
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16384,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+    },
+    # SQLite's defaults: rollback journal, no memory map
+    'legacy': {
+        'busy_timeout': 5000,
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+    },
+}
+
+DEFAULT_PRAGMA_PROFILE = 'balanced'
+
+# Seconds a pooled connection may sit idle before it is checked on checkout
+DEFAULT_HEALTH_CHECK_IDLE = 30.0
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes free within the pool timeout"""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections with checkout/return semantics
+
+    Each connection is used by one thread at a time: a caller checks it out
+    with acquire() (or the connection() context manager) and hands it back
+    with release(). When every connection is busy, callers wait up to
+    `timeout` seconds for one to be returned.
+
+    A returned connection is checked (SELECT 1) before its next checkout only
+    when it was idle longer than `health_check_idle` seconds or was returned
+    after an error; recently used connections are handed out as they are.
+    """
+
+    def __init__(self, connect, max_size=8, timeout=10.0, health_check_idle=DEFAULT_HEALTH_CHECK_IDLE):
+        """
+        Initialize ConnectionPool
+
+        Args:
+            connect (callable): Factory returning a new sqlite3.Connection
+            max_size (int): Maximum number of open connections
+            timeout (float): Seconds to wait for a free connection
+            health_check_idle (float): Idle seconds after which a connection
+                is checked before reuse
+        """
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_idle = health_check_idle
+        # (connection, time it was returned, returned after an error)
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        # Pool metrics
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._created = 0
+        self._discarded = 0
+        self._health_checks = 0
+
+    def acquire(self):
+        """
+        Check a connection out of the pool, opening a new one if allowed
+
+        Returns:
+            sqlite3.Connection: Connection reserved for the caller
+
+        Raises:
+            PoolTimeoutError: If no connection is free within the timeout
+        """
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        waited = False
+        conn = None
+        check = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed")
+                if self._idle:
+                    conn, returned_at, failed = self._idle.pop()
+                    check = failed or start - returned_at > self.health_check_idle
+                    if check:
+                        self._health_checks += 1
+                    break
+                if self._size < self.max_size:
+                    # Reserve a slot; the connection is opened outside the lock
+                    self._size += 1
+                    break
+
+                waited = True
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available within {self.timeout}s "
+                        f"(pool size: {self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+            elapsed = time.perf_counter() - start
+            self._checkouts += 1
+            self._in_use += 1
+            if waited:
+                self._waits += 1
+                self._wait_time += elapsed
+                self._max_wait_time = max(self._max_wait_time, elapsed)
+
+        try:
+            if check and not self._is_healthy(conn):
+                self._discard(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+                with self._cond:
+                    self._created += 1
+            return conn
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn, failed=False):
+        """
+        Return a checked-out connection to the pool
+
+        Any transaction left open by the caller is rolled back so the next
+        user starts from a clean state.
+
+        Args:
+            conn (sqlite3.Connection): Connection obtained from acquire()
+            failed (bool, optional): The caller hit an error while using it;
+                the connection is checked before its next checkout
+        """
+        healthy = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            healthy = False
+
+        with self._cond:
+            self._in_use -= 1
+            if healthy and not self._closed:
+                self._idle.append((conn, time.perf_counter(), failed))
+            else:
+                self._size -= 1
+                self._discarded += 1
+            self._cond.notify()
+
+        if not healthy or self._closed:
+            self._close_quietly(conn)
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Context manager that checks out a connection and returns it afterwards"""
+        conn = self.acquire()
+        failed = True
+        try:
+            yield conn
+            failed = False
+        finally:
+            self.release(conn, failed)
+
+    def stats(self):
+        """
+        Return pool usage and wait metrics
+
+        Returns:
+            dict: Pool size, usage and wait statistics
+        """
+        with self._cond:
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'total_wait_seconds': round(self._wait_time, 6),
+                'max_wait_seconds': round(self._max_wait_time, 6),
+                'avg_wait_seconds': round(self._wait_time / self._waits, 6) if self._waits else 0.0,
+                'connections_created': self._created,
+                'connections_discarded': self._discarded,
+                'health_checks': self._health_checks,
+            }
+
+    def close(self):
+        """Close all idle connections and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def _is_healthy(self, conn):
+        """Check that a long idle or failed connection is still usable"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn):
+        """Drop a broken connection (its pool slot is reused by the caller)"""
+        with self._cond:
+            self._discarded += 1
+        self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+class PooledDatabase:
+    """
+    A connection checked out from a Database pool
+
+    Exposes the same get_connection()/get_cursor() interface as Database, so
+    BookManager and AuthorManager can run on it unchanged. close() returns
+    the connection to the pool instead of closing it.
+    """
+
+    def __init__(self, database, pool, conn):
+        """
+        Initialize PooledDatabase
+
+        Args:
+            database (Database): Database the connection belongs to
+            pool (ConnectionPool): Pool the connection was checked out from
+            conn (sqlite3.Connection): Checked-out connection
+        """
+        self.database = database
+        self.db_path = database.db_path
+        self._pool = pool
+        self.conn = conn
+        self.cursor = conn.cursor()
+
+    def get_connection(self):
+        """Return the checked-out connection"""
+        return self.conn
+
+    def get_cursor(self):
+        """Return the cursor bound to the checked-out connection"""
+        return self.cursor
+
+    def get_record_cache(self):
+        """Return the record cache shared by every connection of the Database"""
+        return self.database.get_record_cache()
+
+    def get_query_stats(self):
+        """Return the statement statistics shared by every connection of the Database"""
+        return self.database.get_query_stats()
+
+    def close(self, failed=False):
+        """
+        Return the connection to the pool
+
+        Args:
+            failed (bool, optional): An error occurred while using it (see
+                ConnectionPool.release)
+        """
+        if self.conn is not None:
+            try:
+                self.cursor.close()
+            except sqlite3.Error:
+                pass
+            self._pool.release(self.conn, failed)
+            self.conn = None
+            self.cursor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class DedicatedDatabase(PooledDatabase):
+    """
+    A connection owned by one thread for its whole life, outside the pool
+
+    Same interface as PooledDatabase; close() closes the connection.
+    """
+
+    def __init__(self, database, conn):
+        """
+        Initialize DedicatedDatabase
+
+        Args:
+            database (Database): Database the connection belongs to
+            conn (sqlite3.Connection): Connection from Database.open_connection()
+        """
+        super().__init__(database, None, conn)
+
+    def close(self, failed=False):
+        """Close the connection"""
+        if self.conn is not None:
+            try:
+                self.cursor.close()
+                self.conn.close()
+            except sqlite3.Error:
+                pass
+            self.conn = None
+            self.cursor = None
+
+
+# Every Database of this process, so a forked child can replace their
+# connections (see Database.after_fork)
+_databases = weakref.WeakSet()
+
+# Connections and pools inherited across fork(): kept referenced and never
+# closed in the child, since closing them could disturb the parent's
+_inherited = []
+
+
+def _after_fork_in_child():
+    for database in list(_databases):
+        database.after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
 
 
 class Database:
     """Manages SQLite database connections and schema creation"""
 
-    def __init__(self, db_path='../data/library.db'):
+    def __init__(self, db_path='../data/library.db', pool_size=8, pool_timeout=10.0,
+                 profile=None, pragmas=None, cache_size=DEFAULT_RECORD_CACHE_SIZE,
+                 cache_ttl=DEFAULT_RECORD_CACHE_TTL, instrument=True,
+                 slow_query_ms=DEFAULT_SLOW_QUERY_MS, slow_query_log=None):
         """
         Initialize Database instance
 
         Args:
             db_path (str): Path to the SQLite database file
+            pool_size (int, optional): Maximum pooled connections (default: 8)
+            pool_timeout (float, optional): Seconds to wait for a pooled connection
+            profile (str, optional): Name of a PRAGMA_PROFILES entry; defaults to
+                the LIBRARY_DB_PROFILE environment variable, then 'balanced'
+            pragmas (dict, optional): PRAGMA values overriding the profile
+            cache_size (int, optional): Books/authors kept in the record cache
+                (0 disables it)
+            cache_ttl (float, optional): Seconds a cached record stays valid
+            instrument (bool, optional): Time every statement into
+                query_stats (see query_stats.py)
+            slow_query_ms (float, optional): Statements slower than this are
+                logged with their query plan (None disables the log)
+            slow_query_log (str, optional): File the slow-query log is
+                appended to as JSON lines
         """
+        profile = profile or os.environ.get('LIBRARY_DB_PROFILE') or DEFAULT_PRAGMA_PROFILE
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(
+                f"Unknown database profile '{profile}' "
+                f"(choose from: {', '.join(sorted(PRAGMA_PROFILES))})"
+            )
+
         self.db_path = db_path
+        self.profile = profile
+        self.pragmas = dict(PRAGMA_PROFILES[profile])
+        self.pragmas.update(pragmas or {})
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
         self.conn = None
         self.cursor = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self.record_cache = RecordCache(cache_size, cache_ttl)
+        self.query_stats = QueryStats(slow_query_ms, slow_query_log) if instrument else None
+        _databases.add(self)
+
+    def get_db_path(self):
+        """
+        Return the absolute path of the database file
+
+        Returns:
+            str: Database path resolved relative to this module
+        """
+        # Get the directory of this file
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        # Build the full path to the database
+        return os.path.abspath(os.path.join(current_dir, self.db_path))
+
+    def open_connection(self):
+        """
+        Open a new, fully configured connection to the database
+
+        Returns:
+            sqlite3.Connection: New connection
+        """
+        # Allow the connection to be handed between threads (one user at a time)
+        if self.query_stats is not None:
+            conn = sqlite3.connect(self.get_db_path(), check_same_thread=False,
+                                   factory=InstrumentedConnection)
+            conn.query_stats = self.query_stats
+        else:
+            conn = sqlite3.connect(self.get_db_path(), check_same_thread=False)
+
+        # Enable foreign key constraints
+        conn.execute("PRAGMA foreign_keys = ON")
+
+        # Apply the performance profile (busy_timeout first so a journal mode
+        # switch waits for other connections instead of failing)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}").fetchall()
+        return conn
+
+    def get_pragma_settings(self, conn=None):
+        """
+        Read back the PRAGMA values that are actually in effect
+
+        Args:
+            conn (sqlite3.Connection, optional): Connection to inspect
+                (default: the main connection)
+
+        Returns:
+            dict: Profile name plus the active value of every profile PRAGMA
+        """
+        conn = conn or self.conn
+        settings = {'profile': self.profile}
+        for name in self.pragmas:
+            row = conn.execute(f"PRAGMA {name}").fetchone()
+            settings[name] = row[0] if row else None
+        return settings
 
     def connect(self):
         """
@@ -27,18 +495,10 @@ class Database:
         Creates the database file if it doesn't exist
         """
         try:
-            # Get the directory of this file
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            # Build the full path to the database
-            full_db_path = os.path.join(current_dir, self.db_path)
-
-            # Allow SQLite to be used across threads (for Flask)
-            self.conn = sqlite3.connect(full_db_path, check_same_thread=False)
+            full_db_path = self.get_db_path()
+            self.conn = self.open_connection()
             self.cursor = self.conn.cursor()
 
-            # Enable foreign key constraints
-            self.cursor.execute("PRAGMA foreign_keys = ON")
-
             print(f"✓ Connected to database: {full_db_path}")
             return True
         except sqlite3.Error as e:
@@ -47,83 +507,113 @@ class Database:
 
     def create_tables(self):
         """
-        Create all required tables for the library management system
-        Tables: Authors, Books, Members, Loans
-        """
-        try:
-            # Create Authors table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS Authors (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    birth_year INTEGER,
-                    nationality TEXT
-                )
-            """)
-
-            # Create Books table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS Books (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    isbn TEXT UNIQUE NOT NULL,
-                    year INTEGER,
-                    genre TEXT,
-                    copies INTEGER DEFAULT 1,
-                    author_id INTEGER,
-                    FOREIGN KEY(author_id) REFERENCES Authors(id)
-                )
-            """)
-
-            # Create Members table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS Members (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    phone TEXT,
-                    membership_date TEXT DEFAULT CURRENT_DATE,
-                    status TEXT DEFAULT 'active'
-                )
-            """)
-
-            # Create Loans table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS Loans (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    book_id INTEGER NOT NULL,
-                    member_id INTEGER NOT NULL,
-                    loan_date TEXT DEFAULT CURRENT_DATE,
-                    due_date TEXT NOT NULL,
-                    return_date TEXT,
-                    status TEXT DEFAULT 'borrowed',
-                    FOREIGN KEY(book_id) REFERENCES Books(id),
-                    FOREIGN KEY(member_id) REFERENCES Members(id)
-                )
-            """)
-
-            # Commit the changes
-            self.conn.commit()
-
-            print("✓ All tables created successfully!")
-            print("  - Authors")
-            print("  - Books")
-            print("  - Members")
-            print("  - Loans")
-            return True
+        Bring the schema up to date by applying pending migrations
+        Tables: Authors, Books, Members, Loans (see migrations.py)
 
-        except sqlite3.Error as e:
-            print(f"✗ Error creating tables: {e}")
-            return False
+        Cheap to call on every start: an up-to-date database only costs a
+        version check.
+
+        Returns:
+            bool: True if the schema is current, False otherwise
+        """
+        return Migrator(self).migrate()
 
     def close(self):
         """
-        Safely close the database connection
+        Safely close the database connection and any pooled connections
         """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
         if self.conn:
             self.conn.close()
             print("✓ Database connection closed")
 
+    def after_fork(self):
+        """
+        Give a forked child process its own connections
+
+        Runs automatically in the child after os.fork() (pre-fork servers):
+        SQLite connections must not be used across fork(), so the inherited
+        main connection and pool are set aside unclosed, the pool is created
+        again on first use and the main connection, if the parent had one, is
+        reopened. The record cache and query statistics start empty, since
+        their locks may have been held by another thread of the parent.
+        """
+        _inherited.append((self.conn, self.cursor, self._pool))
+        reconnect = self.conn is not None
+        self.conn = None
+        self.cursor = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self.record_cache = RecordCache(self.record_cache.max_size, self.record_cache.ttl)
+        if self.query_stats is not None:
+            self.query_stats = QueryStats(self.query_stats.slow_query_ms, self.query_stats.log_path)
+        if reconnect:
+            self.conn = self.open_connection()
+            self.cursor = self.conn.cursor()
+
+    def get_pool(self):
+        """
+        Return the connection pool, creating it on first use
+
+        Returns:
+            ConnectionPool: Pool of connections to this database
+        """
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(
+                        self.open_connection,
+                        max_size=self.pool_size,
+                        timeout=self.pool_timeout,
+                    )
+        return self._pool
+
+    def lease(self):
+        """
+        Check a connection out of the pool
+
+        Returns:
+            PooledDatabase: Database-like wrapper; close() returns it to the pool
+        """
+        pool = self.get_pool()
+        return PooledDatabase(self, pool, pool.acquire())
+
+    def open_dedicated(self, read_only=False):
+        """
+        Open a connection outside the pool for one long-lived worker thread
+
+        Args:
+            read_only (bool, optional): Reject writes on it (PRAGMA query_only)
+
+        Returns:
+            DedicatedDatabase: Database-like wrapper; close() closes the connection
+        """
+        conn = self.open_connection()
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return DedicatedDatabase(self, conn)
+
+    def get_record_cache(self):
+        """
+        Return the in-process cache of book and author rows
+
+        Returns:
+            RecordCache: Cache shared by this Database and its pooled connections
+        """
+        return self.record_cache
+
+    def get_query_stats(self):
+        """
+        Return the per-statement timing statistics
+
+        Returns:
+            QueryStats: Statistics of every connection of this Database, or
+                        None when instrumentation is off
+        """
+        return self.query_stats
+
     def get_connection(self):
         """
         Return the database connection object
@@ -0,0 +1,206 @@
+"""
+Bulk import tool for Library Management System
+Loads books, authors or members from CSV, JSON or NDJSON files in batched
+transactions
+
+Usage:
+    python import_catalog.py books catalogue.csv --create-authors
+    python import_catalog.py authors authors.ndjson --batch-size 5000
+    python import_catalog.py members directory.csv --batch-size 1000 --pause 0.01
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import Database
+from author_manager import AuthorManager
+from book_manager import BookManager
+from member_manager import MemberManager
+
+# Fields converted to integers when read from CSV
+INTEGER_FIELDS = {'year', 'copies', 'author_id', 'birth_year'}
+
+# Number of per-row problems printed in the summary
+MAX_REPORTED_PROBLEMS = 20
+
+
+def detect_format(path):
+    """Guess the input format from the file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    if extension == '.json':
+        return 'json'
+    return 'csv'
+
+
+def _clean_record(record):
+    """
+    Turn empty strings into None and numeric CSV fields into ints
+
+    A numeric field that isn't an integer keeps its text; the bulk insert
+    reports its row as an error instead of the whole import failing.
+    """
+    cleaned = {}
+    for key, value in record.items():
+        if key is None:
+            continue
+        key = key.strip()
+        if isinstance(value, str):
+            value = value.strip()
+            if value == '':
+                value = None
+            elif key in INTEGER_FIELDS:
+                try:
+                    value = int(value)
+                except ValueError:
+                    pass
+        cleaned[key] = value
+    return cleaned
+
+
+def read_records(path, fmt):
+    """
+    Stream records from a CSV, JSON (array) or NDJSON file
+
+    Args:
+        path (str): Input file path
+        fmt (str): 'csv', 'json' or 'ndjson'
+
+    Yields:
+        dict: One record per input row
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            for record in csv.DictReader(f):
+                yield _clean_record(record)
+        elif fmt == 'ndjson':
+            for line in f:
+                if line.strip():
+                    yield _clean_record(json.loads(line))
+        else:
+            for record in json.load(f):
+                yield _clean_record(record)
+
+
+def print_report(report, noun):
+    """Print the per-row problems from a bulk import report"""
+    problems = report.get('conflicts', []) + report.get('errors', [])
+    problems.sort(key=lambda problem: problem['row'])
+    for problem in problems[:MAX_REPORTED_PROBLEMS]:
+        key = problem.get('isbn') or problem.get('email') or problem.get('name')
+        print(f"  ✗ Row {problem['row']} ({key}): {problem['error']}")
+    if len(problems) > MAX_REPORTED_PROBLEMS:
+        print(f"  ... and {len(problems) - MAX_REPORTED_PROBLEMS} more")
+    if 'updated' in report:
+        print(f"\nDone: {report['inserted']} {noun} added, {report['updated']} updated, "
+              f"{report['unchanged']} unchanged, {len(problems)} rows skipped.")
+    elif 'existing' in report:
+        print(f"\nDone: {report['inserted']} {noun} imported, {report['existing']} already present, "
+              f"{len(problems)} rows skipped.")
+    else:
+        print(f"\nDone: {report['inserted']} {noun} imported, {len(problems)} rows skipped.")
+
+
+def import_authors(db, path, fmt, batch_size):
+    """Import an authors file"""
+    author_mgr = AuthorManager(db)
+    report = author_mgr.bulk_add_authors(read_records(path, fmt), batch_size)
+    print_report(report, 'authors')
+    return report
+
+
+def import_members(db, path, fmt, batch_size, pause=0.0):
+    """
+    Sync a member directory file: insert new emails, update changed members
+
+    Args:
+        db (Database): Database instance
+        path (str): Input file path
+        fmt (str): Input format
+        batch_size (int): Rows per transaction
+        pause (float): Seconds to sleep between batches so circulation
+            writes get the lock during a long sync
+    """
+    member_mgr = MemberManager(db)
+    report = member_mgr.bulk_upsert_members(read_records(path, fmt), batch_size, pause)
+    print_report(report, 'members')
+    return report
+
+
+def import_books(db, path, fmt, batch_size, create_authors=False):
+    """
+    Import a books file, resolving "author" names to IDs in memory
+
+    Args:
+        db (Database): Database instance
+        path (str): Input file path
+        fmt (str): Input format
+        batch_size (int): Rows per transaction
+        create_authors (bool): Create authors named in the file that don't exist yet
+    """
+    author_mgr = AuthorManager(db)
+    book_mgr = BookManager(db)
+    author_ids = author_mgr.get_author_id_map()
+
+    if create_authors:
+        # First pass: collect author names missing from the database
+        missing = []
+        for record in read_records(path, fmt):
+            name = record.get('author')
+            if name and name not in author_ids:
+                author_ids[name] = None
+                missing.append({'name': name})
+        if missing:
+            author_ids.update(author_mgr.bulk_add_authors(missing, batch_size)['ids'])
+
+    report = book_mgr.bulk_add_books(read_records(path, fmt), batch_size, author_ids)
+    print_report(report, 'books')
+    return report
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Bulk import books, authors or members")
+    parser.add_argument('kind', choices=['books', 'authors', 'members'], help="What the file contains")
+    parser.add_argument('path', help="CSV, JSON or NDJSON file to import")
+    parser.add_argument('--format', choices=['csv', 'json', 'ndjson'],
+                        help="Input format (default: from file extension)")
+    parser.add_argument('--batch-size', type=int, default=5000,
+                        help="Rows per transaction (default: 5000)")
+    parser.add_argument('--pause', type=float, default=0.0,
+                        help="Seconds to sleep between member batches (default: 0)")
+    parser.add_argument('--create-authors', action='store_true',
+                        help="Create authors named in a books file that don't exist yet")
+    parser.add_argument('--db', default='../data/library.db', help="Database path")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or detect_format(args.path)
+
+    db = Database(args.db)
+    if not db.connect():
+        print("Failed to connect to database!")
+        return 1
+    db.create_tables()
+
+    try:
+        if args.kind == 'authors':
+            import_authors(db, args.path, fmt, args.batch_size)
+        elif args.kind == 'members':
+            import_members(db, args.path, fmt, args.batch_size, args.pause)
+        else:
+            import_books(db, args.path, fmt, args.batch_size, args.create_authors)
+    except (OSError, ValueError) as e:
+        print(f"✗ Import failed: {e}")
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
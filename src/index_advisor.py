@@ -0,0 +1,258 @@
+"""
+Index advisor for Library Management System
+Runs EXPLAIN QUERY PLAN over the queries issued by the book, author, loan
+and member repositories and the overdue scanner, and flags full table scans
+and temporary B-tree sorts
+
+Usage:
+    python index_advisor.py
+    python index_advisor.py --db ../data/library.db --verbose
+
+Exits with status 1 when a query has a problem that is not marked as
+expected, so it can run as a check before deploying schema or query changes.
+"""
+
+import argparse
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import Database
+from book_repository import BOOK_SELECT
+from author_repository import AUTHOR_SELECT
+from loan_repository import LOAN_SELECT
+from member_repository import MEMBER_SELECT, MEMBER_PREFIX_SEARCH, MEMBER_SYNC_INSERT, MEMBER_SYNC_UPDATE
+from overdue_scanner import OVERDUE_CANDIDATES
+from search_index import BOOK_SEARCH_QUERY, AUTHOR_SEARCH_QUERY
+from book_facets import FACET_ROWS
+
+# Problems the advisor looks for in a query plan
+SCAN = 'scan'
+TEMP_SORT = 'temp_sort'
+
+# Queries checked by the advisor: (name, sql, sample params, expected problems).
+# "expected" lists problems that are inherent to the query, such as a full
+# export walking the whole table; anything else is reported as a regression.
+ADVISED_QUERIES = [
+    # BookRepository
+    ('books.get_all_books', BOOK_SELECT + " ORDER BY b.title", (), set()),
+    ('books.list_books (first page)',
+     BOOK_SELECT + " ORDER BY b.title, b.id LIMIT ?", (100,), set()),
+    ('books.list_books (next page)',
+     BOOK_SELECT + " WHERE (b.title, b.id) > (?, ?) ORDER BY b.title, b.id LIMIT ?",
+     ('M', 1, 100), set()),
+    ('books.list_books (genre)',
+     BOOK_SELECT + " WHERE b.genre = ? AND (b.title, b.id) > (?, ?) ORDER BY b.title, b.id LIMIT ?",
+     ('Fiction', 'M', 1, 100), set()),
+    ('books.list_books (decade)',
+     BOOK_SELECT + " WHERE b.decade = ? ORDER BY b.title, b.id LIMIT ?", (1990, 100), set()),
+    # A common nationality walks the title index and skips other authors' books
+    ('books.list_books (nationality, walk)',
+     BOOK_SELECT + " WHERE +b.author_id IN (SELECT id FROM Authors WHERE nationality = ?)"
+     " ORDER BY b.title, b.id LIMIT ?", ('British', 100), set()),
+    # A rare one fetches its few books by author and sorts them
+    ('books.list_books (nationality, by author)',
+     BOOK_SELECT + " WHERE b.author_id IN (SELECT id FROM Authors WHERE nationality = ?)"
+     " ORDER BY b.title, b.id LIMIT ?", ('Icelandic', 100), {TEMP_SORT}),
+    ('books.iter_book_batches', BOOK_SELECT + " ORDER BY b.id", (), {SCAN}),
+    # bm25 ranking is computed per match, so ordering by it always needs a sort
+    ('books.search_books', BOOK_SEARCH_QUERY, ('"orwell"*', 50), {TEMP_SORT}),
+    ('books.get_book_by_id', BOOK_SELECT + " WHERE b.id = ?", (1,), set()),
+    ('books.update_book', "UPDATE Books SET title = ? WHERE id = ?", ('T', 1), set()),
+    ('books.bulk_add_books (ISBN check)',
+     "SELECT isbn FROM Books WHERE isbn IN (?, ?)", ('1', '2'), set()),
+
+    # AuthorRepository
+    ('authors.bulk_add_authors (name check)',
+     "SELECT name, MIN(id) FROM Authors WHERE name IN (?, ?) GROUP BY name", ('A', 'B'), set()),
+    ('authors.get_all_authors', AUTHOR_SELECT + " ORDER BY name", (), set()),
+    ('authors.list_authors (first page)',
+     AUTHOR_SELECT + " ORDER BY name, id LIMIT ?", (100,), set()),
+    ('authors.list_authors (next page)',
+     AUTHOR_SELECT + " WHERE (name, id) > (?, ?) ORDER BY name, id LIMIT ?",
+     ('M', 1, 100), set()),
+    ('authors.iter_author_batches', AUTHOR_SELECT + " ORDER BY id", (), {SCAN}),
+    ('authors.search_authors', AUTHOR_SEARCH_QUERY, ('"orwell"*', 50), {TEMP_SORT}),
+    ('authors.get_author_by_id', AUTHOR_SELECT + " WHERE id = ?", (1,), set()),
+    ('authors.get_author_id_map', "SELECT name, MIN(id) FROM Authors GROUP BY name", (), set()),
+
+    # LoanRepository
+    ('loans.checkout (claim copy)',
+     "UPDATE Books SET on_loan = on_loan + 1 WHERE id = ? AND available_copies > 0",
+     (1,), set()),
+    ('loans.get_loan_by_id', LOAN_SELECT + " WHERE l.id = ?", (1,), set()),
+    # Walks the rowid B-tree newest first and stops after one page
+    ('loans.list_loans', LOAN_SELECT + " ORDER BY l.id DESC LIMIT ?", (100,), {SCAN}),
+    ('loans.list_loans (member)',
+     LOAN_SELECT + " WHERE l.member_id = ? AND l.id < ? ORDER BY l.id DESC LIMIT ?", (1, 100, 100), set()),
+    ('loans.list_loans (book)',
+     LOAN_SELECT + " WHERE l.book_id = ? ORDER BY l.id DESC LIMIT ?", (1, 100), set()),
+    ('loans.list_loans (status)',
+     LOAN_SELECT + " WHERE l.status = ? ORDER BY l.id DESC LIMIT ?", ('borrowed', 100), set()),
+    ('loans.iter_loan_batches', LOAN_SELECT + " ORDER BY l.id", (), {SCAN}),
+    ('loans.get_loan_count (status)', "SELECT COUNT(*) FROM Loans WHERE status = ?", ('overdue',), set()),
+
+    # OverdueScanner
+    ('overdue_scanner.run (candidates)', OVERDUE_CANDIDATES,
+     ('2026-01-01', '2026-01-02', '2026-01-01', 0, 1000), set()),
+    ('overdue_scanner.run (mark overdue)',
+     "UPDATE Loans SET status = 'overdue' WHERE id IN (?, ?) AND status = 'borrowed'", (1, 2), set()),
+
+    # MemberRepository
+    ('members.list_members (first page)',
+     MEMBER_SELECT + " ORDER BY name, id LIMIT ?", (100,), set()),
+    ('members.list_members (next page)',
+     MEMBER_SELECT + " WHERE (name, id) > (?, ?) ORDER BY name, id LIMIT ?",
+     ('M', 1, 100), set()),
+    # Two index ranges (name and email) are merged, so the result needs a sort;
+    # both ranges are bounded by the prefix, so the sort stays small
+    ('members.search_members', MEMBER_PREFIX_SEARCH, ('ad', 'ae', 'ad', 'ae', 50), {TEMP_SORT}),
+    ('members.get_member_by_id', MEMBER_SELECT + " WHERE id = ?", (1,), set()),
+    ('members.get_member_by_email', MEMBER_SELECT + " WHERE email = ?", ('a@example.com',), set()),
+    ('members.bulk_upsert_members (insert)',
+     MEMBER_SYNC_INSERT, ('A', 'a@example.com', None, None, None), set()),
+    ('members.bulk_upsert_members (update)',
+     MEMBER_SYNC_UPDATE, ('A', 'a@example.com', None, None, None), set()),
+
+    # Conditional GETs (api/conditional.py) and every tracked write
+    ('change_versions.get_version',
+     "SELECT version, changed_at FROM change_versions WHERE table_name = ?", ('Authors',), set()),
+    ('change_versions.get_version (books)',
+     "SELECT SUM(version), MAX(changed_at) FROM change_versions WHERE table_name IN (?, ?)",
+     ('Books', 'Loans'), set()),
+    ('change_versions.sync_record_cache',
+     "SELECT seq, table_name, row_id FROM row_changes WHERE seq > ? ORDER BY seq", (0,), set()),
+
+    # book_facets aggregate: a few thousand rows, grouped per request
+    ('book_facets.get_facet_counts (genre)',
+     "SELECT genre, SUM(books) FROM book_facets WHERE decade = ? GROUP BY genre HAVING SUM(books) > 0"
+     " ORDER BY 2 DESC, 1", (1990,), {SCAN, TEMP_SORT}),
+    ('book_facets.count_books',
+     "SELECT COALESCE(SUM(books), 0) FROM book_facets WHERE genre = ? AND nationality = ?",
+     ('Fiction', 'British'), set()),
+    ('book_facets.find_facet_drift', FACET_ROWS, (), {SCAN, TEMP_SORT}),
+    ('trigger: facets_authors_nationality_update',
+     "SELECT COALESCE(genre, ''), COALESCE(decade, ''), COUNT(*) FROM Books WHERE author_id = ? GROUP BY 1, 2",
+     (1,), {TEMP_SORT}),
+
+    # library_stats counters (every count method reads these)
+    ('library_stats.get_counter', "SELECT value FROM library_stats WHERE name = ?", ('rows:Books',), set()),
+    ('library_stats.get_group_counts',
+     "SELECT name, value FROM library_stats WHERE name >= ? AND name < ?", ('genre:', 'genre;'), set()),
+    # Reconciliation recomputes the counters from the tables on purpose
+    ('library_stats.compute_counters (rows)', "SELECT COUNT(*) FROM Members", (), set()),
+    ('library_stats.compute_counters (copies)',
+     "SELECT COUNT(*), COALESCE(SUM(copies), 0) FROM Books", (), {SCAN}),
+    ('library_stats.compute_counters (genres)',
+     "SELECT 'genre:' || COALESCE(genre, ''), COUNT(*) FROM Books GROUP BY 1", (), {SCAN, TEMP_SORT}),
+    ('library_stats.deferred_counters (genres)',
+     "SELECT 'genre:' || COALESCE(genre, ''), COUNT(*) FROM Books WHERE id > ? GROUP BY 1", (0,), {TEMP_SORT}),
+
+    # Lookups SQLite runs implicitly: foreign key checks on delete and the
+    # authors_search_update trigger
+    ('fk: delete author -> Books', "SELECT 1 FROM Books WHERE author_id = ?", (1,), set()),
+    ('fk: delete book -> Loans', "SELECT 1 FROM Loans WHERE book_id = ?", (1,), set()),
+    ('fk: delete member -> Loans', "SELECT 1 FROM Loans WHERE member_id = ?", (1,), set()),
+]
+
+
+def find_problems(plan):
+    """
+    Find full table scans and temp B-tree sorts in a query plan
+
+    Args:
+        plan (list): Rows from EXPLAIN QUERY PLAN (id, parent, notused, detail)
+
+    Returns:
+        list: (problem, detail) pairs
+    """
+    problems = []
+    for row in plan:
+        detail = row[3]
+        if detail.startswith('USE TEMP B-TREE'):
+            problems.append((TEMP_SORT, detail))
+        elif (detail.startswith('SCAN ') and ' USING ' not in detail
+              and 'VIRTUAL TABLE' not in detail and detail != 'SCAN CONSTANT ROW'):
+            # "SCAN t USING [COVERING] INDEX" walks an index in order, which is
+            # what ORDER BY/COUNT queries want; a bare "SCAN t" reads every row.
+            # "SCAN CONSTANT ROW" is a SELECT without FROM and reads no table
+            problems.append((SCAN, detail))
+    return problems
+
+
+def explain(conn, query, params=()):
+    """
+    Get the query plan for a statement
+
+    Args:
+        conn (sqlite3.Connection): Connection to run EXPLAIN on
+        query (str): SQL statement
+        params (tuple): Sample parameters
+
+    Returns:
+        list: Rows from EXPLAIN QUERY PLAN
+    """
+    return conn.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+
+
+def advise(db, queries=ADVISED_QUERIES, verbose=False):
+    """
+    Check every query and print a report
+
+    Args:
+        db (Database): Connected database with the schema created
+        queries (list): (name, sql, params, expected problems) entries
+        verbose (bool): Print the plan of every query, not only flagged ones
+
+    Returns:
+        int: Number of queries with unexpected problems
+    """
+    conn = db.get_connection()
+    regressions = 0
+
+    for name, query, params, expected in queries:
+        plan = explain(conn, query, params)
+        problems = find_problems(plan)
+        unexpected = [(problem, detail) for problem, detail in problems if problem not in expected]
+
+        if unexpected:
+            regressions += 1
+            print(f"✗ {name}")
+            for problem, detail in unexpected:
+                label = 'full table scan' if problem == SCAN else 'temp B-tree sort'
+                print(f"    {label}: {detail}")
+        elif problems:
+            print(f"✓ {name} (expected: {', '.join(sorted(expected))})")
+        else:
+            print(f"✓ {name}")
+
+        if verbose or unexpected:
+            for row in plan:
+                print(f"      | {row[3]}")
+
+    print(f"\n{len(queries)} queries checked, {regressions} with unexpected scans or sorts.")
+    return regressions
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Check query plans for scans and temp sorts")
+    parser.add_argument('--db', default='../data/library.db', help="Database path")
+    parser.add_argument('--verbose', action='store_true', help="Print every query plan")
+    args = parser.parse_args(argv)
+
+    db = Database(args.db)
+    if not db.connect():
+        print("Failed to connect to database!")
+        return 1
+    db.create_tables()
+
+    try:
+        regressions = advise(db, verbose=args.verbose)
+    finally:
+        db.close()
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,16 @@ from database import Database
 from book_manager import BookManager
 from author_manager import AuthorManager
 
+# Rows per page in the book and author listings
+CLI_PAGE_SIZE = 20
+
+# Listing filter commands: letter -> (filter, prompt, type)
+BOOK_FILTERS = {
+    'g': ('genre', "Genre: ", str),
+    'd': ('decade', "Decade (e.g. 1990): ", int),
+    'a': ('nationality', "Author nationality: ", str),
+}
+
 
 def print_header():
     """Print the application header"""
@@ -82,6 +92,118 @@ def get_input(prompt, required=True, input_type=str):
             print(f"✗ Invalid input. Please enter a valid {input_type.__name__}.")
 
 
+def browse(view_page, count, noun, jump_prompt, select=False, filter_commands=None):
+    """
+    Page through a listing one keyset page at a time
+
+    Only the current page is held in memory; going back re-reads the page
+    from the (title, id) or (name, id) key it started at, which is kept for
+    every page visited.
+
+    Args:
+        view_page (callable): view_page(limit, after, filters) prints one page
+            and returns (rows, key of the next page or None)
+        count (callable): count(filters) returns the number of matching rows
+        noun (str): What is listed, e.g. 'books'
+        jump_prompt (str): Prompt for the jump command (a title/name prefix)
+        select (bool): Let the user type an ID to pick a row
+        filter_commands (dict, optional): Filter commands as in BOOK_FILTERS
+
+    Returns:
+        int: ID typed by the user when select is True, otherwise None
+    """
+    filter_commands = filter_commands or {}
+    filters = {}
+    starts = [None]
+    jumped_to = None
+
+    while True:
+        total = count(filters)
+        position = f"page {len(starts)}" if jumped_to is None else f"from '{jumped_to}'"
+        shown = ", ".join(f"{name}={value}" for name, value in filters.items())
+        print(f"\n📚 {noun.capitalize()}, {position} — {total} {noun}" + (f" ({shown})" if shown else ""))
+        rows, next_after = view_page(CLI_PAGE_SIZE, starts[-1], filters)
+
+        commands = ["[Enter/n] next", "[p] prev", "[f] first", "[j] jump"]
+        commands += [f"[{letter}] {name}" for letter, (name, _, _) in filter_commands.items()]
+        if filter_commands:
+            commands.append("[c] clear filters")
+        commands.append("[q] done")
+        print("  ".join(commands))
+        prompt = f"Command{' or ID to select' if select else ''}: "
+
+        while True:
+            command = input(prompt).strip().lower()
+            if select and command.isdigit():
+                return int(command)
+            if command in ('', 'n'):
+                if next_after is None:
+                    print(f"✗ No more {noun}.")
+                    continue
+                starts.append(next_after)
+            elif command == 'p':
+                if len(starts) == 1:
+                    print("✗ Already on the first page.")
+                    continue
+                starts.pop()
+                if len(starts) == 1:
+                    jumped_to = None
+            elif command == 'f':
+                starts, jumped_to = [None], None
+            elif command == 'j':
+                jumped_to = get_input(jump_prompt)
+                # (prefix, 0) sorts before every row whose key starts with the prefix
+                starts = [None, (jumped_to, 0)]
+            elif command in filter_commands:
+                name, filter_prompt, input_type = filter_commands[command]
+                value = get_input(filter_prompt, required=False, input_type=input_type)
+                if value is None:
+                    filters.pop(name, None)
+                else:
+                    filters[name] = value
+                starts, jumped_to = [None], None
+            elif command == 'c' and filter_commands:
+                filters = {}
+                starts, jumped_to = [None], None
+            elif command == 'q':
+                return None
+            else:
+                print("✗ Unknown command.")
+                continue
+            break
+
+
+def browse_books(book_mgr, select=False):
+    """
+    Page through the books by title, with genre/decade/nationality filters
+
+    Args:
+        book_mgr (BookManager): Book manager
+        select (bool): Let the user type a book ID to pick it
+
+    Returns:
+        int: Selected book ID, or None
+    """
+    return browse(book_mgr.view_books_page, book_mgr.get_book_count, 'books',
+                  "Jump to title starting with: ", select, BOOK_FILTERS)
+
+
+def browse_authors(author_mgr, select=False):
+    """
+    Page through the authors by name
+
+    Args:
+        author_mgr (AuthorManager): Author manager
+        select (bool): Let the user type an author ID to pick it
+
+    Returns:
+        int: Selected author ID, or None
+    """
+    return browse(lambda limit, after, filters: author_mgr.view_authors_page(limit, after),
+                  lambda filters: author_mgr.get_author_count(), 'authors',
+                  "Jump to name starting with: ", select)
+
+
 def handle_book_management(book_mgr, author_mgr):
     """Handle book management operations"""
     while True:
@@ -90,8 +212,7 @@ def handle_book_management(book_mgr, author_mgr):
 
         if choice == 1:
             # View All Books
-            print("\n📚 Viewing All Books:")
-            book_mgr.view_all_books()
+            browse_books(book_mgr)
 
         elif choice == 2:
             # Search Books
@@ -114,16 +235,18 @@ def handle_book_management(book_mgr, author_mgr):
             author_id = None
             if link_author == 'y':
                 print("\nAvailable Authors:")
-                author_mgr.view_all_authors()
-                author_id = get_input("Enter Author ID (or leave blank): ", required=False, input_type=int)
+                author_id = browse_authors(author_mgr, select=True)
+                if author_id is None:
+                    author_id = get_input("Enter Author ID (or leave blank): ", required=False, input_type=int)
 
             book_mgr.add_book(title, isbn, year, genre, copies, author_id)
 
         elif choice == 4:
             # Update Book
             print("\n--- Update Book ---")
-            book_mgr.view_all_books()
-            book_id = get_input("Enter Book ID to update: ", input_type=int)
+            book_id = browse_books(book_mgr, select=True)
+            if book_id is None:
+                book_id = get_input("Enter Book ID to update: ", input_type=int)
 
             print("\nEnter new values (leave blank to keep current):")
             title = get_input("New title: ", required=False)
@@ -138,8 +261,9 @@ def handle_book_management(book_mgr, author_mgr):
         elif choice == 5:
             # Delete Book
             print("\n--- Delete Book ---")
-            book_mgr.view_all_books()
-            book_id = get_input("Enter Book ID to delete: ", input_type=int)
+            book_id = browse_books(book_mgr, select=True)
+            if book_id is None:
+                book_id = get_input("Enter Book ID to delete: ", input_type=int)
             confirm = get_input(f"Are you sure you want to delete book {book_id}? (y/n): ").lower()
             if confirm == 'y':
                 book_mgr.delete_book(book_id)
@@ -172,8 +296,7 @@ def handle_author_management(author_mgr):
 
         if choice == 1:
             # View All Authors
-            print("\n📚 Viewing All Authors:")
-            author_mgr.view_all_authors()
+            browse_authors(author_mgr)
 
         elif choice == 2:
             # Search Authors
@@ -192,8 +315,9 @@ def handle_author_management(author_mgr):
         elif choice == 4:
             # Update Author
             print("\n--- Update Author ---")
-            author_mgr.view_all_authors()
-            author_id = get_input("Enter Author ID to update: ", input_type=int)
+            author_id = browse_authors(author_mgr, select=True)
+            if author_id is None:
+                author_id = get_input("Enter Author ID to update: ", input_type=int)
 
             print("\nEnter new values (leave blank to keep current):")
             name = get_input("New name: ", required=False)
@@ -205,8 +329,9 @@ def handle_author_management(author_mgr):
         elif choice == 5:
             # Delete Author
             print("\n--- Delete Author ---")
-            author_mgr.view_all_authors()
-            author_id = get_input("Enter Author ID to delete: ", input_type=int)
+            author_id = browse_authors(author_mgr, select=True)
+            if author_id is None:
+                author_id = get_input("Enter Author ID to delete: ", input_type=int)
             confirm = get_input(f"Are you sure you want to delete author {author_id}? (y/n): ").lower()
             if confirm == 'y':
                 author_mgr.delete_author(author_id)
@@ -0,0 +1,466 @@
+"""
+Library statistics for Library Management System
+Counters kept up to date by triggers, so counts are read in constant time
+instead of walking a table with SELECT COUNT(*)
+
+Every insert and delete on a counted table adjusts its 'rows:<table>'
+counter in the same transaction, whichever code path wrote it (repositories,
+bulk imports, the sqlite3 shell). Books also keep the total number of copies
+('copies:Books') and a count per genre ('genre:<genre>'), and authors a
+count per nationality ('nationality:<nationality>'). Bulk loads swap the
+per-row insert trigger for set-based updates (deferred_counters), like the
+search index. The counters and triggers are created by migrations 8 and 9
+(see migrations.py); the builders here recreate the insert triggers after a
+bulk load and must keep producing the SQL those migrations ran.
+
+StatsReconciler recomputes every counter (and the book_facets aggregate)
+from the tables and repairs any drift; run it from cron (python library_stats.py reconcile) or in-process
+with LIBRARY_STATS_RECONCILE_INTERVAL.
+
+Usage:
+    python library_stats.py show
+    python library_stats.py check       # exits 1 when a counter has drifted
+    python library_stats.py reconcile
+    python library_stats.py watch --interval 3600
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+import threading
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from overdue_scanner import JOB_STATE_SELECT, JOB_STATE_UPSERT
+from book_facets import find_facet_drift, rebuild_facets
+
+# Tables whose row count is maintained
+COUNTED_TABLES = ('Books', 'Authors', 'Members', 'Loans')
+
+# Columns whose total is maintained as '<column>:<table>'
+SUMMED_COLUMNS = {'Books': ('copies',)}
+
+# Columns with a row count per value, kept as '<column>:<value>'; NULL is
+# counted under the empty value
+GROUPED_COLUMNS = {'Books': ('genre',), 'Authors': ('nationality',)}
+
+# Name of the reconciler's row in job_state
+JOB_NAME = 'library_stats_reconcile'
+
+
+def _insert_trigger(table):
+    """Per-row insert trigger incrementing rows:<table>, as migration 8 created it"""
+    return f"""
+        CREATE TRIGGER IF NOT EXISTS stats_{table.lower()}_insert AFTER INSERT ON {table}
+        BEGIN
+            UPDATE library_stats SET value = value + 1 WHERE name = 'rows:{table}';
+        END
+        """
+
+
+def _add_row(table, row):
+    """Trigger statements counting `row` (NEW or OLD) in"""
+    statements = [f"UPDATE library_stats SET value = value + 1 WHERE name = 'rows:{table}';"]
+    for column in SUMMED_COLUMNS.get(table, ()):
+        statements.append(f"UPDATE library_stats SET value = value + COALESCE({row}.{column}, 0) "
+                          f"WHERE name = '{column}:{table}';")
+    for column in GROUPED_COLUMNS.get(table, ()):
+        statements.append(_add_group(column, row))
+    return statements
+
+
+def _add_group(column, row):
+    # Upsert: the first row with a new value creates its counter
+    return (f"INSERT INTO library_stats (name, value) VALUES ('{column}:' || COALESCE({row}.{column}, ''), 1) "
+            f"ON CONFLICT(name) DO UPDATE SET value = value + 1;")
+
+
+def _trigger(name, event, table, statements):
+    body = '\n            '.join(statements)
+    return f"""
+        CREATE TRIGGER IF NOT EXISTS {name} {event} ON {table}
+        BEGIN
+            {body}
+        END
+        """
+
+
+def _counter_insert_trigger(table):
+    """Per-row insert trigger for a table with summed or grouped columns, as migration 9 created it"""
+    return _trigger(f"stats_{table.lower()}_insert", 'AFTER INSERT', table, _add_row(table, 'NEW'))
+
+
+# Tables with counters beyond their row count
+DETAILED_TABLES = tuple(table for table in COUNTED_TABLES
+                        if table in SUMMED_COLUMNS or table in GROUPED_COLUMNS)
+
+
+def _current_insert_trigger(table):
+    """The insert trigger the latest migration installed on `table`"""
+    return _counter_insert_trigger(table) if table in DETAILED_TABLES else _insert_trigger(table)
+
+
+def get_counter(conn, name):
+    """
+    Read one counter
+
+    Args:
+        conn (sqlite3.Connection): Connection to read from
+        name (str): Counter name, e.g. 'copies:Books'
+
+    Returns:
+        int: Counter value, or None if there is no such counter
+    """
+    row = conn.execute("SELECT value FROM library_stats WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def _get_prefixed(conn, prefix):
+    """Counters named '<prefix>:...' keyed by the part after the colon"""
+    # ';' sorts right after ':', so this is one range on the primary key
+    rows = conn.execute(
+        "SELECT name, value FROM library_stats WHERE name >= ? AND name < ?",
+        (f"{prefix}:", f"{prefix};")
+    ).fetchall()
+    return {name[len(prefix) + 1:]: value for name, value in rows}
+
+
+def get_row_counts(conn):
+    """
+    Read the maintained row counts
+
+    Args:
+        conn (sqlite3.Connection): Connection to read from
+
+    Returns:
+        dict: Table name -> row count
+    """
+    return _get_prefixed(conn, 'rows')
+
+
+def get_row_count(conn, table):
+    """
+    Read one maintained row count
+
+    Args:
+        conn (sqlite3.Connection): Connection to read from
+        table (str): Table name, e.g. 'Books'
+
+    Returns:
+        int: Row count, or None if the table isn't counted
+    """
+    return get_counter(conn, f"rows:{table}")
+
+
+def get_group_counts(conn, column):
+    """
+    Read the per-value row counts of a grouped column
+
+    Args:
+        conn (sqlite3.Connection): Connection to read from
+        column (str): One of the GROUPED_COLUMNS, e.g. 'genre'
+
+    Returns:
+        dict: Value -> row count, for values with at least one row; rows
+            with no value are counted under ''
+    """
+    return {value: count for value, count in _get_prefixed(conn, column).items() if count > 0}
+
+
+@contextlib.contextmanager
+def deferred_counters(conn, table):
+    """
+    Count rows inserted inside the block with a few set-based statements
+    instead of the per-row trigger (the trigger alone can double a bulk
+    load's insert time)
+
+    Must be used inside an explicit transaction: the trigger is dropped and
+    recreated within it, so a rollback restores it untouched. Rows are
+    counted by id, so the block may only insert into the table (no deletes).
+
+    Args:
+        conn (sqlite3.Connection): Connection with the open transaction
+        table (str): One of COUNTED_TABLES
+    """
+    last_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+    conn.execute(f"DROP TRIGGER IF EXISTS stats_{table.lower()}_insert")
+    yield
+
+    summed = SUMMED_COLUMNS.get(table, ())
+    totals = conn.execute(
+        f"SELECT COUNT(*){''.join(f', COALESCE(SUM({column}), 0)' for column in summed)} "
+        f"FROM {table} WHERE id > ?", (last_id,)
+    ).fetchone()
+    for name, added in zip([f"rows:{table}"] + [f"{column}:{table}" for column in summed], totals):
+        conn.execute("UPDATE library_stats SET value = value + ? WHERE name = ?", (added, name))
+    for column in GROUPED_COLUMNS.get(table, ()):
+        conn.execute(f"""
+            INSERT INTO library_stats (name, value)
+            SELECT '{column}:' || COALESCE({column}, ''), COUNT(*) FROM {table} WHERE id > ? GROUP BY 1
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+        """, (last_id,))
+    conn.execute(_current_insert_trigger(table))
+
+
+def compute_counters(conn):
+    """
+    Compute every counter from the tables (full scans; for reconciliation)
+
+    Args:
+        conn (sqlite3.Connection): Connection to read from
+
+    Returns:
+        dict: Counter name -> value
+    """
+    counters = {}
+    for table in COUNTED_TABLES:
+        summed = SUMMED_COLUMNS.get(table, ())
+        totals = conn.execute(
+            f"SELECT COUNT(*){''.join(f', COALESCE(SUM({column}), 0)' for column in summed)} FROM {table}"
+        ).fetchone()
+        counters[f"rows:{table}"] = totals[0]
+        for column, total in zip(summed, totals[1:]):
+            counters[f"{column}:{table}"] = total
+        for column in GROUPED_COLUMNS.get(table, ()):
+            for name, count in conn.execute(
+                f"SELECT '{column}:' || COALESCE({column}, ''), COUNT(*) FROM {table} GROUP BY 1"
+            ):
+                counters[name] = count
+    return counters
+
+
+def find_drift(conn):
+    """
+    Compare the stored counters and book_facets rows with the tables
+
+    Call inside a transaction so both are read from the same snapshot.
+
+    Args:
+        conn (sqlite3.Connection): Connection to read from
+
+    Returns:
+        tuple: (number of counters and facet rows checked, list of {'name',
+            'stored', 'actual'} for those that disagree; stored is None for a
+            missing counter)
+    """
+    stored = dict(conn.execute("SELECT name, value FROM library_stats").fetchall())
+    actual = compute_counters(conn)
+    drift = []
+    for name in sorted(set(stored) | set(actual)):
+        # A grouped value whose rows are all gone may keep a zero counter
+        if stored.get(name) != actual.get(name) and (stored.get(name) or actual.get(name)):
+            drift.append({'name': name, 'stored': stored.get(name), 'actual': actual.get(name, 0)})
+    facet_rows, facet_drift = find_facet_drift(conn)
+    return len(actual) + facet_rows, drift + facet_drift
+
+
+class StatsReconciler:
+    """
+    Checks the library_stats counters against the tables and repairs drift
+
+    The triggers keep the counters exact for every write that goes through
+    SQLite, so drift means something bypassed them (a restored table, a
+    trigger dropped by hand, a crashed tool holding deferred_counters).
+    Silent like the repositories: returns run statistics and lets sqlite3
+    errors propagate.
+    """
+
+    def __init__(self, database):
+        """
+        Initialize StatsReconciler with database connection
+
+        Args:
+            database (Database): Database instance
+        """
+        self.db = database
+        self.conn = database.get_connection()
+
+    def get_state(self):
+        """
+        Read the reconciler's last-run metrics
+
+        Returns:
+            dict: job_state columns, or None if the reconciler has never run
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(JOB_STATE_SELECT, (JOB_NAME,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            columns = [description[0] for description in cursor.description]
+            return dict(zip(columns, row))
+        finally:
+            cursor.close()
+
+    def check(self):
+        """
+        Find drifted counters without changing anything
+
+        Returns:
+            dict: {'checked', 'drift', 'fixed', 'seconds'}; fixed is always 0
+        """
+        started = time.perf_counter()
+        cursor = self.conn.cursor()
+        try:
+            # One read transaction: counters and tables from the same snapshot
+            cursor.execute("BEGIN")
+            try:
+                checked, drift = find_drift(self.conn)
+            finally:
+                self.conn.rollback()
+        finally:
+            cursor.close()
+        return {'checked': checked, 'drift': drift, 'fixed': 0,
+                'seconds': round(time.perf_counter() - started, 6)}
+
+    def run(self):
+        """
+        Check the counters and rewrite the ones that drifted
+
+        The check runs as a reader; only when it finds drift is the write
+        lock taken, the counters re-checked and fixed in one transaction.
+
+        Returns:
+            dict: {'checked', 'drift', 'fixed', 'seconds'}
+        """
+        started = time.perf_counter()
+        stats = self.check()
+        cursor = self.conn.cursor()
+        try:
+            if stats['drift']:
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    stats['checked'], stats['drift'] = find_drift(self.conn)
+                    counters = [entry for entry in stats['drift'] if not entry['name'].startswith('book_facets:')]
+                    cursor.executemany(
+                        "INSERT OR REPLACE INTO library_stats (name, value) VALUES (?, ?)",
+                        [(entry['name'], entry['actual']) for entry in counters])
+                    if len(counters) < len(stats['drift']):
+                        rebuild_facets(self.conn)
+                    self.conn.commit()
+                except BaseException:
+                    self.conn.rollback()
+                    raise
+                stats['fixed'] = len(stats['drift'])
+
+            stats['seconds'] = round(time.perf_counter() - started, 6)
+            cursor.execute(JOB_STATE_UPSERT, (JOB_NAME, None, stats['checked'], stats['fixed'], stats['seconds']))
+            self.conn.commit()
+            return stats
+        finally:
+            cursor.close()
+
+
+class BackgroundStatsReconciler:
+    """
+    Runs StatsReconciler on a daemon thread every `interval` seconds
+
+    Each pass leases its own connection from the Database pool, so it never
+    shares a connection with request handlers.
+    """
+
+    def __init__(self, database, interval):
+        """
+        Initialize BackgroundStatsReconciler
+
+        Args:
+            database (Database): Shared Database that owns the connection pool
+            interval (float): Seconds between runs
+        """
+        self.database = database
+        self.interval = interval
+        self.last_stats = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the reconciler thread (runs once immediately, then every interval)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='stats-reconciler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Ask the thread to stop and wait for the current run to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        """Thread body"""
+        while not self._stop.is_set():
+            try:
+                with self.database.lease() as db:
+                    self.last_stats = StatsReconciler(db).run()
+                self.last_error = None
+            except Exception as e:
+                # Keep the thread alive; the next interval retries
+                self.last_error = str(e)
+            self._stop.wait(self.interval)
+
+
+def print_stats(stats):
+    """Print the result of one check or reconcile run"""
+    for entry in stats['drift']:
+        stored = 'missing' if entry['stored'] is None else entry['stored']
+        print(f"✗ {entry['name']}: stored {stored}, actual {entry['actual']}")
+    if stats['fixed']:
+        print(f"✓ {stats['checked']} counters checked, {stats['fixed']} repaired in {stats['seconds']:.3f}s")
+    elif stats['drift']:
+        print(f"✗ {stats['checked']} counters checked, {len(stats['drift'])} drifted ({stats['seconds']:.3f}s)")
+    else:
+        print(f"✓ {stats['checked']} counters checked, all current ({stats['seconds']:.3f}s)")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    from database import Database
+
+    parser = argparse.ArgumentParser(description="Show, check and reconcile the library_stats counters")
+    parser.add_argument('command', choices=['show', 'check', 'reconcile', 'watch'])
+    parser.add_argument('--db', default='../data/library.db', help="Database path")
+    parser.add_argument('--interval', type=float, default=3600,
+                        help="Seconds between runs for watch (default: 3600)")
+    args = parser.parse_args(argv)
+
+    db = Database(args.db)
+    if not db.connect():
+        print("Failed to connect to database!")
+        return 1
+    db.create_tables()
+
+    try:
+        reconciler = StatsReconciler(db)
+        if args.command == 'show':
+            for name, value in db.get_connection().execute("SELECT name, value FROM library_stats"):
+                print(f"{name:40} {value}")
+            state = reconciler.get_state()
+            if state is not None:
+                print(f"\nLast reconciled {state['last_run_at']} UTC: {state['last_updated']} repaired "
+                      f"({state['total_updated']} over {state['total_runs']} runs)")
+            return 0
+
+        if args.command == 'check':
+            stats = reconciler.check()
+            print_stats(stats)
+            return 1 if stats['drift'] else 0
+
+        if args.command == 'reconcile':
+            print_stats(reconciler.run())
+            return 0
+
+        while True:
+            print_stats(reconciler.run())
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
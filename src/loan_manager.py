@@ -0,0 +1,242 @@
+"""
+Loan Manager module for Library Management System
+Handles checkout, return and renewal of books with console output
+"""
+
+import sqlite3
+from database import Database
+from loan_repository import LoanRepository, CirculationError, DEFAULT_LOAN_DAYS, RENEWAL_DAYS
+
+
+class LoanManager:
+    """Manages loan circulation in the library system"""
+
+    def __init__(self, database):
+        """
+        Initialize LoanManager with database connection
+
+        Args:
+            database (Database): Database instance
+        """
+        self.db = database
+        self.conn = database.get_connection()
+        self.cursor = database.get_cursor()
+        self.repository = LoanRepository(database)
+
+    def _print_loans_table(self, loans):
+        """Print loan records as a formatted table"""
+        print("=" * 110)
+        print(f"{'ID':<6} {'Book':<30} {'Member':<25} {'Loaned':<11} {'Due':<11} {'Returned':<11} {'Status':<10}")
+        print("=" * 110)
+
+        for loan in loans:
+            loan_id, book_id, book_title, member_id, member_name, loan_date, due_date, return_date, status, renewals = loan
+            book_str = book_title if book_title else f"#{book_id}"
+            member_str = member_name if member_name else f"#{member_id}"
+
+            # Truncate long titles and names to fit columns
+            book_display = book_str[:28] + ".." if len(book_str) > 30 else book_str
+            member_display = member_str[:23] + ".." if len(member_str) > 25 else member_str
+
+            print(f"{loan_id:<6} {book_display:<30} {member_display:<25} {loan_date or 'N/A':<11} "
+                  f"{due_date:<11} {return_date or '-':<11} {status:<10}")
+
+        print("=" * 110)
+
+    def checkout_book(self, book_id, member_id, loan_days=DEFAULT_LOAN_DAYS):
+        """
+        Lend one copy of a book to a member
+
+        Args:
+            book_id (int): ID of the book
+            member_id (int): ID of the borrowing member
+            loan_days (int, optional): Days until the loan is due (default: 14)
+
+        Returns:
+            int: ID of the new loan, or None if failed
+        """
+        try:
+            loan_id = self.repository.checkout(book_id, member_id, loan_days)
+            loan = self.repository.get_loan_by_id(loan_id)
+            print(f"✓ Book checked out successfully! (Loan ID: {loan_id})")
+            print(f"  Book: {loan[2]}")
+            print(f"  Member: {loan[4]}")
+            print(f"  Due: {loan[6]}")
+            return loan_id
+
+        except CirculationError as e:
+            print(f"✗ Cannot check out book: {e}")
+            return None
+        except sqlite3.Error as e:
+            print(f"✗ Error checking out book: {e}")
+            return None
+
+    def return_book(self, loan_id):
+        """
+        Return a borrowed book
+
+        Args:
+            loan_id (int): ID of the loan
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            self.repository.return_loan(loan_id)
+            print(f"✓ Loan {loan_id} returned successfully!")
+            return True
+
+        except CirculationError as e:
+            print(f"✗ Cannot return book: {e}")
+            return False
+        except sqlite3.Error as e:
+            print(f"✗ Error returning book: {e}")
+            return False
+
+    def renew_loan(self, loan_id, days=RENEWAL_DAYS):
+        """
+        Extend the due date of a loan
+
+        Args:
+            loan_id (int): ID of the loan
+            days (int, optional): Days to extend by (default: 14)
+
+        Returns:
+            str: New due date, or None if failed
+        """
+        try:
+            due_date = self.repository.renew(loan_id, days)
+            print(f"✓ Loan {loan_id} renewed! New due date: {due_date}")
+            return due_date
+
+        except CirculationError as e:
+            print(f"✗ Cannot renew loan: {e}")
+            return None
+        except sqlite3.Error as e:
+            print(f"✗ Error renewing loan: {e}")
+            return None
+
+    def get_loan_by_id(self, loan_id):
+        """
+        Retrieve and display a loan
+
+        Args:
+            loan_id (int): The ID of the loan to retrieve
+
+        Returns:
+            Loan: Loan record or None if not found
+        """
+        try:
+            loan = self.repository.get_loan_by_id(loan_id)
+
+            if not loan:
+                print(f"\n✗ No loan found with ID: {loan_id}")
+                return None
+
+            loan_id, book_id, book_title, member_id, member_name, loan_date, due_date, return_date, status, renewals = loan
+            print(f"\n📋 Loan Details (ID: {loan_id})")
+            print("=" * 50)
+            print(f"Book:       {book_title} (ID: {book_id})")
+            print(f"Member:     {member_name} (ID: {member_id})")
+            print(f"Loaned:     {loan_date}")
+            print(f"Due:        {due_date}")
+            print(f"Returned:   {return_date if return_date else 'Not yet'}")
+            print(f"Status:     {status}")
+            print(f"Renewals:   {renewals}")
+            print("=" * 50 + "\n")
+
+            return loan
+
+        except sqlite3.Error as e:
+            print(f"✗ Error retrieving loan: {e}")
+            return None
+
+    def view_loans(self, member_id=None, book_id=None, status=None, limit=100):
+        """
+        Display the most recent loans, optionally filtered
+
+        Args:
+            member_id (int, optional): Only loans of this member
+            book_id (int, optional): Only loans of this book
+            status (str, optional): Only loans with this status
+            limit (int, optional): Maximum number of loans to show
+
+        Returns:
+            list: Loan records
+        """
+        try:
+            loans = self.repository.list_loans(limit, member_id=member_id, book_id=book_id, status=status)
+
+            if not loans:
+                print("\n📚 No loans found.")
+                return []
+
+            print(f"\n📚 Loans ({len(loans)} shown):")
+            self._print_loans_table(loans)
+            return loans
+
+        except sqlite3.Error as e:
+            print(f"✗ Error retrieving loans: {e}")
+            return []
+
+    def get_loan_count(self, status=None):
+        """
+        Get the number of loans
+
+        Args:
+            status (str, optional): Only count loans with this status
+
+        Returns:
+            int: Number of loans
+        """
+        try:
+            return self.repository.get_loan_count(status)
+        except sqlite3.Error as e:
+            print(f"✗ Error counting loans: {e}")
+            return 0
+
+
+# Test the LoanManager class
+if __name__ == "__main__":
+    print("=== Library Management System - Loan Manager Test ===\n")
+
+    # Initialize database
+    db = Database()
+
+    if not db.connect():
+        print("Failed to connect to database!")
+        exit(1)
+
+    # Create tables if they don't exist
+    db.create_tables()
+
+    loan_mgr = LoanManager(db)
+
+    # Make sure there is a member to lend to
+    db.cursor.execute("""
+        INSERT OR IGNORE INTO Members (name, email) VALUES ('Test Member', 'test.member@example.com')
+    """)
+    db.conn.commit()
+    db.cursor.execute("SELECT id FROM Members WHERE email = 'test.member@example.com'")
+    member_id = db.cursor.fetchone()[0]
+
+    print("\n--- Test 1: Check Out a Book ---")
+    loan_id = loan_mgr.checkout_book(1, member_id)
+
+    print("\n--- Test 2: Renew the Loan ---")
+    if loan_id:
+        loan_mgr.renew_loan(loan_id)
+
+    print("\n--- Test 3: View Member's Loans ---")
+    loan_mgr.view_loans(member_id=member_id)
+
+    print("\n--- Test 4: Return the Book ---")
+    if loan_id:
+        loan_mgr.return_book(loan_id)
+        loan_mgr.return_book(loan_id)  # Already returned
+
+    print("\n--- Test 5: Loan Count ---")
+    print(f"Total loans in database: {loan_mgr.get_loan_count()}")
+
+    # Close database connection
+    db.close()
@@ -0,0 +1,310 @@
+"""
+Loan Repository module for Library Management System
+Silent data-access layer for loans: checkout, return and renew run as single
+BEGIN IMMEDIATE transactions that keep Books.on_loan (and so the derived
+Books.available_copies) in step
+"""
+
+import sqlite3
+import contextlib
+from change_versions import bump_version
+from library_stats import get_row_count
+from records import Loan
+
+
+# Loan length and renewal rules
+DEFAULT_LOAN_DAYS = 14
+RENEWAL_DAYS = 14
+MAX_RENEWALS = 2
+
+# Loan statuses stored in Loans.status
+LOAN_STATUSES = ('borrowed', 'overdue', 'returned')
+
+# Column list shared by every query that returns full loan rows:
+# (id, book_id, book_title, member_id, member_name, loan_date, due_date,
+#  return_date, status, renewals)
+LOAN_SELECT = """
+    SELECT l.id, l.book_id, b.title AS book_title, l.member_id, m.name AS member_name,
+           l.loan_date, l.due_date, l.return_date, l.status, l.renewals
+    FROM Loans l
+    LEFT JOIN Books b ON l.book_id = b.id
+    LEFT JOIN Members m ON l.member_id = m.id
+"""
+
+
+class CirculationError(Exception):
+    """Raised when a checkout, return or renewal breaks a circulation rule"""
+
+
+class NotFoundError(CirculationError):
+    """Raised when the book, member or loan of a circulation request doesn't exist"""
+
+
+class LoanRepository:
+    """
+    Data access for loans
+
+    Every method uses its own cursor, returns records (records.py) or plain values and lets
+    sqlite3 errors propagate to the caller. Circulation rule violations raise
+    CirculationError. Console output lives in LoanManager; the API adapter
+    calls this class directly.
+    """
+
+    def __init__(self, database):
+        """
+        Initialize LoanRepository with database connection
+
+        Args:
+            database (Database): Database instance
+        """
+        self.db = database
+        self.conn = database.get_connection()
+        self.cache = database.get_record_cache()
+
+    def _fetchall(self, query, params=(), row_factory=None):
+        """Run a query on a fresh cursor and return all rows (built by row_factory if given)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = row_factory
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _fetchone(self, query, params=(), row_factory=None):
+        """Run a query on a fresh cursor and return the first row (built by row_factory if given)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = row_factory
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    @contextlib.contextmanager
+    def _immediate(self):
+        """
+        Run the block in a BEGIN IMMEDIATE transaction
+
+        The write lock is taken up front, so concurrent terminals queue on
+        busy_timeout instead of failing on a lock upgrade mid-transaction.
+        Commits on success and rolls back on any exception.
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+        finally:
+            cursor.close()
+
+    def _get_open_loan(self, cursor, loan_id):
+        """Fetch (book_id, due_date, renewals) of an unreturned loan or raise"""
+        cursor.execute(
+            "SELECT book_id, due_date, renewals, return_date FROM Loans WHERE id = ?",
+            (loan_id,),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            raise NotFoundError(f"Loan {loan_id} not found")
+        if row[3] is not None:
+            raise CirculationError(f"Loan {loan_id} has already been returned")
+        return row[:3]
+
+    def checkout(self, book_id, member_id, loan_days=DEFAULT_LOAN_DAYS):
+        """
+        Lend one copy of a book to a member
+
+        Args:
+            book_id (int): ID of the book
+            member_id (int): ID of the borrowing member
+            loan_days (int, optional): Days until the loan is due
+
+        Returns:
+            int: ID of the new loan
+
+        Raises:
+            NotFoundError: If the book or member doesn't exist
+            CirculationError: If the member isn't active or no copy is available
+        """
+        with self._immediate() as cursor:
+            cursor.execute("SELECT status FROM Members WHERE id = ?", (member_id,))
+            member = cursor.fetchone()
+            if member is None:
+                raise NotFoundError(f"Member {member_id} not found")
+            if member[0] not in (None, 'active'):
+                raise CirculationError(f"Member {member_id} is not active (status: {member[0]})")
+
+            # Claim a copy; the guard makes this a no-op when none is left
+            cursor.execute("""
+                UPDATE Books SET on_loan = on_loan + 1
+                WHERE id = ? AND available_copies > 0
+            """, (book_id,))
+            if cursor.rowcount == 0:
+                cursor.execute("SELECT 1 FROM Books WHERE id = ?", (book_id,))
+                if cursor.fetchone() is None:
+                    raise NotFoundError(f"Book {book_id} not found")
+                raise CirculationError(f"No copies of book {book_id} are available")
+
+            cursor.execute("""
+                INSERT INTO Loans (book_id, member_id, loan_date, due_date, status)
+                VALUES (?, ?, date('now'), date('now', ?), 'borrowed')
+            """, (book_id, member_id, f"+{int(loan_days)} days"))
+            loan_id = cursor.lastrowid
+            bump_version(cursor, 'Loans')
+
+        # The cached book row carries available_copies
+        self.cache.invalidate(('book', book_id))
+        return loan_id
+
+    def return_loan(self, loan_id):
+        """
+        Mark a loan as returned and put its copy back on the shelf
+
+        Args:
+            loan_id (int): ID of the loan
+
+        Raises:
+            NotFoundError: If the loan doesn't exist
+            CirculationError: If the loan was already returned
+        """
+        with self._immediate() as cursor:
+            book_id, _, _ = self._get_open_loan(cursor, loan_id)
+            cursor.execute("""
+                UPDATE Loans SET return_date = date('now'), status = 'returned'
+                WHERE id = ?
+            """, (loan_id,))
+            cursor.execute("UPDATE Books SET on_loan = on_loan - 1 WHERE id = ?", (book_id,))
+            bump_version(cursor, 'Loans')
+
+        self.cache.invalidate(('book', book_id))
+
+    def renew(self, loan_id, days=RENEWAL_DAYS):
+        """
+        Extend an open loan's due date
+
+        The new due date counts from the later of the current due date and
+        today, so renewing an overdue loan gives a full renewal period.
+
+        Args:
+            loan_id (int): ID of the loan
+            days (int, optional): Days to extend by
+
+        Returns:
+            str: New due date (YYYY-MM-DD)
+
+        Raises:
+            NotFoundError: If the loan doesn't exist
+            CirculationError: If the loan was returned or can't be renewed again
+        """
+        with self._immediate() as cursor:
+            _, _, renewals = self._get_open_loan(cursor, loan_id)
+            if renewals >= MAX_RENEWALS:
+                raise CirculationError(f"Loan {loan_id} has reached the renewal limit ({MAX_RENEWALS})")
+
+            cursor.execute("""
+                UPDATE Loans
+                SET due_date = date(MAX(due_date, date('now')), ?),
+                    renewals = renewals + 1,
+                    status = 'borrowed'
+                WHERE id = ?
+            """, (f"+{int(days)} days", loan_id))
+            cursor.execute("SELECT due_date FROM Loans WHERE id = ?", (loan_id,))
+            return cursor.fetchone()[0]
+
+    def get_loan_by_id(self, loan_id):
+        """
+        Fetch a single loan
+
+        Args:
+            loan_id (int): The ID of the loan
+
+        Returns:
+            Loan: Loan record or None if not found
+        """
+        return self._fetchone(LOAN_SELECT + " WHERE l.id = ?", (loan_id,), row_factory=Loan.from_row)
+
+    def list_loans(self, limit=100, after=None, member_id=None, book_id=None, status=None):
+        """
+        Fetch one page of loans, newest first, using keyset pagination
+
+        Args:
+            limit (int, optional): Maximum number of loans to return
+            after (int, optional): ID of the last loan on the previous page
+            member_id (int, optional): Only loans of this member
+            book_id (int, optional): Only loans of this book
+            status (str, optional): Only loans with this status
+
+        Returns:
+            list: Loan records
+        """
+        conditions = []
+        params = []
+        for column, value in (('l.member_id', member_id), ('l.book_id', book_id), ('l.status', status)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if after is not None:
+            conditions.append("l.id < ?")
+            params.append(after)
+
+        query = LOAN_SELECT
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY l.id DESC LIMIT ?"
+        params.append(limit)
+        return self._fetchall(query, params, row_factory=Loan.from_row)
+
+    def iter_loan_batches(self, batch_size=1000):
+        """
+        Iterate over every loan in id order without loading the whole table
+
+        Args:
+            batch_size (int, optional): Rows fetched from SQLite per batch
+
+        Yields:
+            list: Up to batch_size loan records
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = Loan.from_row
+        try:
+            cursor.execute(LOAN_SELECT + " ORDER BY l.id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+    def get_availability(self, book_id):
+        """
+        Read a book's copy counts
+
+        Args:
+            book_id (int): The ID of the book
+
+        Returns:
+            tuple: (copies, available_copies) or None if the book doesn't exist
+        """
+        return self._fetchone("SELECT copies, available_copies FROM Books WHERE id = ?", (book_id,))
+
+    def get_loan_count(self, status=None):
+        """
+        Count loans
+
+        Args:
+            status (str, optional): Only count loans with this status
+                (counted on idx_loans_status_id); all loans come from the
+                trigger-maintained counter
+
+        Returns:
+            int: Number of loans
+        """
+        if status is None:
+            return get_row_count(self.conn, 'Loans')
+        return self._fetchone("SELECT COUNT(*) FROM Loans WHERE status = ?", (status,))[0]
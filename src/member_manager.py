@@ -0,0 +1,336 @@
+"""
+Member Manager module for Library Management System
+Handles CRUD operations for library members with console output
+"""
+
+import sqlite3
+from database import Database
+from member_repository import MemberRepository
+from search_index import DEFAULT_SEARCH_LIMIT
+
+
+class MemberManager:
+    """Manages member-related operations in the library system"""
+
+    def __init__(self, database):
+        """
+        Initialize MemberManager with database connection
+
+        Args:
+            database (Database): Database instance
+        """
+        self.db = database
+        self.conn = database.get_connection()
+        self.cursor = database.get_cursor()
+        self.repository = MemberRepository(database)
+
+    def _print_members_table(self, members):
+        """Print member records as a formatted table"""
+        print("=" * 100)
+        print(f"{'ID':<6} {'Name':<25} {'Email':<32} {'Phone':<15} {'Since':<11} {'Status':<8}")
+        print("=" * 100)
+
+        for member in members:
+            member_id, name, email, phone, membership_date, status = member
+            name_display = name[:23] + ".." if len(name) > 25 else name
+            email_display = email[:30] + ".." if len(email) > 32 else email
+
+            print(f"{member_id:<6} {name_display:<25} {email_display:<32} {phone or 'N/A':<15} "
+                  f"{membership_date or 'N/A':<11} {status or 'N/A':<8}")
+
+        print("=" * 100)
+
+    def add_member(self, name, email, phone=None, status='active'):
+        """
+        Add a new member to the database
+
+        Args:
+            name (str): Member's full name
+            email (str): Email address (unique)
+            phone (str, optional): Phone number
+            status (str, optional): Membership status (default: 'active')
+
+        Returns:
+            int: ID of the newly created member, or None if failed
+        """
+        try:
+            member_id = self.repository.add_member(name, email, phone, status)
+            print(f"✓ Member added successfully! (ID: {member_id})")
+            print(f"  Name: {name}")
+            print(f"  Email: {email}")
+            if phone:
+                print(f"  Phone: {phone}")
+            return member_id
+
+        except sqlite3.IntegrityError as e:
+            if 'email' in str(e).lower():
+                print(f"✗ Email constraint error: This email is already registered")
+            else:
+                print(f"✗ Database integrity error: {e}")
+            return None
+        except sqlite3.Error as e:
+            print(f"✗ Error adding member: {e}")
+            return None
+
+    def bulk_upsert_members(self, records, batch_size=1000, pause=0.0):
+        """
+        Insert or update many members by email in batched transactions
+
+        Args:
+            records (iterable): Dicts with name, email and optional phone,
+                membership_date, status
+            batch_size (int, optional): Rows per transaction (default: 1000)
+            pause (float, optional): Seconds to sleep between batches
+
+        Returns:
+            dict: Report from MemberRepository.bulk_upsert_members
+        """
+        report = self.repository.bulk_upsert_members(records, batch_size, pause)
+        print(f"✓ Members synced: {report['inserted']} added, {report['updated']} updated, "
+              f"{report['unchanged']} unchanged")
+        if report['errors']:
+            print(f"✗ {len(report['errors'])} rows rejected")
+        return report
+
+    def view_members(self, limit=100):
+        """
+        Display the first page of members ordered by name
+
+        Args:
+            limit (int, optional): Maximum number of members to show
+
+        Returns:
+            list: Member records
+        """
+        try:
+            members = self.repository.list_members(limit)
+
+            if not members:
+                print("\n👥 No members found in the database.")
+                return []
+
+            print(f"\n👥 Members ({len(members)} shown):")
+            self._print_members_table(members)
+            return members
+
+        except sqlite3.Error as e:
+            print(f"✗ Error retrieving members: {e}")
+            return []
+
+    def list_members(self, limit=100, after=None):
+        """
+        Fetch one page of members ordered by (name, id) without printing
+
+        Args:
+            limit (int, optional): Maximum number of members to return
+            after (tuple, optional): (name, id) of the last member on the
+                previous page
+
+        Returns:
+            list: Member records
+        """
+        try:
+            return self.repository.list_members(limit, after)
+        except sqlite3.Error as e:
+            print(f"✗ Error listing members: {e}")
+            return []
+
+    def search_members(self, prefix, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Search members whose name or email starts with a prefix
+
+        Args:
+            prefix (str): Start of a name or email address
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: Matching member records
+        """
+        try:
+            members = self.repository.search_members(prefix, limit)
+
+            if not members:
+                print(f"\n🔍 No members found matching '{prefix}'")
+                return []
+
+            print(f"\n🔍 Search results for '{prefix}' ({len(members)} found):")
+            self._print_members_table(members)
+            return members
+
+        except sqlite3.Error as e:
+            print(f"✗ Error searching members: {e}")
+            return []
+
+    def _print_member(self, member):
+        """Print one member's details"""
+        member_id, name, email, phone, membership_date, status = member
+        print(f"\n👤 Member Details (ID: {member_id})")
+        print("=" * 50)
+        print(f"Name:       {name}")
+        print(f"Email:      {email}")
+        print(f"Phone:      {phone if phone else 'N/A'}")
+        print(f"Since:      {membership_date if membership_date else 'N/A'}")
+        print(f"Status:     {status if status else 'N/A'}")
+        print("=" * 50 + "\n")
+
+    def get_member_by_id(self, member_id):
+        """
+        Retrieve and display a member
+
+        Args:
+            member_id (int): The ID of the member to retrieve
+
+        Returns:
+            Member: Member record or None if not found
+        """
+        try:
+            member = self.repository.get_member_by_id(member_id)
+            if not member:
+                print(f"\n✗ No member found with ID: {member_id}")
+                return None
+            self._print_member(member)
+            return member
+
+        except sqlite3.Error as e:
+            print(f"✗ Error retrieving member: {e}")
+            return None
+
+    def get_member_by_email(self, email):
+        """
+        Retrieve and display a member by email address
+
+        Args:
+            email (str): Email address (case-insensitive)
+
+        Returns:
+            Member: Member record or None if not found
+        """
+        try:
+            member = self.repository.get_member_by_email(email)
+            if not member:
+                print(f"\n✗ No member found with email: {email}")
+                return None
+            self._print_member(member)
+            return member
+
+        except sqlite3.Error as e:
+            print(f"✗ Error retrieving member: {e}")
+            return None
+
+    def update_member(self, member_id, name=None, email=None, phone=None, status=None):
+        """
+        Update an existing member's information
+
+        Args:
+            member_id (int): ID of the member to update
+            name (str, optional): New name
+            email (str, optional): New email address
+            phone (str, optional): New phone number
+            status (str, optional): New membership status
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            if not self.repository.get_member_by_id(member_id):
+                print(f"✗ No member found with ID: {member_id}")
+                return False
+
+            if not self.repository.update_member(member_id, name, email, phone, status):
+                print("✗ No fields to update")
+                return False
+
+            print(f"✓ Member {member_id} updated successfully!")
+            return True
+
+        except sqlite3.IntegrityError as e:
+            if 'email' in str(e).lower():
+                print(f"✗ Email constraint error: This email is already registered")
+            else:
+                print(f"✗ Database integrity error: {e}")
+            return False
+        except sqlite3.Error as e:
+            print(f"✗ Error updating member: {e}")
+            return False
+
+    def delete_member(self, member_id):
+        """
+        Delete a member from the database
+
+        Args:
+            member_id (int): ID of the member to delete
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            if not self.repository.delete_member(member_id):
+                print(f"✗ No member found with ID: {member_id}")
+                return False
+
+            print(f"✓ Member {member_id} deleted successfully!")
+            return True
+
+        except sqlite3.IntegrityError:
+            print(f"✗ Cannot delete member: Loans are linked to this member")
+            return False
+        except sqlite3.Error as e:
+            print(f"✗ Error deleting member: {e}")
+            return False
+
+    def get_member_count(self):
+        """
+        Get the total number of members
+
+        Returns:
+            int: Number of members in the database
+        """
+        try:
+            return self.repository.get_member_count()
+        except sqlite3.Error as e:
+            print(f"✗ Error counting members: {e}")
+            return 0
+
+
+# Test the MemberManager class
+if __name__ == "__main__":
+    print("=== Library Management System - Member Manager Test ===\n")
+
+    # Initialize database
+    db = Database()
+
+    if not db.connect():
+        print("Failed to connect to database!")
+        exit(1)
+
+    # Create tables if they don't exist
+    db.create_tables()
+
+    member_mgr = MemberManager(db)
+
+    print("\n--- Test 1: Adding Members ---")
+    member_mgr.add_member("Ada Lovelace", "ada@example.com", "555-0100")
+    member_mgr.add_member("Alan Turing", "alan@example.com")
+    member_mgr.add_member("Duplicate Ada", "ADA@example.com")  # Duplicate email
+
+    print("\n--- Test 2: Directory Sync ---")
+    member_mgr.bulk_upsert_members([
+        {'name': 'Ada King', 'email': 'ada@example.com'},
+        {'name': 'Grace Hopper', 'email': 'grace@example.com', 'phone': '555-0101'},
+    ])
+
+    print("\n--- Test 3: View Members ---")
+    member_mgr.view_members()
+
+    print("\n--- Test 4: Prefix Search ---")
+    member_mgr.search_members("ad")
+    member_mgr.search_members("grace@")
+
+    print("\n--- Test 5: Lookup by Email ---")
+    member_mgr.get_member_by_email("Alan@Example.com")
+
+    print("\n--- Test 6: Member Count ---")
+    print(f"Total members in database: {member_mgr.get_member_count()}")
+
+    # Close database connection
+    db.close()
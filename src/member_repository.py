@@ -0,0 +1,338 @@
+"""
+Member Repository module for Library Management System
+Silent data-access layer for members: runs SQL and returns rows, never prints
+"""
+
+import time
+import sqlite3
+from search_index import DEFAULT_SEARCH_LIMIT
+from library_stats import get_row_count
+from records import Member
+
+
+# Column list shared by every query that returns full member rows:
+# (id, name, email, phone, membership_date, status)
+MEMBER_SELECT = "SELECT id, name, email, phone, membership_date, status FROM Members"
+
+# Prefix search on name (NOCASE index) or email (UNIQUE index, stored lower-case)
+MEMBER_PREFIX_SEARCH = MEMBER_SELECT + """
+    WHERE (name COLLATE NOCASE >= ? AND name COLLATE NOCASE < ?)
+       OR (email >= ? AND email < ?)
+    ORDER BY name COLLATE NOCASE, id
+    LIMIT ?
+"""
+
+# Directory sync runs two statements per batch; parameters for both are
+# (name, email, phone, membership_date, status). The insert adds emails that
+# aren't registered yet. A plain INSERT ... ON CONFLICT would burn an
+# AUTOINCREMENT id for every existing member on every sync, while the
+# NOT EXISTS guard never generates a row for them.
+MEMBER_SYNC_INSERT = """
+    INSERT INTO Members (name, email, phone, membership_date, status)
+    SELECT ?1, ?2, ?3, COALESCE(?4, CURRENT_DATE), COALESCE(?5, 'active')
+    WHERE NOT EXISTS (SELECT 1 FROM Members WHERE email = ?2)
+"""
+
+# The update then applies changed names, phones and statuses; a missing phone
+# or status keeps the stored value. Unchanged members are skipped by the
+# WHERE clause, so a nightly sync of a mostly unchanged directory writes (and
+# logs to the WAL) only the differences.
+MEMBER_SYNC_UPDATE = """
+    UPDATE Members SET
+        name = ?1,
+        phone = COALESCE(?3, phone),
+        status = COALESCE(?5, status)
+    WHERE email = ?2
+      AND (name, phone, status) IS NOT (?1, COALESCE(?3, phone), COALESCE(?5, status))
+"""
+
+
+def normalize_email(email):
+    """
+    Normalize an email address for storage and lookup
+
+    Args:
+        email (str): Email address as entered
+
+    Returns:
+        str: Trimmed, lower-cased address (None stays None)
+    """
+    return email.strip().lower() if email is not None else None
+
+
+def prefix_range(prefix):
+    """
+    Turn a prefix into the [low, high) range of strings that start with it
+
+    Args:
+        prefix (str): Lower-cased, non-empty prefix
+
+    Returns:
+        tuple: (low, high) bounds for an indexed range scan
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class MemberRepository:
+    """
+    Data access for members
+
+    Every method uses its own cursor, returns records (records.py) or plain values and lets
+    sqlite3 errors propagate to the caller. Console output lives in
+    MemberManager; the API adapter calls this class directly.
+    """
+
+    def __init__(self, database):
+        """
+        Initialize MemberRepository with database connection
+
+        Args:
+            database (Database): Database instance
+        """
+        self.db = database
+        self.conn = database.get_connection()
+
+    def _fetchall(self, query, params=(), row_factory=None):
+        """Run a query on a fresh cursor and return all rows (built by row_factory if given)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = row_factory
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _fetchone(self, query, params=(), row_factory=None):
+        """Run a query on a fresh cursor and return the first row (built by row_factory if given)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = row_factory
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    def _write(self, query, params=()):
+        """Run a write statement, commit and return the cursor's rowcount/lastrowid"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, params)
+            self.conn.commit()
+            return cursor.rowcount, cursor.lastrowid
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def list_members(self, limit=100, after=None):
+        """
+        Fetch one page of members ordered by (name, id) using keyset pagination
+
+        Args:
+            limit (int, optional): Maximum number of members to return
+            after (tuple, optional): (name, id) of the last member on the
+                previous page; None starts from the beginning
+
+        Returns:
+            list: Member records
+        """
+        if after is None:
+            return self._fetchall(MEMBER_SELECT + " ORDER BY name, id LIMIT ?", (limit,),
+                                  row_factory=Member.from_row)
+        return self._fetchall(
+            MEMBER_SELECT + " WHERE (name, id) > (?, ?) ORDER BY name, id LIMIT ?",
+            (after[0], after[1], limit),
+            row_factory=Member.from_row,
+        )
+
+    def search_members(self, prefix, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Find members whose name or email starts with a prefix (case-insensitive)
+
+        Args:
+            prefix (str): Start of a name or email address
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: Matching member records ordered by name
+        """
+        prefix = (prefix or "").strip().lower()
+        if not prefix:
+            return []
+        low, high = prefix_range(prefix)
+        return self._fetchall(MEMBER_PREFIX_SEARCH, (low, high, low, high, limit), row_factory=Member.from_row)
+
+    def get_member_by_id(self, member_id):
+        """
+        Fetch a single member
+
+        Args:
+            member_id (int): The ID of the member
+
+        Returns:
+            Member: Member record or None if not found
+        """
+        return self._fetchone(MEMBER_SELECT + " WHERE id = ?", (member_id,), row_factory=Member.from_row)
+
+    def get_member_by_email(self, email):
+        """
+        Fetch a single member by email address (case-insensitive)
+
+        Args:
+            email (str): Email address
+
+        Returns:
+            Member: Member record or None if not found
+        """
+        return self._fetchone(MEMBER_SELECT + " WHERE email = ?", (normalize_email(email),),
+                              row_factory=Member.from_row)
+
+    def add_member(self, name, email, phone=None, status='active'):
+        """
+        Insert a member
+
+        Args:
+            name (str): Member's full name
+            email (str): Email address (unique)
+            phone (str, optional): Phone number
+            status (str, optional): Membership status (default: 'active')
+
+        Returns:
+            int: ID of the new member
+
+        Raises:
+            sqlite3.IntegrityError: If the email is already registered
+        """
+        _, member_id = self._write("""
+            INSERT INTO Members (name, email, phone, status)
+            VALUES (?, ?, ?, ?)
+        """, (name, normalize_email(email), phone, status))
+        return member_id
+
+    def update_member(self, member_id, name=None, email=None, phone=None, status=None):
+        """
+        Update the given (non-None) fields of a member
+
+        Args:
+            member_id (int): ID of the member to update
+            name, email, phone, status (optional): New values
+
+        Returns:
+            bool: True if a member was updated, False if it doesn't exist or
+                  no fields were given
+
+        Raises:
+            sqlite3.IntegrityError: If the new email belongs to another member
+        """
+        fields = {'name': name, 'email': normalize_email(email), 'phone': phone, 'status': status}
+        updates = {column: value for column, value in fields.items() if value is not None}
+        if not updates:
+            return False
+
+        query = f"UPDATE Members SET {', '.join(f'{column} = ?' for column in updates)} WHERE id = ?"
+        rowcount, _ = self._write(query, [*updates.values(), member_id])
+        return rowcount > 0
+
+    def delete_member(self, member_id):
+        """
+        Delete a member
+
+        Args:
+            member_id (int): ID of the member to delete
+
+        Returns:
+            bool: True if a member was deleted, False if it doesn't exist
+
+        Raises:
+            sqlite3.IntegrityError: If loans reference the member
+        """
+        rowcount, _ = self._write("DELETE FROM Members WHERE id = ?", (member_id,))
+        return rowcount > 0
+
+    def get_member_count(self):
+        """
+        Count all members (trigger-maintained counter, no table scan)
+
+        Returns:
+            int: Number of members
+        """
+        return get_row_count(self.conn, 'Members')
+
+    def bulk_upsert_members(self, records, batch_size=1000, pause=0.0):
+        """
+        Insert or update many members by email, one short transaction per batch
+
+        Each batch takes the write lock only for its own executemany, so
+        checkouts and returns keep running between batches of a large sync.
+
+        Args:
+            records (iterable): Dicts with name, email and optional phone,
+                membership_date, status
+            batch_size (int, optional): Rows per transaction (default: 1000)
+            pause (float, optional): Seconds to sleep between batches
+
+        Returns:
+            dict: {'inserted': int, 'updated': int, 'unchanged': int, 'errors': [...]}
+                  where each error is {'row': n, 'email': ..., 'error': ...}
+        """
+        report = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'errors': []}
+        batch = []
+
+        for row_number, record in enumerate(records, start=1):
+            name = record.get('name')
+            email = normalize_email(record.get('email'))
+            if not name or not email:
+                report['errors'].append({'row': row_number, 'email': email,
+                                         'error': 'Name and email are required'})
+                continue
+            if '@' not in email:
+                report['errors'].append({'row': row_number, 'email': email,
+                                         'error': 'Invalid email address'})
+                continue
+
+            batch.append((row_number, (name, email, record.get('phone'),
+                                       record.get('membership_date'), record.get('status'))))
+            if len(batch) >= batch_size:
+                self._upsert_member_batch(batch, report)
+                batch = []
+                if pause:
+                    time.sleep(pause)
+
+        if batch:
+            self._upsert_member_batch(batch, report)
+
+        return report
+
+    def _upsert_member_batch(self, batch, report):
+        """
+        Sync one batch of (row_number, params) pairs in a single transaction
+
+        Args:
+            batch (list): (row_number, (name, email, phone, membership_date, status))
+            report (dict): Report updated in place
+        """
+        params = [params for _, params in batch]
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            # rowcount leaves out rows written by triggers (the maintained
+            # counters), which conn.total_changes would include
+            cursor.executemany(MEMBER_SYNC_INSERT, params)
+            inserted = cursor.rowcount
+
+            # Rows inserted above already match, so only real changes count here
+            cursor.executemany(MEMBER_SYNC_UPDATE, params)
+            updated = cursor.rowcount
+            self.conn.commit()
+
+            report['inserted'] += inserted
+            report['updated'] += updated
+            report['unchanged'] += len(batch) - inserted - updated
+
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            for row_number, params in batch:
+                report['errors'].append({'row': row_number, 'email': params[1], 'error': str(e)})
+        finally:
+            cursor.close()
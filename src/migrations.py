@@ -0,0 +1,901 @@
+"""
+Schema migrations for Library Management System
+Numbered migrations tracked in a schema_version table, with batched backfills
+
+Usage:
+    python migrations.py status
+    python migrations.py migrate --batch-size 5000 --pause 0.05
+    python migrations.py dump-schema ../data/schema.sql
+
+Each migration's DDL runs in one short transaction together with its
+schema_version row. Data backfills run afterwards in many small transactions
+(one id range each), so a large library.db stays writable while they run; an
+interrupted backfill resumes on the next migrate. Never edit a migration that
+has shipped; add a new one instead.
+"""
+
+import argparse
+import os
+import sys
+import time
+import sqlite3
+import textwrap
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# Rows per backfill transaction
+DEFAULT_BACKFILL_BATCH_SIZE = 5000
+
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        backfilled_at TEXT
+    )
+"""
+
+
+class Backfill:
+    """
+    A data backfill run in id-range batches after a migration's DDL
+
+    Each statement takes two parameters, (low, high], bounding the id of the
+    rows in `table` to process; a batch runs them in order in one
+    transaction. They must be idempotent so an interrupted run can resume
+    from the beginning.
+    """
+
+    def __init__(self, description, table, *statements):
+        """
+        Initialize Backfill
+
+        Args:
+            description (str): What the backfill populates (for progress output)
+            table (str): Table whose id range is walked
+            *statements (str): SQL taking (low, high] id bounds
+        """
+        self.description = description
+        self.table = table
+        self.statements = statements
+
+
+class Migration:
+    """A numbered schema change: DDL statements plus optional backfills"""
+
+    def __init__(self, version, name, statements, backfills=()):
+        """
+        Initialize Migration
+
+        Args:
+            version (int): Migration number; applied in ascending order
+            name (str): Short description
+            statements (list): DDL statements run in one transaction
+            backfills (tuple, optional): Backfill steps run after the DDL
+        """
+        self.version = version
+        self.name = name
+        self.statements = statements
+        self.backfills = backfills
+
+
+MIGRATIONS = [
+    Migration(1, 'initial schema', [
+        """
+        CREATE TABLE IF NOT EXISTS Authors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            birth_year INTEGER,
+            nationality TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Books (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            isbn TEXT UNIQUE NOT NULL,
+            year INTEGER,
+            genre TEXT,
+            copies INTEGER DEFAULT 1,
+            author_id INTEGER,
+            FOREIGN KEY(author_id) REFERENCES Authors(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Members (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            phone TEXT,
+            membership_date TEXT DEFAULT CURRENT_DATE,
+            status TEXT DEFAULT 'active'
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Loans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_id INTEGER NOT NULL,
+            member_id INTEGER NOT NULL,
+            loan_date TEXT DEFAULT CURRENT_DATE,
+            due_date TEXT NOT NULL,
+            return_date TEXT,
+            status TEXT DEFAULT 'borrowed',
+            FOREIGN KEY(book_id) REFERENCES Books(id),
+            FOREIGN KEY(member_id) REFERENCES Members(id)
+        )
+        """,
+    ]),
+
+    # Run `python index_advisor.py` after adding indexes or changing queries
+    Migration(2, 'secondary indexes', [
+        # Title/name ordering and keyset pagination: ORDER BY title, id with (title, id) > (?, ?)
+        "CREATE INDEX IF NOT EXISTS idx_books_title_id ON Books(title, id)",
+        "CREATE INDEX IF NOT EXISTS idx_authors_name_id ON Authors(name, id)",
+        "CREATE INDEX IF NOT EXISTS idx_members_name_id ON Members(name, id)",
+        # Foreign keys: an author's books, a book's or member's loans, and the
+        # child-table lookups SQLite runs when a parent row is deleted
+        "CREATE INDEX IF NOT EXISTS idx_books_author_id ON Books(author_id)",
+        "CREATE INDEX IF NOT EXISTS idx_loans_book_id ON Loans(book_id)",
+        "CREATE INDEX IF NOT EXISTS idx_loans_member_id ON Loans(member_id)",
+        # Loan queues: loans in a given status ordered by due date (e.g. overdue)
+        "CREATE INDEX IF NOT EXISTS idx_loans_status_due_date ON Loans(status, due_date)",
+    ]),
+
+    # FTS5 tables that use the source row id as their rowid, so results join
+    # straight back to Books/Authors. The sync triggers are live before the
+    # backfill starts, so rows written while it runs are indexed by the
+    # triggers and skipped by the backfill
+    Migration(3, 'full-text search', [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS BookSearch USING fts5(
+            title, genre, isbn, author_name,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS AuthorSearch USING fts5(
+            name,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS books_search_insert AFTER INSERT ON Books
+        BEGIN
+            INSERT INTO BookSearch (rowid, title, genre, isbn, author_name)
+            VALUES (NEW.id, NEW.title, NEW.genre, NEW.isbn,
+                    (SELECT name FROM Authors WHERE id = NEW.author_id));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS books_search_update
+        AFTER UPDATE OF title, genre, isbn, author_id ON Books
+        BEGIN
+            DELETE FROM BookSearch WHERE rowid = OLD.id;
+            INSERT INTO BookSearch (rowid, title, genre, isbn, author_name)
+            VALUES (NEW.id, NEW.title, NEW.genre, NEW.isbn,
+                    (SELECT name FROM Authors WHERE id = NEW.author_id));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS books_search_delete AFTER DELETE ON Books
+        BEGIN
+            DELETE FROM BookSearch WHERE rowid = OLD.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS authors_search_insert AFTER INSERT ON Authors
+        BEGIN
+            INSERT INTO AuthorSearch (rowid, name) VALUES (NEW.id, NEW.name);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS authors_search_update AFTER UPDATE OF name ON Authors
+        BEGIN
+            UPDATE AuthorSearch SET name = NEW.name WHERE rowid = NEW.id;
+            UPDATE BookSearch SET author_name = NEW.name
+            WHERE rowid IN (SELECT id FROM Books WHERE author_id = NEW.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS authors_search_delete AFTER DELETE ON Authors
+        BEGIN
+            DELETE FROM AuthorSearch WHERE rowid = OLD.id;
+        END
+        """,
+    ], (
+        Backfill('BookSearch', 'Books', """
+            INSERT INTO BookSearch (rowid, title, genre, isbn, author_name)
+            SELECT b.id, b.title, b.genre, b.isbn, a.name
+            FROM Books b
+            LEFT JOIN Authors a ON b.author_id = a.id
+            WHERE b.id > ? AND b.id <= ?
+              AND NOT EXISTS (SELECT 1 FROM BookSearch WHERE rowid = b.id)
+        """),
+        Backfill('AuthorSearch', 'Authors', """
+            INSERT INTO AuthorSearch (rowid, name)
+            SELECT id, name FROM Authors
+            WHERE id > ? AND id <= ?
+              AND NOT EXISTS (SELECT 1 FROM AuthorSearch WHERE rowid = Authors.id)
+        """),
+    )),
+
+    # Books.on_loan is the denormalized count of open loans, kept by
+    # LoanRepository (checkout +1, return -1); available_copies is derived
+    # from it as a virtual column, so it always agrees with copies and adds
+    # no work to inserts
+    Migration(4, 'loan circulation', [
+        "ALTER TABLE Books ADD COLUMN on_loan INTEGER NOT NULL DEFAULT 0",
+        """
+        ALTER TABLE Books ADD COLUMN available_copies INTEGER
+        GENERATED ALWAYS AS (COALESCE(copies, 0) - on_loan) VIRTUAL
+        """,
+        "ALTER TABLE Loans ADD COLUMN renewals INTEGER NOT NULL DEFAULT 0",
+        "CREATE INDEX IF NOT EXISTS idx_loans_status_id ON Loans(status, id)",
+        """
+        CREATE TRIGGER IF NOT EXISTS books_copies_check
+        BEFORE UPDATE OF copies ON Books
+        WHEN COALESCE(NEW.copies, 0) < OLD.on_loan
+        BEGIN
+            SELECT RAISE(ABORT, 'copies cannot be fewer than the copies on loan');
+        END
+        """,
+    ], (
+        Backfill('Books.on_loan', 'Books', """
+            UPDATE Books
+            SET on_loan = (
+                SELECT COUNT(*) FROM Loans
+                WHERE Loans.book_id = Books.id AND Loans.return_date IS NULL
+            )
+            WHERE id > ? AND id <= ?
+        """),
+    )),
+
+    # Member emails are stored lower-cased so the UNIQUE index serves exact
+    # lookups and prefix ranges; names get a NOCASE index for prefix search.
+    # Legacy emails whose lower-cased form is already taken are left as-is.
+    Migration(5, 'member lookup', [
+        "CREATE INDEX IF NOT EXISTS idx_members_name_nocase ON Members(name COLLATE NOCASE, id)",
+    ], (
+        Backfill('Members.email', 'Members', """
+            UPDATE Members SET email = lower(trim(email))
+            WHERE id > ? AND id <= ?
+              AND email != lower(trim(email))
+              AND NOT EXISTS (SELECT 1 FROM Members m WHERE m.email = lower(trim(Members.email)))
+        """),
+    )),
+
+    # Background jobs keep their watermark and last-run metrics in job_state.
+    # The overdue scanner compares due dates as text on idx_loans_status_due_date,
+    # so parseable due dates are normalized to YYYY-MM-DD; values date() can't
+    # parse are left for manual repair.
+    Migration(6, 'job state', [
+        """
+        CREATE TABLE IF NOT EXISTS job_state (
+            name TEXT PRIMARY KEY,
+            watermark TEXT,
+            last_run_at TEXT,
+            last_scanned INTEGER NOT NULL DEFAULT 0,
+            last_updated INTEGER NOT NULL DEFAULT 0,
+            last_duration REAL,
+            total_runs INTEGER NOT NULL DEFAULT 0,
+            total_updated INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+    ], (
+        Backfill('Loans.due_date', 'Loans', """
+            UPDATE Loans SET due_date = date(due_date)
+            WHERE id > ? AND id <= ?
+              AND date(due_date) IS NOT NULL
+              AND due_date != date(due_date)
+        """),
+    )),
+
+    # Per-table change versions behind the API's ETag/Last-Modified headers;
+    # repositories bump them in the same transaction as their writes
+    Migration(7, 'change versions', [
+        """
+        CREATE TABLE IF NOT EXISTS change_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            changed_at REAL NOT NULL
+        ) WITHOUT ROWID
+        """,
+        """
+        INSERT OR IGNORE INTO change_versions (table_name, version, changed_at)
+        VALUES ('Books', 1, (julianday('now') - 2440587.5) * 86400.0),
+               ('Authors', 1, (julianday('now') - 2440587.5) * 86400.0)
+        """,
+    ]),
+
+    # Row counters maintained by triggers (see library_stats.py), so /metrics
+    # and the count endpoints don't walk whole tables. The DDL starts every
+    # counter at zero with its triggers live and records each table's max id
+    # in stats_seed; the backfills then add the rows up to that watermark,
+    # moving stats_seed.seeded_to in the same transaction so a resumed run
+    # never counts a range twice. Deleting a pre-existing row before its
+    # range is counted leaves drift, which StatsReconciler repairs.
+    Migration(8, 'library stats', [
+        """
+        CREATE TABLE IF NOT EXISTS library_stats (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS stats_seed (
+            name TEXT PRIMARY KEY,
+            watermark INTEGER NOT NULL,
+            seeded_to INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """,
+        """
+        INSERT OR IGNORE INTO library_stats (name, value)
+        VALUES ('rows:Books', 0), ('rows:Authors', 0), ('rows:Members', 0), ('rows:Loans', 0)
+        """,
+        """
+        INSERT OR IGNORE INTO stats_seed (name, watermark)
+        SELECT 'rows:Books', COALESCE(MAX(id), 0) FROM Books
+        UNION ALL SELECT 'rows:Authors', COALESCE(MAX(id), 0) FROM Authors
+        UNION ALL SELECT 'rows:Members', COALESCE(MAX(id), 0) FROM Members
+        UNION ALL SELECT 'rows:Loans', COALESCE(MAX(id), 0) FROM Loans
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_books_insert AFTER INSERT ON Books
+        BEGIN
+            UPDATE library_stats SET value = value + 1 WHERE name = 'rows:Books';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_books_delete AFTER DELETE ON Books
+        BEGIN
+            UPDATE library_stats SET value = value - 1 WHERE name = 'rows:Books';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_authors_insert AFTER INSERT ON Authors
+        BEGIN
+            UPDATE library_stats SET value = value + 1 WHERE name = 'rows:Authors';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_authors_delete AFTER DELETE ON Authors
+        BEGIN
+            UPDATE library_stats SET value = value - 1 WHERE name = 'rows:Authors';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_members_insert AFTER INSERT ON Members
+        BEGIN
+            UPDATE library_stats SET value = value + 1 WHERE name = 'rows:Members';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_members_delete AFTER DELETE ON Members
+        BEGIN
+            UPDATE library_stats SET value = value - 1 WHERE name = 'rows:Members';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_loans_insert AFTER INSERT ON Loans
+        BEGIN
+            UPDATE library_stats SET value = value + 1 WHERE name = 'rows:Loans';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_loans_delete AFTER DELETE ON Loans
+        BEGIN
+            UPDATE library_stats SET value = value - 1 WHERE name = 'rows:Loans';
+        END
+        """,
+    ], (
+        Backfill('rows:Books', 'Books', """
+            UPDATE library_stats SET value = value + (
+                SELECT COUNT(*) FROM stats_seed s, Books t
+                WHERE s.name = 'rows:Books' AND t.id > MAX(?1, s.seeded_to) AND t.id <= MIN(?2, s.watermark)
+            )
+            WHERE name = 'rows:Books'
+        """, """
+            UPDATE stats_seed SET seeded_to = MIN(?2, watermark)
+            WHERE name = 'rows:Books' AND seeded_to < MIN(?2, watermark)
+        """),
+        Backfill('rows:Authors', 'Authors', """
+            UPDATE library_stats SET value = value + (
+                SELECT COUNT(*) FROM stats_seed s, Authors t
+                WHERE s.name = 'rows:Authors' AND t.id > MAX(?1, s.seeded_to) AND t.id <= MIN(?2, s.watermark)
+            )
+            WHERE name = 'rows:Authors'
+        """, """
+            UPDATE stats_seed SET seeded_to = MIN(?2, watermark)
+            WHERE name = 'rows:Authors' AND seeded_to < MIN(?2, watermark)
+        """),
+        Backfill('rows:Members', 'Members', """
+            UPDATE library_stats SET value = value + (
+                SELECT COUNT(*) FROM stats_seed s, Members t
+                WHERE s.name = 'rows:Members' AND t.id > MAX(?1, s.seeded_to) AND t.id <= MIN(?2, s.watermark)
+            )
+            WHERE name = 'rows:Members'
+        """, """
+            UPDATE stats_seed SET seeded_to = MIN(?2, watermark)
+            WHERE name = 'rows:Members' AND seeded_to < MIN(?2, watermark)
+        """),
+        Backfill('rows:Loans', 'Loans', """
+            UPDATE library_stats SET value = value + (
+                SELECT COUNT(*) FROM stats_seed s, Loans t
+                WHERE s.name = 'rows:Loans' AND t.id > MAX(?1, s.seeded_to) AND t.id <= MIN(?2, s.watermark)
+            )
+            WHERE name = 'rows:Loans'
+        """, """
+            UPDATE stats_seed SET seeded_to = MIN(?2, watermark)
+            WHERE name = 'rows:Loans' AND seeded_to < MIN(?2, watermark)
+        """),
+    )),
+
+    # Total copies, books per genre and authors per nationality, kept by the
+    # same triggers as the row counts (which this replaces on Books/Authors).
+    # Seeded in batched backfills up to a stats_seed watermark, like migration 8.
+    Migration(9, 'catalogue counters', [
+        "DROP TRIGGER IF EXISTS stats_books_insert",
+        "DROP TRIGGER IF EXISTS stats_books_delete",
+        "DROP TRIGGER IF EXISTS stats_authors_insert",
+        "DROP TRIGGER IF EXISTS stats_authors_delete",
+        "INSERT OR IGNORE INTO library_stats (name, value) VALUES ('copies:Books', 0)",
+        """
+        INSERT OR IGNORE INTO stats_seed (name, watermark)
+        SELECT 'counters:Books', COALESCE(MAX(id), 0) FROM Books
+        UNION ALL SELECT 'counters:Authors', COALESCE(MAX(id), 0) FROM Authors
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_books_insert AFTER INSERT ON Books
+        BEGIN
+            UPDATE library_stats SET value = value + 1 WHERE name = 'rows:Books';
+            UPDATE library_stats SET value = value + COALESCE(NEW.copies, 0) WHERE name = 'copies:Books';
+            INSERT INTO library_stats (name, value) VALUES ('genre:' || COALESCE(NEW.genre, ''), 1) ON CONFLICT(name) DO UPDATE SET value = value + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_books_delete AFTER DELETE ON Books
+        BEGIN
+            UPDATE library_stats SET value = value - 1 WHERE name = 'rows:Books';
+            UPDATE library_stats SET value = value - COALESCE(OLD.copies, 0) WHERE name = 'copies:Books';
+            UPDATE library_stats SET value = value - 1 WHERE name = 'genre:' || COALESCE(OLD.genre, '');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_books_copies_update AFTER UPDATE OF copies ON Books
+        WHEN OLD.copies IS NOT NEW.copies
+        BEGIN
+            UPDATE library_stats SET value = value + COALESCE(NEW.copies, 0) - COALESCE(OLD.copies, 0) WHERE name = 'copies:Books';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_books_genre_update AFTER UPDATE OF genre ON Books
+        WHEN OLD.genre IS NOT NEW.genre
+        BEGIN
+            UPDATE library_stats SET value = value - 1 WHERE name = 'genre:' || COALESCE(OLD.genre, '');
+            INSERT INTO library_stats (name, value) VALUES ('genre:' || COALESCE(NEW.genre, ''), 1) ON CONFLICT(name) DO UPDATE SET value = value + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_authors_insert AFTER INSERT ON Authors
+        BEGIN
+            UPDATE library_stats SET value = value + 1 WHERE name = 'rows:Authors';
+            INSERT INTO library_stats (name, value) VALUES ('nationality:' || COALESCE(NEW.nationality, ''), 1) ON CONFLICT(name) DO UPDATE SET value = value + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_authors_delete AFTER DELETE ON Authors
+        BEGIN
+            UPDATE library_stats SET value = value - 1 WHERE name = 'rows:Authors';
+            UPDATE library_stats SET value = value - 1 WHERE name = 'nationality:' || COALESCE(OLD.nationality, '');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_authors_nationality_update AFTER UPDATE OF nationality ON Authors
+        WHEN OLD.nationality IS NOT NEW.nationality
+        BEGIN
+            UPDATE library_stats SET value = value - 1 WHERE name = 'nationality:' || COALESCE(OLD.nationality, '');
+            INSERT INTO library_stats (name, value) VALUES ('nationality:' || COALESCE(NEW.nationality, ''), 1) ON CONFLICT(name) DO UPDATE SET value = value + 1;
+        END
+        """,
+    ], (
+        Backfill('copies:Books, genre:*', 'Books', """
+            UPDATE library_stats SET value = value + (
+                SELECT COALESCE(SUM(t.copies), 0) FROM stats_seed s, Books t
+                WHERE s.name = 'counters:Books' AND t.id > MAX(?1, s.seeded_to) AND t.id <= MIN(?2, s.watermark)
+            )
+            WHERE name = 'copies:Books'
+        """, """
+            INSERT INTO library_stats (name, value)
+            SELECT 'genre:' || COALESCE(t.genre, ''), COUNT(*) FROM stats_seed s, Books t
+            WHERE s.name = 'counters:Books' AND t.id > MAX(?1, s.seeded_to) AND t.id <= MIN(?2, s.watermark)
+            GROUP BY 1
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+        """, """
+            UPDATE stats_seed SET seeded_to = MIN(?2, watermark)
+            WHERE name = 'counters:Books' AND seeded_to < MIN(?2, watermark)
+        """),
+        Backfill('nationality:*', 'Authors', """
+            INSERT INTO library_stats (name, value)
+            SELECT 'nationality:' || COALESCE(t.nationality, ''), COUNT(*) FROM stats_seed s, Authors t
+            WHERE s.name = 'counters:Authors' AND t.id > MAX(?1, s.seeded_to) AND t.id <= MIN(?2, s.watermark)
+            GROUP BY 1
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+        """, """
+            UPDATE stats_seed SET seeded_to = MIN(?2, watermark)
+            WHERE name = 'counters:Authors' AND seeded_to < MIN(?2, watermark)
+        """),
+    )),
+
+    # Faceted browse: decade as a virtual column so it can be indexed, an
+    # index per filter that keeps the (title, id) page order, and the
+    # book_facets aggregate behind /api/books/facets (see book_facets.py),
+    # seeded in batched backfills up to a stats_seed watermark like the
+    # counters. Changing an author's nationality before all of their books
+    # are counted leaves drift, which StatsReconciler repairs.
+    Migration(10, 'book facets', [
+        "ALTER TABLE Books ADD COLUMN decade INTEGER GENERATED ALWAYS AS (year - year % 10) VIRTUAL",
+        "CREATE INDEX IF NOT EXISTS idx_books_genre_title_id ON Books(genre, title, id)",
+        "CREATE INDEX IF NOT EXISTS idx_books_decade_title_id ON Books(decade, title, id)",
+        "CREATE INDEX IF NOT EXISTS idx_authors_nationality_id ON Authors(nationality, id)",
+        """
+        CREATE TABLE IF NOT EXISTS book_facets (
+            genre TEXT NOT NULL,
+            decade INTEGER NOT NULL,
+            nationality TEXT NOT NULL,
+            books INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (genre, decade, nationality)
+        ) WITHOUT ROWID
+        """,
+        """
+        INSERT OR IGNORE INTO stats_seed (name, watermark)
+        SELECT 'book_facets', COALESCE(MAX(id), 0) FROM Books
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS facets_books_insert AFTER INSERT ON Books
+        BEGIN
+            INSERT INTO book_facets (genre, decade, nationality, books) VALUES (COALESCE(NEW.genre, ''), COALESCE(NEW.decade, ''), COALESCE((SELECT nationality FROM Authors WHERE id = NEW.author_id), ''), 1) ON CONFLICT(genre, decade, nationality) DO UPDATE SET books = books + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS facets_books_delete AFTER DELETE ON Books
+        BEGIN
+            UPDATE book_facets SET books = books - 1 WHERE genre = COALESCE(OLD.genre, '') AND decade = COALESCE(OLD.decade, '') AND nationality = COALESCE((SELECT nationality FROM Authors WHERE id = OLD.author_id), '');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS facets_books_update AFTER UPDATE OF genre, year, author_id ON Books
+        WHEN OLD.genre IS NOT NEW.genre OR OLD.year IS NOT NEW.year OR OLD.author_id IS NOT NEW.author_id
+        BEGIN
+            UPDATE book_facets SET books = books - 1 WHERE genre = COALESCE(OLD.genre, '') AND decade = COALESCE(OLD.decade, '') AND nationality = COALESCE((SELECT nationality FROM Authors WHERE id = OLD.author_id), '');
+            INSERT INTO book_facets (genre, decade, nationality, books) VALUES (COALESCE(NEW.genre, ''), COALESCE(NEW.decade, ''), COALESCE((SELECT nationality FROM Authors WHERE id = NEW.author_id), ''), 1) ON CONFLICT(genre, decade, nationality) DO UPDATE SET books = books + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS facets_authors_nationality_update AFTER UPDATE OF nationality ON Authors
+        WHEN OLD.nationality IS NOT NEW.nationality
+        BEGIN
+            UPDATE book_facets
+            SET books = books - (
+                SELECT COUNT(*) FROM Books b
+                WHERE b.author_id = OLD.id
+                  AND COALESCE(b.genre, '') = book_facets.genre
+                  AND COALESCE(b.decade, '') = book_facets.decade
+            )
+            WHERE nationality = COALESCE(OLD.nationality, '')
+              AND (genre, decade) IN (
+                  SELECT COALESCE(genre, ''), COALESCE(decade, '') FROM Books WHERE author_id = OLD.id
+              );
+            INSERT INTO book_facets (genre, decade, nationality, books)
+            SELECT COALESCE(genre, ''), COALESCE(decade, ''), COALESCE(NEW.nationality, ''), COUNT(*)
+            FROM Books WHERE author_id = NEW.id
+            GROUP BY 1, 2
+            ON CONFLICT(genre, decade, nationality) DO UPDATE SET books = books + excluded.books;
+        END
+        """,
+    ], (
+        Backfill('book_facets', 'Books', """
+            INSERT INTO book_facets (genre, decade, nationality, books)
+            SELECT COALESCE(b.genre, ''), COALESCE(b.decade, ''), COALESCE(a.nationality, ''), COUNT(*)
+            FROM stats_seed s
+            JOIN Books b ON b.id > MAX(?1, s.seeded_to) AND b.id <= MIN(?2, s.watermark)
+            LEFT JOIN Authors a ON a.id = b.author_id
+            WHERE s.name = 'book_facets'
+            GROUP BY 1, 2, 3
+            ON CONFLICT(genre, decade, nationality) DO UPDATE SET books = books + excluded.books
+        """, """
+            UPDATE stats_seed SET seeded_to = MIN(?2, watermark)
+            WHERE name = 'book_facets' AND seeded_to < MIN(?2, watermark)
+        """),
+    )),
+
+    # Feed of changed Books/Authors rows, so each process can drop just those
+    # rows from its record cache (change_versions.sync_record_cache) however
+    # they were written. Inserts aren't logged: missing rows aren't cached.
+    # Every 1000th entry trims the feed to its last 10000; a process that
+    # falls further behind clears its whole cache. Circulation writes get
+    # their own 'Loans' version, so a checkout no longer bumps 'Books'.
+    Migration(11, 'row changes', [
+        """
+        CREATE TABLE IF NOT EXISTS row_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS row_changes_books_update AFTER UPDATE ON Books
+        BEGIN
+            INSERT INTO row_changes (table_name, row_id) VALUES ('Books', OLD.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS row_changes_books_delete AFTER DELETE ON Books
+        BEGIN
+            INSERT INTO row_changes (table_name, row_id) VALUES ('Books', OLD.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS row_changes_authors_update AFTER UPDATE ON Authors
+        BEGIN
+            INSERT INTO row_changes (table_name, row_id) VALUES ('Authors', OLD.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS row_changes_authors_delete AFTER DELETE ON Authors
+        BEGIN
+            INSERT INTO row_changes (table_name, row_id) VALUES ('Authors', OLD.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS row_changes_trim AFTER INSERT ON row_changes
+        WHEN NEW.seq % 1000 = 0
+        BEGIN
+            DELETE FROM row_changes WHERE seq <= NEW.seq - 10000;
+        END
+        """,
+        """
+        INSERT OR IGNORE INTO change_versions (table_name, version, changed_at)
+        VALUES ('Loans', 1, (julianday('now') - 2440587.5) * 86400.0)
+        """,
+    ]),
+]
+
+
+class Migrator:
+    """Applies pending migrations to a database and reports its version"""
+
+    def __init__(self, database, migrations=MIGRATIONS):
+        """
+        Initialize Migrator with database connection
+
+        Args:
+            database (Database): Connected Database instance
+            migrations (list, optional): Migrations in ascending version order
+        """
+        self.db = database
+        self.conn = database.get_connection()
+        self.migrations = migrations
+
+    def latest_version(self):
+        """
+        Return the version of the newest known migration
+
+        Returns:
+            int: Latest migration version
+        """
+        return self.migrations[-1].version if self.migrations else 0
+
+    def _applied(self):
+        """Map applied version -> True once its backfills have completed"""
+        try:
+            rows = self.conn.execute(
+                "SELECT version, backfilled_at IS NOT NULL FROM schema_version"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # No schema_version table yet
+            return {}
+        return {version: bool(done) for version, done in rows}
+
+    def current_version(self):
+        """
+        Return the newest migration applied to the database
+
+        Returns:
+            int: Schema version (0 for an empty or unversioned database)
+        """
+        return max(self._applied(), default=0)
+
+    def pending(self):
+        """
+        List migrations whose DDL or backfills have not finished
+
+        Returns:
+            list: Migration objects in the order they will run
+        """
+        applied = self._applied()
+        return [m for m in self.migrations
+                if m.version not in applied or not applied[m.version]]
+
+    def is_current(self):
+        """
+        Check whether the database needs no migration work
+
+        Returns:
+            bool: True if every migration and backfill has been applied
+        """
+        return not self.pending()
+
+    def migrate(self, batch_size=DEFAULT_BACKFILL_BATCH_SIZE, pause=0.0):
+        """
+        Apply every pending migration, then run its backfills
+
+        Args:
+            batch_size (int, optional): Rows per backfill transaction
+            pause (float, optional): Seconds to sleep between backfill batches,
+                leaving room for other writers on a busy database
+
+        Returns:
+            bool: True if the database is up to date, False otherwise
+        """
+        pending = self.pending()
+        if not pending:
+            print(f"✓ Database schema is up to date (version {self.current_version()})")
+            return True
+
+        try:
+            self.conn.execute(SCHEMA_VERSION_TABLE)
+            self.conn.commit()
+
+            for migration in pending:
+                if self._apply(migration):
+                    print(f"✓ Applied migration {migration.version:03d}: {migration.name}")
+                for backfill in migration.backfills:
+                    rows = self._run_backfill(backfill, batch_size, pause)
+                    print(f"  - {backfill.description}: {rows} rows backfilled")
+                self.conn.execute(
+                    "UPDATE schema_version SET backfilled_at = CURRENT_TIMESTAMP WHERE version = ?",
+                    (migration.version,),
+                )
+                self.conn.commit()
+
+            print(f"✓ Database schema is up to date (version {self.current_version()})")
+            return True
+
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"✗ Error migrating database: {e}")
+            return False
+
+    def _apply(self, migration):
+        """
+        Run a migration's DDL and record it, unless another process already did
+
+        Returns:
+            bool: True if the DDL was applied by this call
+        """
+        cursor = self.conn.cursor()
+        try:
+            # Take the write lock before checking, so concurrent starters
+            # apply each migration exactly once
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT 1 FROM schema_version WHERE version = ?", (migration.version,))
+            if cursor.fetchone():
+                self.conn.rollback()
+                return False
+
+            for statement in migration.statements:
+                cursor.execute(statement)
+            # Migrations without backfills are complete as soon as they commit
+            cursor.execute("""
+                INSERT INTO schema_version (version, name, backfilled_at)
+                VALUES (?, ?, CASE WHEN ? THEN NULL ELSE CURRENT_TIMESTAMP END)
+            """, (migration.version, migration.name, bool(migration.backfills)))
+            self.conn.commit()
+            return True
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _run_backfill(self, backfill, batch_size, pause):
+        """
+        Run a backfill over its table's id range, one transaction per batch
+
+        Returns:
+            int: Number of rows written
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {backfill.table}")
+            max_id = cursor.fetchone()[0]
+
+            rows = 0
+            low = 0
+            while low < max_id:
+                high = low + batch_size
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    for statement in backfill.statements:
+                        cursor.execute(statement, (low, high))
+                        rows += cursor.rowcount
+                    self.conn.commit()
+                except sqlite3.Error:
+                    self.conn.rollback()
+                    raise
+                low = high
+                if pause:
+                    time.sleep(pause)
+            return rows
+        finally:
+            cursor.close()
+
+    def dump_schema(self):
+        """
+        Return the current schema as SQL, for keeping data/schema.sql in sync
+
+        Returns:
+            str: CREATE statements for tables, indexes and triggers
+        """
+        rows = self.conn.execute("""
+            SELECT sql FROM sqlite_master
+            WHERE sql IS NOT NULL
+              AND name NOT LIKE 'sqlite_%'
+              AND name NOT LIKE 'BookSearch_%'
+              AND name NOT LIKE 'AuthorSearch_%'
+            ORDER BY CASE type WHEN 'table' THEN 0 WHEN 'index' THEN 1 ELSE 2 END, rowid
+        """).fetchall()
+
+        statements = []
+        for (sql,) in rows:
+            # Re-indent the body by two spaces, with the closing line flush left
+            lines = sql.rstrip().splitlines()
+            if len(lines) > 2:
+                body = textwrap.indent(textwrap.dedent("\n".join(lines[1:-1])), "  ")
+                sql = "\n".join([lines[0], body, lines[-1].strip()])
+            statements.append(sql + ";")
+        return "\n\n".join(statements) + "\n"
+
+
+def main(argv=None):
+    """Command line entry point"""
+    from database import Database
+
+    parser = argparse.ArgumentParser(description="Manage the library database schema")
+    parser.add_argument('command', choices=['status', 'migrate', 'dump-schema'])
+    parser.add_argument('path', nargs='?', help="Output file for dump-schema (default: stdout)")
+    parser.add_argument('--db', default='../data/library.db', help="Database path")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BACKFILL_BATCH_SIZE,
+                        help=f"Rows per backfill transaction (default: {DEFAULT_BACKFILL_BATCH_SIZE})")
+    parser.add_argument('--pause', type=float, default=0.0,
+                        help="Seconds to sleep between backfill batches")
+    args = parser.parse_args(argv)
+
+    db = Database(args.db)
+    if not db.connect():
+        print("Failed to connect to database!")
+        return 1
+
+    try:
+        migrator = Migrator(db)
+        if args.command == 'status':
+            print(f"Schema version: {migrator.current_version()} (latest: {migrator.latest_version()})")
+            for migration in migrator.pending():
+                print(f"  pending: {migration.version:03d} {migration.name}")
+            return 0
+        if args.command == 'dump-schema':
+            schema = migrator.dump_schema()
+            if args.path:
+                with open(args.path, 'w', encoding='utf-8') as f:
+                    f.write(schema)
+                print(f"✓ Schema written to {args.path}")
+            else:
+                print(schema)
+            return 0
+        return 0 if migrator.migrate(args.batch_size, args.pause) else 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Overdue scanner for Library Management System
+Flips borrowed loans whose due date has passed to 'overdue' in small batches
+
+Usage:
+    python overdue_scanner.py run
+    python overdue_scanner.py run --full --batch-size 500
+    python overdue_scanner.py status
+    python overdue_scanner.py watch --interval 3600
+
+Each run walks idx_loans_status_due_date from the watermark left by the
+previous run (the date it ran up to) to today, so a nightly run reads only
+the loans that fell due since the night before instead of the whole Loans
+history. Batches are separate short transactions; an interrupted run leaves
+the watermark unchanged and the next run picks up the remaining rows.
+"""
+
+import argparse
+import os
+import sys
+import time
+import threading
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Name of the scanner's row in job_state
+JOB_NAME = 'overdue_scanner'
+
+# Loans examined per transaction
+DEFAULT_SCAN_BATCH_SIZE = 1000
+
+# Borrowed loans due in [since, until), after the (due_date, id) of the
+# previous batch; served in index order by idx_loans_status_due_date
+OVERDUE_CANDIDATES = """
+    SELECT id, due_date FROM Loans
+    WHERE status = 'borrowed'
+      AND due_date >= ? AND due_date < ?
+      AND (due_date, id) > (?, ?)
+    ORDER BY due_date, id
+    LIMIT ?
+"""
+
+JOB_STATE_SELECT = """
+    SELECT name, watermark, last_run_at, last_scanned, last_updated, last_duration,
+           total_runs, total_updated
+    FROM job_state WHERE name = ?
+"""
+
+JOB_STATE_UPSERT = """
+    INSERT INTO job_state (name, watermark, last_run_at, last_scanned, last_updated,
+                           last_duration, total_runs, total_updated)
+    VALUES (?1, ?2, CURRENT_TIMESTAMP, ?3, ?4, ?5, 1, ?4)
+    ON CONFLICT(name) DO UPDATE SET
+        watermark = ?2,
+        last_run_at = CURRENT_TIMESTAMP,
+        last_scanned = ?3,
+        last_updated = ?4,
+        last_duration = ?5,
+        total_runs = total_runs + 1,
+        total_updated = total_updated + ?4
+"""
+
+
+class OverdueScanner:
+    """
+    Marks loans past their due date as overdue
+
+    Silent like the repositories: returns run statistics and lets sqlite3
+    errors propagate. The CLI below and the API print or serialize them.
+    """
+
+    def __init__(self, database, batch_size=DEFAULT_SCAN_BATCH_SIZE, pause=0.0):
+        """
+        Initialize OverdueScanner with database connection
+
+        Args:
+            database (Database): Database instance
+            batch_size (int, optional): Loans examined per transaction
+            pause (float, optional): Seconds to sleep between batches
+        """
+        self.db = database
+        self.conn = database.get_connection()
+        self.batch_size = batch_size
+        self.pause = pause
+
+    def get_state(self):
+        """
+        Read the scanner's watermark and last-run metrics
+
+        Returns:
+            dict: job_state columns, or None if the scanner has never run
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(JOB_STATE_SELECT, (JOB_NAME,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            columns = [description[0] for description in cursor.description]
+            return dict(zip(columns, row))
+        finally:
+            cursor.close()
+
+    def run(self, as_of=None, full=False):
+        """
+        Mark every borrowed loan due before `as_of` as overdue
+
+        Args:
+            as_of (str, optional): Cut-off date (YYYY-MM-DD); loans due before
+                it are overdue. Defaults to today (UTC, like checkout dates)
+            full (bool, optional): Ignore the watermark and scan every borrowed
+                loan, e.g. after due dates were edited by hand
+
+        Returns:
+            dict: {'since', 'until', 'scanned', 'updated', 'batches', 'seconds'}
+        """
+        started = time.perf_counter()
+        cursor = self.conn.cursor()
+        try:
+            if as_of is None:
+                cursor.execute("SELECT date('now')")
+                as_of = cursor.fetchone()[0]
+
+            state = self.get_state()
+            watermark = state['watermark'] if state else None
+            # '' sorts before every date, so a first or full run scans all borrowed loans
+            since = '' if full or not watermark else min(watermark, as_of)
+
+            stats = {'since': since or None, 'until': as_of,
+                     'scanned': 0, 'updated': 0, 'batches': 0}
+            after = (since, 0)
+
+            while True:
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor.execute(OVERDUE_CANDIDATES, (since, as_of, after[0], after[1], self.batch_size))
+                    rows = cursor.fetchall()
+                    if rows:
+                        ids = [row[0] for row in rows]
+                        placeholders = ', '.join('?' * len(ids))
+                        cursor.execute(f"""
+                            UPDATE Loans SET status = 'overdue'
+                            WHERE id IN ({placeholders}) AND status = 'borrowed'
+                        """, ids)
+                        stats['updated'] += cursor.rowcount
+                    self.conn.commit()
+                except BaseException:
+                    self.conn.rollback()
+                    raise
+
+                stats['scanned'] += len(rows)
+                if not rows:
+                    break
+                stats['batches'] += 1
+                after = (rows[-1][1], rows[-1][0])
+                if len(rows) < self.batch_size:
+                    break
+                if self.pause:
+                    time.sleep(self.pause)
+
+            stats['seconds'] = round(time.perf_counter() - started, 6)
+
+            # Only a completed run moves the watermark forward
+            cursor.execute(JOB_STATE_UPSERT, (JOB_NAME, max(as_of, watermark or ''),
+                                              stats['scanned'], stats['updated'], stats['seconds']))
+            self.conn.commit()
+            return stats
+        finally:
+            cursor.close()
+
+
+class BackgroundOverdueScanner:
+    """
+    Runs OverdueScanner on a daemon thread every `interval` seconds
+
+    Each pass leases its own connection from the Database pool, so it never
+    shares a connection with request handlers.
+    """
+
+    def __init__(self, database, interval, batch_size=DEFAULT_SCAN_BATCH_SIZE):
+        """
+        Initialize BackgroundOverdueScanner
+
+        Args:
+            database (Database): Shared Database that owns the connection pool
+            interval (float): Seconds between runs
+            batch_size (int, optional): Loans examined per transaction
+        """
+        self.database = database
+        self.interval = interval
+        self.batch_size = batch_size
+        self.last_stats = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the scanner thread (runs once immediately, then every interval)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='overdue-scanner', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Ask the thread to stop and wait for the current run to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        """Thread body"""
+        while not self._stop.is_set():
+            try:
+                with self.database.lease() as db:
+                    self.last_stats = OverdueScanner(db, self.batch_size).run()
+                self.last_error = None
+            except Exception as e:
+                # Keep the thread alive; the next interval retries
+                self.last_error = str(e)
+            self._stop.wait(self.interval)
+
+
+def print_stats(stats):
+    """Print the result of one scanner run"""
+    window = f"{stats['since']} to {stats['until']}" if stats['since'] else f"before {stats['until']}"
+    print(f"✓ Overdue scan ({window}): {stats['scanned']} loans scanned, "
+          f"{stats['updated']} marked overdue in {stats['seconds']:.3f}s")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    from database import Database
+
+    parser = argparse.ArgumentParser(description="Mark loans past their due date as overdue")
+    parser.add_argument('command', choices=['run', 'status', 'watch'])
+    parser.add_argument('--db', default='../data/library.db', help="Database path")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_SCAN_BATCH_SIZE,
+                        help=f"Loans per transaction (default: {DEFAULT_SCAN_BATCH_SIZE})")
+    parser.add_argument('--pause', type=float, default=0.0,
+                        help="Seconds to sleep between batches")
+    parser.add_argument('--as-of', help="Cut-off date YYYY-MM-DD (default: today)")
+    parser.add_argument('--full', action='store_true',
+                        help="Ignore the watermark and scan every borrowed loan")
+    parser.add_argument('--interval', type=float, default=3600,
+                        help="Seconds between runs for watch (default: 3600)")
+    args = parser.parse_args(argv)
+
+    db = Database(args.db)
+    if not db.connect():
+        print("Failed to connect to database!")
+        return 1
+    db.create_tables()
+
+    try:
+        scanner = OverdueScanner(db, args.batch_size, args.pause)
+        if args.command == 'status':
+            state = scanner.get_state()
+            if state is None:
+                print("Overdue scanner has not run yet")
+            else:
+                print(f"Watermark: {state['watermark']} (last run {state['last_run_at']} UTC)")
+                print(f"  last run: {state['last_scanned']} scanned, {state['last_updated']} marked overdue "
+                      f"in {state['last_duration']:.3f}s")
+                print(f"  total: {state['total_runs']} runs, {state['total_updated']} marked overdue")
+            return 0
+
+        if args.command == 'run':
+            print_stats(scanner.run(args.as_of, args.full))
+            return 0
+
+        while True:
+            print_stats(scanner.run())
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,483 @@
+"""
+Query statistics for Library Management System
+Times every SQL statement run on Database connections, aggregates them by
+normalized-SQL fingerprint and keeps a log of slow statements with their
+query plans
+
+Connections opened by Database use InstrumentedConnection, so repositories,
+managers and the API are covered without changes. A statement's time runs
+from execute() until its cursor is exhausted, re-executed or closed, so
+rows fetched lazily are included. Parameters are never stored: fingerprints
+replace literals with ?, and slow-log entries carry only the normalized SQL.
+Recording costs a few microseconds per statement; Database(instrument=False)
+(LIBRARY_QUERY_STATS=0 for the API) turns it off.
+"""
+
+import re
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+
+# Statements slower than this are written to the slow-query log
+DEFAULT_SLOW_QUERY_MS = 100.0
+
+# Slow statements kept in memory for the stats endpoint
+SLOW_LOG_SIZE = 100
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+
+# Distinct call sites remembered per fingerprint
+MAX_CALLERS = 10
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Statements EXPLAIN QUERY PLAN can describe
+_EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql):
+    """
+    Reduce a statement to its shape: no comments, literals or extra whitespace
+
+    Args:
+        sql (str): SQL statement
+
+    Returns:
+        str: Normalized statement; "IN (?, ?, ?)" lists collapse to "IN (?+)"
+             so chunked lookups of any size share one fingerprint
+    """
+    sql = _COMMENTS.sub(' ', sql)
+    sql = _STRINGS.sub('?', sql)
+    sql = _NUMBERS.sub('?', sql)
+    sql = _WHITESPACE.sub(' ', sql).strip()
+    return _PLACEHOLDER_LISTS.sub('(?+)', sql)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """
+    Stable short id of a statement's normalized form
+
+    Args:
+        sql (str): SQL statement
+
+    Returns:
+        str: 16 hex characters
+    """
+    return hashlib.blake2b(normalize_sql(sql).encode('utf-8'), digest_size=8).hexdigest()
+
+
+# Generic repository helpers skipped when looking for the calling method
+_HELPER_FUNCTIONS = {'_fetchall', '_fetchone', '_write'}
+
+
+def _caller():
+    """'file.py:line function' of the first frame outside this module, sqlite3 and the helpers"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename
+        if filename != __file__ and 'sqlite3' not in filename and code.co_name not in _HELPER_FUNCTIONS:
+            return f"{filename.rsplit('/', 1)[-1]}:{frame.f_lineno} {code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class QueryStats:
+    """
+    Thread-safe aggregates of statement timings, keyed by fingerprint
+
+    Every entry keeps a call count, error count, total/max time, rows
+    returned or changed, a fixed-bucket latency histogram and the call sites
+    that issued it. Statements over slow_query_ms also go to a bounded
+    in-memory log (and, with log_path, to a JSON-lines file) together with
+    their EXPLAIN QUERY PLAN.
+    """
+
+    def __init__(self, slow_query_ms=DEFAULT_SLOW_QUERY_MS, log_path=None):
+        """
+        Initialize QueryStats
+
+        Args:
+            slow_query_ms (float, optional): Slow-query threshold in
+                milliseconds (None disables the slow-query log)
+            log_path (str, optional): File that slow-query entries are
+                appended to as JSON lines
+        """
+        self.slow_query_ms = slow_query_ms
+        self.log_path = log_path
+        self.started_at = time.time()
+        self._entries = {}
+        self._slow = deque(maxlen=SLOW_LOG_SIZE)
+        self._lock = threading.Lock()
+
+    def record(self, sql, seconds, rows, caller, error=False, conn=None, parameters=None):
+        """
+        Add one finished statement
+
+        Args:
+            sql (str): Statement as executed
+            seconds (float): Time from execute() to the last fetch
+            rows (int): Rows fetched (queries) or changed (writes)
+            caller (str): Call site from _caller()
+            error (bool, optional): Whether the statement raised
+            conn (sqlite3.Connection, optional): Connection for EXPLAIN of a
+                slow statement
+            parameters (optional): Parameters for EXPLAIN (never stored)
+        """
+        key = fingerprint(sql)
+        elapsed_ms = seconds * 1000
+        bucket = bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {
+                    'fingerprint': key,
+                    'sql': normalize_sql(sql),
+                    'count': 0,
+                    'errors': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'rows': 0,
+                    'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                    'callers': {},
+                    'slow': 0,
+                }
+            entry['count'] += 1
+            entry['errors'] += error
+            entry['total_ms'] += elapsed_ms
+            entry['rows'] += rows
+            entry['buckets'][bucket] += 1
+            if elapsed_ms > entry['max_ms']:
+                entry['max_ms'] = elapsed_ms
+            callers = entry['callers']
+            if caller in callers or len(callers) < MAX_CALLERS:
+                callers[caller] = callers.get(caller, 0) + 1
+            slow = self.slow_query_ms is not None and elapsed_ms >= self.slow_query_ms
+            if slow:
+                entry['slow'] += 1
+
+        if slow:
+            self._log_slow(entry, sql, elapsed_ms, rows, caller, error, conn, parameters)
+
+    def _log_slow(self, entry, sql, elapsed_ms, rows, caller, error, conn, parameters):
+        """Explain a slow statement and add it to the slow-query log"""
+        plan = None
+        if conn is not None and entry['sql'].split(' ', 1)[0].upper() in _EXPLAINABLE:
+            try:
+                # A plain cursor, so the EXPLAIN itself isn't recorded
+                cursor = sqlite3.Cursor(conn)
+                try:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {sql}",
+                                   parameters if parameters is not None else ())
+                    plan = [row[3] for row in cursor.fetchall()]
+                finally:
+                    cursor.close()
+            except (sqlite3.Error, ValueError):
+                plan = None
+
+        record = {
+            'at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'ms': round(elapsed_ms, 3),
+            'fingerprint': entry['fingerprint'],
+            'sql': entry['sql'],
+            'rows': rows,
+            'caller': caller,
+            'error': error,
+            'plan': plan,
+        }
+        with self._lock:
+            self._slow.append(record)
+            entry['plan'] = plan
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+            except OSError:
+                pass
+
+    def snapshot(self, limit=20, sort='total_ms'):
+        """
+        Aggregates of the heaviest statements
+
+        Args:
+            limit (int, optional): Number of fingerprints to return
+            sort (str, optional): total_ms, mean_ms, max_ms, count, rows or errors
+
+        Returns:
+            list: One dict per fingerprint with count, errors, total/mean/max
+                  ms, p50/p95/p99 ms (bucket upper bounds), rows,
+                  rows_per_call, histogram, callers and the last slow plan
+        """
+        with self._lock:
+            entries = [dict(entry, buckets=list(entry['buckets']), callers=dict(entry['callers']))
+                       for entry in self._entries.values()]
+
+        results = []
+        for entry in entries:
+            count = entry['count']
+            results.append({
+                'fingerprint': entry['fingerprint'],
+                'sql': entry['sql'],
+                'count': count,
+                'errors': entry['errors'],
+                'slow': entry['slow'],
+                'total_ms': round(entry['total_ms'], 3),
+                'mean_ms': round(entry['total_ms'] / count, 4),
+                'max_ms': round(entry['max_ms'], 3),
+                'p50_ms': _bucket_percentile(entry['buckets'], 0.50),
+                'p95_ms': _bucket_percentile(entry['buckets'], 0.95),
+                'p99_ms': _bucket_percentile(entry['buckets'], 0.99),
+                'rows': entry['rows'],
+                'rows_per_call': round(entry['rows'] / count, 2),
+                'histogram': _histogram(entry['buckets']),
+                'callers': dict(sorted(entry['callers'].items(), key=lambda item: -item[1])),
+                'plan': entry.get('plan'),
+            })
+        results.sort(key=lambda item: item.get(sort, 0), reverse=True)
+        return results[:limit]
+
+    def histograms(self):
+        """
+        Raw per-fingerprint histograms for metrics exporters
+
+        Returns:
+            list: (fingerprint, count, total_ms, cumulative bucket counts)
+        """
+        with self._lock:
+            return [(entry['fingerprint'], entry['count'], entry['total_ms'], _cumulative(entry['buckets']))
+                    for entry in self._entries.values()]
+
+    def slow_queries(self):
+        """
+        Recent slow statements, newest first
+
+        Returns:
+            list: Slow-log entries
+        """
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def totals(self):
+        """
+        Overall counters
+
+        Returns:
+            dict: fingerprints, statements, errors, slow, total_ms and the
+                  seconds since the counters started
+        """
+        with self._lock:
+            return {
+                'fingerprints': len(self._entries),
+                'statements': sum(entry['count'] for entry in self._entries.values()),
+                'errors': sum(entry['errors'] for entry in self._entries.values()),
+                'slow': sum(entry['slow'] for entry in self._entries.values()),
+                'total_ms': round(sum(entry['total_ms'] for entry in self._entries.values()), 3),
+                'since_seconds': round(time.time() - self.started_at, 1),
+            }
+
+    def reset(self):
+        """Drop every aggregate and the slow-query log"""
+        with self._lock:
+            self._entries.clear()
+            self._slow.clear()
+            self.started_at = time.time()
+
+
+def _cumulative(buckets):
+    """Running totals of per-bucket counts"""
+    total = 0
+    cumulative = []
+    for count in buckets:
+        total += count
+        cumulative.append(total)
+    return cumulative
+
+
+def _histogram(buckets):
+    """{'<=bound ms': count} for the non-empty buckets"""
+    labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+    return {label: count for label, count in zip(labels, buckets) if count}
+
+
+def _bucket_percentile(buckets, fraction):
+    """Upper bound (ms) of the bucket holding the given fraction of calls"""
+    total = sum(buckets)
+    if not total:
+        return None
+    target = fraction * total
+    running = 0
+    for index, count in enumerate(buckets):
+        running += count
+        if running >= target:
+            return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else None
+    return None
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor that reports every statement it runs to the connection's QueryStats
+
+    A query stays open while rows are fetched; it is recorded when the cursor
+    runs out of rows, executes the next statement, is closed or is garbage
+    collected. Writes and DDL are recorded as soon as execute() returns.
+    """
+
+    _pending = None
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        return self._run(super().executemany, sql, seq_of_parameters, explain=False)
+
+    def executescript(self, sql_script):
+        self._finish()
+        return self._run(super().executescript, sql_script, None, explain=False)
+
+    def _run(self, method, sql, parameters, explain=True):
+        """Run a statement and record it now (writes) or leave it pending (queries)"""
+        caller = _caller()
+        start = time.perf_counter()
+        try:
+            if parameters is None:
+                method(sql)
+            else:
+                method(sql, parameters)
+        except sqlite3.Error:
+            self.connection.query_stats.record(sql, time.perf_counter() - start, 0, caller, error=True)
+            raise
+        elapsed = time.perf_counter() - start
+
+        params = parameters if explain else None
+        if self.description is None:
+            self.connection.query_stats.record(
+                sql, elapsed, max(self.rowcount, 0), caller,
+                conn=self.connection if explain else None, parameters=params)
+        else:
+            self._pending = [sql, elapsed, 0, caller, params if explain else False]
+        return self
+
+    def _finish(self):
+        """Record the pending query, if any"""
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            sql, elapsed, rows, caller, params = pending
+            self.connection.query_stats.record(
+                sql, elapsed, rows, caller,
+                conn=None if params is False else self.connection,
+                parameters=None if params is False else params)
+
+    def fetchone(self):
+        pending = self._pending
+        if pending is None:
+            return super().fetchone()
+        start = time.perf_counter()
+        row = super().fetchone()
+        pending[1] += time.perf_counter() - start
+        if row is None:
+            self._finish()
+        else:
+            pending[2] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        pending = self._pending
+        size = self.arraysize if size is None else size
+        if pending is None:
+            return super().fetchmany(size)
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        pending[1] += time.perf_counter() - start
+        pending[2] += len(rows)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        pending = self._pending
+        if pending is None:
+            return super().fetchall()
+        start = time.perf_counter()
+        rows = super().fetchall()
+        pending[1] += time.perf_counter() - start
+        pending[2] += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        pending = self._pending
+        if pending is None:
+            return super().__next__()
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            pending[1] += time.perf_counter() - start
+            self._finish()
+            raise
+        pending[1] += time.perf_counter() - start
+        pending[2] += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """
+    Connection whose cursors (including the implicit ones behind
+    Connection.execute) are InstrumentedCursors reporting to query_stats
+    """
+
+    query_stats = None
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    # sqlite3's shortcut methods run on a C-level cursor and would skip the
+    # instrumented execute(), so route them through cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    # Commits are timed too: with synchronous=FULL the fsync happens here
+    def commit(self):
+        caller = _caller()
+        start = time.perf_counter()
+        super().commit()
+        self.query_stats.record("COMMIT", time.perf_counter() - start, 0, caller)
+
+    def rollback(self):
+        caller = _caller()
+        start = time.perf_counter()
+        super().rollback()
+        self.query_stats.record("ROLLBACK", time.perf_counter() - start, 0, caller)
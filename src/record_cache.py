@@ -0,0 +1,151 @@
+"""
+Record cache for Library Management System
+Thread-safe, size-bounded LRU cache with a TTL for rows looked up by id
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+
+# Defaults used by Database; LIBRARY_CACHE_SIZE / LIBRARY_CACHE_TTL override them in the API
+DEFAULT_RECORD_CACHE_SIZE = 10000
+DEFAULT_RECORD_CACHE_TTL = 60.0
+
+
+class RecordCache:
+    """
+    LRU cache of database rows keyed by (kind, id), e.g. ('book', 42)
+
+    Rows are cached by get_or_load() and dropped by invalidate() after the
+    write that changed them commits. Every invalidation bumps a generation
+    counter; a load that overlapped an invalidation is returned but not
+    stored, so a row read just before a write commits can't be cached after
+    that write invalidated it.
+
+    Writes from other processes (a prefork worker, the CLI, an import) reach
+    this cache through change_versions.sync_record_cache, which drops the rows
+    named in the row_changes feed past change_seq; until the next sync the TTL
+    bounds how long such a row can be served stale. A hit never touches
+    SQLite. A max_size of 0 disables caching.
+    """
+
+    def __init__(self, max_size=DEFAULT_RECORD_CACHE_SIZE, ttl=DEFAULT_RECORD_CACHE_TTL):
+        """
+        Initialize RecordCache
+
+        Args:
+            max_size (int, optional): Maximum number of cached rows (0 disables)
+            ttl (float, optional): Seconds a cached row stays valid
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        # Last row_changes entry applied by sync_record_cache (None: never synced)
+        self.change_seq = None
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached row for key, or load, cache and return it
+
+        Args:
+            key (tuple): Cache key
+            loader (callable): Called with no arguments on a miss; returns the
+                row or None (None is not cached)
+
+        Returns:
+            The cached or loaded row
+        """
+        if self.max_size <= 0:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+
+        if value is not None:
+            with self._lock:
+                if self._generation == generation:
+                    self._entries[key] = (value, time.monotonic() + self.ttl)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+        return value
+
+    def invalidate(self, *keys):
+        """
+        Drop rows from the cache
+
+        Args:
+            *keys (tuple): Cache keys to drop (missing keys are ignored)
+        """
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def invalidate_where(self, kind, predicate):
+        """
+        Drop every cached row of one kind that matches a predicate
+
+        Args:
+            kind (str): First element of the keys to check, e.g. 'book'
+            predicate (callable): Called with a cached row; True drops it
+        """
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, (value, _) in self._entries.items()
+                     if key[0] == kind and predicate(value)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        """Drop every cached row"""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Snapshot of the cache counters
+
+        Returns:
+            dict: size, max_size, ttl, hits, misses, hit_ratio, evictions,
+                  expirations and invalidations
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
@@ -0,0 +1,207 @@
+"""
+Record types for Library Management System
+Compact, slotted Book, Author, Loan and Member rows
+
+Repositories build them straight from SQLite with a cursor row factory
+(cursor.row_factory = Book.from_row), and the API serializes them straight
+to JSON with to_dict() (see api/json_provider.py), so a row is materialized
+once instead of as a tuple and again as a dict per layer.
+
+Records still behave like the row tuples they replace: they unpack
+(book_id, title, ... = book), index (book[1]) and compare equal to the
+tuple of their values, so positional callers keep working. Like tuples they
+are immutable, so a record shared through the record cache cannot be
+changed by one of its readers.
+"""
+
+from operator import attrgetter
+
+# Sets a slot of a record being built (records refuse attribute assignment)
+_set = object.__setattr__
+
+
+class Record:
+    """
+    Base of the slotted row types: subclasses list their columns, in SELECT
+    order, as __slots__
+    """
+
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._values = attrgetter(*cls.__slots__)
+
+    @classmethod
+    def from_row(cls, cursor, row):
+        """
+        sqlite3 row factory building a record from a SELECT row
+
+        Args:
+            cursor (sqlite3.Cursor): Cursor that fetched the row
+            row (tuple): Column values in __slots__ order
+
+        Returns:
+            Record: New record
+        """
+        return cls(*row)
+
+    def astuple(self):
+        """
+        Return the column values as a tuple
+
+        Returns:
+            tuple: Values in column order
+        """
+        return self._values(self)
+
+    def to_dict(self):
+        """
+        Return the record as a JSON-friendly dict
+
+        Returns:
+            dict: Column name -> value, in column order
+        """
+        return dict(zip(self.__slots__, self._values(self)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} records are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} records are immutable")
+
+    def __reduce__(self):
+        return type(self), self.astuple()
+
+    def __iter__(self):
+        return iter(self._values(self))
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __getitem__(self, index):
+        return self._values(self)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.astuple() == other.astuple()
+        if isinstance(other, tuple):
+            return self.astuple() == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.astuple())
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={value!r}" for name, value in zip(self.__slots__, self._values(self)))
+        return f"{type(self).__name__}({fields})"
+
+
+class Book(Record):
+    """Book row joined with its author's name (repositories' BOOK_SELECT)"""
+
+    __slots__ = ('id', 'title', 'isbn', 'year', 'genre', 'copies', 'author_id', 'author_name',
+                 'available_copies')
+
+    def __init__(self, id, title, isbn, year=None, genre=None, copies=1, author_id=None,
+                 author_name=None, available_copies=None):
+        _set(self, 'id', id)
+        _set(self, 'title', title)
+        _set(self, 'isbn', isbn)
+        _set(self, 'year', year)
+        _set(self, 'genre', genre)
+        _set(self, 'copies', copies)
+        _set(self, 'author_id', author_id)
+        _set(self, 'author_name', author_name)
+        _set(self, 'available_copies', available_copies)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'isbn': self.isbn,
+            'year': self.year,
+            'genre': self.genre,
+            'copies': self.copies,
+            'author_id': self.author_id,
+            'author_name': self.author_name,
+            'available_copies': self.available_copies,
+        }
+
+
+class Author(Record):
+    """Author row (AUTHOR_SELECT)"""
+
+    __slots__ = ('id', 'name', 'birth_year', 'nationality')
+
+    def __init__(self, id, name, birth_year=None, nationality=None):
+        _set(self, 'id', id)
+        _set(self, 'name', name)
+        _set(self, 'birth_year', birth_year)
+        _set(self, 'nationality', nationality)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'birth_year': self.birth_year,
+            'nationality': self.nationality,
+        }
+
+
+class Loan(Record):
+    """Loan row joined with the book title and member name (LOAN_SELECT)"""
+
+    __slots__ = ('id', 'book_id', 'book_title', 'member_id', 'member_name', 'loan_date',
+                 'due_date', 'return_date', 'status', 'renewals')
+
+    def __init__(self, id, book_id, book_title, member_id, member_name, loan_date, due_date,
+                 return_date=None, status='borrowed', renewals=0):
+        _set(self, 'id', id)
+        _set(self, 'book_id', book_id)
+        _set(self, 'book_title', book_title)
+        _set(self, 'member_id', member_id)
+        _set(self, 'member_name', member_name)
+        _set(self, 'loan_date', loan_date)
+        _set(self, 'due_date', due_date)
+        _set(self, 'return_date', return_date)
+        _set(self, 'status', status)
+        _set(self, 'renewals', renewals)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'book_id': self.book_id,
+            'book_title': self.book_title,
+            'member_id': self.member_id,
+            'member_name': self.member_name,
+            'loan_date': self.loan_date,
+            'due_date': self.due_date,
+            'return_date': self.return_date,
+            'status': self.status,
+            'renewals': self.renewals,
+        }
+
+
+class Member(Record):
+    """Member row (MEMBER_SELECT)"""
+
+    __slots__ = ('id', 'name', 'email', 'phone', 'membership_date', 'status')
+
+    def __init__(self, id, name, email, phone=None, membership_date=None, status='active'):
+        _set(self, 'id', id)
+        _set(self, 'name', name)
+        _set(self, 'email', email)
+        _set(self, 'phone', phone)
+        _set(self, 'membership_date', membership_date)
+        _set(self, 'status', status)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'email': self.email,
+            'phone': self.phone,
+            'membership_date': self.membership_date,
+            'status': self.status,
+        }
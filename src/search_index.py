@@ -0,0 +1,225 @@
+"""
+Search Index module for Library Management System
+Maintains SQLite FTS5 full-text indexes over books and authors
+"""
+
+import re
+import sqlite3
+import contextlib
+from records import Book, Author
+
+
+# Per-row sync trigger for new books, as created by migration 3 (see
+# migrations.py); bulk loads swap it for a set-based insert and recreate it
+BOOK_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS books_search_insert AFTER INSERT ON Books
+    BEGIN
+        INSERT INTO BookSearch (rowid, title, genre, isbn, author_name)
+        VALUES (NEW.id, NEW.title, NEW.genre, NEW.isbn,
+                (SELECT name FROM Authors WHERE id = NEW.author_id));
+    END
+"""
+
+# The same for new authors
+AUTHOR_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS authors_search_insert AFTER INSERT ON Authors
+    BEGIN
+        INSERT INTO AuthorSearch (rowid, name) VALUES (NEW.id, NEW.name);
+    END
+"""
+
+# bm25 column weights for BookSearch: title, genre, isbn, author_name
+BOOK_RANK_WEIGHTS = (10.0, 2.0, 1.0, 5.0)
+
+# Ranked search queries; parameters are (MATCH expression, limit)
+BOOK_SEARCH_QUERY = f"""
+    SELECT b.id, b.title, b.isbn, b.year, b.genre, b.copies, b.author_id, a.name AS author_name,
+           b.available_copies
+    FROM BookSearch
+    JOIN Books b ON b.id = BookSearch.rowid
+    LEFT JOIN Authors a ON b.author_id = a.id
+    WHERE BookSearch MATCH ?
+    ORDER BY bm25(BookSearch, {", ".join(str(w) for w in BOOK_RANK_WEIGHTS)}), b.title
+    LIMIT ?
+"""
+
+AUTHOR_SEARCH_QUERY = """
+    SELECT a.id, a.name, a.birth_year, a.nationality
+    FROM AuthorSearch
+    JOIN Authors a ON a.id = AuthorSearch.rowid
+    WHERE AuthorSearch MATCH ?
+    ORDER BY bm25(AuthorSearch), a.name
+    LIMIT ?
+"""
+
+# Default and maximum number of results returned by a search
+DEFAULT_SEARCH_LIMIT = 50
+MAX_SEARCH_LIMIT = 500
+
+
+def build_match_query(search_term):
+    """
+    Turn free text into an FTS5 MATCH expression
+
+    Every word becomes a quoted prefix term, and all terms must match:
+    "orwell 19" -> '"orwell"* "19"*'
+
+    Args:
+        search_term (str): Text typed by the user
+
+    Returns:
+        str: MATCH expression, or None if the text has no searchable words
+    """
+    tokens = re.findall(r"\w+", search_term or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class SearchIndex:
+    """Manages the FTS5 search tables for books and authors"""
+
+    def __init__(self, database):
+        """
+        Initialize SearchIndex with database connection
+
+        Args:
+            database (Database): Database instance
+        """
+        self.db = database
+        self.conn = database.get_connection()
+        self._available = None
+
+    def is_available(self):
+        """
+        Check whether the search tables exist in this database
+
+        Returns:
+            bool: True if BookSearch and AuthorSearch can be queried
+        """
+        if self._available is None:
+            try:
+                rows = self.conn.execute("""
+                    SELECT COUNT(*) FROM sqlite_master
+                    WHERE type = 'table' AND name IN ('BookSearch', 'AuthorSearch')
+                """).fetchone()
+                self._available = rows[0] == 2
+            except sqlite3.Error:
+                self._available = False
+        return self._available
+
+    def rebuild(self):
+        """
+        Repopulate both search tables from Books and Authors
+
+        Raises:
+            sqlite3.Error: If the rebuild fails (it is rolled back)
+        """
+        try:
+            self.conn.execute("DELETE FROM BookSearch")
+            self.conn.execute("""
+                INSERT INTO BookSearch (rowid, title, genre, isbn, author_name)
+                SELECT b.id, b.title, b.genre, b.isbn, a.name
+                FROM Books b
+                LEFT JOIN Authors a ON b.author_id = a.id
+            """)
+            self.conn.execute("DELETE FROM AuthorSearch")
+            self.conn.execute("""
+                INSERT INTO AuthorSearch (rowid, name)
+                SELECT id, name FROM Authors
+            """)
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+    @contextlib.contextmanager
+    def deferred_book_indexing(self):
+        """
+        Index books inserted inside the block with one set-based statement
+        instead of the per-row trigger (much faster for bulk loads)
+
+        Must be used inside an explicit transaction: the trigger is dropped
+        and recreated within it, so a rollback restores it untouched. If the
+        block raises, nothing is indexed and the caller must roll back.
+        """
+        if not self.is_available():
+            yield
+            return
+
+        last_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM Books").fetchone()[0]
+        self.conn.execute("DROP TRIGGER IF EXISTS books_search_insert")
+        yield
+        self.conn.execute("""
+            INSERT INTO BookSearch (rowid, title, genre, isbn, author_name)
+            SELECT b.id, b.title, b.genre, b.isbn, a.name
+            FROM Books b
+            LEFT JOIN Authors a ON b.author_id = a.id
+            WHERE b.id > ?
+        """, (last_id,))
+        self.conn.execute(BOOK_INSERT_TRIGGER)
+
+    @contextlib.contextmanager
+    def deferred_author_indexing(self):
+        """
+        Index authors inserted inside the block with one set-based statement
+        instead of the per-row trigger; same rules as deferred_book_indexing
+        """
+        if not self.is_available():
+            yield
+            return
+
+        last_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM Authors").fetchone()[0]
+        self.conn.execute("DROP TRIGGER IF EXISTS authors_search_insert")
+        yield
+        self.conn.execute("""
+            INSERT INTO AuthorSearch (rowid, name)
+            SELECT id, name FROM Authors WHERE id > ?
+        """, (last_id,))
+        self.conn.execute(AUTHOR_INSERT_TRIGGER)
+
+    def search_books(self, search_term, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Ranked, prefix-matching search over title, genre, ISBN and author name
+
+        Args:
+            search_term (str): Text to search for
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: Book records, best match first
+        """
+        match = build_match_query(search_term)
+        if match is None:
+            return []
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.row_factory = Book.from_row
+            cursor.execute(BOOK_SEARCH_QUERY, (match, limit))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def search_authors(self, search_term, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Ranked, prefix-matching search over author names
+
+        Args:
+            search_term (str): Text to search for
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: Author records, best match first
+        """
+        match = build_match_query(search_term)
+        if match is None:
+            return []
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.row_factory = Author.from_row
+            cursor.execute(AUTHOR_SEARCH_QUERY, (match, limit))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
@@ -149,23 +149,26 @@ def seed_database():
     author_mgr = AuthorManager(db)
     book_mgr = BookManager(db)
 
-    # Insert authors
+    # Insert authors that aren't in the database yet
     print("\n--- Adding Authors ---")
-    author_ids = []
-    for name, birth_year, nationality in AUTHORS:
-        aid = author_mgr.add_author(name, birth_year, nationality)
-        author_ids.append(aid)
-    print(f"\nAdded {len(author_ids)} authors")
+    author_ids = author_mgr.get_author_id_map()
+    author_mgr.bulk_add_authors(
+        {'name': name, 'birth_year': birth_year, 'nationality': nationality}
+        for name, birth_year, nationality in AUTHORS
+        if name not in author_ids
+    )
+    author_ids = author_mgr.get_author_id_map()
 
     # Insert 100 books
     print("\n--- Adding 100 Books ---")
-    added = 0
-    for title, isbn, year, genre, copies, author_idx in BOOKS:
-        author_id = author_ids[author_idx] if author_idx < len(author_ids) else None
-        if book_mgr.add_book(title, isbn, year, genre, copies, author_id):
-            added += 1
+    books = [
+        {'title': title, 'isbn': isbn, 'year': year, 'genre': genre,
+         'copies': copies, 'author': AUTHORS[author_idx][0]}
+        for title, isbn, year, genre, copies, author_idx in BOOKS
+    ]
+    report = book_mgr.bulk_add_books(books, author_ids=author_ids)
 
-    print(f"\nDone: {added} books added, {author_mgr.get_author_count()} authors, {book_mgr.get_book_count()} books total.")
+    print(f"\nDone: {report['inserted']} books added, {author_mgr.get_author_count()} authors, {book_mgr.get_book_count()} books total.")
     db.close()
     return True
 
@@ -4,6 +4,7 @@
  */
 
 const API_BASE_URL = 'http://localhost:5001/api';
+const PAGE_SIZE = 500;
 
 /**
  * Generic fetch wrapper with error handling
@@ -31,15 +32,48 @@ async function apiRequest(url, options = {}) {
     }
 }
 
+/**
+ * Fetch one page of a keyset-paginated collection
+ */
+async function fetchPage(url, limit = PAGE_SIZE, after = null) {
+    const params = new URLSearchParams({ limit });
+    if (after) {
+        params.set('after', after);
+    }
+    return apiRequest(`${url}?${params}`);
+}
+
+/**
+ * Fetch every page of a collection by following next_cursor
+ */
+async function fetchAllPages(url) {
+    const items = [];
+    let cursor = null;
+    do {
+        const page = await fetchPage(url, PAGE_SIZE, cursor);
+        items.push(...page.data);
+        cursor = page.next_cursor;
+    } while (cursor);
+
+    return { success: true, data: items };
+}
+
 /**
  * Book API methods
  */
 const BooksAPI = {
     /**
-     * Get all books
+     * Get all books (fetched page by page)
      */
     async getAll() {
-        return apiRequest(`${API_BASE_URL}/books`);
+        return fetchAllPages(`${API_BASE_URL}/books`);
+    },
+
+    /**
+     * Get one page of books; pass the previous page's next_cursor as after
+     */
+    async getPage(limit = PAGE_SIZE, after = null) {
+        return fetchPage(`${API_BASE_URL}/books`, limit, after);
     },
 
     /**
@@ -98,10 +132,17 @@ const BooksAPI = {
  */
 const AuthorsAPI = {
     /**
-     * Get all authors
+     * Get all authors (fetched page by page)
      */
     async getAll() {
-        return apiRequest(`${API_BASE_URL}/authors`);
+        return fetchAllPages(`${API_BASE_URL}/authors`);
+    },
+
+    /**
+     * Get one page of authors; pass the previous page's next_cursor as after
+     */
+    async getPage(limit = PAGE_SIZE, after = null) {
+        return fetchPage(`${API_BASE_URL}/authors`, limit, after);
     },
 
     /**
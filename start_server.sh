@@ -17,6 +17,20 @@ if [ ! -f "data/library.db" ] || [ $(sqlite3 data/library.db "SELECT COUNT(*) FR
     echo "✓ Database populated"
 fi
 
+# LIBRARY_PREFORK=1 runs one worker process per core (LIBRARY_PREFORK_WORKERS
+# overrides); kill -HUP the master to reload gracefully
+if [ "$LIBRARY_PREFORK" = "1" ]; then
+    exec python3 src/api/prefork.py --host 0.0.0.0 --port 5001
+fi
+
+# LIBRARY_ASGI=1 serves the same API from an event loop (needs uvicorn)
+if [ "$LIBRARY_ASGI" = "1" ]; then
+    echo "Starting ASGI server on http://localhost:5001"
+    echo "Press CTRL+C to stop"
+    echo ""
+    exec uvicorn api.asgi:app --app-dir src --host 0.0.0.0 --port 5001
+fi
+
 echo "Starting Flask server on http://localhost:5001"
 echo "Press CTRL+C to stop"
 echo ""
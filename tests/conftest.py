@@ -1,6 +1,7 @@
 """
-Playwright test configuration.
-Starts the Flask server before tests and stops it after.
+Test configuration.
+Playwright tests get a Flask server started before the session and stopped
+after it; unit tests get a fresh, migrated database per test.
 """
 
 import pytest
@@ -18,6 +19,10 @@ BASE_URL = f"http://localhost:{SERVER_PORT}"
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 LAUNCHER = os.path.join(PROJECT_ROOT, "tests", "_test_server.py")
 LOG_DIR = os.path.join(PROJECT_ROOT, "tests")
+SRC_DIR = os.path.join(PROJECT_ROOT, "src")
+
+# Unit tests import the modules under src/ directly
+sys.path.insert(0, SRC_DIR)
 
 
 @pytest.fixture(scope="session")
@@ -79,3 +84,39 @@ def home_page(page, base_url):
     # Wait for the books table to render
     page.wait_for_selector("#books-table-container table", timeout=10000)
     return page
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a new database file with the current schema."""
+    from database import Database
+
+    path = str(tmp_path / "library.db")
+    database = Database(path)
+    assert database.connect() and database.create_tables()
+    database.close()
+    return path
+
+
+@pytest.fixture
+def database(db_path):
+    """Connected Database on a fresh, migrated file."""
+    from database import Database
+
+    database = Database(db_path)
+    assert database.connect()
+    yield database
+    database.close()
+
+
+@pytest.fixture(scope="session")
+def client(tmp_path_factory):
+    """Flask test client of the API on its own database.
+
+    api.app binds its database when first imported, so all API tests in the
+    session share it; each test creates the rows it needs.
+    """
+    os.environ["LIBRARY_DB_PATH"] = str(tmp_path_factory.mktemp("api") / "library.db")
+    from api.app import app
+
+    return app.test_client()
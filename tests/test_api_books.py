@@ -0,0 +1,216 @@
+"""
+API tests for book updates, batch writes and conditional GETs.
+"""
+
+import os
+import itertools
+
+from database import Database
+from book_repository import BookRepository
+
+_isbns = itertools.count(1)
+
+
+def create_book(client, copies=1, **fields):
+    fields = dict({'title': "Emma", 'isbn': f"api-{next(_isbns)}", 'copies': copies}, **fields)
+    response = client.post('/api/books', json=fields)
+    assert response.status_code == 201
+    return response.get_json()['data']
+
+
+def create_member(client):
+    number = next(_isbns)
+    response = client.post('/api/members', json={'name': f"Reader {number}",
+                                                  'email': f"reader{number}@example.org"})
+    assert response.status_code == 201
+    return response.get_json()['data']
+
+
+def book_count(client):
+    return client.get('/api/books/count').get_json()['data']['count']
+
+
+def lend(client, book, copies):
+    member = create_member(client)
+    for _ in range(copies):
+        response = client.post('/api/loans', json={'book_id': book['id'], 'member_id': member['id']})
+        assert response.status_code == 201
+
+
+class TestCopiesOnLoan:
+    """Lowering copies below the copies on loan is a 409 conflict."""
+
+    def test_single_update(self, client):
+        book = create_book(client, copies=2)
+        lend(client, book, 2)
+
+        response = client.put(f"/api/books/{book['id']}", json={'copies': 1})
+
+        assert response.status_code == 409
+        assert "copies on loan" in response.get_json()['error']
+        assert client.get(f"/api/books/{book['id']}").get_json()['data']['copies'] == 2
+
+    def test_single_update_above_loans(self, client):
+        book = create_book(client, copies=2)
+        lend(client, book, 1)
+
+        response = client.put(f"/api/books/{book['id']}", json={'copies': 1})
+
+        assert response.status_code == 200
+        assert response.get_json()['data']['available_copies'] == 0
+
+    def test_atomic_batch_update(self, client):
+        book = create_book(client, copies=1)
+        other = create_book(client)
+        lend(client, book, 1)
+
+        response = client.put('/api/books/batch', json=[{'id': other['id'], 'genre': "Essay"},
+                                                         {'id': book['id'], 'copies': 0}])
+
+        assert response.status_code == 409
+        assert response.get_json()['results'][0]['status'] == 'conflict'
+        assert client.get(f"/api/books/{other['id']}").get_json()['data']['genre'] is None
+
+    def test_partial_batch_update(self, client):
+        book = create_book(client, copies=1)
+        other = create_book(client)
+        lend(client, book, 1)
+
+        response = client.put('/api/books/batch?mode=partial',
+                              json=[{'id': book['id'], 'copies': 0}, {'id': other['id'], 'genre': "Essay"}])
+
+        assert response.status_code == 200
+        assert [result['status'] for result in response.get_json()['data']] == ['conflict', 'updated']
+
+
+class TestBatchModes:
+    """Atomic batches are all or nothing; partial batches report per item."""
+
+    def test_atomic_create(self, client):
+        items = [{'title': "Sanditon", 'isbn': f"batch-{next(_isbns)}"},
+                 {'title': "The Watsons", 'isbn': f"batch-{next(_isbns)}", 'copies': 2}]
+
+        response = client.post('/api/books/batch', json=items)
+
+        assert response.status_code == 201
+        data = response.get_json()['data']
+        assert [result['status'] for result in data] == ['created', 'created']
+        assert [result['data']['title'] for result in data] == ["Sanditon", "The Watsons"]
+
+    def test_atomic_create_rejects_everything(self, client):
+        before = book_count(client)
+        items = [{'title': "Sanditon", 'isbn': f"batch-{next(_isbns)}"}, {'title': "No ISBN"}]
+
+        response = client.post('/api/books/batch', json={'items': items, 'mode': 'atomic'})
+
+        assert response.status_code == 400
+        assert response.get_json()['results'][0]['index'] == 1
+        assert book_count(client) == before
+
+    def test_atomic_create_rolls_back_on_conflict(self, client):
+        existing = create_book(client)
+        before = book_count(client)
+        items = [{'title': "Sanditon", 'isbn': f"batch-{next(_isbns)}"},
+                 {'title': "Duplicate", 'isbn': existing['isbn']}]
+
+        response = client.post('/api/books/batch', json=items)
+
+        assert response.status_code == 400
+        assert book_count(client) == before
+
+    def test_partial_create(self, client):
+        existing = create_book(client)
+        items = [{'title': "Sanditon", 'isbn': f"batch-{next(_isbns)}"},
+                 {'title': "Duplicate", 'isbn': existing['isbn']},
+                 {'title': "Bad year", 'isbn': f"batch-{next(_isbns)}", 'year': "soon"}]
+
+        response = client.post('/api/books/batch?mode=partial', json=items)
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert [result['status'] for result in body['data']] == ['created', 'error', 'error']
+        assert body['counts'] == {'created': 1, 'error': 2}
+        assert body['data'][0]['data']['title'] == "Sanditon"
+
+    def test_partial_delete_reports_missing(self, client):
+        book = create_book(client)
+
+        response = client.delete('/api/books/batch?mode=partial', json=[book['id'], 999999])
+
+        assert [result['status'] for result in response.get_json()['data']] == ['deleted', 'not_found']
+        assert client.get(f"/api/books/{book['id']}").status_code == 404
+
+    def test_negative_copies_are_rejected(self, client):
+        book = create_book(client)
+        items = [{'title': "Sanditon", 'isbn': f"batch-{next(_isbns)}", 'copies': -3}]
+
+        created = client.post('/api/books/batch?mode=partial', json=items)
+        updated = client.put('/api/books/batch?mode=partial', json=[{'id': book['id'], 'copies': -1}])
+
+        for response in (created, updated):
+            assert response.status_code == 200
+            result = response.get_json()['data'][0]
+            assert (result['status'], result['error']) == ('error', "Copies cannot be negative")
+        assert client.get(f"/api/books/{book['id']}").get_json()['data']['copies'] == 1
+
+    def test_unknown_mode(self, client):
+        response = client.post('/api/books/batch?mode=sometimes', json=[{'title': "X", 'isbn': "Y"}])
+        assert response.status_code == 400
+
+
+class TestConditionalGet:
+    """ETags follow the books change version."""
+
+    def test_not_modified_until_a_write(self, client):
+        book = create_book(client)
+        url = f"/api/books/{book['id']}"
+
+        first = client.get(url)
+        etag = first.headers['ETag']
+        assert first.status_code == 200
+        assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+        assert client.put(url, json={'title': "Emma (revised)"}).status_code == 200
+
+        after_write = client.get(url, headers={'If-None-Match': etag})
+        assert after_write.status_code == 200
+        assert after_write.headers['ETag'] != etag
+        assert after_write.get_json()['data']['title'] == "Emma (revised)"
+
+    def test_list_revalidates_after_a_write_elsewhere(self, client):
+        first = client.get('/api/books?limit=5')
+        etag = first.headers['ETag']
+        assert client.get('/api/books?limit=5', headers={'If-None-Match': etag}).status_code == 304
+
+        create_book(client)
+
+        assert client.get('/api/books?limit=5', headers={'If-None-Match': etag}).status_code == 200
+
+    def test_write_from_another_process_is_not_served_stale(self, client):
+        book = create_book(client)
+        url = f"/api/books/{book['id']}"
+        etag = client.get(url).headers['ETag']
+
+        # A second Database on the same file stands in for a prefork worker or the CLI
+        other = Database(os.environ['LIBRARY_DB_PATH'])
+        assert other.connect()
+        try:
+            BookRepository(other).update_book(book['id'], title="Sense and Sensibility")
+        finally:
+            other.close()
+
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.get_json()['data']['title'] == "Sense and Sensibility"
+        assert client.get(url, headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+    def test_checkout_changes_the_book_etag(self, client):
+        book = create_book(client, copies=2)
+        url = f"/api/books/{book['id']}"
+        etag = client.get(url).headers['ETag']
+
+        lend(client, book, 1)
+
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.get_json()['data']['available_copies'] == 1
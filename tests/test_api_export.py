@@ -0,0 +1,32 @@
+"""
+API tests for the streaming export endpoints.
+"""
+
+import json
+
+
+class TestExport:
+    """Exports stream books, authors and loans; members are not exported."""
+
+    def test_books_as_ndjson(self, client):
+        client.post('/api/books', json={'title': "Lady Susan", 'isbn': "export-1"})
+
+        response = client.get('/api/export/books')
+
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in response.get_data().splitlines()]
+        assert "export-1" in {row['isbn'] for row in rows}
+
+    def test_authors_as_json(self, client):
+        client.post('/api/authors', json={'name': "Export Author"})
+
+        response = client.get('/api/export/authors?format=json')
+
+        assert response.status_code == 200
+        assert "Export Author" in {row['name'] for row in response.get_json()}
+
+    def test_members_are_not_exported(self, client):
+        response = client.get('/api/export/members')
+
+        assert response.status_code == 404
+        assert "choose from: books, authors, loans" in response.get_json()['error']
@@ -0,0 +1,56 @@
+"""
+Unit tests for the connection pool's health checks.
+"""
+
+import sqlite3
+
+import pytest
+
+from database import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """Pool of one connection to an empty database file."""
+    pool = ConnectionPool(lambda: sqlite3.connect(tmp_path / "pool.db", check_same_thread=False),
+                          max_size=1)
+    yield pool
+    pool.close()
+
+
+class TestHealthChecks:
+    """Tests for when a returned connection is checked before reuse."""
+
+    def test_recent_connection_is_not_checked(self, pool):
+        with pool.connection() as conn:
+            pass
+
+        statements = []
+        conn.set_trace_callback(statements.append)
+        with pool.connection() as reused:
+            assert reused is conn
+
+        assert statements == []
+        assert pool.stats()['health_checks'] == 0
+
+    def test_idle_connection_is_checked(self, pool):
+        pool.health_check_idle = 0
+        with pool.connection():
+            pass
+        with pool.connection():
+            pass
+
+        assert pool.stats()['health_checks'] == 1
+
+    def test_connection_is_checked_after_an_error(self, pool):
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.connection() as conn:
+                conn.execute("SELECT * FROM missing")
+        conn.close()
+
+        with pool.connection() as replacement:
+            assert replacement is not conn
+
+        stats = pool.stats()
+        assert stats['health_checks'] == 1
+        assert stats['connections_discarded'] == 1
@@ -0,0 +1,78 @@
+"""
+Unit tests for the bulk import tool.
+"""
+
+import sqlite3
+
+import import_catalog
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+class TestImportBooks:
+    """Bad rows are reported and skipped; the rest of the file is imported."""
+
+    def test_non_integer_cells_are_row_errors(self, db_path, tmp_path, capsys):
+        path = _write(tmp_path, 'books.csv',
+                      "title,isbn,year,copies\n"
+                      "Emma,isbn-1,1815,2\n"
+                      "Persuasion,isbn-2,notayear,1\n"
+                      "Mansfield Park,isbn-3,1814,lots\n"
+                      "Northanger Abbey,isbn-4,1817,1\n")
+
+        assert import_catalog.main(['books', path, '--db', db_path, '--batch-size', '2']) == 0
+
+        output = capsys.readouterr().out
+        assert 'Row 2 (isbn-2): "year" must be an integer' in output
+        assert 'Row 3 (isbn-3): "copies" must be an integer' in output
+        assert "Done: 2 books imported, 2 rows skipped." in output
+        titles = {row[0] for row in sqlite3.connect(db_path).execute("SELECT title FROM Books")}
+        assert titles == {"Emma", "Northanger Abbey"}
+
+    def test_negative_copies_are_rejected(self, db_path, tmp_path, capsys):
+        path = _write(tmp_path, 'books.ndjson',
+                      '{"title": "Emma", "isbn": "isbn-1", "copies": -5}\n'
+                      '{"title": "Persuasion", "isbn": "isbn-2", "copies": 0}\n')
+
+        assert import_catalog.main(['books', path, '--db', db_path]) == 0
+
+        assert "Copies cannot be negative" in capsys.readouterr().out
+        rows = sqlite3.connect(db_path).execute("SELECT isbn, available_copies FROM Books").fetchall()
+        assert rows == [("isbn-2", 0)]
+
+
+class TestImportAuthors:
+    """Author rows with a bad birth year are skipped."""
+
+    def test_non_integer_birth_year_is_a_row_error(self, db_path, tmp_path, capsys):
+        path = _write(tmp_path, 'authors.csv',
+                      "name,birth_year,nationality\n"
+                      "Jane Austen,1775,British\n"
+                      "Anonymous,unknown,\n")
+
+        assert import_catalog.main(['authors', path, '--db', db_path]) == 0
+
+        output = capsys.readouterr().out
+        assert 'Row 2 (Anonymous): "birth_year" must be an integer' in output
+        assert "Done: 1 authors imported, 0 already present, 1 rows skipped." in output
+
+    def test_rerun_adds_nothing(self, db_path, tmp_path, capsys):
+        path = _write(tmp_path, 'authors.ndjson',
+                      '{"name": "Jane Austen", "nationality": "British"}\n'
+                      '{"name": "Mary Shelley", "nationality": "British"}\n'
+                      '{"name": "Jane Austen"}\n')
+
+        assert import_catalog.main(['authors', path, '--db', db_path]) == 0
+        assert "Done: 2 authors imported, 1 already present, 0 rows skipped." in capsys.readouterr().out
+        assert import_catalog.main(['authors', path, '--db', db_path]) == 0
+        assert "Done: 0 authors imported, 3 already present, 0 rows skipped." in capsys.readouterr().out
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM Authors").fetchone()[0] == 2
+        assert conn.execute("SELECT value FROM library_stats WHERE name = 'rows:Authors'").fetchone()[0] == 2
+        assert conn.execute("SELECT value FROM library_stats WHERE name = 'nationality:British'").fetchone()[0] == 2
+        assert conn.execute("SELECT COUNT(*) FROM AuthorSearch WHERE AuthorSearch MATCH 'shelley'").fetchone()[0] == 1
@@ -0,0 +1,69 @@
+"""
+Unit tests for the JSON provider's encoders and fragment cache.
+"""
+
+import json
+
+import pytest
+from flask import Flask
+
+from records import Author
+from api.json_provider import FastJSONProvider, FragmentCache, StdlibEncoder
+
+
+class TestStdlibEncoder:
+    """Tests for the standard library encoder."""
+
+    def test_non_ascii_is_escaped_everywhere(self):
+        encoder = StdlibEncoder()
+        author = Author(1, 'Émile Zola', 1840, 'French')
+
+        assert b'\\u00c9mile' in encoder.encode_sorted({'name': 'Émile'})
+        assert b'\\u00c9mile' in encoder.encode_items([author])
+        assert b'\\u00c9mile' in encoder.encode_lines([author])
+
+
+class TestFragmentCache:
+    """Tests for FragmentCache."""
+
+    def test_hit_keeps_entry_recent(self):
+        cache = FragmentCache(StdlibEncoder().encode_sorted, max_size=2)
+        first, second, third = (Author(i, f'Author {i}') for i in (1, 2, 3))
+
+        cache.get(first)
+        cache.get(second)
+        cache.get(first)
+        cache.get(third)
+
+        assert cache.stats()['evictions'] == 1
+        cache.get(first)
+        assert cache.stats()['hits'] == 2
+
+    def test_changed_record_is_encoded_again(self):
+        cache = FragmentCache(StdlibEncoder().encode_sorted)
+
+        cache.get(Author(1, 'Old name'))
+        fragment = cache.get(Author(1, 'New name'))
+
+        assert json.loads(fragment)['name'] == 'New name'
+        assert cache.stats()['misses'] == 2
+
+
+class TestFastJSONProvider:
+    """Tests for FastJSONProvider responses."""
+
+    @pytest.fixture
+    def app(self):
+        app = Flask(__name__)
+        app.json = FastJSONProvider(app, backend='json')
+        return app
+
+    def test_response_arguments(self, app):
+        with app.app_context():
+            assert json.loads(app.json.response(1, 2).get_data()) == [1, 2]
+            assert json.loads(app.json.response(a=1).get_data()) == {'a': 1}
+            assert json.loads(app.json.response().get_data()) is None
+
+    def test_args_and_kwargs_together_are_rejected(self, app):
+        with app.app_context(), pytest.raises(TypeError):
+            app.json.response(1, a=1)
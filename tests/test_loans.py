@@ -0,0 +1,141 @@
+"""
+Unit tests for loan circulation: checkout, return and renewal.
+"""
+
+import pytest
+
+from book_repository import BookRepository
+from member_repository import MemberRepository
+from loan_repository import LoanRepository, CirculationError, NotFoundError, MAX_RENEWALS
+
+
+@pytest.fixture
+def loans(database):
+    return LoanRepository(database)
+
+
+@pytest.fixture
+def book_id(database):
+    return BookRepository(database).add_book("Emma", "978-0-14-143958-7", copies=2)
+
+
+@pytest.fixture
+def member_id(database):
+    return MemberRepository(database).add_member("Ada Lovelace", "ada@example.org")
+
+
+def available(database, book_id):
+    return BookRepository(database).get_book_by_id(book_id).available_copies
+
+
+class TestCheckout:
+    """Tests for LoanRepository.checkout."""
+
+    def test_checkout_claims_a_copy(self, database, loans, book_id, member_id):
+        loan_id = loans.checkout(book_id, member_id)
+
+        loan = loans.get_loan_by_id(loan_id)
+        assert (loan.book_id, loan.member_id, loan.status, loan.renewals) == (book_id, member_id, 'borrowed', 0)
+        assert loan.return_date is None
+        assert available(database, book_id) == 1
+
+    def test_no_copies_left(self, database, loans, book_id, member_id):
+        loans.checkout(book_id, member_id)
+        loans.checkout(book_id, member_id)
+
+        with pytest.raises(CirculationError, match="No copies"):
+            loans.checkout(book_id, member_id)
+        assert available(database, book_id) == 0
+        assert loans.get_loan_count() == 2
+
+    def test_unknown_book_or_member(self, loans, book_id, member_id):
+        with pytest.raises(NotFoundError):
+            loans.checkout(book_id + 100, member_id)
+        with pytest.raises(NotFoundError):
+            loans.checkout(book_id, member_id + 100)
+
+    def test_inactive_member(self, database, loans, book_id):
+        member_id = MemberRepository(database).add_member("Suspended", "s@example.org", status='suspended')
+
+        with pytest.raises(CirculationError, match="not active"):
+            loans.checkout(book_id, member_id)
+        assert available(database, book_id) == 2
+
+
+class TestReturn:
+    """Tests for LoanRepository.return_loan."""
+
+    def test_return_puts_the_copy_back(self, database, loans, book_id, member_id):
+        loan_id = loans.checkout(book_id, member_id)
+
+        loans.return_loan(loan_id)
+
+        loan = loans.get_loan_by_id(loan_id)
+        assert loan.status == 'returned'
+        assert loan.return_date is not None
+        assert available(database, book_id) == 2
+
+    def test_return_twice(self, database, loans, book_id, member_id):
+        loan_id = loans.checkout(book_id, member_id)
+        loans.return_loan(loan_id)
+
+        with pytest.raises(CirculationError, match="already been returned"):
+            loans.return_loan(loan_id)
+        assert available(database, book_id) == 2
+
+    def test_unknown_loan(self, loans):
+        with pytest.raises(NotFoundError):
+            loans.return_loan(999)
+
+
+class TestRenew:
+    """Tests for LoanRepository.renew."""
+
+    def test_renew_extends_the_due_date(self, loans, book_id, member_id):
+        loan_id = loans.checkout(book_id, member_id, loan_days=14)
+        due_date = loans.get_loan_by_id(loan_id).due_date
+
+        new_due_date = loans.renew(loan_id, days=7)
+
+        assert new_due_date > due_date
+        assert loans.get_loan_by_id(loan_id).renewals == 1
+
+    def test_renewal_limit(self, loans, book_id, member_id):
+        loan_id = loans.checkout(book_id, member_id)
+        for _ in range(MAX_RENEWALS):
+            loans.renew(loan_id)
+
+        with pytest.raises(CirculationError, match="renewal limit"):
+            loans.renew(loan_id)
+        assert loans.get_loan_by_id(loan_id).renewals == MAX_RENEWALS
+
+    def test_renew_returned_loan(self, loans, book_id, member_id):
+        loan_id = loans.checkout(book_id, member_id)
+        loans.return_loan(loan_id)
+
+        with pytest.raises(CirculationError):
+            loans.renew(loan_id)
+
+
+class TestLoanRoutes:
+    """The loan endpoints map refused requests to 404 and 409."""
+
+    def test_checkout_return_renew(self, client):
+        book = client.post('/api/books', json={'title': "Persuasion", 'isbn': "loan-route-1",
+                                               'copies': 1}).get_json()['data']
+        member = client.post('/api/members', json={'name': "Loan Reader",
+                                                   'email': "loan-reader@example.org"}).get_json()['data']
+        body = {'book_id': book['id'], 'member_id': member['id']}
+
+        response = client.post('/api/loans', json=body)
+        assert response.status_code == 201
+        loan_id = response.get_json()['data']['id']
+
+        assert client.post('/api/loans', json=body).status_code == 409
+        for _ in range(MAX_RENEWALS):
+            assert client.post(f'/api/loans/{loan_id}/renew').status_code == 200
+        assert client.post(f'/api/loans/{loan_id}/renew').status_code == 409
+
+        assert client.post(f'/api/loans/{loan_id}/return').status_code == 200
+        assert client.post(f'/api/loans/{loan_id}/return').status_code == 409
+        assert client.post('/api/loans/999999/return').status_code == 404
@@ -0,0 +1,49 @@
+"""
+Unit tests for the member repository's directory sync.
+"""
+
+from member_repository import MemberRepository
+
+
+def _directory(count, start=0, **fields):
+    return [dict({'name': f"Member {i}", 'email': f"member{i}@example.org"}, **fields)
+            for i in range(start, start + count)]
+
+
+class TestBulkUpsertMembers:
+    """Inserted/updated/unchanged counts of bulk_upsert_members."""
+
+    def test_new_members_are_counted_once(self, database):
+        members = MemberRepository(database)
+        report = members.bulk_upsert_members(_directory(10))
+        assert report == {'inserted': 10, 'updated': 0, 'unchanged': 0, 'errors': []}
+        assert members.get_member_count() == 10
+
+    def test_resync_reports_only_changes(self, database):
+        members = MemberRepository(database)
+        members.bulk_upsert_members(_directory(10))
+
+        directory = _directory(10)
+        directory[3]['name'] = "Renamed Member"
+        directory[7]['phone'] = "555-0107"
+        report = members.bulk_upsert_members(directory + _directory(2, start=10))
+
+        assert report == {'inserted': 2, 'updated': 2, 'unchanged': 8, 'errors': []}
+        assert members.get_member_by_email("member3@example.org").name == "Renamed Member"
+        assert members.get_member_count() == 12
+
+    def test_counts_across_batches(self, database):
+        members = MemberRepository(database)
+        report = members.bulk_upsert_members(_directory(25), batch_size=10)
+        assert (report['inserted'], report['updated'], report['unchanged']) == (25, 0, 0)
+
+    def test_invalid_rows_are_reported(self, database):
+        members = MemberRepository(database)
+        report = members.bulk_upsert_members([
+            {'name': "No Email"},
+            {'name': "Bad Email", 'email': "not-an-address"},
+            {'name': "Good", 'email': "Good@Example.org"},
+        ])
+        assert report['inserted'] == 1
+        assert [error['row'] for error in report['errors']] == [1, 2]
+        assert members.get_member_by_email("good@example.org") is not None
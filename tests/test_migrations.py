@@ -0,0 +1,151 @@
+"""
+Unit tests for schema migrations from older versions.
+"""
+
+import pytest
+
+from database import Database
+from migrations import Migrator, MIGRATIONS
+from library_stats import get_row_counts
+from book_repository import BookRepository
+from author_repository import AuthorRepository
+from member_repository import MemberRepository
+
+
+def open_database(path):
+    database = Database(path)
+    assert database.connect()
+    return database
+
+
+@pytest.fixture
+def legacy_database(tmp_path):
+    """Database migrated only to version 1 and filled the way the old code did."""
+    database = open_database(str(tmp_path / "legacy.db"))
+    assert Migrator(database, MIGRATIONS[:1]).migrate()
+
+    conn = database.get_connection()
+    conn.execute("INSERT INTO Authors (name, birth_year, nationality) VALUES ('Jane Austen', 1775, 'British')")
+    conn.executemany(
+        "INSERT INTO Books (title, isbn, year, genre, copies, author_id) VALUES (?, ?, ?, ?, ?, 1)",
+        [("Emma", "isbn-1", 1815, "Fiction", 3), ("Persuasion", "isbn-2", 1817, "Fiction", 1),
+         ("Lady Susan", "isbn-3", 1794, "Letters", 2)],
+    )
+    conn.execute("INSERT INTO Members (name, email) VALUES ('Ada Lovelace', '  Ada@Example.ORG ')")
+    conn.executemany(
+        "INSERT INTO Loans (book_id, member_id, loan_date, due_date, return_date, status) VALUES (?, 1, ?, ?, ?, ?)",
+        [(1, '2024-01-02', '2024-01-16 00:00:00', None, 'borrowed'),
+         (1, '2024-01-03', '2024-01-17', None, 'borrowed'),
+         (2, '2023-12-01', '2023-12-15', '2023-12-10', 'returned')],
+    )
+    conn.commit()
+    yield database
+    database.close()
+
+
+class TestMigrateFromOlderVersion:
+    """Upgrading a version 1 database to the latest schema."""
+
+    def test_reaches_latest_version(self, legacy_database):
+        migrator = Migrator(legacy_database)
+        assert migrator.current_version() == 1
+        assert not migrator.is_current()
+
+        assert migrator.migrate(batch_size=1)
+
+        assert migrator.current_version() == MIGRATIONS[-1].version
+        assert migrator.is_current()
+        assert migrator.pending() == []
+
+    def test_backfills_existing_rows(self, legacy_database):
+        assert Migrator(legacy_database).migrate(batch_size=2)
+
+        books = BookRepository(legacy_database)
+        assert [books.get_book_by_id(book_id).available_copies for book_id in (1, 2, 3)] == [1, 1, 2]
+        assert [book.isbn for book in books.search_books("persuasion")] == ["isbn-2"]
+        assert [author.name for author in AuthorRepository(legacy_database).search_authors("austen")] == \
+            ["Jane Austen"]
+        assert MemberRepository(legacy_database).get_member_by_email("ada@example.org") is not None
+
+        conn = legacy_database.get_connection()
+        due_dates = [row[0] for row in conn.execute("SELECT due_date FROM Loans ORDER BY id")]
+        assert due_dates == ['2024-01-16', '2024-01-17', '2023-12-15']
+
+    def test_seeds_counters_and_facets(self, legacy_database):
+        assert Migrator(legacy_database).migrate()
+
+        books = BookRepository(legacy_database)
+        counts = get_row_counts(legacy_database.get_connection())
+        assert (counts['Books'], counts['Authors'], counts['Members'], counts['Loans']) == (3, 1, 1, 3)
+        assert books.get_copy_count() == 6
+        assert books.get_genre_counts() == {'Fiction': 2, 'Letters': 1}
+        assert books.get_book_count({'decade': 1810}) == 2
+        assert books.get_change_version()[0] >= 1
+
+    def test_seeding_counts_rows_written_during_the_backfill_once(self, legacy_database):
+        assert Migrator(legacy_database, MIGRATIONS[:7]).migrate()
+        migrator = Migrator(legacy_database)
+        # Migration 8's DDL has committed but its backfill hasn't run yet
+        assert migrator._apply(MIGRATIONS[7])
+        MemberRepository(legacy_database).add_member("Grace Hopper", "grace@example.org")
+
+        assert migrator.migrate(batch_size=1)
+
+        assert get_row_counts(legacy_database.get_connection())['Members'] == 2
+
+    def test_resumed_seeding_does_not_count_twice(self, legacy_database):
+        assert Migrator(legacy_database).migrate(batch_size=2)
+        conn = legacy_database.get_connection()
+        # As if the process died after the seeding but before backfilled_at was set
+        conn.execute("UPDATE schema_version SET backfilled_at = NULL WHERE version >= 8")
+        conn.commit()
+
+        assert Migrator(legacy_database).migrate(batch_size=2)
+
+        counts = get_row_counts(conn)
+        assert (counts['Books'], counts['Authors'], counts['Members'], counts['Loans']) == (3, 1, 1, 3)
+        books = BookRepository(legacy_database)
+        assert books.get_copy_count() == 6
+        assert books.get_genre_counts() == {'Fiction': 2, 'Letters': 1}
+        assert AuthorRepository(legacy_database).get_nationality_counts() == {'British': 1}
+        assert books.get_book_count({'decade': 1810, 'nationality': 'British'}) == 2
+
+    def test_migrate_is_idempotent(self, legacy_database):
+        assert Migrator(legacy_database).migrate()
+        schema = Migrator(legacy_database).dump_schema()
+
+        assert Migrator(legacy_database).migrate()
+        assert Migrator(legacy_database).dump_schema() == schema
+
+    def test_new_database_matches_migrated_one(self, legacy_database, db_path):
+        assert Migrator(legacy_database).migrate()
+        fresh = open_database(db_path)
+        try:
+            assert Migrator(fresh).dump_schema() == Migrator(legacy_database).dump_schema()
+        finally:
+            fresh.close()
+
+
+class TestDeferredTriggers:
+    """Bulk loads recreate the per-row insert triggers exactly as the migrations left them."""
+
+    def test_bulk_load_keeps_the_schema(self, database):
+        # Recreated triggers move to the end of sqlite_master, so compare as sets
+        schema = set(Migrator(database).dump_schema().strip().split("\n\n"))
+
+        report = BookRepository(database).bulk_add_books(
+            [{'title': f"Book {i}", 'isbn': f"bulk-{i}", 'genre': "Fiction"} for i in range(5)])
+
+        assert report['inserted'] == 5
+        assert set(Migrator(database).dump_schema().strip().split("\n\n")) == schema
+        assert [book.isbn for book in BookRepository(database).search_books("book")][:1] == ["bulk-0"]
+
+    def test_bulk_author_load_keeps_the_schema(self, database):
+        schema = set(Migrator(database).dump_schema().strip().split("\n\n"))
+        authors = AuthorRepository(database)
+
+        report = authors.bulk_add_authors([{'name': "Jane Austen"}, {'name': "Mary Shelley"}])
+
+        assert report['inserted'] == 2
+        assert set(Migrator(database).dump_schema().strip().split("\n\n")) == schema
+        assert [author.id for author in authors.search_authors("shelley")] == [report['ids']["Mary Shelley"]]
@@ -0,0 +1,42 @@
+"""
+Tests for how the pre-fork launcher starts the app: the reload check and the
+background tasks.
+"""
+
+import os
+import sys
+import subprocess
+
+from conftest import SRC_DIR
+
+PREFORK = os.path.join(SRC_DIR, "api", "prefork.py")
+
+
+def run_python(args, **env):
+    """Run Python in src/ with extra environment variables."""
+    return subprocess.run([sys.executable, *args], cwd=SRC_DIR, capture_output=True, text=True,
+                          env={**os.environ, **env}, timeout=60)
+
+
+class TestPreforkStartup:
+    """Tests for the pre-fork launcher's startup."""
+
+    def test_check_does_not_open_the_database(self, tmp_path):
+        db_path = tmp_path / "library.db"
+
+        result = run_python([PREFORK, "--check"], LIBRARY_IMPORT_ONLY="1",
+                            LIBRARY_DB_PATH=str(db_path))
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert not db_path.exists()
+
+    def test_background_tasks_wait_for_a_worker(self, tmp_path):
+        script = ("import threading, api.prefork; "
+                  "print(sorted(t.name for t in threading.enumerate()))")
+
+        result = run_python(["-c", script], LIBRARY_DB_PATH=str(tmp_path / "library.db"),
+                            LIBRARY_OVERDUE_SCAN_INTERVAL="60",
+                            LIBRARY_STATS_RECONCILE_INTERVAL="60")
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "['MainThread']"
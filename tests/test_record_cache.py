@@ -0,0 +1,151 @@
+"""
+Unit tests for the record cache and the row_changes feed that keeps it current.
+"""
+
+import pytest
+
+from database import Database
+from record_cache import RecordCache
+from change_versions import sync_record_cache
+from book_repository import BookRepository
+from author_repository import AuthorRepository
+from loan_repository import LoanRepository
+from member_repository import MemberRepository
+
+
+class TestRecordCache:
+    """Tests for RecordCache on its own."""
+
+    def test_hit_after_load(self):
+        cache = RecordCache()
+        calls = []
+        loader = lambda: calls.append(1) or 'row'
+
+        assert cache.get_or_load(('book', 1), loader) == 'row'
+        assert cache.get_or_load(('book', 1), loader) == 'row'
+        assert len(calls) == 1
+        assert cache.stats()['hits'] == 1
+
+    def test_invalidate_reloads(self):
+        cache = RecordCache()
+        rows = iter(['old', 'new'])
+
+        assert cache.get_or_load(('book', 1), lambda: next(rows)) == 'old'
+        cache.invalidate(('book', 1))
+        assert cache.get_or_load(('book', 1), lambda: next(rows)) == 'new'
+        assert cache.stats()['misses'] == 2
+
+    def test_disabled_cache_always_loads(self):
+        cache = RecordCache(max_size=0)
+        calls = []
+        cache.get_or_load(('book', 1), lambda: calls.append(1))
+        cache.get_or_load(('book', 1), lambda: calls.append(1))
+        assert len(calls) == 2
+
+
+@pytest.fixture
+def writer_and_reader(db_path):
+    """Two Databases on one file, standing in for two processes."""
+    writer, reader = Database(db_path), Database(db_path)
+    assert writer.connect() and reader.connect()
+    sync_record_cache(reader)
+    yield writer, reader
+    writer.close()
+    reader.close()
+
+
+class TestCrossProcessWrites:
+    """A write through another connection is dropped from this cache on the next sync."""
+
+    def test_book_changed_elsewhere_is_reloaded(self, writer_and_reader):
+        writer, reader = writer_and_reader
+        book_id = BookRepository(writer).add_book("Sense and Sensibility", "978-0-14-143966-2")
+        other_id = BookRepository(writer).add_book("Emma", "978-0-14-143958-7")
+        books = BookRepository(reader)
+        books.get_book_by_id(book_id)
+        books.get_book_by_id(other_id)
+
+        BookRepository(writer).update_book(book_id, title="Pride and Prejudice")
+        sync_record_cache(reader)
+
+        assert books.get_book_by_id(book_id).title == "Pride and Prejudice"
+        # Only the changed row was dropped
+        books.get_book_by_id(other_id)
+        assert reader.get_record_cache().stats()['hits'] == 1
+
+    def test_author_changed_elsewhere_is_reloaded(self, writer_and_reader):
+        writer, reader = writer_and_reader
+        author_id = AuthorRepository(writer).add_author("Jane Austen", 1775, "British")
+        book_id = BookRepository(writer).add_book("Emma", "978-0-14-143958-7", author_id=author_id)
+        authors, books = AuthorRepository(reader), BookRepository(reader)
+        authors.get_author_by_id(author_id)
+        books.get_book_by_id(book_id)
+
+        AuthorRepository(writer).update_author(author_id, name="J. Austen")
+        sync_record_cache(reader)
+
+        assert authors.get_author_by_id(author_id).name == "J. Austen"
+        assert books.get_book_by_id(book_id).author_name == "J. Austen"
+
+    def test_checkout_elsewhere_drops_only_that_book(self, writer_and_reader):
+        writer, reader = writer_and_reader
+        book_id = BookRepository(writer).add_book("Emma", "978-0-14-143958-7", copies=2)
+        other_id = BookRepository(writer).add_book("Persuasion", "978-0-14-143951-8")
+        member_id = MemberRepository(writer).add_member("Ada Lovelace", "ada@example.org")
+        books = BookRepository(reader)
+        books.get_book_by_id(book_id)
+        books.get_book_by_id(other_id)
+        books_version = reader.get_connection().execute(
+            "SELECT version FROM change_versions WHERE table_name = 'Books'").fetchone()
+
+        LoanRepository(writer).checkout(book_id, member_id)
+        sync_record_cache(reader)
+
+        assert books.get_book_by_id(book_id).available_copies == 1
+        books.get_book_by_id(other_id)
+        assert reader.get_record_cache().stats()['hits'] == 1
+        # Circulation moves the Loans version, not the Books one
+        assert reader.get_connection().execute(
+            "SELECT version FROM change_versions WHERE table_name = 'Books'").fetchone() == books_version
+
+    def test_trimmed_feed_clears_the_cache(self, writer_and_reader):
+        writer, reader = writer_and_reader
+        book_id = BookRepository(writer).add_book("Emma", "978-0-14-143958-7")
+        BookRepository(reader).get_book_by_id(book_id)
+        conn = writer.get_connection()
+        conn.execute("INSERT INTO row_changes (table_name, row_id) VALUES ('Books', 0), ('Books', 0)")
+        conn.execute("DELETE FROM row_changes WHERE seq = (SELECT MIN(seq) FROM row_changes)")
+        conn.commit()
+
+        sync_record_cache(reader)
+
+        assert reader.get_record_cache().stats()['size'] == 0
+
+
+class TestCacheHits:
+    """Cache hits never touch SQLite."""
+
+    def test_hit_runs_no_sql(self, database):
+        books = BookRepository(database)
+        book_id = books.add_book("Emma", "978-0-14-143958-7")
+        books.get_book_by_id(book_id)
+
+        statements = []
+        database.get_connection().set_trace_callback(statements.append)
+        try:
+            assert books.get_book_by_id(book_id).title == "Emma"
+        finally:
+            database.get_connection().set_trace_callback(None)
+
+        assert statements == []
+        assert database.get_record_cache().stats()['hits'] == 1
+
+    def test_cached_records_cannot_be_changed(self, database):
+        books = BookRepository(database)
+        book_id = books.add_book("Emma", "978-0-14-143958-7")
+        book = books.get_book_by_id(book_id)
+
+        with pytest.raises(AttributeError):
+            book.title = "Changed"
+
+        assert books.get_book_by_id(book_id).title == "Emma"
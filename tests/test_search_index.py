@@ -0,0 +1,35 @@
+"""
+Unit tests for rebuilding the full-text search index.
+"""
+
+import sqlite3
+
+import pytest
+
+from book_repository import BookRepository
+from search_index import SearchIndex
+
+
+class TestRebuild:
+    """Tests for SearchIndex.rebuild."""
+
+    def test_rebuild_restores_search(self, database):
+        books = BookRepository(database)
+        books.add_book("Emma", "978-0-14-143958-7")
+        database.get_connection().execute("DELETE FROM BookSearch")
+
+        SearchIndex(database).rebuild()
+
+        assert [book.title for book in books.search_books("emma")] == ["Emma"]
+
+    def test_failed_rebuild_raises_and_rolls_back(self, database):
+        books = BookRepository(database)
+        books.add_book("Emma", "978-0-14-143958-7")
+        conn = database.get_connection()
+        conn.execute("DROP TABLE AuthorSearch")
+        conn.commit()
+
+        with pytest.raises(sqlite3.OperationalError):
+            SearchIndex(database).rebuild()
+
+        assert conn.execute("SELECT COUNT(*) FROM BookSearch").fetchone()[0] == 1